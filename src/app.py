@@ -46,7 +46,15 @@ def _configure_logging() -> None:
 
 _configure_logging()
 
-app = create_app()
+app = create_app(
+    quote_runtime=os.getenv("UAG_QUOTE_RUNTIME", "thread"),
+    quote_source=os.getenv("UAG_QUOTE_SOURCE", "rest"),
+    quote_workers=int(os.getenv("UAG_QUOTE_WORKERS", "2")),
+    tick_log_dir=os.getenv("UAG_TICK_LOG_DIR") or None,
+    vector_rules=os.getenv("UAG_VECTOR_RULES", "0") == "1",
+    kia_request_rate_per_second=float(os.getenv("UAG_KIA_REQUEST_RATE", "5.0")),
+    kia_request_burst=int(os.getenv("UAG_KIA_REQUEST_BURST", "5")),
+)
 
 
 if __name__ == "__main__":
@@ -7,11 +7,12 @@ from .errors import (
     CsmSymbolDuplicatedError,
     CsmSymbolFormatInvalidError,
 )
-from .repository import CsmRuntimeRepository
+from .repository import CachedCsmRuntimeRepository, CsmRuntimeRepository
 from .service import CsmService
 
 __all__ = [
     "CsmRuntimeRepository",
+    "CachedCsmRuntimeRepository",
     "CsmService",
     "CsmSymbolCountOutOfRangeError",
     "CsmSymbolFormatInvalidError",
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import copy
 import json
 import os
 import tempfile
+import time
+from threading import Lock
+from typing import Callable
+
+_FileSignature = tuple[int, int, int]
 
 
 def _atomic_write_json(path: str, payload: dict) -> None:
@@ -42,3 +48,94 @@ class CsmRuntimeRepository:
 
     def write_credentials(self, credential_payload: dict) -> None:
         _atomic_write_json(self.credentials_path, credential_payload)
+
+
+class CachedCsmRuntimeRepository(CsmRuntimeRepository):
+    def __init__(
+        self,
+        settings_path: str = "runtime/config/settings.local.json",
+        credentials_path: str = "runtime/config/credentials.local.json",
+        *,
+        revalidate_interval_seconds: float = 0.0,
+        monotonic_fn: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(settings_path=settings_path, credentials_path=credentials_path)
+        self._revalidate_interval_seconds = max(0.0, revalidate_interval_seconds)
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self._lock = Lock()
+        self._entries: dict[str, tuple[_FileSignature, dict, float]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def read_settings(self) -> dict:
+        return self._read_cached(self.settings_path, super().read_settings)
+
+    def write_settings(self, snapshot: dict) -> None:
+        super().write_settings(snapshot)
+        self._store(self.settings_path, snapshot)
+
+    def read_credentials(self) -> dict:
+        return self._read_cached(self.credentials_path, super().read_credentials)
+
+    def write_credentials(self, credential_payload: dict) -> None:
+        super().write_credentials(credential_payload)
+        self._store(self.credentials_path, credential_payload)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+
+    def cache_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses, "invalidations": self._invalidations}
+
+    def _read_cached(self, path: str, loader: Callable[[], dict]) -> dict:
+        now = self._monotonic_fn()
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None:
+            signature, payload, checked_at = entry
+            if now - checked_at < self._revalidate_interval_seconds:
+                return self._hit(payload)
+            current = self._signature(path)
+            if current == signature:
+                with self._lock:
+                    if path in self._entries:
+                        self._entries[path] = (signature, payload, now)
+                return self._hit(payload)
+            with self._lock:
+                self._invalidations += 1
+
+        signature = self._signature(path)
+        payload = loader()
+        with self._lock:
+            self._misses += 1
+            if signature is not None and signature == self._signature(path):
+                self._entries[path] = (signature, payload, now)
+            else:
+                self._entries.pop(path, None)
+        return copy.deepcopy(payload)
+
+    def _hit(self, payload: dict) -> dict:
+        with self._lock:
+            self._hits += 1
+        return copy.deepcopy(payload)
+
+    def _store(self, path: str, payload: dict) -> None:
+        signature = self._signature(path)
+        with self._lock:
+            if signature is None:
+                self._entries.pop(path, None)
+                return
+            self._entries[path] = (signature, copy.deepcopy(payload), self._monotonic_fn())
+
+    @staticmethod
+    def _signature(path: str) -> _FileSignature | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
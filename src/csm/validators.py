@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import re
 
+from tse.constants import MAX_WATCH_SYMBOLS
+
 from .errors import (
     CsmCredentialRequiredFieldMissingError,
     CsmLiveConfirmRequiredError,
@@ -20,7 +22,7 @@ def normalize_symbols(watch_symbols: list[str]) -> list[str]:
 
 
 def validate_watch_symbols(watch_symbols: list[str]) -> None:
-    if len(watch_symbols) < 1 or len(watch_symbols) > 20:
+    if len(watch_symbols) < 1 or len(watch_symbols) > MAX_WATCH_SYMBOLS:
         raise CsmSymbolCountOutOfRangeError(field="watchSymbols", value=len(watch_symbols))
     if any((not symbol) or (not SYMBOL_PATTERN.match(symbol)) for symbol in watch_symbols):
         raise CsmSymbolFormatInvalidError(field="watchSymbols", value=watch_symbols)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import argparse
+import logging
+
+from prp.export import PrpColumnarExporter
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Export PRP event tables to Parquet partitions by table and trading date.")
+    parser.add_argument("--db", default="runtime/state/prp.db")
+    parser.add_argument("--out", default="runtime/export/prp")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--include-today", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    logger = logging.getLogger("privatetrade.export")
+
+    exporter = PrpColumnarExporter(args.db, args.out, chunk_size=args.chunk_size)
+    exported = exporter.export(include_today=args.include_today)
+    logger.info(
+        "PRP export finished: partitions=%s rows=%s out=%s",
+        len(exported),
+        sum(partition.row_count for partition in exported),
+        args.out,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
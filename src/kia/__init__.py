@@ -1,5 +1,8 @@
 from .api_client import RoutingKiaApiClient
+from .async_client import AsyncLiveKiaApiClient, AsyncPooledHttpTransport, asyncio_transport
+from .chart_cache import ChartBarCache, ChartBarStore
 from .contracts import (
+    AsyncKiaGateway,
     ExecutionFill,
     ExecutionResult,
     FetchExecutionRequest,
@@ -16,13 +19,30 @@ from .contracts import (
     SubmitOrderRequest,
 )
 from .errors import KiaError, KiaErrorPayload
-from .gateway import DefaultKiaGateway
+from .gateway import DefaultAsyncKiaGateway, DefaultKiaGateway
+from .http_pool import PooledHttpTransport
+from .idempotency import InMemoryIdempotencyStore, JournaledIdempotencyStore
+from .rate_limit import KiaRateLimiter, RateLimitRule
+from .realtime import KiaRealtimeQuoteClient
 
 __all__ = [
     "KiaApiClient",
     "KiaGateway",
     "RoutingKiaApiClient",
     "DefaultKiaGateway",
+    "AsyncKiaGateway",
+    "DefaultAsyncKiaGateway",
+    "AsyncLiveKiaApiClient",
+    "asyncio_transport",
+    "AsyncPooledHttpTransport",
+    "ChartBarCache",
+    "ChartBarStore",
+    "PooledHttpTransport",
+    "InMemoryIdempotencyStore",
+    "JournaledIdempotencyStore",
+    "KiaRateLimiter",
+    "RateLimitRule",
+    "KiaRealtimeQuoteClient",
     "FetchQuoteRequest",
     "MarketQuote",
     "PollQuotesRequest",
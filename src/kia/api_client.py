@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import json
 import time
-from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
-from threading import Lock
+from threading import Event, Lock
 from typing import Any, Callable
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
@@ -12,9 +12,16 @@ from urllib.request import Request, urlopen
 from .contracts import Mode, ServiceType
 from .endpoint_resolver import CsmEndpointResolver
 from .error_mapper import map_exception, map_http_status
-from .errors import KiaError
+from .errors import KiaError, make_kia_error
 from .idempotency import InMemoryIdempotencyStore
 from .models import AccessToken
+from .rate_limit import (
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE_PER_SECOND,
+    KiaRateLimiter,
+    RateLimitRule,
+    build_kia_rate_limiter,
+)
 from .retry import execute_with_retry
 from .token_provider import InMemoryTokenProvider
 
@@ -24,6 +31,7 @@ TransportFn = Callable[
 ]
 
 _SOR_STOCK_SUFFIX = "_AL"
+_BATCH_RETRYABLE_CODES = {"KIA_API_TIMEOUT", "KIA_RATE_LIMITED"}
 
 
 def _to_quote_sor_symbol(symbol: str) -> str:
@@ -206,6 +214,13 @@ class LiveKiaApiClient:
         quote_min_interval_seconds: float = 1.0,
         quote_global_min_interval_seconds: float = 0.25,
         idempotency_store: InMemoryIdempotencyStore | None = None,
+        quote_batch_max_workers: int = 1,
+        quote_batch_rate_per_second: float | None = None,
+        quote_batch_burst: int = 1,
+        request_rate_per_second: float | None = DEFAULT_REQUEST_RATE_PER_SECOND,
+        request_burst: int = DEFAULT_REQUEST_BURST,
+        order_priority_reserve: int = 1,
+        api_rate_limits: dict[str, RateLimitRule] | None = None,
     ) -> None:
         self._endpoint_resolver = endpoint_resolver
         self._token_provider = token_provider
@@ -219,10 +234,24 @@ class LiveKiaApiClient:
         self._monotonic_fn = monotonic_fn or time.monotonic
         self._quote_min_interval_seconds = max(0.0, quote_min_interval_seconds)
         self._quote_global_min_interval_seconds = max(0.0, quote_global_min_interval_seconds)
-        self._quote_rate_lock = Lock()
-        self._last_quote_sent_at_by_symbol: dict[tuple[Mode, str], float] = {}
-        self._last_quote_sent_at_global_by_mode: dict[Mode, float] = {}
         self._idempotency_store = idempotency_store or InMemoryIdempotencyStore()
+        self._quote_batch_max_workers = max(1, quote_batch_max_workers)
+        self._rate_limiter = build_kia_rate_limiter(
+            quote_global_min_interval_seconds=self._quote_global_min_interval_seconds,
+            quote_batch_rate_per_second=quote_batch_rate_per_second,
+            quote_batch_burst=quote_batch_burst,
+            request_rate_per_second=request_rate_per_second,
+            request_burst=request_burst,
+            order_priority_reserve=order_priority_reserve,
+            api_rate_limits=api_rate_limits,
+            monotonic_fn=self._monotonic_fn,
+        )
+        self._quote_batch_executor: ThreadPoolExecutor | None = None
+        self._quote_batch_executor_lock = Lock()
+
+    @property
+    def rate_limiter(self) -> KiaRateLimiter:
+        return self._rate_limiter
 
     def call(
         self,
@@ -236,6 +265,7 @@ class LiveKiaApiClient:
         idempotency_key: str | None = None,
         query: dict[str, str] | None = None,
         retry_attempts_override: int | None = None,
+        deadline: float | None = None,
     ) -> dict[str, Any]:
         resolved_mode: Mode = mode or "mock"
         if service_type == "auth":
@@ -266,6 +296,7 @@ class LiveKiaApiClient:
                     query=query,
                     idempotency_key=idempotency_key,
                     token=token.token,
+                    deadline=deadline,
                 )
                 if service_type == "order" and idempotency_key:
                     self._idempotency_store.save(mode=resolved_mode, key=idempotency_key, response=response)
@@ -285,6 +316,7 @@ class LiveKiaApiClient:
                         query=query,
                         idempotency_key=idempotency_key,
                         token=refreshed.token,
+                        deadline=deadline,
                     )
                 if service_type == "order" and exc.code == "KIA_API_TIMEOUT":
                     existing = self._idempotency_store.find(mode=resolved_mode, key=idempotency_key)
@@ -317,6 +349,13 @@ class LiveKiaApiClient:
         poll_cycle_id: str,
     ) -> dict[str, Any]:
         resolved_mode: Mode = mode or "mock"
+        if self._quote_batch_max_workers > 1 and len(symbols) > 1:
+            return self._fetch_quotes_batch_concurrent(
+                mode=resolved_mode,
+                symbols=symbols,
+                timeout_ms=timeout_ms,
+                poll_cycle_id=poll_cycle_id,
+            )
         quotes: list[dict[str, Any]] = []
         errors: list[dict[str, Any]] = []
         for symbol in symbols:
@@ -365,6 +404,116 @@ class LiveKiaApiClient:
             "partial": len(errors) > 0,
         }
 
+    def _fetch_quotes_batch_concurrent(
+        self,
+        *,
+        mode: Mode,
+        symbols: list[str],
+        timeout_ms: int,
+        poll_cycle_id: str,
+    ) -> dict[str, Any]:
+        timeout_seconds = max(timeout_ms, 0) / 1000
+        deadline = self._monotonic_fn() + timeout_seconds
+        executor = self._get_quote_batch_executor()
+        cycle_closed = Event()
+        quotes: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        submitted: list[tuple[str, Future[dict[str, Any]]]] = []
+        for symbol in symbols:
+            ready_at = self._claim_quote_slot(mode=mode, symbol=symbol, deadline=deadline)
+            if ready_at is None:
+                errors.append({"symbol": symbol, "code": "KIA_RATE_LIMITED", "retryable": True})
+                continue
+            future = executor.submit(
+                self._fetch_batch_quote,
+                mode=mode,
+                symbol=symbol,
+                ready_at=ready_at,
+                deadline=deadline,
+                cycle_closed=cycle_closed,
+            )
+            submitted.append((symbol, future))
+        done, _ = wait([future for _, future in submitted], timeout=timeout_seconds)
+        cycle_closed.set()
+
+        for symbol, future in submitted:
+            if future not in done:
+                future.cancel()
+                errors.append({"symbol": symbol, "code": "KIA_API_TIMEOUT", "retryable": True})
+                continue
+            try:
+                quotes.append(future.result())
+            except KiaError as exc:
+                errors.append({"symbol": symbol, "code": exc.code, "retryable": exc.retryable})
+            except Exception as exc:  # pragma: no cover - call() maps transport errors
+                mapped = map_exception(exc)
+                errors.append({"symbol": symbol, "code": mapped.code, "retryable": mapped.retryable})
+        order = {symbol: index for index, symbol in enumerate(symbols)}
+        errors.sort(key=lambda error: order[error["symbol"]])
+        return {
+            "poll_cycle_id": poll_cycle_id,
+            "timeout_ms": timeout_ms,
+            "quotes": quotes,
+            "errors": errors,
+            "partial": len(errors) > 0,
+        }
+
+    def _claim_quote_slot(self, *, mode: Mode, symbol: str, deadline: float) -> float | None:
+        if self._quote_min_interval_seconds <= 0:
+            return self._monotonic_fn()
+        return self._rate_limiter.claim_key_slot(
+            mode=mode,
+            api_id="ka10007",
+            key=_to_quote_sor_symbol(symbol),
+            interval_seconds=self._quote_min_interval_seconds,
+            deadline=deadline,
+        )
+
+    def _fetch_batch_quote(
+        self,
+        *,
+        mode: Mode,
+        symbol: str,
+        ready_at: float,
+        deadline: float,
+        cycle_closed: Event,
+    ) -> dict[str, Any]:
+        wait_seconds = ready_at - self._monotonic_fn()
+        if wait_seconds > 0:
+            sleep_fn = self._sleep_fn if self._sleep_fn is not None else time.sleep
+            sleep_fn(wait_seconds)
+        attempts = 0
+        while True:
+            if cycle_closed.is_set() or self._monotonic_fn() >= deadline:
+                raise make_kia_error(
+                    "KIA_API_TIMEOUT",
+                    "시세 조회 주기 마감 시간이 지나 호출을 취소했습니다.",
+                    True,
+                    {"reason": "quote_batch_deadline"},
+                )
+            attempts += 1
+            try:
+                return self.call(
+                    service_type="quote",
+                    mode=mode,
+                    payload={"stk_cd": _to_quote_sor_symbol(symbol)},
+                    api_id="ka10007",
+                    retry_attempts_override=1,
+                    deadline=deadline,
+                )
+            except KiaError as exc:
+                if exc.code not in _BATCH_RETRYABLE_CODES or attempts >= 2 or self._monotonic_fn() >= deadline:
+                    raise
+
+    def _get_quote_batch_executor(self) -> ThreadPoolExecutor:
+        with self._quote_batch_executor_lock:
+            if self._quote_batch_executor is None:
+                self._quote_batch_executor = ThreadPoolExecutor(
+                    max_workers=self._quote_batch_max_workers,
+                    thread_name_prefix="kia-quote-batch",
+                )
+            return self._quote_batch_executor
+
     def submit_order_raw(
         self,
         *,
@@ -401,36 +550,39 @@ class LiveKiaApiClient:
         query: dict[str, str] | None,
         idempotency_key: str | None,
         token: str | None = None,
+        deadline: float | None = None,
     ) -> dict[str, Any]:
-        request_guard = self._quote_rate_lock if service_type != "quote" else nullcontext()
-        with request_guard:
-            if service_type == "quote":
-                self._enforce_quote_rate_limit(mode=mode, payload=payload)
-
-            endpoint = self._endpoint_resolver.resolve(mode, service_type)
-            headers = {
-                "Content-Type": "application/json;charset=UTF-8",
-                "cont-yn": cont_yn,
-                "next-key": next_key,
-            }
-            if token:
-                headers["authorization"] = f"Bearer {token}"
-            if api_id:
-                headers["api-id"] = api_id
-            if idempotency_key:
-                headers["X-Idempotency-Key"] = idempotency_key
-
-            try:
-                status, response = self._transport(
-                    endpoint.method,
-                    f"{endpoint.base_url}{endpoint.path}",
-                    headers,
-                    payload,
-                    query,
-                    self._timeout_seconds,
-                )
-            except Exception as exc:  # pragma: no cover - mapper is covered
-                raise map_exception(exc) from exc
+        if service_type != "auth":
+            self._acquire_rate_limit(service_type=service_type, mode=mode, api_id=api_id, payload=payload, deadline=deadline)
+
+        timeout_seconds = self._timeout_seconds
+        if deadline is not None:
+            timeout_seconds = min(timeout_seconds, max(deadline - self._monotonic_fn(), 0.001))
+
+        endpoint = self._endpoint_resolver.resolve(mode, service_type)
+        headers = {
+            "Content-Type": "application/json;charset=UTF-8",
+            "cont-yn": cont_yn,
+            "next-key": next_key,
+        }
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+        if api_id:
+            headers["api-id"] = api_id
+        if idempotency_key:
+            headers["X-Idempotency-Key"] = idempotency_key
+
+        try:
+            status, response = self._transport(
+                endpoint.method,
+                f"{endpoint.base_url}{endpoint.path}",
+                headers,
+                payload,
+                query,
+                timeout_seconds,
+            )
+        except Exception as exc:  # pragma: no cover - mapper is covered
+            raise map_exception(exc) from exc
 
         if status < 200 or status >= 300:
             raise map_http_status(status, response)
@@ -438,38 +590,37 @@ class LiveKiaApiClient:
             raise map_exception(ValueError("response is not object"))
         return response
 
-    def _enforce_quote_rate_limit(self, *, mode: Mode, payload: dict[str, Any] | None) -> None:
-        sleep_fn = self._sleep_fn if self._sleep_fn is not None else time.sleep
-        with self._quote_rate_lock:
-            if self._quote_min_interval_seconds <= 0 and self._quote_global_min_interval_seconds <= 0:
-                return
-            symbol = ""
-            if payload is not None:
-                symbol = str(payload.get("stk_cd", "")).strip()
-            symbol_key = symbol if symbol else "*"
-            symbol_rate_key = (mode, symbol_key)
-            now = self._monotonic_fn()
-            remaining_by_symbol = 0.0
-            if self._quote_min_interval_seconds > 0:
-                last_sent_at = self._last_quote_sent_at_by_symbol.get(symbol_rate_key)
-                if last_sent_at is not None:
-                    elapsed_by_symbol = now - last_sent_at
-                    remaining_by_symbol = self._quote_min_interval_seconds - elapsed_by_symbol
-
-            remaining_global = 0.0
-            if self._quote_global_min_interval_seconds > 0:
-                last_global = self._last_quote_sent_at_global_by_mode.get(mode)
-                if last_global is not None:
-                    elapsed_global = now - last_global
-                    remaining_global = self._quote_global_min_interval_seconds - elapsed_global
-
-            remaining = max(remaining_by_symbol, remaining_global)
-            if remaining > 0:
-                sleep_fn(remaining)
-                now = self._monotonic_fn()
-
-            self._last_quote_sent_at_by_symbol[symbol_rate_key] = now
-            self._last_quote_sent_at_global_by_mode[mode] = now
+    def _acquire_rate_limit(
+        self,
+        *,
+        service_type: ServiceType,
+        mode: Mode,
+        api_id: str | None,
+        payload: dict[str, Any] | None,
+        deadline: float | None,
+    ) -> None:
+        key: str | None = None
+        if service_type == "quote" and deadline is None and self._quote_min_interval_seconds > 0:
+            symbol = str((payload or {}).get("stk_cd", "")).strip()
+            key = symbol if symbol else "*"
+        wait_seconds = self._rate_limiter.reserve(
+            mode=mode,
+            api_id=api_id,
+            priority=service_type == "order",
+            key=key,
+            key_interval_seconds=self._quote_min_interval_seconds,
+            deadline=deadline,
+        )
+        if wait_seconds is None:
+            raise make_kia_error(
+                "KIA_API_TIMEOUT",
+                "시세 조회 주기 마감 시간 내에 호출 한도를 확보하지 못했습니다.",
+                True,
+                {"reason": "quote_batch_deadline"},
+            )
+        if wait_seconds > 0:
+            sleep_fn = self._sleep_fn if self._sleep_fn is not None else time.sleep
+            sleep_fn(wait_seconds)
 
 
 class RoutingKiaApiClient:
@@ -487,11 +638,20 @@ class RoutingKiaApiClient:
         monotonic_fn: Callable[[], float] | None = None,
         quote_min_interval_seconds: float = 1.0,
         quote_global_min_interval_seconds: float = 0.25,
+        quote_batch_max_workers: int = 1,
+        quote_batch_rate_per_second: float | None = None,
+        quote_batch_burst: int = 1,
+        request_rate_per_second: float | None = DEFAULT_REQUEST_RATE_PER_SECOND,
+        request_burst: int = DEFAULT_REQUEST_BURST,
+        order_priority_reserve: int = 1,
+        api_rate_limits: dict[str, RateLimitRule] | None = None,
+        token_provider: InMemoryTokenProvider | None = None,
+        idempotency_store: InMemoryIdempotencyStore | None = None,
     ) -> None:
         self._resolver = CsmEndpointResolver(csm_repository=csm_repository)
         self._transport = transport
         self._mock_client = MockKiaApiClient()
-        self._token_provider = InMemoryTokenProvider(self._issue_live_token)
+        self._token_provider = token_provider or InMemoryTokenProvider(self._issue_live_token)
         self._live_client = LiveKiaApiClient(
             endpoint_resolver=self._resolver,
             token_provider=self._token_provider,
@@ -505,6 +665,14 @@ class RoutingKiaApiClient:
             monotonic_fn=monotonic_fn,
             quote_min_interval_seconds=quote_min_interval_seconds,
             quote_global_min_interval_seconds=quote_global_min_interval_seconds,
+            quote_batch_max_workers=quote_batch_max_workers,
+            quote_batch_rate_per_second=quote_batch_rate_per_second,
+            quote_batch_burst=quote_batch_burst,
+            request_rate_per_second=request_rate_per_second,
+            request_burst=request_burst,
+            order_priority_reserve=order_priority_reserve,
+            api_rate_limits=api_rate_limits,
+            idempotency_store=idempotency_store,
         )
         self._last_mode: Mode | None = None
 
@@ -579,6 +747,28 @@ class RoutingKiaApiClient:
         client = self._select_client(selected_mode)
         return client.fetch_position_raw(mode=selected_mode, account_no=account_no, symbol=symbol)
 
+    @property
+    def endpoint_resolver(self) -> CsmEndpointResolver:
+        return self._resolver
+
+    @property
+    def token_provider(self) -> InMemoryTokenProvider:
+        return self._token_provider
+
+    @property
+    def mock_client(self) -> MockKiaApiClient:
+        return self._mock_client
+
+    @property
+    def rate_limiter(self) -> KiaRateLimiter:
+        return self._live_client.rate_limiter
+
+    def resolve_mode(self, mode: Mode | None) -> Mode:
+        return self._resolve_mode(mode)
+
+    def uses_live_client(self, mode: Mode) -> bool:
+        return self._select_client(mode) is self._live_client
+
     def _resolve_mode(self, mode: Mode | None) -> Mode:
         if mode in {"mock", "live"}:
             selected_mode: Mode = mode
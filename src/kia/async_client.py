@@ -0,0 +1,617 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import ssl
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlencode, urlsplit
+
+from .api_client import _BATCH_RETRYABLE_CODES, _to_quote_sor_symbol
+from .contracts import Mode, ServiceType
+from .endpoint_resolver import CsmEndpointResolver
+from .error_mapper import map_exception, map_http_status
+from .errors import KiaError, make_kia_error
+from .http_pool import is_retryable_request
+from .idempotency import InMemoryIdempotencyStore
+from .models import AccessToken
+from .rate_limit import KiaRateLimiter, build_kia_rate_limiter
+from .retry import execute_with_retry_async
+from .token_provider import InMemoryTokenProvider
+
+AsyncTransportFn = Callable[
+    [str, str, dict[str, str], dict[str, Any] | None, dict[str, str] | None, float],
+    Awaitable[tuple[int, dict[str, Any]]],
+]
+
+
+_STALE_CONNECTION_ERRORS = (ConnectionError, asyncio.IncompleteReadError)
+
+
+def _decode_body(status: int, raw: str) -> tuple[int, dict[str, Any]]:
+    if not raw.strip():
+        return status, {}
+    try:
+        return status, json.loads(raw)
+    except ValueError:
+        if 200 <= status < 300:
+            raise
+        return status, {"raw": raw}
+
+
+def _prepare_request(
+    url: str,
+    headers: dict[str, str],
+    payload: dict[str, Any] | None,
+    query: dict[str, str] | None,
+    *,
+    keep_alive: bool,
+) -> tuple[tuple[str, str, int], str, dict[str, str], bytes]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ""
+    default_port = 443 if scheme == "https" else 80
+    port = parts.port or default_port
+
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    if query:
+        target = f"{target}{'&' if parts.query else '?'}{urlencode(query)}"
+
+    body = b""
+    if payload is not None:
+        body = json.dumps(payload).encode("utf-8")
+
+    request_headers = {
+        "Host": host if port == default_port else f"{host}:{port}",
+        "Connection": "keep-alive" if keep_alive else "close",
+        **headers,
+    }
+    if payload is not None:
+        request_headers["Content-Length"] = str(len(body))
+    return (scheme, host, port), target, request_headers, body
+
+
+async def _open_stream(key: tuple[str, str, int]) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    scheme, host, port = key
+    return await asyncio.open_connection(
+        host,
+        port,
+        ssl=ssl.create_default_context() if scheme == "https" else None,
+    )
+
+
+async def _close_stream(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except (OSError, ssl.SSLError):
+        pass
+
+
+async def _exchange(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    target: str,
+    headers: dict[str, str],
+    body: bytes,
+) -> tuple[int, str, bool]:
+    head = "".join(f"{key}: {value}\r\n" for key, value in headers.items())
+    writer.write(f"{method} {target} HTTP/1.1\r\n{head}\r\n".encode("latin-1") + body)
+    await writer.drain()
+
+    status_line = (await reader.readline()).decode("latin-1").strip()
+    if not status_line:
+        raise ConnectionResetError("connection closed before response started")
+    status_parts = status_line.split(" ", 2)
+    if len(status_parts) < 2 or not status_parts[1].isdigit():
+        raise ConnectionError(f"invalid status line: {status_line!r}")
+    status = int(status_parts[1])
+
+    response_headers: dict[str, str] = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in {"\r\n", "\n", ""}:
+            break
+        name, _, value = line.partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+
+    reusable = status_parts[0].upper() == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+    if response_headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks: list[bytes] = []
+        while True:
+            size_line = (await reader.readline()).decode("latin-1").split(";", 1)[0].strip()
+            size = int(size_line or "0", 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        raw = b"".join(chunks)
+    elif "content-length" in response_headers:
+        raw = await reader.readexactly(int(response_headers["content-length"]))
+    else:
+        raw = await reader.read()
+        reusable = False
+    return status, raw.decode("utf-8"), reusable
+
+
+async def asyncio_transport(
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    payload: dict[str, Any] | None,
+    query: dict[str, str] | None,
+    timeout_seconds: float,
+) -> tuple[int, dict[str, Any]]:
+    status, raw = await asyncio.wait_for(_request(method, url, headers, payload, query), timeout=timeout_seconds)
+    return _decode_body(status, raw)
+
+
+async def _request(
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    payload: dict[str, Any] | None,
+    query: dict[str, str] | None,
+) -> tuple[int, str]:
+    key, target, request_headers, body = _prepare_request(url, headers, payload, query, keep_alive=False)
+    reader, writer = await _open_stream(key)
+    try:
+        status, raw, _ = await _exchange(reader, writer, method, target, request_headers, body)
+    except asyncio.IncompleteReadError as exc:
+        raise ConnectionError("connection closed before response completed") from exc
+    finally:
+        await _close_stream(writer)
+    return status, raw
+
+
+@dataclass
+class _AsyncPooledConnection:
+    connection_id: int
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    loop: asyncio.AbstractEventLoop
+    last_used_at: float
+    request_count: int = 0
+
+
+class AsyncPooledHttpTransport:
+    def __init__(
+        self,
+        *,
+        max_idle_per_origin: int = 4,
+        idle_timeout_seconds: float = 30.0,
+        monotonic_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if max_idle_per_origin < 1:
+            raise ValueError("max_idle_per_origin must be >= 1")
+        self._max_idle_per_origin = max_idle_per_origin
+        self._idle_timeout_seconds = max(0.0, idle_timeout_seconds)
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self._idle: dict[tuple[str, str, int], deque[_AsyncPooledConnection]] = {}
+        self._ids = count(1)
+        self._closed = False
+        self._connections_created = 0
+        self._requests_total = 0
+        self._reused_requests = 0
+        self._reconnects = 0
+        self._idle_evictions = 0
+
+    async def __call__(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any] | None,
+        query: dict[str, str] | None,
+        timeout_seconds: float,
+    ) -> tuple[int, dict[str, Any]]:
+        status, raw = await asyncio.wait_for(self._request(method, url, headers, payload, query), timeout=timeout_seconds)
+        return _decode_body(status, raw)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "connections_created": self._connections_created,
+            "requests_total": self._requests_total,
+            "reused_requests": self._reused_requests,
+            "reconnects": self._reconnects,
+            "idle_evictions": self._idle_evictions,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+        }
+
+    def close(self) -> None:
+        self._closed = True
+        pooled_items = [pooled for idle in self._idle.values() for pooled in idle]
+        self._idle.clear()
+        for pooled in pooled_items:
+            if not pooled.loop.is_closed():
+                pooled.loop.call_soon_threadsafe(pooled.writer.close)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any] | None,
+        query: dict[str, str] | None,
+    ) -> tuple[int, str]:
+        key, target, request_headers, body = _prepare_request(url, headers, payload, query, keep_alive=True)
+        pooled = await self._acquire(key)
+        if pooled.request_count > 0:
+            try:
+                return await self._send(key, pooled, method, target, request_headers, body)
+            except _STALE_CONNECTION_ERRORS:
+                if not is_retryable_request(method, headers):
+                    raise
+                self._reconnects += 1
+            pooled = await self._acquire(key, force_new=True)
+        try:
+            return await self._send(key, pooled, method, target, request_headers, body)
+        except asyncio.IncompleteReadError as exc:
+            raise ConnectionError("connection closed before response completed") from exc
+
+    async def _send(
+        self,
+        key: tuple[str, str, int],
+        pooled: _AsyncPooledConnection,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> tuple[int, str]:
+        try:
+            status, raw, reusable = await _exchange(pooled.reader, pooled.writer, method, target, headers, body)
+        except BaseException:
+            pooled.writer.close()
+            raise
+        self._requests_total += 1
+        if pooled.request_count > 0:
+            self._reused_requests += 1
+        pooled.request_count += 1
+        pooled.last_used_at = self._monotonic_fn()
+        idle = self._idle.setdefault(key, deque())
+        if reusable and not self._closed and len(idle) < self._max_idle_per_origin:
+            idle.append(pooled)
+        else:
+            await _close_stream(pooled.writer)
+        return status, raw
+
+    async def _acquire(self, key: tuple[str, str, int], *, force_new: bool = False) -> _AsyncPooledConnection:
+        if self._closed:
+            raise RuntimeError("transport is closed")
+        loop = asyncio.get_running_loop()
+        idle = self._idle.setdefault(key, deque())
+        now = self._monotonic_fn()
+        while idle and not force_new:
+            pooled = idle.pop()
+            expired = self._idle_timeout_seconds and now - pooled.last_used_at > self._idle_timeout_seconds
+            if pooled.loop is not loop or expired or pooled.reader.at_eof():
+                self._idle_evictions += 1
+                if pooled.loop is loop:
+                    await _close_stream(pooled.writer)
+                continue
+            return pooled
+        reader, writer = await _open_stream(key)
+        self._connections_created += 1
+        return _AsyncPooledConnection(
+            connection_id=next(self._ids),
+            reader=reader,
+            writer=writer,
+            loop=loop,
+            last_used_at=self._monotonic_fn(),
+        )
+
+
+class AsyncLiveKiaApiClient:
+    def __init__(
+        self,
+        *,
+        endpoint_resolver: CsmEndpointResolver,
+        token_provider: InMemoryTokenProvider,
+        transport: AsyncTransportFn | None = None,
+        timeout_seconds: float = 5.0,
+        retry_attempts: int = 3,
+        retry_base_delay_seconds: float = 0.2,
+        retry_max_delay_seconds: float = 2.0,
+        sleep_fn: Callable[[float], Awaitable[None]] | None = None,
+        rand_fn: Callable[[float, float], float] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        quote_min_interval_seconds: float = 1.0,
+        quote_global_min_interval_seconds: float = 0.25,
+        idempotency_store: InMemoryIdempotencyStore | None = None,
+        rate_limiter: KiaRateLimiter | None = None,
+    ) -> None:
+        self._endpoint_resolver = endpoint_resolver
+        self._token_provider = token_provider
+        self._transport = transport if transport is not None else AsyncPooledHttpTransport()
+        self._timeout_seconds = timeout_seconds
+        self._retry_attempts = retry_attempts
+        self._retry_base_delay_seconds = retry_base_delay_seconds
+        self._retry_max_delay_seconds = retry_max_delay_seconds
+        self._sleep_fn = sleep_fn or asyncio.sleep
+        self._rand_fn = rand_fn or random.uniform
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self._quote_min_interval_seconds = max(0.0, quote_min_interval_seconds)
+        self._rate_limiter = rate_limiter or build_kia_rate_limiter(
+            quote_global_min_interval_seconds=max(0.0, quote_global_min_interval_seconds),
+            monotonic_fn=self._monotonic_fn,
+        )
+        self._idempotency_store = idempotency_store or InMemoryIdempotencyStore()
+
+    @property
+    def transport(self) -> AsyncTransportFn:
+        return self._transport
+
+    @property
+    def rate_limiter(self) -> KiaRateLimiter:
+        return self._rate_limiter
+
+    async def call(
+        self,
+        *,
+        service_type: ServiceType,
+        mode: Mode | None,
+        payload: dict[str, Any] | None,
+        api_id: str | None = None,
+        cont_yn: str = "N",
+        next_key: str = "",
+        idempotency_key: str | None = None,
+        query: dict[str, str] | None = None,
+        retry_attempts_override: int | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        resolved_mode: Mode = mode or "mock"
+        if service_type == "auth":
+            return await self._send(
+                service_type="auth",
+                mode=resolved_mode,
+                payload=payload,
+                api_id=api_id,
+                cont_yn=cont_yn,
+                next_key=next_key,
+                query=query,
+                idempotency_key=idempotency_key,
+            )
+
+        has_forced_refresh = False
+
+        async def operation() -> dict[str, Any]:
+            nonlocal has_forced_refresh
+            token = await self._get_valid_token(resolved_mode)
+            try:
+                response = await self._send(
+                    service_type=service_type,
+                    mode=resolved_mode,
+                    payload=payload,
+                    api_id=api_id,
+                    cont_yn=cont_yn,
+                    next_key=next_key,
+                    query=query,
+                    idempotency_key=idempotency_key,
+                    token=token.token,
+                    deadline=deadline,
+                )
+                if service_type == "order" and idempotency_key:
+                    self._idempotency_store.save(mode=resolved_mode, key=idempotency_key, response=response)
+                return response
+            except KiaError as exc:
+                if exc.code == "KIA_AUTH_TOKEN_EXPIRED" and not has_forced_refresh:
+                    has_forced_refresh = True
+                    self._token_provider.invalidate(resolved_mode)
+                    refreshed = await asyncio.to_thread(self._token_provider.force_refresh, resolved_mode)
+                    return await self._send(
+                        service_type=service_type,
+                        mode=resolved_mode,
+                        payload=payload,
+                        api_id=api_id,
+                        cont_yn=cont_yn,
+                        next_key=next_key,
+                        query=query,
+                        idempotency_key=idempotency_key,
+                        token=refreshed.token,
+                        deadline=deadline,
+                    )
+                if service_type == "order" and exc.code == "KIA_API_TIMEOUT":
+                    existing = self._idempotency_store.find(mode=resolved_mode, key=idempotency_key)
+                    if existing is not None:
+                        return existing
+                raise
+
+        return await execute_with_retry_async(
+            operation,
+            should_retry=lambda exc, _attempt: isinstance(exc, KiaError)
+            and exc.retryable
+            and getattr(exc, "code", "") != "KIA_AUTH_TOKEN_EXPIRED"
+            and not (service_type == "order" and getattr(exc, "code", "") == "KIA_API_TIMEOUT"),
+            attempts=retry_attempts_override if retry_attempts_override is not None else self._retry_attempts,
+            base_delay_seconds=self._retry_base_delay_seconds,
+            max_delay_seconds=self._retry_max_delay_seconds,
+            sleep_fn=self._sleep_fn,
+            rand_fn=self._rand_fn,
+        )
+
+    async def fetch_quote_raw(self, *, mode: Mode | None, symbol: str, api_id: str = "ka10007") -> dict[str, Any]:
+        return await self.call(service_type="quote", mode=mode, payload={"stk_cd": _to_quote_sor_symbol(symbol)}, api_id=api_id)
+
+    async def fetch_quotes_batch_raw(
+        self,
+        *,
+        mode: Mode | None,
+        symbols: list[str],
+        timeout_ms: int,
+        poll_cycle_id: str,
+    ) -> dict[str, Any]:
+        resolved_mode: Mode = mode or "mock"
+        timeout_seconds = max(timeout_ms, 0) / 1000
+        deadline = self._monotonic_fn() + timeout_seconds
+        tasks = [
+            asyncio.ensure_future(self._fetch_batch_quote(mode=resolved_mode, symbol=symbol, deadline=deadline))
+            for symbol in symbols
+        ]
+        done: set[asyncio.Future[dict[str, Any]]] = set()
+        if tasks:
+            done, _ = await asyncio.wait(tasks, timeout=timeout_seconds)
+
+        quotes: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        for symbol, task in zip(symbols, tasks):
+            if task not in done:
+                task.cancel()
+                errors.append({"symbol": symbol, "code": "KIA_API_TIMEOUT", "retryable": True})
+                continue
+            try:
+                quotes.append(task.result())
+            except KiaError as exc:
+                errors.append({"symbol": symbol, "code": exc.code, "retryable": exc.retryable})
+            except Exception as exc:  # pragma: no cover - call() maps transport errors
+                mapped = map_exception(exc)
+                errors.append({"symbol": symbol, "code": mapped.code, "retryable": mapped.retryable})
+        return {
+            "poll_cycle_id": poll_cycle_id,
+            "timeout_ms": timeout_ms,
+            "quotes": quotes,
+            "errors": errors,
+            "partial": len(errors) > 0,
+        }
+
+    async def _fetch_batch_quote(self, *, mode: Mode, symbol: str, deadline: float) -> dict[str, Any]:
+        try:
+            return await self.call(
+                service_type="quote",
+                mode=mode,
+                payload={"stk_cd": _to_quote_sor_symbol(symbol)},
+                api_id="ka10007",
+                retry_attempts_override=1,
+                deadline=deadline,
+            )
+        except KiaError as first_error:
+            if first_error.code not in _BATCH_RETRYABLE_CODES or self._monotonic_fn() >= deadline:
+                raise
+        return await self.call(
+            service_type="quote",
+            mode=mode,
+            payload={"stk_cd": _to_quote_sor_symbol(symbol)},
+            api_id="ka10007",
+            retry_attempts_override=1,
+            deadline=deadline,
+        )
+
+    async def submit_order_raw(
+        self,
+        *,
+        mode: Mode | None,
+        payload: dict[str, Any],
+        client_order_id: str,
+        api_id: str,
+    ) -> dict[str, Any]:
+        return await self.call(service_type="order", mode=mode, payload=payload, idempotency_key=client_order_id, api_id=api_id)
+
+    async def fetch_execution_raw(self, *, mode: Mode | None, account_no: str, broker_order_id: str) -> dict[str, Any]:
+        return await self.call(
+            service_type="execution",
+            mode=mode,
+            payload=None,
+            query={"accountNo": account_no, "brokerOrderId": broker_order_id},
+        )
+
+    async def fetch_position_raw(self, *, mode: Mode | None, account_no: str, symbol: str | None) -> dict[str, Any]:
+        query = {"accountNo": account_no}
+        if symbol is not None:
+            query["symbol"] = symbol
+        return await self.call(service_type="execution", mode=mode, payload=None, query=query)
+
+    async def _get_valid_token(self, mode: Mode) -> AccessToken:
+        token = self._token_provider.peek_valid_token(mode)
+        if token is not None:
+            return token
+        return await asyncio.to_thread(self._token_provider.get_valid_token, mode)
+
+    async def _send(
+        self,
+        *,
+        service_type: ServiceType,
+        mode: Mode,
+        payload: dict[str, Any] | None,
+        api_id: str | None,
+        cont_yn: str,
+        next_key: str,
+        query: dict[str, str] | None,
+        idempotency_key: str | None,
+        token: str | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        if service_type != "auth":
+            await self._acquire_rate_limit(service_type=service_type, mode=mode, api_id=api_id, payload=payload, deadline=deadline)
+
+        timeout_seconds = self._timeout_seconds
+        if deadline is not None:
+            timeout_seconds = min(timeout_seconds, max(deadline - self._monotonic_fn(), 0.001))
+
+        endpoint = self._endpoint_resolver.resolve(mode, service_type)
+        headers = {
+            "Content-Type": "application/json;charset=UTF-8",
+            "cont-yn": cont_yn,
+            "next-key": next_key,
+        }
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+        if api_id:
+            headers["api-id"] = api_id
+        if idempotency_key:
+            headers["X-Idempotency-Key"] = idempotency_key
+
+        try:
+            status, response = await self._transport(
+                endpoint.method,
+                f"{endpoint.base_url}{endpoint.path}",
+                headers,
+                payload,
+                query,
+                timeout_seconds,
+            )
+        except Exception as exc:  # pragma: no cover - mapper is covered
+            raise map_exception(exc) from exc
+
+        if status < 200 or status >= 300:
+            raise map_http_status(status, response)
+        if not isinstance(response, dict):
+            raise map_exception(ValueError("response is not object"))
+        return response
+
+    async def _acquire_rate_limit(
+        self,
+        *,
+        service_type: ServiceType,
+        mode: Mode,
+        api_id: str | None,
+        payload: dict[str, Any] | None,
+        deadline: float | None,
+    ) -> None:
+        key: str | None = None
+        if service_type == "quote" and self._quote_min_interval_seconds > 0:
+            symbol = str((payload or {}).get("stk_cd", "")).strip()
+            key = symbol if symbol else "*"
+        wait_seconds = self._rate_limiter.reserve(
+            mode=mode,
+            api_id=api_id,
+            priority=service_type == "order",
+            key=key,
+            key_interval_seconds=self._quote_min_interval_seconds,
+            deadline=deadline,
+        )
+        if wait_seconds is None:
+            raise make_kia_error(
+                "KIA_API_TIMEOUT",
+                "시세 조회 주기 마감 시간 내에 호출 한도를 확보하지 못했습니다.",
+                True,
+                {"reason": "quote_batch_deadline"},
+            )
+        if wait_seconds > 0:
+            await self._sleep_fn(wait_seconds)
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Callable, Iterable
+
+from .api_client import RoutingKiaApiClient
+from .contracts import Mode
+
+CHART_API_ID = "ka10080"
+CHART_ROWS_KEY = "stk_min_pole_chart_qry"
+DEFAULT_CHART_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_KST = timezone(timedelta(hours=9))
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS chart_bars (
+        symbol TEXT NOT NULL,
+        trading_date TEXT NOT NULL,
+        tic_scope TEXT NOT NULL,
+        complete INTEGER NOT NULL,
+        last_bar_time TEXT NOT NULL,
+        row_count INTEGER NOT NULL,
+        byte_size INTEGER NOT NULL,
+        fetched_at TEXT NOT NULL,
+        accessed_at REAL NOT NULL,
+        payload BLOB NOT NULL,
+        PRIMARY KEY (symbol, trading_date, tic_scope)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_chart_bars_accessed ON chart_bars(accessed_at)",
+)
+
+
+def build_chart_payload(symbol: str, trading_date: date, tic_scope: str = "1") -> dict[str, Any]:
+    return {
+        "stk_cd": symbol,
+        "tic_scope": tic_scope,
+        "upd_stkpc_tp": "1",
+        "base_dt": trading_date.strftime("%Y%m%d"),
+    }
+
+
+def _row_digits(row: dict[str, Any]) -> str:
+    return "".join(ch for ch in str(row.get("cntr_tm") or row.get("time") or "") if ch.isdigit())
+
+
+def chart_rows_for_date(raw: dict[str, Any], trading_date: date) -> list[dict[str, Any]]:
+    rows = raw.get(CHART_ROWS_KEY) or raw.get("min_chart") or []
+    if not isinstance(rows, list):
+        return []
+    target = trading_date.strftime("%Y%m%d")
+    selected: list[dict[str, Any]] = []
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        digits = _row_digits(row)
+        if len(digits) == 6 or (len(digits) >= 14 and digits.startswith(target)):
+            selected.append(row)
+    return selected
+
+
+def _last_bar_time(rows: list[dict[str, Any]]) -> str:
+    return max((_row_digits(row)[-6:] for row in rows), default="000000")
+
+
+def _encode_rows(rows: list[dict[str, Any]]) -> bytes:
+    keys = list(dict.fromkeys(key for row in rows for key in row))
+    columns = {key: [row.get(key) for row in rows] for key in keys}
+    document = {"count": len(rows), "columns": columns}
+    return zlib.compress(json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _decode_rows(payload: bytes) -> list[dict[str, Any]]:
+    document = json.loads(zlib.decompress(payload).decode("utf-8"))
+    columns: dict[str, list[Any]] = document["columns"]
+    return [
+        {key: values[index] for key, values in columns.items() if values[index] is not None}
+        for index in range(int(document["count"]))
+    ]
+
+
+def previous_trading_days(today: date, count: int) -> list[date]:
+    days: list[date] = []
+    current = today
+    while len(days) < count:
+        current -= timedelta(days=1)
+        if current.weekday() < 5:
+            days.append(current)
+    return days
+
+
+class ChartBarStore:
+    def __init__(
+        self,
+        db_path: str = "runtime/state/chart_bars.db",
+        *,
+        max_bytes: int = DEFAULT_CHART_CACHE_MAX_BYTES,
+        clock_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._clock_fn = clock_fn or (lambda: datetime.now(timezone.utc).timestamp())
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def get(
+        self,
+        *,
+        symbol: str,
+        trading_date: date,
+        tic_scope: str = "1",
+        covering: dt_time | None = None,
+    ) -> list[dict[str, Any]] | None:
+        key = (symbol, trading_date.isoformat(), tic_scope)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT complete, last_bar_time, payload FROM chart_bars WHERE symbol = ? AND trading_date = ? AND tic_scope = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            complete, last_bar_time, payload = row
+            if not complete and (covering is None or last_bar_time <= covering.strftime("%H%M%S")):
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE chart_bars SET accessed_at = ? WHERE symbol = ? AND trading_date = ? AND tic_scope = ?",
+                    (self._clock_fn(), *key),
+                )
+        return _decode_rows(payload)
+
+    def contains(self, *, symbol: str, trading_date: date, tic_scope: str = "1") -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT complete FROM chart_bars WHERE symbol = ? AND trading_date = ? AND tic_scope = ?",
+                (symbol, trading_date.isoformat(), tic_scope),
+            ).fetchone()
+        return bool(row and row[0])
+
+    def put(
+        self,
+        *,
+        symbol: str,
+        trading_date: date,
+        tic_scope: str,
+        rows: list[dict[str, Any]],
+        complete: bool,
+    ) -> None:
+        payload = _encode_rows(rows)
+        now = self._clock_fn()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO chart_bars (
+                    symbol, trading_date, tic_scope, complete, last_bar_time,
+                    row_count, byte_size, fetched_at, accessed_at, payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    symbol,
+                    trading_date.isoformat(),
+                    tic_scope,
+                    int(complete),
+                    _last_bar_time(rows),
+                    len(rows),
+                    len(payload),
+                    datetime.fromtimestamp(now, timezone.utc).isoformat(),
+                    now,
+                    payload,
+                ),
+            )
+            self._evict_locked()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COALESCE(SUM(byte_size), 0) FROM chart_bars").fetchone()[0])
+
+    def _evict_locked(self) -> None:
+        total = int(self._conn.execute("SELECT COALESCE(SUM(byte_size), 0) FROM chart_bars").fetchone()[0])
+        if total <= self.max_bytes:
+            return
+        victims: list[tuple[str, str, str]] = []
+        for symbol, trading_date, tic_scope, byte_size in self._conn.execute(
+            "SELECT symbol, trading_date, tic_scope, byte_size FROM chart_bars ORDER BY accessed_at ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            victims.append((symbol, trading_date, tic_scope))
+            total -= int(byte_size)
+        self._conn.executemany(
+            "DELETE FROM chart_bars WHERE symbol = ? AND trading_date = ? AND tic_scope = ?",
+            victims,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ChartBarCache:
+    def __init__(self, store: ChartBarStore, *, now_fn: Callable[[], datetime] | None = None) -> None:
+        self.store = store
+        self._now_fn = now_fn or (lambda: datetime.now(_KST))
+        self._logger = logging.getLogger("privatetrade.kia.chart_cache")
+
+    def today(self) -> date:
+        return self._now_fn().astimezone(_KST).date()
+
+    def lookup(
+        self,
+        *,
+        symbol: str,
+        trading_date: date,
+        tic_scope: str = "1",
+        covering: dt_time | None = None,
+    ) -> dict[str, Any] | None:
+        today = self.today()
+        if trading_date > today or (trading_date == today and covering is None):
+            return None
+        rows = self.store.get(symbol=symbol, trading_date=trading_date, tic_scope=tic_scope, covering=covering)
+        if rows is None:
+            return None
+        return {CHART_ROWS_KEY: rows}
+
+    def remember(self, *, symbol: str, trading_date: date, tic_scope: str, raw: dict[str, Any]) -> None:
+        today = self.today()
+        if trading_date > today:
+            return
+        rows = chart_rows_for_date(raw, trading_date)
+        if not rows:
+            return
+        self.store.put(
+            symbol=symbol,
+            trading_date=trading_date,
+            tic_scope=tic_scope,
+            rows=rows,
+            complete=trading_date < today,
+        )
+
+    def fetch(
+        self,
+        api_client: RoutingKiaApiClient,
+        *,
+        mode: Mode | None,
+        symbol: str,
+        trading_date: date,
+        tic_scope: str = "1",
+        covering: dt_time | None = None,
+    ) -> dict[str, Any]:
+        selected_mode = api_client.resolve_mode(mode)
+        cacheable = api_client.uses_live_client(selected_mode)
+        if cacheable:
+            cached = self.lookup(symbol=symbol, trading_date=trading_date, tic_scope=tic_scope, covering=covering)
+            if cached is not None:
+                return cached
+        raw = api_client.call(
+            service_type="chart",
+            mode=selected_mode,
+            payload=build_chart_payload(symbol, trading_date, tic_scope),
+            api_id=CHART_API_ID,
+        )
+        if cacheable:
+            self.remember(symbol=symbol, trading_date=trading_date, tic_scope=tic_scope, raw=raw)
+        return raw
+
+    def prefetch(
+        self,
+        api_client: RoutingKiaApiClient,
+        *,
+        mode: Mode | None,
+        symbols: Iterable[str],
+        trading_dates: Iterable[date],
+        tic_scope: str = "1",
+    ) -> int:
+        fetched = 0
+        today = self.today()
+        symbols = list(symbols)
+        for trading_date in trading_dates:
+            if trading_date >= today:
+                continue
+            for symbol in symbols:
+                if self.store.contains(symbol=symbol, trading_date=trading_date, tic_scope=tic_scope):
+                    continue
+                try:
+                    self.fetch(api_client, mode=mode, symbol=symbol, trading_date=trading_date, tic_scope=tic_scope)
+                except Exception:
+                    self._logger.exception(
+                        "Chart prefetch failed: symbol=%s trading_date=%s tic_scope=%s",
+                        symbol,
+                        trading_date.isoformat(),
+                        tic_scope,
+                    )
+                    continue
+                fetched += 1
+        return fetched
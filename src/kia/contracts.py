@@ -8,6 +8,8 @@ from typing import Literal, Protocol
 Mode = Literal["mock", "live"]
 ServiceType = Literal["auth", "quote", "chart", "order", "execution"]
 
+QUOTE_BATCH_MAX_SYMBOLS = 20
+
 
 @dataclass(frozen=True)
 class FetchQuoteRequest:
@@ -155,3 +157,15 @@ class KiaGateway(Protocol):
     def fetch_execution(self, req: FetchExecutionRequest) -> ExecutionResult: ...
 
     def fetch_position(self, req: FetchPositionRequest) -> list[PositionSnapshot]: ...
+
+
+class AsyncKiaGateway(Protocol):
+    async def fetch_quote(self, req: FetchQuoteRequest) -> MarketQuote: ...
+
+    async def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult: ...
+
+    async def submit_order(self, req: SubmitOrderRequest) -> OrderResult: ...
+
+    async def fetch_execution(self, req: FetchExecutionRequest) -> ExecutionResult: ...
+
+    async def fetch_position(self, req: FetchPositionRequest) -> list[PositionSnapshot]: ...
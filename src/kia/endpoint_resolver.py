@@ -15,6 +15,7 @@ class CsmEndpointResolver:
         "order": ("POST", "/api/dostk/ordr"),
         "execution": ("POST", "/api/dostk/websocket"),
     }
+    REALTIME_PATH = "/api/dostk/websocket"
 
     def __init__(
         self,
@@ -22,10 +23,14 @@ class CsmEndpointResolver:
         *,
         default_mock_base_url: str = "https://mockapi.kiwoom.com",
         default_live_base_url: str = "https://api.kiwoom.com",
+        default_mock_websocket_url: str = "wss://mockapi.kiwoom.com:10000",
+        default_live_websocket_url: str = "wss://api.kiwoom.com:10000",
     ) -> None:
         self._csm_repository = csm_repository
         self._default_mock_base_url = default_mock_base_url
         self._default_live_base_url = default_live_base_url
+        self._default_mock_websocket_url = default_mock_websocket_url
+        self._default_live_websocket_url = default_live_websocket_url
 
     def resolve(self, mode: Mode, service_type: ServiceType) -> EndpointInfo:
         route = self.ROUTES.get(service_type)
@@ -34,6 +39,14 @@ class CsmEndpointResolver:
         method, path = route
         return EndpointInfo(base_url=self._resolve_base_url(mode), path=path, method=method, protocol="REST")  # type: ignore[arg-type]
 
+    def resolve_websocket(self, mode: Mode) -> EndpointInfo:
+        credential = self._read_credential()
+        if mode == "mock":
+            base_url = str(credential.get("mockWebSocketUrl") or "").strip() or self._default_mock_websocket_url
+        else:
+            base_url = str(credential.get("liveWebSocketUrl") or "").strip() or self._default_live_websocket_url
+        return EndpointInfo(base_url=base_url, path=self.REALTIME_PATH, method="GET", protocol="WEBSOCKET")
+
     def read_csm_mode(self) -> Mode:
         if self._csm_repository is None:
             return "mock"
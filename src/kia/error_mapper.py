@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from http.client import HTTPException
 from socket import timeout as socket_timeout
 from typing import Any
 from urllib.error import URLError
@@ -28,7 +29,7 @@ def map_http_status(status_code: int, body: dict[str, Any] | None = None) -> Kia
 def map_exception(exc: Exception) -> KiaError:
     if isinstance(exc, KiaError):
         return exc
-    if isinstance(exc, (TimeoutError, socket_timeout, URLError)):
+    if isinstance(exc, (TimeoutError, socket_timeout, URLError, ConnectionError, HTTPException)):
         return make_kia_error("KIA_API_TIMEOUT", "거래 API 응답 시간이 초과되었습니다.", True, {"error": str(exc)})
     if isinstance(exc, (ValueError, json.JSONDecodeError)):
         return make_kia_error("KIA_RESPONSE_INVALID", "거래 API 응답 형식이 올바르지 않습니다.", False, {"error": str(exc)})
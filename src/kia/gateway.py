@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, time as dt_time, timedelta, timezone
 from decimal import Decimal, InvalidOperation
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from .api_client import RoutingKiaApiClient
+from .async_client import AsyncLiveKiaApiClient, AsyncPooledHttpTransport, AsyncTransportFn
+from .chart_cache import CHART_API_ID, ChartBarCache, build_chart_payload
 from .contracts import (
+    QUOTE_BATCH_MAX_SYMBOLS,
     ExecutionFill,
     ExecutionResult,
     FetchExecutionRequest,
@@ -22,6 +26,8 @@ from .contracts import (
     SubmitOrderRequest,
 )
 from .errors import make_kia_error
+from .idempotency import InMemoryIdempotencyStore
+from .rate_limit import KiaRateLimiter
 
 
 _LOGGER = logging.getLogger("privatetrade.kia.gateway")
@@ -29,6 +35,7 @@ _REFERENCE_MINUTE_START = dt_time(hour=8, minute=30, second=0)
 _REFERENCE_MINUTE_END = dt_time(hour=8, minute=30, second=59)
 _KST = timezone(timedelta(hours=9))
 _SOR_STOCK_SUFFIX = "_AL"
+REALTIME_QUOTE_TYPE = "0B"
 
 
 def _parse_dt(value: Any) -> datetime:
@@ -93,211 +100,304 @@ def _is_reference_minute(time_value: dt_time) -> bool:
     return _REFERENCE_MINUTE_START <= time_value <= _REFERENCE_MINUTE_END
 
 
-class DefaultKiaGateway:
-    def __init__(self, api_client: RoutingKiaApiClient | None = None, *, csm_repository: Any | None = None) -> None:
-        self._api_client = api_client or RoutingKiaApiClient(csm_repository=csm_repository)
+def _resolve_quote_symbol_name(raw: dict[str, Any]) -> str | None:
+    return _resolve_symbol_name(
+        raw.get(
+            "symbol_name",
+            raw.get(
+                "name",
+                raw.get(
+                    "stk_nm",
+                    raw.get("hts_kor_isnm", raw.get("prdt_abrv_name", raw.get("isu_nm"))),
+                ),
+            ),
+        )
+    )
 
-    def fetch_quote(self, req: FetchQuoteRequest) -> MarketQuote:
-        raw = self._api_client.fetch_quote_raw(mode=req.mode, symbol=req.symbol, api_id="ka10007")
-        price_value = raw.get("cur_prc", raw.get("price", "0"))
+
+def parse_market_quote(raw: dict[str, Any], req: FetchQuoteRequest) -> MarketQuote:
+    price_value = raw.get("cur_prc", raw.get("price", "0"))
+    try:
+        normalized_price = _parse_non_negative_price(price_value)
+    except (InvalidOperation, ValueError):
+        _LOGGER.warning(
+            "Invalid quote price format: symbol=%s raw_cur_prc=%s raw_price=%s mode=%s",
+            req.symbol,
+            raw.get("cur_prc"),
+            raw.get("price"),
+            req.mode,
+        )
+        normalized_price = Decimal("0")
+
+    if _is_negative_signed_price_text(raw.get("cur_prc")) or _is_negative_signed_price_text(raw.get("price")):
+        _LOGGER.warning(
+            "Signed quote price detected: symbol=%s raw_cur_prc=%s raw_price=%s normalized=%s mode=%s",
+            req.symbol,
+            raw.get("cur_prc"),
+            raw.get("price"),
+            format(normalized_price, "f"),
+            req.mode,
+        )
+
+    return MarketQuote(
+        symbol=_resolve_symbol(raw.get("symbol", req.symbol), fallback=req.symbol),
+        price=normalized_price,
+        tick_size=int(raw.get("tick_size", 1)),
+        as_of=_parse_dt(raw.get("as_of")),
+        symbol_name=_resolve_quote_symbol_name(raw),
+    )
+
+
+def parse_realtime_quote(item: dict[str, Any], *, received_at: datetime) -> MarketQuote | None:
+    if str(item.get("type", "")) != REALTIME_QUOTE_TYPE:
+        return None
+    values = item.get("values")
+    if not isinstance(values, dict):
+        return None
+    symbol = _resolve_symbol(item.get("item"))
+    if not symbol:
+        return None
+    try:
+        price = _parse_non_negative_price(values.get("10", "0"))
+    except (InvalidOperation, ValueError):
+        _LOGGER.warning("Invalid realtime quote price format: symbol=%s raw_price=%s", symbol, values.get("10"))
+        return None
+
+    trade_time = _parse_hhmmss(values.get("20"))
+    as_of = received_at
+    if trade_time is not None:
+        as_of = datetime.combine(received_at.astimezone(_KST).date(), trade_time, tzinfo=_KST)
+    return MarketQuote(symbol=symbol, price=price, tick_size=1, as_of=as_of)
+
+
+def validate_poll_quotes_request(req: PollQuotesRequest) -> None:
+    if not (1 <= len(req.symbols) <= QUOTE_BATCH_MAX_SYMBOLS):
+        raise make_kia_error("KIA_INVALID_REQUEST", f"symbols는 1개 이상 {QUOTE_BATCH_MAX_SYMBOLS}개 이하여야 합니다.", False)
+    if not req.poll_cycle_id.strip():
+        raise make_kia_error("KIA_INVALID_REQUEST", "poll_cycle_id는 빈 문자열일 수 없습니다.", False)
+
+
+def parse_poll_quotes_result(raw: dict[str, Any], req: PollQuotesRequest) -> PollQuotesResult:
+    quotes: list[MarketQuote] = []
+    for index, item in enumerate(raw.get("quotes", [])):
+        if not isinstance(item, dict):
+            continue
+        requested_symbol = req.symbols[index] if index < len(req.symbols) else ""
+        resolved_symbol = _resolve_symbol(
+            item.get("symbol", item.get("stk_cd", item.get("code", item.get("pdno", "")))),
+            fallback=requested_symbol,
+        )
+        price_value = item.get("cur_prc", item.get("price", "0"))
         try:
             normalized_price = _parse_non_negative_price(price_value)
         except (InvalidOperation, ValueError):
             _LOGGER.warning(
-                "Invalid quote price format: symbol=%s raw_cur_prc=%s raw_price=%s mode=%s",
-                req.symbol,
-                raw.get("cur_prc"),
-                raw.get("price"),
+                "Invalid batch quote price format: cycle_id=%s symbol=%s raw_cur_prc=%s raw_price=%s mode=%s",
+                req.poll_cycle_id,
+                resolved_symbol,
+                item.get("cur_prc"),
+                item.get("price"),
                 req.mode,
             )
             normalized_price = Decimal("0")
 
-        if _is_negative_signed_price_text(raw.get("cur_prc")) or _is_negative_signed_price_text(raw.get("price")):
+        if _is_negative_signed_price_text(item.get("cur_prc")) or _is_negative_signed_price_text(item.get("price")):
             _LOGGER.warning(
-                "Signed quote price detected: symbol=%s raw_cur_prc=%s raw_price=%s normalized=%s mode=%s",
-                req.symbol,
-                raw.get("cur_prc"),
-                raw.get("price"),
+                "Signed batch quote price detected: cycle_id=%s symbol=%s raw_cur_prc=%s raw_price=%s normalized=%s mode=%s",
+                req.poll_cycle_id,
+                resolved_symbol,
+                item.get("cur_prc"),
+                item.get("price"),
                 format(normalized_price, "f"),
                 req.mode,
             )
 
-        return MarketQuote(
-            symbol=_resolve_symbol(raw.get("symbol", req.symbol), fallback=req.symbol),
-            price=normalized_price,
-            tick_size=int(raw.get("tick_size", 1)),
-            as_of=_parse_dt(raw.get("as_of")),
-            symbol_name=_resolve_symbol_name(
-                raw.get(
-                    "symbol_name",
-                    raw.get(
-                        "name",
-                        raw.get(
-                            "stk_nm",
-                            raw.get("hts_kor_isnm", raw.get("prdt_abrv_name", raw.get("isu_nm"))),
-                        ),
-                    ),
-                )
-            ),
+        quotes.append(
+            MarketQuote(
+                symbol=resolved_symbol,
+                price=normalized_price,
+                tick_size=int(item.get("tick_size", 1)),
+                as_of=_parse_dt(item.get("as_of")),
+                symbol_name=_resolve_quote_symbol_name(item),
+            )
         )
 
-    def fetch_reference_price_0830(self, *, mode: Mode | None, symbol: str) -> Decimal | None:
-        base_dt = datetime.now(_KST).strftime("%Y%m%d")
-        raw = self._api_client.call(
-            service_type="chart",
-            mode=mode,
-            payload={
-                "stk_cd": symbol,
-                "tic_scope": "1",
-                "upd_stkpc_tp": "1",
-                "base_dt": base_dt,
-            },
-            api_id="ka10080",
+    errors: list[PollQuoteError] = []
+    for item in raw.get("errors", []):
+        if not isinstance(item, dict):
+            continue
+        errors.append(
+            PollQuoteError(
+                symbol=str(item.get("symbol", "")),
+                code=str(item.get("code", "KIA_UNKNOWN")),
+                retryable=bool(item.get("retryable", False)),
+            )
         )
-        rows = raw.get("stk_min_pole_chart_qry", [])
-        if not isinstance(rows, list):
-            return None
 
-        best_time: dt_time | None = None
-        best_price: Decimal | None = None
+    return PollQuotesResult(
+        poll_cycle_id=str(raw.get("poll_cycle_id", req.poll_cycle_id)),
+        quotes=quotes,
+        errors=errors,
+        partial=bool(raw.get("partial", len(errors) > 0)),
+    )
+
+
+def build_order_payload(req: SubmitOrderRequest) -> tuple[str, dict[str, Any]]:
+    if req.order_type == "MARKET":
+        trde_tp = "3"
+    else:
+        trde_tp = "0"
+    api_id = "kt10000" if req.side == "BUY" else "kt10001"
+    payload = {
+        "dmst_stex_tp": "SOR",
+        "stk_cd": req.symbol,
+        "ord_qty": str(req.quantity),
+        "ord_uv": "" if req.price is None else str(req.price),
+        "trde_tp": trde_tp,
+        "cond_uv": "",
+    }
+    return api_id, payload
+
+
+def parse_order_result(raw: dict[str, Any], req: SubmitOrderRequest) -> OrderResult:
+    accepted_at = raw.get("accepted_at")
+    return OrderResult(
+        broker_order_id=str(raw.get("ord_no", raw.get("broker_order_id", ""))),
+        client_order_id=str(raw.get("client_order_id", req.client_order_id)),
+        status=str(raw.get("status", "PENDING")),  # type: ignore[arg-type]
+        accepted_at=_parse_dt(accepted_at) if accepted_at else None,
+    )
+
+
+def parse_execution_result(raw: dict[str, Any], req: FetchExecutionRequest) -> ExecutionResult:
+    fills: list[ExecutionFill] = []
+    for item in raw.get("fills", []):
+        fills.append(
+            ExecutionFill(
+                execution_id=str(item.get("execution_id", "")),
+                price=Decimal(str(item.get("price", "0"))),
+                quantity=int(item.get("quantity", 0)),
+                executed_at=_parse_dt(item.get("executed_at")),
+            )
+        )
 
-        for row in rows:
-            if not isinstance(row, dict):
-                continue
-            trade_time = _parse_hhmmss(row.get("cntr_tm"))
-            if trade_time is None or not _is_reference_minute(trade_time):
-                continue
+    return ExecutionResult(
+        broker_order_id=str(raw.get("broker_order_id", req.broker_order_id)),
+        fills=fills,
+        remaining_qty=int(raw.get("remaining_qty", 0)),
+    )
+
+
+def parse_position_snapshots(raw: dict[str, Any], req: FetchPositionRequest) -> list[PositionSnapshot]:
+    rows = raw.get("positions", [])
+    if not isinstance(rows, list):
+        return []
+
+    snapshots: list[PositionSnapshot] = []
+    for item in rows:
+        if not isinstance(item, dict):
+            continue
+        snapshots.append(
+            PositionSnapshot(
+                account_no=str(item.get("account_no", req.account_no)),
+                symbol=str(item.get("symbol", "")),
+                quantity=int(item.get("quantity", 0)),
+                avg_buy_price=Decimal(str(item.get("avg_buy_price", "0"))),
+            )
+        )
+    return snapshots
 
-            try:
-                normalized_price = _parse_non_negative_price(row.get("cur_prc", row.get("price", "0")))
-            except (InvalidOperation, ValueError):
-                continue
-            if normalized_price <= 0:
-                continue
 
-            if best_time is None or trade_time > best_time:
-                best_time = trade_time
-                best_price = normalized_price
+def build_reference_chart_payload(symbol: str) -> dict[str, Any]:
+    return {
+        "stk_cd": symbol,
+        "tic_scope": "1",
+        "upd_stkpc_tp": "1",
+        "base_dt": datetime.now(_KST).strftime("%Y%m%d"),
+    }
 
-        if best_price is None:
-            return None
 
-        return best_price
+def parse_reference_price_0830(raw: dict[str, Any]) -> Decimal | None:
+    rows = raw.get("stk_min_pole_chart_qry", [])
+    if not isinstance(rows, list):
+        return None
 
-    def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
-        if not (1 <= len(req.symbols) <= 20):
-            raise make_kia_error("KIA_INVALID_REQUEST", "symbols는 1개 이상 20개 이하여야 합니다.", False)
-        if not req.poll_cycle_id.strip():
-            raise make_kia_error("KIA_INVALID_REQUEST", "poll_cycle_id는 빈 문자열일 수 없습니다.", False)
+    best_time: dt_time | None = None
+    best_price: Decimal | None = None
 
-        raw = self._api_client.fetch_quotes_batch_raw(
-            mode=req.mode,
-            symbols=req.symbols,
-            timeout_ms=req.timeout_ms,
-            poll_cycle_id=req.poll_cycle_id,
-        )
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        trade_time = _parse_hhmmss(row.get("cntr_tm"))
+        if trade_time is None or not _is_reference_minute(trade_time):
+            continue
 
-        quotes: list[MarketQuote] = []
-        for index, item in enumerate(raw.get("quotes", [])):
-            if not isinstance(item, dict):
-                continue
-            requested_symbol = req.symbols[index] if index < len(req.symbols) else ""
-            resolved_symbol = _resolve_symbol(
-                item.get("symbol", item.get("stk_cd", item.get("code", item.get("pdno", "")))),
-                fallback=requested_symbol,
-            )
-            price_value = item.get("cur_prc", item.get("price", "0"))
-            try:
-                normalized_price = _parse_non_negative_price(price_value)
-            except (InvalidOperation, ValueError):
-                _LOGGER.warning(
-                    "Invalid batch quote price format: cycle_id=%s symbol=%s raw_cur_prc=%s raw_price=%s mode=%s",
-                    req.poll_cycle_id,
-                    resolved_symbol,
-                    item.get("cur_prc"),
-                    item.get("price"),
-                    req.mode,
-                )
-                normalized_price = Decimal("0")
-
-            if _is_negative_signed_price_text(item.get("cur_prc")) or _is_negative_signed_price_text(item.get("price")):
-                _LOGGER.warning(
-                    "Signed batch quote price detected: cycle_id=%s symbol=%s raw_cur_prc=%s raw_price=%s normalized=%s mode=%s",
-                    req.poll_cycle_id,
-                    resolved_symbol,
-                    item.get("cur_prc"),
-                    item.get("price"),
-                    format(normalized_price, "f"),
-                    req.mode,
-                )
+        try:
+            normalized_price = _parse_non_negative_price(row.get("cur_prc", row.get("price", "0")))
+        except (InvalidOperation, ValueError):
+            continue
+        if normalized_price <= 0:
+            continue
 
-            quotes.append(
-                MarketQuote(
-                    symbol=resolved_symbol,
-                    price=normalized_price,
-                    tick_size=int(item.get("tick_size", 1)),
-                    as_of=_parse_dt(item.get("as_of")),
-                    symbol_name=_resolve_symbol_name(
-                        item.get(
-                            "symbol_name",
-                            item.get(
-                                "name",
-                                item.get(
-                                    "stk_nm",
-                                    item.get("hts_kor_isnm", item.get("prdt_abrv_name", item.get("isu_nm"))),
-                                ),
-                            ),
-                        )
-                    ),
-                )
-            )
+        if best_time is None or trade_time > best_time:
+            best_time = trade_time
+            best_price = normalized_price
 
-        errors: list[PollQuoteError] = []
-        for item in raw.get("errors", []):
-            if not isinstance(item, dict):
-                continue
-            errors.append(
-                PollQuoteError(
-                    symbol=str(item.get("symbol", "")),
-                    code=str(item.get("code", "KIA_UNKNOWN")),
-                    retryable=bool(item.get("retryable", False)),
-                )
+    return best_price
+
+
+class DefaultKiaGateway:
+    def __init__(
+        self,
+        api_client: RoutingKiaApiClient | None = None,
+        *,
+        csm_repository: Any | None = None,
+        chart_cache: ChartBarCache | None = None,
+    ) -> None:
+        self._api_client = api_client or RoutingKiaApiClient(csm_repository=csm_repository)
+        self._chart_cache = chart_cache
+
+    def fetch_quote(self, req: FetchQuoteRequest) -> MarketQuote:
+        raw = self._api_client.fetch_quote_raw(mode=req.mode, symbol=req.symbol, api_id="ka10007")
+        return parse_market_quote(raw, req)
+
+    def fetch_reference_price_0830(self, *, mode: Mode | None, symbol: str) -> Decimal | None:
+        if self._chart_cache is not None:
+            raw = self._chart_cache.fetch(
+                self._api_client,
+                mode=mode,
+                symbol=symbol,
+                trading_date=self._chart_cache.today(),
+                covering=_REFERENCE_MINUTE_END,
             )
+            return parse_reference_price_0830(raw)
+        raw = self._api_client.call(
+            service_type="chart",
+            mode=mode,
+            payload=build_reference_chart_payload(symbol),
+            api_id="ka10080",
+        )
+        return parse_reference_price_0830(raw)
 
-        return PollQuotesResult(
-            poll_cycle_id=str(raw.get("poll_cycle_id", req.poll_cycle_id)),
-            quotes=quotes,
-            errors=errors,
-            partial=bool(raw.get("partial", len(errors) > 0)),
+    def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
+        validate_poll_quotes_request(req)
+        raw = self._api_client.fetch_quotes_batch_raw(
+            mode=req.mode,
+            symbols=req.symbols,
+            timeout_ms=req.timeout_ms,
+            poll_cycle_id=req.poll_cycle_id,
         )
+        return parse_poll_quotes_result(raw, req)
 
     def submit_order(self, req: SubmitOrderRequest) -> OrderResult:
-        if req.order_type == "MARKET":
-            trde_tp = "3"
-        else:
-            trde_tp = "0"
-        api_id = "kt10000" if req.side == "BUY" else "kt10001"
-        payload = {
-            "dmst_stex_tp": "SOR",
-            "stk_cd": req.symbol,
-            "ord_qty": str(req.quantity),
-            "ord_uv": "" if req.price is None else str(req.price),
-            "trde_tp": trde_tp,
-            "cond_uv": "",
-        }
+        api_id, payload = build_order_payload(req)
         raw = self._api_client.submit_order_raw(
             mode=req.mode,
             payload=payload,
             client_order_id=req.client_order_id,
             api_id=api_id,
         )
-        accepted_at = raw.get("accepted_at")
-        return OrderResult(
-            broker_order_id=str(raw.get("ord_no", raw.get("broker_order_id", ""))),
-            client_order_id=str(raw.get("client_order_id", req.client_order_id)),
-            status=str(raw.get("status", "PENDING")),  # type: ignore[arg-type]
-            accepted_at=_parse_dt(accepted_at) if accepted_at else None,
-        )
+        return parse_order_result(raw, req)
 
     def fetch_execution(self, req: FetchExecutionRequest) -> ExecutionResult:
         raw = self._api_client.fetch_execution_raw(
@@ -305,39 +405,148 @@ class DefaultKiaGateway:
             account_no=req.account_no,
             broker_order_id=req.broker_order_id,
         )
-        fills: list[ExecutionFill] = []
-        for item in raw.get("fills", []):
-            fills.append(
-                ExecutionFill(
-                    execution_id=str(item.get("execution_id", "")),
-                    price=Decimal(str(item.get("price", "0"))),
-                    quantity=int(item.get("quantity", 0)),
-                    executed_at=_parse_dt(item.get("executed_at")),
-                )
-            )
-
-        return ExecutionResult(
-            broker_order_id=str(raw.get("broker_order_id", req.broker_order_id)),
-            fills=fills,
-            remaining_qty=int(raw.get("remaining_qty", 0)),
-        )
+        return parse_execution_result(raw, req)
 
     def fetch_position(self, req: FetchPositionRequest) -> list[PositionSnapshot]:
         raw = self._api_client.fetch_position_raw(mode=req.mode, account_no=req.account_no, symbol=req.symbol)
-        rows = raw.get("positions", [])
-        if not isinstance(rows, list):
-            return []
-
-        snapshots: list[PositionSnapshot] = []
-        for item in rows:
-            if not isinstance(item, dict):
-                continue
-            snapshots.append(
-                PositionSnapshot(
-                    account_no=str(item.get("account_no", req.account_no)),
-                    symbol=str(item.get("symbol", "")),
-                    quantity=int(item.get("quantity", 0)),
-                    avg_buy_price=Decimal(str(item.get("avg_buy_price", "0"))),
+        return parse_position_snapshots(raw, req)
+
+
+class DefaultAsyncKiaGateway:
+    def __init__(
+        self,
+        api_client: RoutingKiaApiClient | None = None,
+        *,
+        csm_repository: Any | None = None,
+        transport: AsyncTransportFn | None = None,
+        timeout_seconds: float = 5.0,
+        retry_attempts: int = 3,
+        sleep_fn: Callable[[float], Awaitable[None]] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        quote_min_interval_seconds: float = 1.0,
+        quote_global_min_interval_seconds: float = 0.25,
+        chart_cache: ChartBarCache | None = None,
+        rate_limiter: KiaRateLimiter | None = None,
+        idempotency_store: InMemoryIdempotencyStore | None = None,
+    ) -> None:
+        self._api_client = api_client or RoutingKiaApiClient(csm_repository=csm_repository)
+        self._chart_cache = chart_cache
+        self._owned_transport = AsyncPooledHttpTransport() if transport is None else None
+        self._live_client = AsyncLiveKiaApiClient(
+            endpoint_resolver=self._api_client.endpoint_resolver,
+            token_provider=self._api_client.token_provider,
+            transport=transport or self._owned_transport,
+            timeout_seconds=timeout_seconds,
+            retry_attempts=retry_attempts,
+            sleep_fn=sleep_fn,
+            monotonic_fn=monotonic_fn,
+            quote_min_interval_seconds=quote_min_interval_seconds,
+            quote_global_min_interval_seconds=quote_global_min_interval_seconds,
+            rate_limiter=rate_limiter,
+            idempotency_store=idempotency_store,
+        )
+
+    def close(self) -> None:
+        if self._owned_transport is not None:
+            self._owned_transport.close()
+
+    async def fetch_quote(self, req: FetchQuoteRequest) -> MarketQuote:
+        mode = self._api_client.resolve_mode(req.mode)
+        if self._api_client.uses_live_client(mode):
+            raw = await self._live_client.fetch_quote_raw(mode=mode, symbol=req.symbol, api_id="ka10007")
+        else:
+            raw = self._api_client.mock_client.fetch_quote_raw(mode=mode, symbol=req.symbol, api_id="ka10007")
+        return parse_market_quote(raw, req)
+
+    async def fetch_reference_price_0830(self, *, mode: Mode | None, symbol: str) -> Decimal | None:
+        selected_mode = self._api_client.resolve_mode(mode)
+        payload = build_reference_chart_payload(symbol)
+        if self._api_client.uses_live_client(selected_mode) and self._chart_cache is not None:
+            trading_date = self._chart_cache.today()
+            raw = await asyncio.to_thread(
+                self._chart_cache.lookup,
+                symbol=symbol,
+                trading_date=trading_date,
+                covering=_REFERENCE_MINUTE_END,
+            )
+            if raw is None:
+                raw = await self._live_client.call(
+                    service_type="chart",
+                    mode=selected_mode,
+                    payload=build_chart_payload(symbol, trading_date),
+                    api_id=CHART_API_ID,
+                )
+                await asyncio.to_thread(
+                    self._chart_cache.remember,
+                    symbol=symbol,
+                    trading_date=trading_date,
+                    tic_scope="1",
+                    raw=raw,
                 )
+        elif self._api_client.uses_live_client(selected_mode):
+            raw = await self._live_client.call(service_type="chart", mode=selected_mode, payload=payload, api_id="ka10080")
+        else:
+            raw = self._api_client.mock_client.call(service_type="chart", mode=selected_mode, payload=payload, api_id="ka10080")
+        return parse_reference_price_0830(raw)
+
+    async def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
+        validate_poll_quotes_request(req)
+        mode = self._api_client.resolve_mode(req.mode)
+        if self._api_client.uses_live_client(mode):
+            raw = await self._live_client.fetch_quotes_batch_raw(
+                mode=mode,
+                symbols=req.symbols,
+                timeout_ms=req.timeout_ms,
+                poll_cycle_id=req.poll_cycle_id,
+            )
+        else:
+            raw = self._api_client.mock_client.fetch_quotes_batch_raw(
+                mode=mode,
+                symbols=req.symbols,
+                timeout_ms=req.timeout_ms,
+                poll_cycle_id=req.poll_cycle_id,
+            )
+        return parse_poll_quotes_result(raw, req)
+
+    async def submit_order(self, req: SubmitOrderRequest) -> OrderResult:
+        api_id, payload = build_order_payload(req)
+        mode = self._api_client.resolve_mode(req.mode)
+        if self._api_client.uses_live_client(mode):
+            raw = await self._live_client.submit_order_raw(
+                mode=mode,
+                payload=payload,
+                client_order_id=req.client_order_id,
+                api_id=api_id,
+            )
+        else:
+            raw = self._api_client.mock_client.submit_order_raw(
+                mode=mode,
+                payload=payload,
+                client_order_id=req.client_order_id,
+                api_id=api_id,
             )
-        return snapshots
+        return parse_order_result(raw, req)
+
+    async def fetch_execution(self, req: FetchExecutionRequest) -> ExecutionResult:
+        mode = self._api_client.resolve_mode(req.mode)
+        if self._api_client.uses_live_client(mode):
+            raw = await self._live_client.fetch_execution_raw(
+                mode=mode,
+                account_no=req.account_no,
+                broker_order_id=req.broker_order_id,
+            )
+        else:
+            raw = self._api_client.mock_client.fetch_execution_raw(
+                mode=mode,
+                account_no=req.account_no,
+                broker_order_id=req.broker_order_id,
+            )
+        return parse_execution_result(raw, req)
+
+    async def fetch_position(self, req: FetchPositionRequest) -> list[PositionSnapshot]:
+        mode = self._api_client.resolve_mode(req.mode)
+        if self._api_client.uses_live_client(mode):
+            raw = await self._live_client.fetch_position_raw(mode=mode, account_no=req.account_no, symbol=req.symbol)
+        else:
+            raw = self._api_client.mock_client.fetch_position_raw(mode=mode, account_no=req.account_no, symbol=req.symbol)
+        return parse_position_snapshots(raw, req)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import http.client
+import json
+import ssl
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from threading import Condition
+from typing import Any, Callable
+from urllib.parse import urlencode, urlsplit
+
+ConnectionFactory = Callable[[str, str, int, float], http.client.HTTPConnection]
+
+_RESET_ERRORS = (
+    ConnectionResetError,
+    BrokenPipeError,
+    ConnectionAbortedError,
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    http.client.CannotSendRequest,
+)
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_ORDER_API_ID_PREFIX = "kt"
+
+
+def is_retryable_request(method: str, headers: dict[str, str]) -> bool:
+    if method.upper() in _IDEMPOTENT_METHODS:
+        return True
+    api_id = next((str(value) for name, value in headers.items() if name.lower() == "api-id"), "")
+    return bool(api_id) and not api_id.lower().startswith(_ORDER_API_ID_PREFIX)
+
+
+def default_connection_factory(scheme: str, host: str, port: int, timeout_seconds: float) -> http.client.HTTPConnection:
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, port, timeout=timeout_seconds, context=ssl.create_default_context())
+    return http.client.HTTPConnection(host, port, timeout=timeout_seconds)
+
+
+@dataclass
+class _PooledConnection:
+    connection_id: int
+    origin: str
+    conn: http.client.HTTPConnection
+    created_at: float
+    last_used_at: float
+    request_count: int = 0
+
+
+class PooledHttpTransport:
+    def __init__(
+        self,
+        *,
+        max_connections_per_origin: int = 4,
+        idle_timeout_seconds: float = 30.0,
+        connection_factory: ConnectionFactory = default_connection_factory,
+        monotonic_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if max_connections_per_origin < 1:
+            raise ValueError("max_connections_per_origin must be >= 1")
+        self._max_connections_per_origin = max_connections_per_origin
+        self._idle_timeout_seconds = max(0.0, idle_timeout_seconds)
+        self._connection_factory = connection_factory
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self._condition = Condition()
+        self._idle: dict[tuple[str, str, int], deque[_PooledConnection]] = {}
+        self._open_count: dict[tuple[str, str, int], int] = {}
+        self._live: dict[int, _PooledConnection] = {}
+        self._ids = count(1)
+        self._closed = False
+        self._connections_created = 0
+        self._requests_total = 0
+        self._reused_requests = 0
+        self._reconnects = 0
+        self._idle_evictions = 0
+
+    def __call__(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        payload: dict[str, Any] | None,
+        query: dict[str, str] | None,
+        timeout_seconds: float,
+    ) -> tuple[int, dict[str, Any]]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, host, port)
+
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        if query:
+            target = f"{target}{'&' if parts.query else '?'}{urlencode(query)}"
+
+        body: bytes | None = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+
+        pooled = self._acquire(key, timeout_seconds)
+        try:
+            status, raw, reusable = self._send(pooled, method, target, headers, body, timeout_seconds)
+        except _RESET_ERRORS:
+            if pooled.request_count == 0 or not is_retryable_request(method, headers):
+                self._discard(key, pooled)
+                raise
+            self._discard(key, pooled)
+            with self._condition:
+                self._reconnects += 1
+            pooled = self._acquire(key, timeout_seconds, force_new=True)
+            try:
+                status, raw, reusable = self._send(pooled, method, target, headers, body, timeout_seconds)
+            except BaseException:
+                self._discard(key, pooled)
+                raise
+        except BaseException:
+            self._discard(key, pooled)
+            raise
+
+        if reusable:
+            self._release(key, pooled)
+        else:
+            self._discard(key, pooled)
+
+        if not raw.strip():
+            return status, {}
+        try:
+            return status, json.loads(raw)
+        except ValueError:
+            if 200 <= status < 300:
+                raise
+            return status, {"raw": raw}
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "connections_created": self._connections_created,
+                "requests_total": self._requests_total,
+                "reused_requests": self._reused_requests,
+                "reconnects": self._reconnects,
+                "idle_evictions": self._idle_evictions,
+                "connections": [
+                    {
+                        "connection_id": pooled.connection_id,
+                        "origin": pooled.origin,
+                        "requests": pooled.request_count,
+                        "reuses": max(pooled.request_count - 1, 0),
+                    }
+                    for pooled in sorted(self._live.values(), key=lambda item: item.connection_id)
+                ],
+            }
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            pooled_items = list(self._live.values())
+            self._idle.clear()
+            self._open_count.clear()
+            self._live.clear()
+            self._condition.notify_all()
+        for pooled in pooled_items:
+            pooled.conn.close()
+
+    def _send(
+        self,
+        pooled: _PooledConnection,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        body: bytes | None,
+        timeout_seconds: float,
+    ) -> tuple[int, str, bool]:
+        conn = pooled.conn
+        conn.timeout = timeout_seconds
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout_seconds)
+
+        request_headers = dict(headers)
+        request_headers.setdefault("Connection", "keep-alive")
+        conn.request(method, target, body=body, headers=request_headers)
+        response = conn.getresponse()
+        raw = response.read().decode("utf-8")
+
+        with self._condition:
+            self._requests_total += 1
+            if pooled.request_count > 0:
+                self._reused_requests += 1
+            pooled.request_count += 1
+            pooled.last_used_at = self._monotonic_fn()
+        return int(response.status), raw, not response.will_close
+
+    def _acquire(self, key: tuple[str, str, int], timeout_seconds: float, *, force_new: bool = False) -> _PooledConnection:
+        deadline = self._monotonic_fn() + max(timeout_seconds, 0.0)
+        stale: list[_PooledConnection] = []
+        try:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("transport is closed")
+                    idle = self._idle.setdefault(key, deque())
+                    now = self._monotonic_fn()
+                    while idle and not force_new:
+                        pooled = idle.pop()
+                        if self._idle_timeout_seconds and now - pooled.last_used_at > self._idle_timeout_seconds:
+                            stale.append(self._forget(key, pooled))
+                            self._idle_evictions += 1
+                            continue
+                        return pooled
+                    if force_new and idle and self._open_count.get(key, 0) >= self._max_connections_per_origin:
+                        stale.append(self._forget(key, idle.popleft()))
+                    if self._open_count.get(key, 0) < self._max_connections_per_origin:
+                        self._open_count[key] = self._open_count.get(key, 0) + 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise TimeoutError("connection pool exhausted")
+                    self._condition.wait(timeout=remaining)
+        finally:
+            for pooled in stale:
+                pooled.conn.close()
+
+        scheme, host, port = key
+        try:
+            conn = self._connection_factory(scheme, host, port, timeout_seconds)
+        except BaseException:
+            with self._condition:
+                self._open_count[key] -= 1
+                self._condition.notify()
+            raise
+
+        now = self._monotonic_fn()
+        with self._condition:
+            pooled = _PooledConnection(
+                connection_id=next(self._ids),
+                origin=f"{scheme}://{host}:{port}",
+                conn=conn,
+                created_at=now,
+                last_used_at=now,
+            )
+            self._live[pooled.connection_id] = pooled
+            self._connections_created += 1
+        return pooled
+
+    def _release(self, key: tuple[str, str, int], pooled: _PooledConnection) -> None:
+        with self._condition:
+            if self._closed or pooled.connection_id not in self._live:
+                closed = True
+            else:
+                closed = False
+                self._idle.setdefault(key, deque()).append(pooled)
+                self._condition.notify()
+        if closed:
+            pooled.conn.close()
+
+    def _discard(self, key: tuple[str, str, int], pooled: _PooledConnection) -> None:
+        with self._condition:
+            if pooled.connection_id in self._live:
+                self._forget(key, pooled)
+            self._condition.notify()
+        pooled.conn.close()
+
+    def _forget(self, key: tuple[str, str, int], pooled: _PooledConnection) -> _PooledConnection:
+        self._live.pop(pooled.connection_id, None)
+        self._open_count[key] = max(self._open_count.get(key, 1) - 1, 0)
+        return pooled
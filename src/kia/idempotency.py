@@ -1,25 +1,194 @@
 from __future__ import annotations
 
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
 from threading import Lock
-from typing import Any
+from typing import Any, Callable
 
 from .contracts import Mode
 
+_StoreKey = tuple[Mode, str]
+
+
+class _Shard:
+    __slots__ = ("lock", "entries")
 
-class InMemoryIdempotencyStore:
     def __init__(self) -> None:
-        self._lock = Lock()
-        self._store: dict[tuple[Mode, str], dict[str, Any]] = {}
+        self.lock = Lock()
+        self.entries: OrderedDict[_StoreKey, tuple[float, dict[str, Any]]] = OrderedDict()
+
+
+class InMemoryIdempotencyStore:
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 86_400.0,
+        shard_count: int = 16,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self._max_entries = max_entries
+        self._ttl_seconds = max(0.0, ttl_seconds)
+        self._time_fn = time_fn or time.time
+        self._shards = [_Shard() for _ in range(max(1, min(shard_count, max_entries)))]
+        self._shard_capacity = -(-max_entries // len(self._shards))
+        self._stats_lock = Lock()
+        self._evictions = 0
+        self._expirations = 0
 
     def save(self, *, mode: Mode, key: str, response: dict[str, Any]) -> None:
         if not key:
             return
-        with self._lock:
-            self._store[(mode, key)] = dict(response)
+        saved_at = self._time_fn()
+        self._put((mode, key), saved_at, dict(response))
+        self._on_saved(mode=mode, key=key, saved_at=saved_at, response=response)
 
     def find(self, *, mode: Mode, key: str | None) -> dict[str, Any] | None:
         if not key:
             return None
-        with self._lock:
-            response = self._store.get((mode, key))
-            return dict(response) if response is not None else None
+        store_key = (mode, key)
+        shard = self._shard_for(store_key)
+        with shard.lock:
+            entry = shard.entries.get(store_key)
+            if entry is None:
+                return None
+            saved_at, response = entry
+            if not self._is_expired(saved_at, self._time_fn()):
+                shard.entries.move_to_end(store_key)
+                return dict(response)
+            del shard.entries[store_key]
+        with self._stats_lock:
+            self._expirations += 1
+        return None
+
+    def stats(self) -> dict[str, int]:
+        size = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.entries)
+        with self._stats_lock:
+            return {"entries": size, "evictions": self._evictions, "expirations": self._expirations}
+
+    def _put(self, store_key: _StoreKey, saved_at: float, response: dict[str, Any]) -> None:
+        shard = self._shard_for(store_key)
+        evicted = 0
+        with shard.lock:
+            shard.entries[store_key] = (saved_at, response)
+            shard.entries.move_to_end(store_key)
+            while len(shard.entries) > self._shard_capacity:
+                shard.entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            with self._stats_lock:
+                self._evictions += evicted
+
+    def _live_entries(self) -> list[tuple[_StoreKey, float, dict[str, Any]]]:
+        now = self._time_fn()
+        entries: list[tuple[_StoreKey, float, dict[str, Any]]] = []
+        for shard in self._shards:
+            with shard.lock:
+                entries.extend(
+                    (store_key, saved_at, dict(response))
+                    for store_key, (saved_at, response) in shard.entries.items()
+                    if not self._is_expired(saved_at, now)
+                )
+        entries.sort(key=lambda item: item[1])
+        return entries
+
+    def _on_saved(self, *, mode: Mode, key: str, saved_at: float, response: dict[str, Any]) -> None:
+        return None
+
+    def _is_expired(self, saved_at: float, now: float) -> bool:
+        return self._ttl_seconds > 0 and now - saved_at >= self._ttl_seconds
+
+    def _shard_for(self, store_key: _StoreKey) -> _Shard:
+        mode, key = store_key
+        return self._shards[zlib.crc32(f"{mode}:{key}".encode("utf-8")) % len(self._shards)]
+
+
+class JournaledIdempotencyStore(InMemoryIdempotencyStore):
+    def __init__(
+        self,
+        *,
+        journal_path: str,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 86_400.0,
+        shard_count: int = 16,
+        time_fn: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds, shard_count=shard_count, time_fn=time_fn)
+        self.journal_path = journal_path
+        self._logger = logging.getLogger("privatetrade.kia.idempotency")
+        self._journal_lock = Lock()
+        self._journal_records = 0
+        self._restore()
+
+    def _on_saved(self, *, mode: Mode, key: str, saved_at: float, response: dict[str, Any]) -> None:
+        line = json.dumps({"mode": mode, "key": key, "savedAt": saved_at, "response": response}, ensure_ascii=False)
+        with self._journal_lock:
+            with open(self.journal_path, "a", encoding="utf-8") as file:
+                file.write(line + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            self._journal_records += 1
+            if self._journal_records > 2 * self._max_entries:
+                self._compact_locked()
+
+    def compact(self) -> None:
+        with self._journal_lock:
+            self._compact_locked()
+
+    def _restore(self) -> None:
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.journal_path):
+            return
+        records: dict[_StoreKey, tuple[float, dict[str, Any]]] = {}
+        skipped = 0
+        with open(self.journal_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    store_key = (record["mode"], str(record["key"]))
+                    records[store_key] = (float(record["savedAt"]), dict(record["response"]))
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1
+                    continue
+                self._journal_records += 1
+        now = self._time_fn()
+        for store_key, (saved_at, response) in sorted(records.items(), key=lambda item: item[1][0]):
+            if not self._is_expired(saved_at, now):
+                self._put(store_key, saved_at, response)
+        if skipped:
+            self._logger.warning("Skipped unreadable idempotency journal records: path=%s count=%s", self.journal_path, skipped)
+        if self._journal_records > len(records) or skipped:
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        entries = self._live_entries()
+        directory = os.path.dirname(self.journal_path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".jsonl", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                for (mode, key), saved_at, response in entries:
+                    file.write(
+                        json.dumps({"mode": mode, "key": key, "savedAt": saved_at, "response": response}, ensure_ascii=False)
+                        + "\n"
+                    )
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.journal_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._journal_records = len(entries)
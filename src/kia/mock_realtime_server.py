@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+from typing import Any
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class MockKiwoomRealtimeServer:
+    def __init__(
+        self,
+        *,
+        ticks_by_connection: list[list[dict[str, Any]]] | None = None,
+        close_after_ticks: bool = True,
+        login_return_code: int = 0,
+        register_return_code: int = 0,
+        max_connections: int | None = None,
+    ) -> None:
+        self._ticks_by_connection = ticks_by_connection or []
+        self._close_after_ticks = close_after_ticks
+        self._login_return_code = login_return_code
+        self._register_return_code = register_return_code
+        self._max_connections = max_connections
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self._clients: list[socket.socket] = []
+        self.port = int(self._server.getsockname()[1])
+        self.connections = 0
+        self.logins: list[str] = []
+        self.registrations: list[list[str]] = []
+        self.pong_count = 0
+        self._thread = threading.Thread(target=self._serve, name="mock-kiwoom-realtime", daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}"
+
+    def start(self) -> MockKiwoomRealtimeServer:
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._closed.set()
+        self._server.close()
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.close()
+            except OSError:
+                pass
+
+    def __enter__(self) -> MockKiwoomRealtimeServer:
+        return self.start()
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    @staticmethod
+    def tick(symbol: str, price: str, hhmmss: str) -> dict[str, Any]:
+        return {
+            "trnm": "REAL",
+            "data": [{"type": "0B", "name": "주식체결", "item": symbol, "values": {"10": price, "20": hhmmss}}],
+        }
+
+    def _serve(self) -> None:
+        while not self._closed.is_set():
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            with self._lock:
+                index = self.connections
+                self.connections += 1
+                refuse = self._max_connections is not None and index >= self._max_connections
+                if not refuse:
+                    self._clients.append(client)
+            if refuse:
+                client.close()
+                continue
+            threading.Thread(target=self._handle, args=(client, index), daemon=True).start()
+
+    def _handle(self, client: socket.socket, index: int) -> None:
+        stream = client.makefile("rb")
+        try:
+            if not self._handshake(client, stream):
+                return
+            while not self._closed.is_set():
+                message = self._read_message(stream)
+                if message is None:
+                    return
+                trnm = str(message.get("trnm", ""))
+                if trnm == "LOGIN":
+                    with self._lock:
+                        self.logins.append(str(message.get("token", "")))
+                    self._send(client, {"trnm": "LOGIN", "return_code": self._login_return_code, "return_msg": ""})
+                elif trnm == "REG":
+                    items: list[str] = []
+                    for entry in message.get("data", []):
+                        items.extend(str(item) for item in entry.get("item", []))
+                    with self._lock:
+                        self.registrations.append(items)
+                    self._send(client, {"trnm": "REG", "return_code": self._register_return_code, "return_msg": ""})
+                    if self._register_return_code != 0:
+                        continue
+                    self._send(client, {"trnm": "PING"})
+                    echoed = self._read_message(stream)
+                    if echoed is None:
+                        return
+                    if echoed.get("trnm") == "PING":
+                        with self._lock:
+                            self.pong_count += 1
+                    ticks = self._ticks_by_connection[index] if index < len(self._ticks_by_connection) else []
+                    for tick in ticks:
+                        self._send(client, tick)
+                    if self._close_after_ticks and index < len(self._ticks_by_connection):
+                        return
+        except OSError:
+            return
+        finally:
+            stream.close()
+            client.close()
+
+    @staticmethod
+    def _handshake(client: socket.socket, stream: Any) -> bool:
+        headers: dict[str, str] = {}
+        request_line = stream.readline()
+        if not request_line:
+            return False
+        while True:
+            line = stream.readline().decode("latin-1")
+            if line in {"\r\n", "\n", ""}:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        client.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        return True
+
+    @staticmethod
+    def _read_message(stream: Any) -> dict[str, Any] | None:
+        header = stream.read(2)
+        if len(header) < 2:
+            return None
+        opcode = header[0] & 0x0F
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", stream.read(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", stream.read(8))[0]
+        mask = stream.read(4) if header[1] & 0x80 else b""
+        payload = bytearray(stream.read(length))
+        if mask:
+            for offset in range(len(payload)):
+                payload[offset] ^= mask[offset % 4]
+        if opcode == 0x8:
+            return None
+        if opcode != 0x1:
+            return {}
+        return json.loads(payload.decode("utf-8"))
+
+    @staticmethod
+    def _send(client: socket.socket, message: dict[str, Any]) -> None:
+        payload = json.dumps(message).encode("utf-8")
+        if len(payload) < 126:
+            header = struct.pack("!BB", 0x81, len(payload))
+        elif len(payload) < 65536:
+            header = struct.pack("!BBH", 0x81, 126, len(payload))
+        else:
+            header = struct.pack("!BBQ", 0x81, 127, len(payload))
+        client.sendall(header + payload)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+
+from .contracts import Mode
+
+DEFAULT_REQUEST_RATE_PER_SECOND = 5.0
+DEFAULT_REQUEST_BURST = 5
+DEFAULT_QUOTE_RATE_PER_SECOND = 4.0
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    rate_per_second: float
+    burst: int = 1
+
+    def __post_init__(self) -> None:
+        if self.rate_per_second <= 0:
+            raise ValueError("rate_per_second must be > 0")
+        if self.burst < 1:
+            raise ValueError("burst must be >= 1")
+
+    @property
+    def interval_seconds(self) -> float:
+        return 1.0 / self.rate_per_second
+
+
+class _Lane:
+    __slots__ = ("rule", "tat")
+
+    def __init__(self, rule: RateLimitRule) -> None:
+        self.rule = rule
+        self.tat = float("-inf")
+
+    def earliest(self, at: float) -> float:
+        return max(at, self.tat - (self.rule.burst - 1) * self.rule.interval_seconds)
+
+    def commit(self, at: float) -> None:
+        self.tat = max(self.tat, at) + self.rule.interval_seconds
+
+
+class KiaRateLimiter:
+    def __init__(
+        self,
+        *,
+        api_rules: dict[str, RateLimitRule] | None = None,
+        mode_rule: RateLimitRule | None = None,
+        priority_reserve: int = 1,
+        monotonic_fn: Callable[[], float] | None = None,
+    ) -> None:
+        self._api_rules = dict(api_rules or {})
+        self._mode_rule, self._priority_rule = _split_mode_rule(mode_rule, priority_reserve)
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self._lock = Lock()
+        self._mode_lanes: dict[Mode, _Lane] = {}
+        self._priority_lanes: dict[Mode, _Lane] = {}
+        self._api_lanes: dict[tuple[Mode, str], _Lane] = {}
+        self._key_slots: dict[tuple[Mode, str, str], float] = {}
+
+    def rule_for(self, api_id: str | None) -> RateLimitRule | None:
+        if api_id is None:
+            return None
+        return self._api_rules.get(api_id)
+
+    def reserve(
+        self,
+        *,
+        mode: Mode,
+        api_id: str | None,
+        priority: bool = False,
+        key: str | None = None,
+        key_interval_seconds: float = 0.0,
+        deadline: float | None = None,
+    ) -> float | None:
+        with self._lock:
+            now = self._monotonic_fn()
+            lanes: list[_Lane] = []
+            api_rule = self.rule_for(api_id)
+            if api_rule is not None and api_id is not None:
+                api_lane = self._api_lanes.get((mode, api_id))
+                if api_lane is None:
+                    api_lane = self._api_lanes[(mode, api_id)] = _Lane(api_rule)
+                lanes.append(api_lane)
+
+            slot_key = (mode, api_id or "*", key) if key is not None and key_interval_seconds > 0 else None
+            at = now
+            if slot_key is not None:
+                at = max(at, self._key_slots.get(slot_key, now))
+            for lane in lanes:
+                at = lane.earliest(at)
+            if self._mode_rule is not None:
+                candidates = [self._mode_lane(mode)]
+                if priority and self._priority_rule is not None:
+                    candidates.insert(0, self._priority_lane(mode))
+                mode_lane = min(candidates, key=lambda lane: lane.earliest(at))
+                at = mode_lane.earliest(at)
+                lanes.append(mode_lane)
+
+            if deadline is not None and at > deadline:
+                return None
+            for lane in lanes:
+                lane.commit(at)
+            if slot_key is not None:
+                self._key_slots[slot_key] = at + key_interval_seconds
+            return at - now
+
+    def claim_key_slot(
+        self,
+        *,
+        mode: Mode,
+        api_id: str | None,
+        key: str,
+        interval_seconds: float,
+        deadline: float | None = None,
+    ) -> float | None:
+        with self._lock:
+            now = self._monotonic_fn()
+            slot_key = (mode, api_id or "*", key)
+            at = max(now, self._key_slots.get(slot_key, now))
+            if deadline is not None and at > deadline:
+                return None
+            self._key_slots[slot_key] = at + interval_seconds
+            return at
+
+    def _mode_lane(self, mode: Mode) -> _Lane:
+        lane = self._mode_lanes.get(mode)
+        if lane is None:
+            lane = self._mode_lanes[mode] = _Lane(self._mode_rule)
+        return lane
+
+    def _priority_lane(self, mode: Mode) -> _Lane:
+        lane = self._priority_lanes.get(mode)
+        if lane is None:
+            lane = self._priority_lanes[mode] = _Lane(self._priority_rule)
+        return lane
+
+
+def _split_mode_rule(
+    mode_rule: RateLimitRule | None,
+    priority_reserve: int,
+) -> tuple[RateLimitRule | None, RateLimitRule | None]:
+    if mode_rule is None:
+        return None, None
+    reserve = min(max(0, priority_reserve), mode_rule.burst - 1)
+    if reserve == 0:
+        return mode_rule, None
+    shared_share = (mode_rule.burst - reserve) / mode_rule.burst
+    return (
+        RateLimitRule(rate_per_second=mode_rule.rate_per_second * shared_share, burst=mode_rule.burst - reserve),
+        RateLimitRule(rate_per_second=mode_rule.rate_per_second * (1 - shared_share), burst=reserve),
+    )
+
+
+def build_kia_rate_limiter(
+    *,
+    quote_global_min_interval_seconds: float = 0.25,
+    quote_batch_rate_per_second: float | None = None,
+    quote_batch_burst: int = 1,
+    request_rate_per_second: float | None = DEFAULT_REQUEST_RATE_PER_SECOND,
+    request_burst: int = DEFAULT_REQUEST_BURST,
+    order_priority_reserve: int = 1,
+    api_rate_limits: dict[str, RateLimitRule] | None = None,
+    monotonic_fn: Callable[[], float] | None = None,
+) -> KiaRateLimiter:
+    if quote_batch_rate_per_second is None and quote_global_min_interval_seconds > 0:
+        quote_batch_rate_per_second = 1.0 / quote_global_min_interval_seconds
+    api_rules: dict[str, RateLimitRule] = {}
+    if quote_batch_rate_per_second is not None and quote_batch_rate_per_second > 0:
+        api_rules["ka10007"] = RateLimitRule(rate_per_second=quote_batch_rate_per_second, burst=max(1, quote_batch_burst))
+    api_rules.update(api_rate_limits or {})
+    mode_rule: RateLimitRule | None = None
+    if request_rate_per_second is not None and request_rate_per_second > 0:
+        mode_rule = RateLimitRule(rate_per_second=request_rate_per_second, burst=max(1, request_burst))
+    return KiaRateLimiter(
+        api_rules=api_rules,
+        mode_rule=mode_rule,
+        priority_reserve=order_priority_reserve,
+        monotonic_fn=monotonic_fn,
+    )
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from threading import Event, Lock
+from typing import Any, Callable, Protocol
+
+from .api_client import RoutingKiaApiClient
+from .contracts import MarketQuote, Mode
+from .errors import KiaError, make_kia_error
+from .gateway import REALTIME_QUOTE_TYPE, parse_realtime_quote
+
+
+class WebSocketConnection(Protocol):
+    def send(self, payload: str) -> Any: ...
+
+    def recv(self) -> Any: ...
+
+    def close(self) -> Any: ...
+
+
+WebSocketFactory = Callable[[str, float], WebSocketConnection]
+
+
+def create_websocket_connection(url: str, timeout_seconds: float) -> WebSocketConnection:
+    import websocket
+
+    return websocket.create_connection(url, timeout=timeout_seconds)
+
+
+class KiaRealtimeQuoteClient:
+    def __init__(
+        self,
+        *,
+        api_client: RoutingKiaApiClient,
+        mode: Mode,
+        websocket_factory: WebSocketFactory = create_websocket_connection,
+        recv_timeout_seconds: float = 30.0,
+        reconnect_base_delay_seconds: float = 0.5,
+        reconnect_max_delay_seconds: float = 10.0,
+        max_reconnect_attempts: int = 5,
+        group_no: str = "1",
+        now_fn: Callable[[], datetime] | None = None,
+    ) -> None:
+        self._api_client = api_client
+        self._mode = mode
+        self._websocket_factory = websocket_factory
+        self._recv_timeout_seconds = recv_timeout_seconds
+        self._reconnect_base_delay_seconds = max(0.0, reconnect_base_delay_seconds)
+        self._reconnect_max_delay_seconds = max(0.0, reconnect_max_delay_seconds)
+        self._max_reconnect_attempts = max(0, max_reconnect_attempts)
+        self._group_no = group_no
+        self._now_fn = now_fn or (lambda: datetime.now(timezone.utc))
+        self._logger = logging.getLogger("privatetrade.kia.realtime")
+        self._lock = Lock()
+        self._connection: WebSocketConnection | None = None
+        self._connects = 0
+        self._reconnects = 0
+        self._ticks = 0
+        self._last_tick_at: datetime | None = None
+
+    def run(
+        self,
+        *,
+        symbols: list[str],
+        on_quote: Callable[[MarketQuote], None],
+        stop_event: Event,
+        on_disconnect: Callable[[Exception], None] | None = None,
+    ) -> None:
+        failures = 0
+        while not stop_event.is_set():
+            try:
+                self._connect(symbols, on_quote)
+                failures = 0
+                self._receive(on_quote, stop_event)
+            except Exception as exc:
+                self.close()
+                if stop_event.is_set():
+                    break
+                if isinstance(exc, KiaError) and not exc.retryable:
+                    raise
+                failures += 1
+                with self._lock:
+                    self._reconnects += 1
+                self._logger.warning(
+                    "Realtime quote stream disconnected: mode=%s failures=%s error=%s",
+                    self._mode,
+                    failures,
+                    exc,
+                )
+                if on_disconnect is not None:
+                    on_disconnect(exc)
+                if failures > self._max_reconnect_attempts:
+                    raise make_kia_error(
+                        "KIA_REALTIME_UNAVAILABLE",
+                        "실시간 시세 연결을 복구하지 못했습니다.",
+                        True,
+                        {"attempts": failures, "error": str(exc)},
+                    ) from exc
+                delay = min(self._reconnect_base_delay_seconds * (2 ** (failures - 1)), self._reconnect_max_delay_seconds)
+                stop_event.wait(delay)
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            connection = self._connection
+            self._connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:  # pragma: no cover - best effort close
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "connects": self._connects,
+                "reconnects": self._reconnects,
+                "ticks": self._ticks,
+                "last_tick_at": self._last_tick_at,
+            }
+
+    def _connect(self, symbols: list[str], on_quote: Callable[[MarketQuote], None]) -> None:
+        endpoint = self._api_client.endpoint_resolver.resolve_websocket(self._mode)
+        connection = self._websocket_factory(f"{endpoint.base_url}{endpoint.path}", self._recv_timeout_seconds)
+        with self._lock:
+            self._connection = connection
+            self._connects += 1
+
+        token = self._api_client.token_provider.get_valid_token(self._mode)
+        self._send(connection, {"trnm": "LOGIN", "token": token.token})
+        login = self._await_response(connection, "LOGIN", on_quote)
+        if str(login.get("return_code", "0")) != "0":
+            self._api_client.token_provider.invalidate(self._mode)
+            raise make_kia_error(
+                "KIA_REALTIME_LOGIN_FAILED",
+                "실시간 시세 서버 로그인에 실패했습니다.",
+                True,
+                {"return_code": login.get("return_code"), "return_msg": login.get("return_msg")},
+            )
+
+        self._send(
+            connection,
+            {
+                "trnm": "REG",
+                "grp_no": self._group_no,
+                "refresh": "1",
+                "data": [{"item": list(symbols), "type": [REALTIME_QUOTE_TYPE]}],
+            },
+        )
+        registered = self._await_response(connection, "REG", on_quote)
+        if str(registered.get("return_code", "0")) != "0":
+            raise make_kia_error(
+                "KIA_REALTIME_REGISTER_FAILED",
+                "실시간 시세 등록에 실패했습니다.",
+                False,
+                {"return_code": registered.get("return_code"), "return_msg": registered.get("return_msg")},
+            )
+        self._logger.info("Realtime quote stream subscribed: mode=%s symbols=%s", self._mode, ",".join(symbols))
+
+    def _receive(self, on_quote: Callable[[MarketQuote], None], stop_event: Event) -> None:
+        while not stop_event.is_set():
+            connection = self._connection
+            if connection is None:
+                raise ConnectionError("realtime connection closed")
+            self._dispatch(connection, self._recv(connection), on_quote)
+
+    def _await_response(
+        self,
+        connection: WebSocketConnection,
+        trnm: str,
+        on_quote: Callable[[MarketQuote], None],
+    ) -> dict[str, Any]:
+        while True:
+            message = self._recv(connection)
+            if str(message.get("trnm", "")) == trnm:
+                return message
+            self._dispatch(connection, message, on_quote)
+
+    def _dispatch(
+        self,
+        connection: WebSocketConnection,
+        message: dict[str, Any],
+        on_quote: Callable[[MarketQuote], None],
+    ) -> None:
+        trnm = str(message.get("trnm", ""))
+        if trnm == "PING":
+            self._send(connection, message)
+            return
+        if trnm != "REAL":
+            return
+        received_at = self._now_fn()
+        for item in message.get("data", []):
+            if not isinstance(item, dict):
+                continue
+            quote = parse_realtime_quote(item, received_at=received_at)
+            if quote is None:
+                continue
+            with self._lock:
+                self._ticks += 1
+                self._last_tick_at = received_at
+            on_quote(quote)
+
+    @staticmethod
+    def _send(connection: WebSocketConnection, message: dict[str, Any]) -> None:
+        connection.send(json.dumps(message))
+
+    @staticmethod
+    def _recv(connection: WebSocketConnection) -> dict[str, Any]:
+        raw = connection.recv()
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        if not raw:
+            raise ConnectionError("realtime connection closed by server")
+        message = json.loads(raw)
+        if not isinstance(message, dict):
+            raise ValueError("realtime message is not object")
+        return message
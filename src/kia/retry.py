@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import random
 import time
-from typing import Callable, TypeVar
+from typing import Awaitable, Callable, TypeVar
 
 ResultT = TypeVar("ResultT")
 
@@ -31,3 +32,29 @@ def execute_with_retry(
     if last_error is None:
         raise RuntimeError("retry operation failed without explicit error")
     raise last_error
+
+
+async def execute_with_retry_async(
+    operation: Callable[[], Awaitable[ResultT]],
+    *,
+    should_retry: Callable[[Exception, int], bool],
+    attempts: int = 3,
+    base_delay_seconds: float = 0.2,
+    max_delay_seconds: float = 2.0,
+    sleep_fn: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    rand_fn: Callable[[float, float], float] = random.uniform,
+) -> ResultT:
+    last_error: Exception | None = None
+    for attempt in range(1, attempts + 1):
+        try:
+            return await operation()
+        except Exception as exc:  # pragma: no cover - behavior validated by tests
+            last_error = exc
+            if attempt >= attempts or not should_retry(exc, attempt):
+                raise
+            delay = min(base_delay_seconds * (2 ** (attempt - 1)), max_delay_seconds)
+            jitter = rand_fn(0.0, 0.1)
+            await sleep_fn(delay + jitter)
+    if last_error is None:
+        raise RuntimeError("retry operation failed without explicit error")
+    raise last_error
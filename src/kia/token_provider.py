@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from threading import Lock
-from typing import Callable
+import json
+import logging
+import multiprocessing
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Event, Lock, Thread
+from typing import Any, Callable
 
 from .contracts import Mode
+from .errors import make_kia_error
 from .models import AccessToken
 
+RefreshListener = Callable[[AccessToken], None]
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -18,34 +26,243 @@ class InMemoryTokenProvider:
         auth_issuer: Callable[[Mode], AccessToken],
         *,
         now_fn: Callable[[], datetime] = _utc_now,
+        stale_while_revalidate: bool = True,
+        refresh_lead_seconds: float = 30.0,
+        refresh_jitter_seconds: float = 10.0,
+        refresh_retry_seconds: float = 5.0,
+        rand_fn: Callable[[float, float], float] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
     ) -> None:
         self._auth_issuer = auth_issuer
         self._now_fn = now_fn
+        self._stale_while_revalidate = stale_while_revalidate
+        self._refresh_lead_seconds = max(0.0, refresh_lead_seconds)
+        self._refresh_jitter_seconds = max(0.0, refresh_jitter_seconds)
+        self._refresh_retry_seconds = max(0.0, refresh_retry_seconds)
+        self._rand_fn = rand_fn or random.uniform
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self._logger = logging.getLogger("privatetrade.kia.token_provider")
         self._cache: dict[Mode, AccessToken] = {}
         self._locks: dict[Mode, Lock] = {
             "mock": Lock(),
             "live": Lock(),
         }
+        self._state_lock = Lock()
+        self._due_at: dict[Mode, datetime] = {}
+        self._refreshing: set[Mode] = set()
+        self._metrics: dict[Mode, dict[str, Any]] = {}
+        self._refresher: Thread | None = None
+        self._refresher_stop = Event()
+        self._refresher_wake = Event()
+        self._refresh_listeners: list[RefreshListener] = []
+
+    def add_refresh_listener(self, listener: RefreshListener) -> None:
+        self._refresh_listeners.append(listener)
+        for token in list(self._cache.values()):
+            listener(token)
 
     def get_valid_token(self, mode: Mode) -> AccessToken:
         token = self._cache.get(mode)
         now = self._now_fn()
         if token is not None and now < token.refresh_at:
             return token
+        if token is not None and self._serve_stale(mode, token, now):
+            return token
         with self._locks[mode]:
             token = self._cache.get(mode)
             now = self._now_fn()
             if token is not None and now < token.refresh_at:
                 return token
-            refreshed = self._auth_issuer(mode)
-            self._cache[mode] = refreshed
-            return refreshed
+            return self._refresh_locked(mode, trigger="foreground")
+
+    def peek_valid_token(self, mode: Mode) -> AccessToken | None:
+        token = self._cache.get(mode)
+        if token is None:
+            return None
+        now = self._now_fn()
+        if now < token.refresh_at or self._serve_stale(mode, token, now):
+            return token
+        return None
 
     def force_refresh(self, mode: Mode) -> AccessToken:
         with self._locks[mode]:
-            refreshed = self._auth_issuer(mode)
-            self._cache[mode] = refreshed
-            return refreshed
+            return self._refresh_locked(mode, trigger="forced")
 
     def invalidate(self, mode: Mode) -> None:
         self._cache.pop(mode, None)
+        with self._state_lock:
+            self._due_at.pop(mode, None)
+
+    def refresh_due_tokens(self) -> list[Mode]:
+        now = self._now_fn()
+        with self._state_lock:
+            due = [mode for mode, due_at in self._due_at.items() if due_at <= now and mode not in self._refreshing]
+        refreshed: list[Mode] = []
+        for mode in due:
+            if self._refresh_quietly(mode, trigger="background"):
+                refreshed.append(mode)
+        return refreshed
+
+    def start_background_refresh(self) -> None:
+        with self._state_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._refresher_stop.clear()
+            self._refresher = Thread(target=self._refresh_loop, name="kia-token-refresher", daemon=True)
+            self._refresher.start()
+
+    def stop_background_refresh(self, *, timeout_seconds: float = 2.0) -> None:
+        with self._state_lock:
+            refresher = self._refresher
+            self._refresher = None
+        self._refresher_stop.set()
+        self._refresher_wake.set()
+        if refresher is not None and refresher.is_alive():
+            refresher.join(timeout=timeout_seconds)
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        with self._state_lock:
+            snapshot: dict[str, dict[str, Any]] = {}
+            for mode, values in self._metrics.items():
+                item = dict(values)
+                due_at = self._due_at.get(mode)
+                item["next_refresh_at"] = due_at.isoformat() if due_at is not None else None
+                snapshot[mode] = item
+            return snapshot
+
+    def _serve_stale(self, mode: Mode, token: AccessToken, now: datetime) -> bool:
+        if not self._stale_while_revalidate or now >= token.expires_at:
+            return False
+        with self._state_lock:
+            self._mode_metrics(mode)["stale_served"] += 1
+            if mode in self._refreshing:
+                return True
+            self._refreshing.add(mode)
+        Thread(target=self._revalidate, args=(mode,), name=f"kia-token-revalidate-{mode}", daemon=True).start()
+        return True
+
+    def _revalidate(self, mode: Mode) -> None:
+        try:
+            with self._locks[mode]:
+                token = self._cache.get(mode)
+                if token is not None and self._now_fn() < token.refresh_at:
+                    return
+                self._refresh_locked(mode, trigger="revalidate")
+        except Exception:
+            self._logger.warning("Token revalidation failed; serving cached token until expiry: mode=%s", mode)
+        finally:
+            with self._state_lock:
+                self._refreshing.discard(mode)
+
+    def _refresh_quietly(self, mode: Mode, *, trigger: str) -> bool:
+        with self._state_lock:
+            if mode in self._refreshing:
+                return False
+            self._refreshing.add(mode)
+        try:
+            with self._locks[mode]:
+                self._refresh_locked(mode, trigger=trigger)
+            return True
+        except Exception:
+            self._logger.warning("Background token refresh failed: mode=%s", mode)
+            with self._state_lock:
+                if mode in self._due_at:
+                    self._due_at[mode] = self._now_fn() + timedelta(seconds=self._refresh_retry_seconds)
+            return False
+        finally:
+            with self._state_lock:
+                self._refreshing.discard(mode)
+
+    def _refresh_locked(self, mode: Mode, *, trigger: str) -> AccessToken:
+        started = self._monotonic_fn()
+        try:
+            refreshed = self._auth_issuer(mode)
+        except Exception as exc:
+            with self._state_lock:
+                metrics = self._mode_metrics(mode)
+                metrics["failures"] += 1
+                metrics["last_error"] = str(exc)
+            raise
+        latency_ms = (self._monotonic_fn() - started) * 1000
+        self._cache[mode] = refreshed
+        jitter = self._rand_fn(0.0, self._refresh_jitter_seconds) if self._refresh_jitter_seconds > 0 else 0.0
+        with self._state_lock:
+            self._due_at[mode] = refreshed.refresh_at - timedelta(seconds=self._refresh_lead_seconds + jitter)
+            metrics = self._mode_metrics(mode)
+            metrics["refreshes"] += 1
+            metrics[f"{trigger}_refreshes"] += 1
+            metrics["last_refresh_latency_ms"] = round(latency_ms, 3)
+            metrics["max_refresh_latency_ms"] = max(metrics["max_refresh_latency_ms"], round(latency_ms, 3))
+            metrics["last_error"] = None
+        for listener in self._refresh_listeners:
+            try:
+                listener(refreshed)
+            except Exception:
+                self._logger.exception("Token refresh listener failed: mode=%s", mode)
+        self._refresher_wake.set()
+        return refreshed
+
+    def _mode_metrics(self, mode: Mode) -> dict[str, Any]:
+        metrics = self._metrics.get(mode)
+        if metrics is None:
+            metrics = self._metrics[mode] = {
+                "refreshes": 0,
+                "foreground_refreshes": 0,
+                "forced_refreshes": 0,
+                "revalidate_refreshes": 0,
+                "background_refreshes": 0,
+                "failures": 0,
+                "stale_served": 0,
+                "last_refresh_latency_ms": None,
+                "max_refresh_latency_ms": 0.0,
+                "last_error": None,
+            }
+        return metrics
+
+    def _refresh_loop(self) -> None:
+        while not self._refresher_stop.is_set():
+            self.refresh_due_tokens()
+            with self._state_lock:
+                next_due = min(self._due_at.values(), default=None)
+            timeout = None
+            if next_due is not None:
+                timeout = max((next_due - self._now_fn()).total_seconds(), 0.05)
+            self._refresher_wake.wait(timeout)
+            self._refresher_wake.clear()
+
+
+class SharedAccessToken:
+    def __init__(self, context: Any | None = None, *, capacity: int = 4096) -> None:
+        self._buffer = (context or multiprocessing.get_context()).Array("c", capacity)
+
+    def publish(self, token: AccessToken) -> None:
+        encoded = json.dumps(
+            {
+                "token": token.token,
+                "issued_at": token.issued_at.isoformat(),
+                "expires_at": token.expires_at.isoformat(),
+                "refresh_at": token.refresh_at.isoformat(),
+                "mode": token.mode,
+            }
+        ).encode("utf-8")
+        if len(encoded) >= len(self._buffer):
+            raise ValueError("access token does not fit the shared token buffer")
+        with self._buffer.get_lock():
+            self._buffer.value = encoded
+
+    def issue(self, mode: Mode) -> AccessToken:
+        with self._buffer.get_lock():
+            encoded = self._buffer.value
+        record = json.loads(encoded) if encoded else None
+        if record is None or record["mode"] != mode:
+            raise make_kia_error("KIA_AUTH_TOKEN_EXPIRED", "공유 인증 토큰이 아직 발급되지 않았습니다.", True, {"mode": mode})
+        token = AccessToken(
+            token=record["token"],
+            issued_at=datetime.fromisoformat(record["issued_at"]),
+            expires_at=datetime.fromisoformat(record["expires_at"]),
+            refresh_at=datetime.fromisoformat(record["refresh_at"]),
+            mode=mode,
+        )
+        if _utc_now() >= token.expires_at:
+            raise make_kia_error("KIA_AUTH_TOKEN_EXPIRED", "공유 인증 토큰이 만료되었습니다.", True, {"mode": mode})
+        return token
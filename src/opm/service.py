@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import date, datetime
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Any
+from typing import Any, Iterator
 from uuid import uuid4
 
 from prp.models import ExecutionEvent, OrderEvent, PositionSnapshot
@@ -31,6 +32,15 @@ class OpmService:
         self.prp_repository = prp_repository
         self.kia_gateway = kia_gateway
 
+    @contextmanager
+    def unit_of_work(self) -> Iterator[None]:
+        unit_of_work = getattr(self.prp_repository, "unit_of_work", None)
+        if unit_of_work is None:
+            yield
+            return
+        with unit_of_work():
+            yield
+
     def create_order(
         self,
         *,
@@ -94,29 +104,53 @@ class OpmService:
     ) -> tuple[OrderAggregate, PositionModel, int]:
         applied_fill_count = 0
 
-        for fill in fills:
-            persisted = self.prp_repository.append_execution_event(
-                ExecutionEvent(
-                    event_id=f"evt-exe-{uuid4().hex[:12]}",
-                    execution_id=fill.execution_id,
-                    order_id=order.order_aggregate_id,
-                    occurred_at=fill.executed_at,
-                    trading_date=order.trading_date,
-                    symbol=fill.symbol,
-                    side=fill.side,
-                    execution_price=fill.price,
-                    execution_qty=fill.qty,
-                    cum_qty=order.cum_executed_qty + fill.qty,
-                    remaining_qty=max(order.requested_qty - (order.cum_executed_qty + fill.qty), 0),
+        with self.unit_of_work():
+            fresh_fills = self._select_new_fills(fills)
+            events: list[ExecutionEvent] = []
+            cum_qty = order.cum_executed_qty
+            for fill in fresh_fills:
+                cum_qty += fill.qty
+                events.append(
+                    ExecutionEvent(
+                        event_id=f"evt-exe-{uuid4().hex[:12]}",
+                        execution_id=fill.execution_id,
+                        order_id=order.order_aggregate_id,
+                        occurred_at=fill.executed_at,
+                        trading_date=order.trading_date,
+                        symbol=fill.symbol,
+                        side=fill.side,
+                        execution_price=fill.price,
+                        execution_qty=fill.qty,
+                        cum_qty=cum_qty,
+                        remaining_qty=max(order.requested_qty - cum_qty, 0),
+                    )
                 )
+
+            for fill, persisted in zip(fresh_fills, self.prp_repository.append_execution_events(events)):
+                if not persisted:
+                    continue
+
+                applied_fill_count += 1
+                self._apply_fill_to_order(order=order, fill=fill)
+                self._apply_fill_to_position(position=position, side=order.side, fill=fill)
+
+            self._finish_reconcile(
+                order=order,
+                position=position,
+                broker_remaining_qty=broker_remaining_qty,
+                latest_market_price=latest_market_price,
             )
-            if not persisted:
-                continue
 
-            applied_fill_count += 1
-            self._apply_fill_to_order(order=order, fill=fill)
-            self._apply_fill_to_position(position=position, side=order.side, fill=fill)
+        return order, position, applied_fill_count
 
+    def _finish_reconcile(
+        self,
+        *,
+        order: OrderAggregate,
+        position: PositionModel,
+        broker_remaining_qty: int,
+        latest_market_price: Decimal,
+    ) -> None:
         order.remaining_qty = max(broker_remaining_qty, 0)
         if order.remaining_qty == 0 and order.cum_executed_qty >= order.requested_qty:
             if order.status in {"ACCEPTED", "PARTIALLY_FILLED", "RECONCILING"}:
@@ -133,7 +167,15 @@ class OpmService:
         position.updated_at = datetime.now(position.updated_at.tzinfo)
         self._persist_position_snapshot(position=position, last_order_id=order.order_aggregate_id)
 
-        return order, position, applied_fill_count
+    def _select_new_fills(self, fills: list[ExecutionFill]) -> list[ExecutionFill]:
+        known = self.prp_repository.existing_execution_ids([fill.execution_id for fill in fills])
+        fresh: list[ExecutionFill] = []
+        for fill in fills:
+            if fill.execution_id in known:
+                continue
+            known.add(fill.execution_id)
+            fresh.append(fill)
+        return fresh
 
     def _apply_fill_to_order(self, *, order: OrderAggregate, fill: ExecutionFill) -> None:
         prev_qty = order.cum_executed_qty
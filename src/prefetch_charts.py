@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import cast
+
+from csm.repository import CachedCsmRuntimeRepository
+from kia.api_client import RoutingKiaApiClient
+from kia.chart_cache import DEFAULT_CHART_CACHE_MAX_BYTES, ChartBarCache, ChartBarStore, previous_trading_days
+from kia.contracts import Mode
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm the local ka10080 minute-bar cache for the watch list.")
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--tic-scope", default="1")
+    parser.add_argument("--settings", default="runtime/config/settings.local.json")
+    parser.add_argument("--credentials", default="runtime/config/credentials.local.json")
+    parser.add_argument("--db", default="runtime/state/chart_bars.db")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_CHART_CACHE_MAX_BYTES)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    logger = logging.getLogger("privatetrade.prefetch")
+
+    repository = CachedCsmRuntimeRepository(settings_path=args.settings, credentials_path=args.credentials)
+    settings = repository.read_settings()
+    symbols = [str(symbol) for symbol in settings.get("watchSymbols", []) if str(symbol).strip()]
+    mode_raw = str(settings.get("mode", "mock"))
+    mode: Mode = cast(Mode, mode_raw) if mode_raw in {"mock", "live"} else "mock"
+
+    store = ChartBarStore(args.db, max_bytes=args.max_bytes)
+    cache = ChartBarCache(store)
+    try:
+        trading_dates = previous_trading_days(cache.today(), args.days)
+        fetched = cache.prefetch(
+            RoutingKiaApiClient(csm_repository=repository),
+            mode=mode,
+            symbols=symbols,
+            trading_dates=trading_dates,
+            tic_scope=args.tic_scope,
+        )
+        logger.info(
+            "Chart prefetch finished: symbols=%s days=%s fetched=%s cache_bytes=%s",
+            len(symbols),
+            len(trading_dates),
+            fetched,
+            store.total_bytes(),
+        )
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
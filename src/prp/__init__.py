@@ -1,11 +1,25 @@
 from .bootstrap import initialize_database
-from .models import DailyReport, ExecutionEvent, OrderEvent, PositionSnapshot, StrategyEvent, TradeDetail
+from .connections import PrpConnectionManager
+from .journal import PrpJournalStalledError, PrpWriteBehindJournal
+from .models import (
+    DailyReport,
+    ExecutionEvent,
+    OrderEvent,
+    PositionSnapshot,
+    RangeReport,
+    RangeReportDay,
+    StrategyEvent,
+    TradeDetail,
+)
 from .repository import PrpRepository
 from .reporting import generate_daily_report
 
 __all__ = [
     "initialize_database",
     "PrpRepository",
+    "PrpConnectionManager",
+    "PrpWriteBehindJournal",
+    "PrpJournalStalledError",
     "generate_daily_report",
     "StrategyEvent",
     "OrderEvent",
@@ -13,4 +27,6 @@ __all__ = [
     "PositionSnapshot",
     "TradeDetail",
     "DailyReport",
+    "RangeReport",
+    "RangeReportDay",
 ]
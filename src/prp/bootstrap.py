@@ -4,7 +4,8 @@ import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
 
-from .schema import SCHEMA_SQL, SCHEMA_VERSION
+from .codec import legacy_decimal_to_scaled, legacy_timestamp_to_micros
+from .schema import EPOCH_MICROS_COLUMNS, SCALED_DECIMAL_COLUMNS, SCHEMA_SQL, SCHEMA_VERSION
 
 DEFAULT_DB_PATH = Path("runtime/state/prp.db")
 
@@ -13,12 +14,12 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def get_connection(db_path: str | Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
+def get_connection(db_path: str | Path = DEFAULT_DB_PATH, *, check_same_thread: bool = True) -> sqlite3.Connection:
     path = Path(db_path)
     if path != Path(":memory:"):
         path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(path))
+    conn = sqlite3.connect(str(path), check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
@@ -26,11 +27,68 @@ def get_connection(db_path: str | Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
     return conn
 
 
+def _current_schema_version(conn: sqlite3.Connection) -> int:
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone()
+    if exists is None:
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _migrate_v1_to_v2_script(conn: sqlite3.Connection) -> str:
+    tables = [table for table in SCALED_DECIMAL_COLUMNS if _table_columns(conn, table)]
+    indexes = [
+        row[0]
+        for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+            f"AND tbl_name IN ({','.join('?' for _ in tables)})",
+            tables,
+        )
+    ]
+    statements = ["BEGIN"]
+    statements.extend(f"DROP INDEX {index}" for index in indexes)
+    statements.extend(f"ALTER TABLE {table} RENAME TO {table}_v1" for table in tables)
+    statements.append(SCHEMA_SQL)
+    for table in tables:
+        columns = _table_columns(conn, table)
+        expressions = []
+        for column in columns:
+            if column in SCALED_DECIMAL_COLUMNS.get(table, ()):
+                expressions.append(f"prp_scaled_decimal({column})")
+            elif column in EPOCH_MICROS_COLUMNS.get(table, ()):
+                expressions.append(f"prp_epoch_micros({column})")
+            else:
+                expressions.append(column)
+        statements.append(
+            f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(expressions)} FROM {table}_v1"
+        )
+        statements.append(f"DROP TABLE {table}_v1")
+    statements.append(
+        f"INSERT OR REPLACE INTO schema_version(version, applied_at) VALUES ({SCHEMA_VERSION}, '{_utc_now_iso()}')"
+    )
+    statements.append("COMMIT")
+    return ";\n".join(statements) + ";"
+
+
 def run_migrations(conn: sqlite3.Connection) -> None:
+    current = _current_schema_version(conn)
+    if 0 < current < 2:
+        conn.create_function("prp_scaled_decimal", 1, legacy_decimal_to_scaled, deterministic=True)
+        conn.create_function("prp_epoch_micros", 1, legacy_timestamp_to_micros, deterministic=True)
+        try:
+            conn.executescript(_migrate_v1_to_v2_script(conn))
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        return
+
     with conn:
         conn.executescript(SCHEMA_SQL)
-        row = conn.execute("SELECT MAX(version) AS version FROM schema_version").fetchone()
-        current = row["version"] if row and row["version"] is not None else 0
         if current < SCHEMA_VERSION:
             conn.execute(
                 "INSERT OR REPLACE INTO schema_version(version, applied_at) VALUES (?, ?)",
@@ -38,7 +96,14 @@ def run_migrations(conn: sqlite3.Connection) -> None:
             )
 
 
-def initialize_database(db_path: str | Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
-    conn = get_connection(db_path)
+def get_readonly_connection(db_path: str | Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def initialize_database(db_path: str | Path = DEFAULT_DB_PATH, *, check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = get_connection(db_path, check_same_thread=check_same_thread)
     run_migrations(conn)
     return conn
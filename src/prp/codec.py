@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+PRICE_SCALE_DIGITS = 4
+PRICE_SCALE = 10**PRICE_SCALE_DIGITS
+MARKET_TIMEZONE = timezone(timedelta(hours=9))
+
+_PRICE_SCALE_DECIMAL = Decimal(PRICE_SCALE)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_decimal(value: Decimal | int | str) -> int:
+    decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
+    scaled = decimal_value.scaleb(PRICE_SCALE_DIGITS)
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"value has more than {PRICE_SCALE_DIGITS} decimal places: {value}")
+    return int(scaled)
+
+
+def encode_optional_decimal(value: Decimal | None) -> int | None:
+    return None if value is None else encode_decimal(value)
+
+
+def decode_decimal(value: Any) -> Decimal:
+    return Decimal(int(value)) / _PRICE_SCALE_DECIMAL
+
+
+def decode_optional_decimal(value: Any) -> Decimal | None:
+    return None if value is None else decode_decimal(value)
+
+
+def encode_timestamp(value: datetime) -> int:
+    aware = value if value.tzinfo is not None else value.astimezone()
+    return (aware - _EPOCH) // _MICROSECOND
+
+
+def decode_timestamp(value: Any) -> datetime:
+    return datetime.fromtimestamp(int(value) / 1_000_000, MARKET_TIMEZONE)
+
+
+def legacy_decimal_to_scaled(value: Any) -> int | None:
+    return None if value is None else encode_decimal(Decimal(str(value)))
+
+
+def legacy_timestamp_to_micros(value: Any) -> int | None:
+    return None if value is None else encode_timestamp(datetime.fromisoformat(str(value)))
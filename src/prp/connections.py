@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from .bootstrap import DEFAULT_DB_PATH, get_readonly_connection, initialize_database
+from .repository import PrpRepository
+
+
+class PrpConnectionManager:
+    def __init__(self, db_path: str | Path = DEFAULT_DB_PATH, *, read_pool_size: int = 4) -> None:
+        if read_pool_size < 0:
+            raise ValueError("read_pool_size must be >= 0")
+        self.db_path = Path(db_path)
+        self._writer = PrpRepository(conn=initialize_database(self.db_path, check_same_thread=False))
+        self._writer_lock = threading.RLock()
+        self._read_pool_size = 0 if self.db_path == Path(":memory:") else read_pool_size
+        self._readers: queue.LifoQueue[PrpRepository] = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def writer(self) -> Iterator[PrpRepository]:
+        with self._writer_lock:
+            if self._closed:
+                raise RuntimeError("PRP connection manager is closed")
+            yield self._writer
+
+    @contextmanager
+    def reader(self) -> Iterator[PrpRepository]:
+        if self._read_pool_size == 0:
+            with self.writer() as repo:
+                yield repo
+            return
+        repo = self._acquire_reader()
+        try:
+            yield repo
+        finally:
+            if self._closed:
+                repo.close()
+            else:
+                self._readers.put(repo)
+
+    def _acquire_reader(self) -> PrpRepository:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._closed:
+                raise RuntimeError("PRP connection manager is closed")
+            if self._reader_count < self._read_pool_size:
+                repo = PrpRepository(conn=get_readonly_connection(self.db_path))
+                self._reader_count += 1
+                return repo
+        return self._readers.get()
+
+    def close(self) -> None:
+        with self._writer_lock, self._reader_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._writer.close()
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
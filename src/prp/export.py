@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+from dataclasses import dataclass
+from datetime import date, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from .bootstrap import DEFAULT_DB_PATH, get_readonly_connection
+from .codec import PRICE_SCALE_DIGITS, decode_decimal, decode_timestamp
+
+DECIMAL_PRECISION = 18
+DECIMAL_SCALE = PRICE_SCALE_DIGITS
+_DECIMAL_Q = Decimal(1).scaleb(-DECIMAL_SCALE)
+_MANIFEST_NAME = "_manifest.json"
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    name: str
+    kind: str
+
+
+@dataclass(frozen=True)
+class ExportedPartition:
+    table: str
+    trading_date: date
+    path: Path
+    row_count: int
+
+
+def _columns(*specs: tuple[str, str]) -> tuple[ExportColumn, ...]:
+    return tuple(ExportColumn(name=name, kind=kind) for name, kind in specs)
+
+
+EXPORT_TABLES: dict[str, tuple[ExportColumn, ...]] = {
+    "strategy_events": _columns(
+        ("event_id", "string"),
+        ("occurred_at", "timestamp"),
+        ("symbol", "string"),
+        ("event_type", "string"),
+        ("base_price", "decimal"),
+        ("local_low", "decimal"),
+        ("current_price", "decimal"),
+        ("payload_json", "string"),
+    ),
+    "order_events": _columns(
+        ("event_id", "string"),
+        ("order_id", "string"),
+        ("occurred_at", "timestamp"),
+        ("symbol", "string"),
+        ("side", "string"),
+        ("order_type", "string"),
+        ("order_price", "decimal"),
+        ("quantity", "int"),
+        ("status", "string"),
+        ("client_order_key", "string"),
+        ("reason_code", "string"),
+        ("reason_message", "string"),
+    ),
+    "execution_events": _columns(
+        ("event_id", "string"),
+        ("execution_id", "string"),
+        ("order_id", "string"),
+        ("occurred_at", "timestamp"),
+        ("symbol", "string"),
+        ("side", "string"),
+        ("execution_price", "decimal"),
+        ("execution_qty", "int"),
+        ("cum_qty", "int"),
+        ("remaining_qty", "int"),
+    ),
+    "position_snapshots": _columns(
+        ("snapshot_id", "string"),
+        ("saved_at", "timestamp"),
+        ("symbol", "string"),
+        ("avg_buy_price", "decimal"),
+        ("quantity", "int"),
+        ("current_profit_rate", "decimal"),
+        ("max_profit_rate", "decimal"),
+        ("min_profit_locked", "bool"),
+        ("last_order_id", "string"),
+        ("state_version", "int"),
+    ),
+}
+
+
+def _convert(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == "decimal":
+        return decode_decimal(value).quantize(_DECIMAL_Q, rounding=ROUND_HALF_UP)
+    if kind == "timestamp":
+        return decode_timestamp(value).astimezone(timezone.utc)
+    if kind == "int":
+        return int(value)
+    if kind == "bool":
+        return bool(value)
+    return str(value)
+
+
+def iter_partition_batches(
+    conn: sqlite3.Connection,
+    table: str,
+    trading_date: date,
+    *,
+    chunk_size: int = 10_000,
+) -> Iterator[dict[str, list[Any]]]:
+    columns = EXPORT_TABLES[table]
+    cursor = conn.execute(
+        f"SELECT {', '.join(column.name for column in columns)} FROM {table} WHERE trading_date = ? ORDER BY rowid ASC",
+        (trading_date.isoformat(),),
+    )
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield {
+                column.name: [_convert(column.kind, row[index]) for row in rows]
+                for index, column in enumerate(columns)
+            }
+    finally:
+        cursor.close()
+
+
+def _require_pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise RuntimeError("pyarrow is required for columnar PRP export: pip install pyarrow") from exc
+    return pyarrow, pyarrow.parquet
+
+
+def arrow_schema(table: str) -> Any:
+    pa, _ = _require_pyarrow()
+    types = {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+        "decimal": pa.decimal128(DECIMAL_PRECISION, DECIMAL_SCALE),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([pa.field(column.name, types[column.kind]) for column in EXPORT_TABLES[table]])
+
+
+class PrpColumnarExporter:
+    def __init__(
+        self,
+        db_path: str | Path = DEFAULT_DB_PATH,
+        out_dir: str | Path = "runtime/export/prp",
+        *,
+        chunk_size: int = 10_000,
+        today_fn: Callable[[], date] | None = None,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
+        self.db_path = Path(db_path)
+        self.out_dir = Path(out_dir)
+        self.chunk_size = chunk_size
+        self._today_fn = today_fn or date.today
+        self._logger = logging.getLogger("privatetrade.prp.export")
+
+    def partition_path(self, table: str, trading_date: date) -> Path:
+        return self.out_dir / table / f"trading_date={trading_date.isoformat()}" / "part-0000.parquet"
+
+    def pending_partitions(self, *, include_today: bool = False) -> list[tuple[str, date]]:
+        exported = self._read_manifest()
+        today = self._today_fn()
+        conn = get_readonly_connection(self.db_path)
+        try:
+            pending: list[tuple[str, date]] = []
+            for table in EXPORT_TABLES:
+                done = set(exported.get(table, []))
+                for row in conn.execute(f"SELECT DISTINCT trading_date FROM {table} ORDER BY trading_date ASC"):
+                    trading_date = date.fromisoformat(row[0])
+                    if trading_date > today or (trading_date == today and not include_today):
+                        continue
+                    if row[0] not in done or trading_date == today:
+                        pending.append((table, trading_date))
+            return pending
+        finally:
+            conn.close()
+
+    def export(self, *, include_today: bool = False) -> list[ExportedPartition]:
+        pending = self.pending_partitions(include_today=include_today)
+        if not pending:
+            return []
+        _require_pyarrow()
+        today = self._today_fn()
+        manifest = self._read_manifest()
+        exported: list[ExportedPartition] = []
+        conn = get_readonly_connection(self.db_path)
+        try:
+            for table, trading_date in pending:
+                partition = self._write_partition(conn, table, trading_date)
+                exported.append(partition)
+                if trading_date < today:
+                    dates = manifest.setdefault(table, [])
+                    if trading_date.isoformat() not in dates:
+                        dates.append(trading_date.isoformat())
+                        dates.sort()
+                    self._write_manifest(manifest)
+                self._logger.info(
+                    "Exported PRP partition: table=%s trading_date=%s rows=%s path=%s",
+                    table,
+                    trading_date.isoformat(),
+                    partition.row_count,
+                    partition.path,
+                )
+        finally:
+            conn.close()
+        return exported
+
+    def _write_partition(self, conn: sqlite3.Connection, table: str, trading_date: date) -> ExportedPartition:
+        pa, pq = _require_pyarrow()
+        schema = arrow_schema(table)
+        path = self.partition_path(table, trading_date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".parquet", dir=path.parent)
+        os.close(fd)
+        row_count = 0
+        try:
+            with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+                for batch in iter_partition_batches(conn, table, trading_date, chunk_size=self.chunk_size):
+                    writer.write_batch(pa.RecordBatch.from_pydict(batch, schema=schema))
+                    row_count += len(next(iter(batch.values())))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return ExportedPartition(table=table, trading_date=trading_date, path=path, row_count=row_count)
+
+    def _read_manifest(self) -> dict[str, list[str]]:
+        path = self.out_dir / _MANIFEST_NAME
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as file:
+            document = json.load(file)
+        return {str(table): [str(item) for item in dates] for table, dates in document.get("exported", {}).items()}
+
+    def _write_manifest(self, manifest: dict[str, list[str]]) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=self.out_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"exported": manifest}, file, ensure_ascii=False, indent=2)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.out_dir / _MANIFEST_NAME)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
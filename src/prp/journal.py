@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from .codec import legacy_decimal_to_scaled, legacy_timestamp_to_micros
+from .connections import PrpConnectionManager
+from .models import ExecutionEvent, OrderEvent, PositionSnapshot, StrategyEvent
+from .repository import _order_event_row, _position_snapshot_row, _strategy_event_row
+from .schema import SCHEMA_VERSION
+
+DEFAULT_FLUSH_TIMEOUT_SECONDS = 2.0
+DEFAULT_MAX_DRAIN_ATTEMPTS = 20
+DEFAULT_COMPACT_BYTES = 1 << 20
+_MAX_RETRY_DELAY_SECONDS = 1.0
+
+_LEGACY_ROW_CONVERTERS: dict[str, dict[int, Callable[[Any], int | None]]] = {
+    "strategy": {
+        2: legacy_timestamp_to_micros,
+        5: legacy_decimal_to_scaled,
+        6: legacy_decimal_to_scaled,
+        7: legacy_decimal_to_scaled,
+    },
+    "order": {3: legacy_timestamp_to_micros, 7: legacy_decimal_to_scaled},
+    "snapshot": {
+        1: legacy_timestamp_to_micros,
+        4: legacy_decimal_to_scaled,
+        6: legacy_decimal_to_scaled,
+        7: legacy_decimal_to_scaled,
+    },
+}
+
+
+def _upgrade_legacy_row(kind: str, row: tuple) -> tuple:
+    converters = _LEGACY_ROW_CONVERTERS.get(kind, {})
+    return tuple(converters[index](value) if index in converters else value for index, value in enumerate(row))
+
+
+def _encode_record(seq: int, kind: str, row: tuple) -> str:
+    return json.dumps({"seq": seq, "schema": SCHEMA_VERSION, "kind": kind, "row": list(row)}, ensure_ascii=False) + "\n"
+
+
+class PrpJournalStalledError(RuntimeError):
+    pass
+
+
+class PrpWriteBehindJournal:
+    def __init__(
+        self,
+        connections: PrpConnectionManager,
+        journal_path: str | Path,
+        *,
+        capacity: int = 4096,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 0.05,
+        fsync: bool = False,
+        max_drain_attempts: int = DEFAULT_MAX_DRAIN_ATTEMPTS,
+        compact_bytes: int = DEFAULT_COMPACT_BYTES,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+        if max_drain_attempts <= 0:
+            raise ValueError("max_drain_attempts must be > 0")
+        self.connections = connections
+        self.journal_path = Path(journal_path)
+        self.dead_letter_path = self.journal_path.with_name(self.journal_path.name + ".dead")
+        self._max_drain_attempts = max_drain_attempts
+        self._compact_bytes = compact_bytes
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._fsync = fsync
+        self._logger = logging.getLogger("privatetrade.prp.journal")
+        self._buffer: deque[tuple[int, str, tuple]] = deque()
+        self._cond = threading.Condition()
+        self._appended_seq = 0
+        self._drained_seq = 0
+        self._drain_failures = 0
+        self._consecutive_drain_failures = 0
+        self._dead_lettered = 0
+        self._closed = False
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.recovered_count = self._recover()
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._drain_loop, name="prp-write-behind", daemon=True)
+        self._thread.start()
+
+    def append_strategy_event(self, event: StrategyEvent) -> None:
+        self._append("strategy", _strategy_event_row(event))
+
+    def append_order_event(self, event: OrderEvent) -> None:
+        self._append("order", _order_event_row(event))
+
+    def save_state_snapshot(self, snapshot: PositionSnapshot) -> None:
+        self._append("snapshot", _position_snapshot_row(snapshot))
+
+    def existing_execution_ids(self, execution_ids: Sequence[str]) -> set[str]:
+        self.require_drained()
+        with self.connections.writer() as repo:
+            return repo.existing_execution_ids(execution_ids)
+
+    def append_execution_events(self, events: Sequence[ExecutionEvent]) -> list[bool]:
+        self.require_drained()
+        with self.connections.writer() as repo:
+            return repo.append_execution_events(events)
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._buffer)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "pending": len(self._buffer),
+                "appended": self._appended_seq,
+                "drained": self._drained_seq,
+                "drainFailures": self._drain_failures,
+                "stalled": self._consecutive_drain_failures > 0,
+                "deadLettered": self._dead_lettered,
+                "recovered": self.recovered_count,
+            }
+
+    def require_drained(self, timeout: float = DEFAULT_FLUSH_TIMEOUT_SECONDS) -> None:
+        if not self.flush(timeout=timeout):
+            with self._cond:
+                pending = len(self._buffer)
+                failures = self._consecutive_drain_failures
+            raise PrpJournalStalledError(
+                f"PRP write-behind journal did not drain within {timeout}s: pending={pending} consecutive_failures={failures}"
+            )
+
+    def flush(self, timeout: float | None = DEFAULT_FLUSH_TIMEOUT_SECONDS) -> bool:
+        with self._cond:
+            target = self._appended_seq
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._drained_seq >= target or self._closed, timeout=timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        self.flush(timeout=timeout)
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+        with self._cond:
+            self._file.close()
+
+    def _append(self, kind: str, row: tuple) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("PRP write-behind journal is closed")
+            self._cond.wait_for(lambda: len(self._buffer) < self._capacity or self._closed)
+            seq = self._appended_seq + 1
+            self._file.write(_encode_record(seq, kind, row))
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            self._appended_seq = seq
+            self._buffer.append((seq, kind, row))
+            if len(self._buffer) >= self._batch_size:
+                self._cond.notify_all()
+
+    def _drain_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: bool(self._buffer) or self._closed, timeout=self._flush_interval_seconds)
+                if not self._buffer:
+                    if self._closed:
+                        return
+                    continue
+                batch = [self._buffer.popleft() for _ in range(min(self._batch_size, len(self._buffer)))]
+            try:
+                with self.connections.writer() as repo:
+                    repo.write_journal_rows([(kind, row) for _, kind, row in batch])
+            except Exception as exc:
+                self._logger.exception("PRP write-behind drain failed: batch=%s", len(batch))
+                with self._cond:
+                    self._drain_failures += 1
+                    self._consecutive_drain_failures += 1
+                    attempts = self._consecutive_drain_failures
+                if isinstance(exc, sqlite3.OperationalError) and attempts < self._max_drain_attempts:
+                    with self._cond:
+                        self._buffer.extendleft(reversed(batch))
+                        if self._closed:
+                            return
+                        self._cond.wait(timeout=min(self._flush_interval_seconds * 2 ** (attempts - 1), _MAX_RETRY_DELAY_SECONDS))
+                    continue
+                remaining = self._isolate_batch(batch, final=attempts >= self._max_drain_attempts)
+                if remaining:
+                    with self._cond:
+                        self._buffer.extendleft(reversed(remaining))
+                        if self._closed:
+                            return
+                        self._cond.wait(timeout=_MAX_RETRY_DELAY_SECONDS)
+                    continue
+            with self._cond:
+                self._consecutive_drain_failures = 0
+                self._drained_seq = batch[-1][0]
+                self._compact_locked()
+                self._cond.notify_all()
+
+    def _isolate_batch(self, batch: list[tuple[int, str, tuple]], *, final: bool) -> list[tuple[int, str, tuple]]:
+        dead: list[tuple[int, str, tuple, str]] = []
+        for index, (seq, kind, row) in enumerate(batch):
+            try:
+                with self.connections.writer() as repo:
+                    repo.write_journal_rows([(kind, row)])
+            except sqlite3.OperationalError as exc:
+                if not final:
+                    self._write_dead_letters(dead)
+                    return batch[index:]
+                dead.append((seq, kind, row, repr(exc)))
+            except Exception as exc:
+                dead.append((seq, kind, row, repr(exc)))
+        self._write_dead_letters(dead)
+        return []
+
+    def _write_dead_letters(self, dead: list[tuple[int, str, tuple, str]]) -> None:
+        if not dead:
+            return
+        with open(self.dead_letter_path, "a", encoding="utf-8") as file:
+            for seq, kind, row, error in dead:
+                record = {"seq": seq, "schema": SCHEMA_VERSION, "kind": kind, "row": list(row), "error": error}
+                file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        with self._cond:
+            self._dead_lettered += len(dead)
+        self._logger.error(
+            "PRP write-behind rows moved to dead-letter file: path=%s count=%s seqs=%s",
+            self.dead_letter_path,
+            len(dead),
+            [seq for seq, _, _, _ in dead],
+        )
+
+    def _compact_locked(self) -> None:
+        if not self._buffer:
+            if self._drained_seq == self._appended_seq:
+                self._file.seek(0)
+                self._file.truncate()
+            return
+        if self._file.tell() < self._compact_bytes:
+            return
+        pending_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with open(pending_path, "w", encoding="utf-8") as file:
+            for seq, kind, row in self._buffer:
+                file.write(_encode_record(seq, kind, row))
+            file.flush()
+            if self._fsync:
+                os.fsync(file.fileno())
+        self._file.close()
+        os.replace(pending_path, self.journal_path)
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+
+    def _recover(self) -> int:
+        if not self.journal_path.exists():
+            return 0
+        entries: list[tuple[int, str, tuple]] = []
+        skipped = 0
+        with open(self.journal_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    kind = str(record["kind"])
+                    row = tuple(record["row"])
+                    if record.get("schema", 1) < SCHEMA_VERSION:
+                        row = _upgrade_legacy_row(kind, row)
+                    entries.append((int(record.get("seq", 0)), kind, row))
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1
+        if entries:
+            try:
+                with self.connections.writer() as repo:
+                    repo.write_journal_rows([(kind, row) for _, kind, row in entries])
+            except Exception:
+                self._logger.exception("PRP journal replay failed; isolating rows: path=%s", self.journal_path)
+                self._isolate_batch(entries, final=True)
+            self._logger.warning(
+                "Replayed PRP write-behind journal: path=%s records=%s skipped=%s",
+                self.journal_path,
+                len(entries),
+                skipped,
+            )
+        elif skipped:
+            self._logger.warning("Skipped unreadable PRP journal records: path=%s count=%s", self.journal_path, skipped)
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        return len(entries)
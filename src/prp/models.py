@@ -94,3 +94,30 @@ class DailyReport:
     total_net_pnl: Decimal
     total_return_rate: Decimal
     generated_at: datetime
+
+
+@dataclass(frozen=True)
+class RangeReportDay:
+    trading_date: date
+    net_pnl: Decimal
+    cumulative_net_pnl: Decimal
+    drawdown: Decimal
+
+
+@dataclass(frozen=True)
+class RangeReport:
+    from_date: date
+    to_date: date
+    trading_days: int
+    total_buy_amount: Decimal
+    total_sell_amount: Decimal
+    total_sell_tax: Decimal
+    total_sell_fee: Decimal
+    total_net_pnl: Decimal
+    total_return_rate: Decimal
+    trade_count: int
+    win_count: int
+    win_rate: Decimal
+    average_return_rate: Decimal
+    max_drawdown: Decimal
+    days: tuple[RangeReportDay, ...]
@@ -56,7 +56,64 @@ def calc_trade_detail(buy_price: Decimal, sell_price: Decimal, quantity: int) ->
     return buy_amount, sell_amount, sell_tax, sell_fee, net_pnl, return_rate
 
 
-def build_trade_details(executions: list[ExecutionEvent]) -> list[TradeDetail]:
+def match_sell_execution(event: ExecutionEvent, queue: deque[dict[str, object]]) -> list[TradeDetail]:
+    remaining_sell_qty = event.execution_qty
+    trade_details: list[TradeDetail] = []
+    part = 0
+
+    while remaining_sell_qty > 0 and queue:
+        buy_lot = queue[0]
+        buy_remaining = int(buy_lot["remaining_qty"])
+        matched_qty = min(buy_remaining, remaining_sell_qty)
+        buy_price = Decimal(str(buy_lot["price"]))
+        buy_time = buy_lot["occurred_at"]
+
+        buy_amount, sell_amount, sell_tax, sell_fee, net_pnl, return_rate = calc_trade_detail(
+            buy_price=buy_price,
+            sell_price=event.execution_price,
+            quantity=matched_qty,
+        )
+        detail_id = f"{event.execution_id}-{part}"
+        trade_details.append(
+            TradeDetail(
+                id=detail_id,
+                trading_date=event.trading_date,
+                symbol=event.symbol,
+                buy_executed_at=buy_time,
+                sell_executed_at=event.occurred_at,
+                quantity=matched_qty,
+                buy_price=buy_price,
+                sell_price=event.execution_price,
+                buy_amount=buy_amount,
+                sell_amount=sell_amount,
+                sell_tax=sell_tax,
+                sell_fee=sell_fee,
+                net_pnl=net_pnl,
+                return_rate=return_rate,
+            )
+        )
+
+        buy_lot["remaining_qty"] = buy_remaining - matched_qty
+        if int(buy_lot["remaining_qty"]) <= 0:
+            queue.popleft()
+
+        remaining_sell_qty -= matched_qty
+        part += 1
+
+    return trade_details
+
+
+def buy_lot_from_execution(event: ExecutionEvent) -> dict[str, object]:
+    return {
+        "execution_id": event.execution_id,
+        "event_id": event.event_id,
+        "occurred_at": event.occurred_at,
+        "price": event.execution_price,
+        "remaining_qty": event.execution_qty,
+    }
+
+
+def replay_fifo(executions: list[ExecutionEvent]) -> tuple[list[TradeDetail], dict[str, deque[dict[str, object]]]]:
     sorted_events = sorted(executions, key=lambda event: (event.occurred_at, event.event_id))
     buy_queues: dict[str, deque[dict[str, object]]] = defaultdict(deque)
     trade_details: list[TradeDetail] = []
@@ -64,70 +121,28 @@ def build_trade_details(executions: list[ExecutionEvent]) -> list[TradeDetail]:
     for event in sorted_events:
         side = event.side.upper()
         if side == "BUY":
-            buy_queues[event.symbol].append(
-                {
-                    "occurred_at": event.occurred_at,
-                    "price": event.execution_price,
-                    "remaining_qty": event.execution_qty,
-                }
-            )
-            continue
+            buy_queues[event.symbol].append(buy_lot_from_execution(event))
+        elif side == "SELL":
+            trade_details.extend(match_sell_execution(event, buy_queues[event.symbol]))
 
-        if side != "SELL":
-            continue
+    return trade_details, buy_queues
 
-        remaining_sell_qty = event.execution_qty
-        queue = buy_queues[event.symbol]
-        part = 0
 
-        while remaining_sell_qty > 0 and queue:
-            buy_lot = queue[0]
-            buy_remaining = int(buy_lot["remaining_qty"])
-            matched_qty = min(buy_remaining, remaining_sell_qty)
-            buy_price = Decimal(str(buy_lot["price"]))
-            buy_time = buy_lot["occurred_at"]
-
-            buy_amount, sell_amount, sell_tax, sell_fee, net_pnl, return_rate = calc_trade_detail(
-                buy_price=buy_price,
-                sell_price=event.execution_price,
-                quantity=matched_qty,
-            )
-            detail_id = f"{event.execution_id}-{part}"
-            trade_details.append(
-                TradeDetail(
-                    id=detail_id,
-                    trading_date=event.trading_date,
-                    symbol=event.symbol,
-                    buy_executed_at=buy_time,
-                    sell_executed_at=event.occurred_at,
-                    quantity=matched_qty,
-                    buy_price=buy_price,
-                    sell_price=event.execution_price,
-                    buy_amount=buy_amount,
-                    sell_amount=sell_amount,
-                    sell_tax=sell_tax,
-                    sell_fee=sell_fee,
-                    net_pnl=net_pnl,
-                    return_rate=return_rate,
-                )
-            )
-
-            buy_lot["remaining_qty"] = buy_remaining - matched_qty
-            if int(buy_lot["remaining_qty"]) <= 0:
-                queue.popleft()
-
-            remaining_sell_qty -= matched_qty
-            part += 1
-
-    return trade_details
+def build_trade_details(executions: list[ExecutionEvent]) -> list[TradeDetail]:
+    return replay_fifo(executions)[0]
 
 
-def aggregate_daily_report(trade_details: list[TradeDetail], trading_date) -> DailyReport:
-    total_buy_amount = q_amount(sum((detail.buy_amount for detail in trade_details), Decimal("0")))
-    total_sell_amount = q_amount(sum((detail.sell_amount for detail in trade_details), Decimal("0")))
-    total_sell_tax = q_amount(sum((detail.sell_tax for detail in trade_details), Decimal("0")))
-    total_sell_fee = q_amount(sum((detail.sell_fee for detail in trade_details), Decimal("0")))
-    total_net_pnl = q_amount(sum((detail.net_pnl for detail in trade_details), Decimal("0")))
+def aggregate_daily_report(
+    trade_details: list[TradeDetail],
+    trading_date,
+    base: DailyReport | None = None,
+) -> DailyReport:
+    zero = Decimal("0")
+    total_buy_amount = q_amount(sum((detail.buy_amount for detail in trade_details), base.total_buy_amount if base else zero))
+    total_sell_amount = q_amount(sum((detail.sell_amount for detail in trade_details), base.total_sell_amount if base else zero))
+    total_sell_tax = q_amount(sum((detail.sell_tax for detail in trade_details), base.total_sell_tax if base else zero))
+    total_sell_fee = q_amount(sum((detail.sell_fee for detail in trade_details), base.total_sell_fee if base else zero))
+    total_net_pnl = q_amount(sum((detail.net_pnl for detail in trade_details), base.total_net_pnl if base else zero))
 
     if total_buy_amount == Decimal("0"):
         total_return_rate = Decimal("0.0000")
@@ -147,6 +162,6 @@ def aggregate_daily_report(trade_details: list[TradeDetail], trading_date) -> Da
 
 
 def generate_daily_report(executions: list[ExecutionEvent], trading_date) -> tuple[list[TradeDetail], DailyReport]:
-    details = build_trade_details([event for event in executions if event.trading_date == trading_date])
+    details, _ = replay_fifo([event for event in executions if event.trading_date == trading_date])
     report = aggregate_daily_report(details, trading_date)
     return details, report
@@ -2,21 +2,233 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from datetime import date, datetime
+from collections import deque
+from contextlib import contextmanager
+from datetime import date
 from decimal import Decimal
+from typing import Iterator, Sequence
 
 from .bootstrap import initialize_database
-from .models import DailyReport, ExecutionEvent, OrderEvent, PositionSnapshot, StrategyEvent, TradeDetail
-from .reporting import generate_daily_report
+from .codec import (
+    PRICE_SCALE_DIGITS,
+    decode_decimal,
+    decode_optional_decimal,
+    decode_timestamp,
+    encode_decimal,
+    encode_optional_decimal,
+    encode_timestamp,
+)
+from .models import (
+    DailyReport,
+    ExecutionEvent,
+    OrderEvent,
+    PositionSnapshot,
+    RangeReport,
+    RangeReportDay,
+    StrategyEvent,
+    TradeDetail,
+)
+from .reporting import (
+    aggregate_daily_report,
+    buy_lot_from_execution,
+    calc_return_rate,
+    match_sell_execution,
+    q_amount,
+    q_return,
+    replay_fifo,
+)
 
 
-def _to_decimal(value) -> Decimal:
-    return Decimal(str(value))
+_INSERT_STRATEGY_EVENT_SQL = """
+    INSERT INTO strategy_events(
+        event_id, trading_date, occurred_at, symbol, event_type,
+        base_price, local_low, current_price, payload_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_ORDER_EVENT_SQL = """
+    INSERT INTO order_events(
+        event_id, order_id, trading_date, occurred_at, symbol, side,
+        order_type, order_price, quantity, status, client_order_key,
+        reason_code, reason_message
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_EXECUTION_EVENT_SQL = """
+    INSERT INTO execution_events(
+        event_id, execution_id, order_id, trading_date, occurred_at,
+        symbol, side, execution_price, execution_qty, cum_qty, remaining_qty
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_POSITION_SNAPSHOT_SQL = """
+    INSERT INTO position_snapshots(
+        snapshot_id, saved_at, trading_date, symbol, avg_buy_price, quantity,
+        current_profit_rate, max_profit_rate, min_profit_locked, last_order_id, state_version
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+_INSERT_TRADE_DETAIL_SQL = """
+    INSERT INTO trade_details(
+        id, trading_date, symbol, buy_executed_at, sell_executed_at,
+        quantity, buy_price, sell_price, buy_amount, sell_amount,
+        sell_tax, sell_fee, net_pnl, return_rate
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_OPEN_LOT_SQL = """
+    INSERT OR REPLACE INTO report_open_lots(
+        trading_date, symbol, execution_id, event_id, occurred_at, price, remaining_qty
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_RANGE_SERIES_SQL = """
+    WITH series AS (
+        SELECT trading_date, total_net_pnl,
+               SUM(total_net_pnl) OVER (ORDER BY trading_date ROWS UNBOUNDED PRECEDING) AS cumulative_net_pnl
+        FROM daily_reports
+        WHERE trading_date BETWEEN ? AND ?
+    ),
+    drawdowns AS (
+        SELECT trading_date, total_net_pnl, cumulative_net_pnl,
+               cumulative_net_pnl - MAX(0, MAX(cumulative_net_pnl) OVER (ORDER BY trading_date ROWS UNBOUNDED PRECEDING))
+                   AS drawdown
+        FROM series
+    )
+    SELECT trading_date, total_net_pnl, cumulative_net_pnl, drawdown
+    FROM drawdowns
+    ORDER BY trading_date ASC
+"""
+
+_RANGE_TOTALS_SQL = """
+    SELECT COUNT(*) AS trading_days,
+           COALESCE(SUM(total_buy_amount), 0) AS total_buy_amount,
+           COALESCE(SUM(total_sell_amount), 0) AS total_sell_amount,
+           COALESCE(SUM(total_sell_tax), 0) AS total_sell_tax,
+           COALESCE(SUM(total_sell_fee), 0) AS total_sell_fee,
+           COALESCE(SUM(total_net_pnl), 0) AS total_net_pnl
+    FROM daily_reports
+    WHERE trading_date BETWEEN ? AND ?
+"""
+
+_RANGE_TRADE_STATS_SQL = """
+    SELECT COUNT(*) AS trade_count,
+           COALESCE(SUM(CASE WHEN net_pnl > 0 THEN 1 ELSE 0 END), 0) AS win_count,
+           COALESCE(AVG(return_rate), 0) AS average_return_rate
+    FROM trade_details
+    WHERE trading_date BETWEEN ? AND ?
+"""
+
+_JOURNAL_INSERT_SQL = {
+    "strategy": _INSERT_STRATEGY_EVENT_SQL,
+    "order": _INSERT_ORDER_EVENT_SQL,
+    "snapshot": _INSERT_POSITION_SNAPSHOT_SQL,
+}
+
+
+def _strategy_event_row(event: StrategyEvent) -> tuple:
+    payload_json = None
+    if event.payload is not None:
+        payload_json = json.dumps(event.payload, ensure_ascii=False, separators=(",", ":"))
+    return (
+        event.event_id,
+        event.trading_date.isoformat(),
+        encode_timestamp(event.occurred_at),
+        event.symbol,
+        event.event_type,
+        encode_optional_decimal(event.base_price),
+        encode_optional_decimal(event.local_low),
+        encode_optional_decimal(event.current_price),
+        payload_json,
+    )
+
+
+def _order_event_row(event: OrderEvent) -> tuple:
+    return (
+        event.event_id,
+        event.order_id,
+        event.trading_date.isoformat(),
+        encode_timestamp(event.occurred_at),
+        event.symbol,
+        event.side,
+        event.order_type,
+        encode_decimal(event.order_price),
+        event.quantity,
+        event.status,
+        event.client_order_key,
+        event.reason_code,
+        event.reason_message,
+    )
+
+
+def _execution_event_row(event: ExecutionEvent) -> tuple:
+    return (
+        event.event_id,
+        event.execution_id,
+        event.order_id,
+        event.trading_date.isoformat(),
+        encode_timestamp(event.occurred_at),
+        event.symbol,
+        event.side,
+        encode_decimal(event.execution_price),
+        event.execution_qty,
+        event.cum_qty,
+        event.remaining_qty,
+    )
+
+
+def _trade_detail_row(detail: TradeDetail) -> tuple:
+    return (
+        detail.id,
+        detail.trading_date.isoformat(),
+        detail.symbol,
+        encode_timestamp(detail.buy_executed_at),
+        encode_timestamp(detail.sell_executed_at),
+        detail.quantity,
+        encode_decimal(detail.buy_price),
+        encode_decimal(detail.sell_price),
+        encode_decimal(detail.buy_amount),
+        encode_decimal(detail.sell_amount),
+        encode_decimal(detail.sell_tax),
+        encode_decimal(detail.sell_fee),
+        encode_decimal(detail.net_pnl),
+        encode_decimal(detail.return_rate),
+    )
+
+
+def _open_lot_row(trading_date: date, symbol: str, lot: dict[str, object]) -> tuple:
+    return (
+        trading_date.isoformat(),
+        symbol,
+        lot["execution_id"],
+        lot["event_id"],
+        encode_timestamp(lot["occurred_at"]),
+        encode_decimal(lot["price"]),
+        int(lot["remaining_qty"]),
+    )
+
+
+def _position_snapshot_row(snapshot: PositionSnapshot) -> tuple:
+    return (
+        snapshot.snapshot_id,
+        encode_timestamp(snapshot.saved_at),
+        snapshot.trading_date.isoformat(),
+        snapshot.symbol,
+        encode_decimal(snapshot.avg_buy_price),
+        snapshot.quantity,
+        encode_decimal(snapshot.current_profit_rate),
+        encode_decimal(snapshot.max_profit_rate),
+        1 if snapshot.min_profit_locked else 0,
+        snapshot.last_order_id,
+        snapshot.state_version,
+    )
 
 
 class PrpRepository:
     def __init__(self, conn: sqlite3.Connection | None = None, db_path: str = "runtime/state/prp.db") -> None:
         self.conn = conn or initialize_database(db_path)
+        self._unit_depth = 0
 
     def close(self) -> None:
         self.conn.close()
@@ -27,110 +239,177 @@ class PrpRepository:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.close()
 
-    def append_strategy_event(self, event: StrategyEvent) -> None:
-        payload_json = None
-        if event.payload is not None:
-            payload_json = json.dumps(event.payload, ensure_ascii=False, separators=(",", ":"))
+    @contextmanager
+    def unit_of_work(self) -> Iterator["PrpRepository"]:
+        self._unit_depth += 1
+        try:
+            if self._unit_depth > 1:
+                yield self
+            else:
+                with self.conn:
+                    yield self
+        finally:
+            self._unit_depth -= 1
 
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        if self._unit_depth:
+            yield self.conn
+            return
         with self.conn:
-            self.conn.execute(
-                """
-                INSERT INTO strategy_events(
-                    event_id, trading_date, occurred_at, symbol, event_type,
-                    base_price, local_low, current_price, payload_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event.event_id,
-                    event.trading_date.isoformat(),
-                    event.occurred_at.isoformat(),
-                    event.symbol,
-                    event.event_type,
-                    str(event.base_price) if event.base_price is not None else None,
-                    str(event.local_low) if event.local_low is not None else None,
-                    str(event.current_price) if event.current_price is not None else None,
-                    payload_json,
-                ),
-            )
+            yield self.conn
+
+    def append_strategy_event(self, event: StrategyEvent) -> None:
+        self.append_strategy_events([event])
+
+    def append_strategy_events(self, events: Sequence[StrategyEvent]) -> None:
+        if not events:
+            return
+        with self._transaction() as conn:
+            conn.executemany(_INSERT_STRATEGY_EVENT_SQL, [_strategy_event_row(event) for event in events])
 
     def append_order_event(self, event: OrderEvent) -> None:
-        with self.conn:
-            self.conn.execute(
-                """
-                INSERT INTO order_events(
-                    event_id, order_id, trading_date, occurred_at, symbol, side,
-                    order_type, order_price, quantity, status, client_order_key,
-                    reason_code, reason_message
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event.event_id,
-                    event.order_id,
-                    event.trading_date.isoformat(),
-                    event.occurred_at.isoformat(),
-                    event.symbol,
-                    event.side,
-                    event.order_type,
-                    str(event.order_price),
-                    event.quantity,
-                    event.status,
-                    event.client_order_key,
-                    event.reason_code,
-                    event.reason_message,
-                ),
-            )
+        self.append_order_events([event])
+
+    def append_order_events(self, events: Sequence[OrderEvent]) -> None:
+        if not events:
+            return
+        with self._transaction() as conn:
+            conn.executemany(_INSERT_ORDER_EVENT_SQL, [_order_event_row(event) for event in events])
 
     def append_execution_event(self, event: ExecutionEvent) -> bool:
         try:
-            with self.conn:
-                self.conn.execute(
-                    """
-                    INSERT INTO execution_events(
-                        event_id, execution_id, order_id, trading_date, occurred_at,
-                        symbol, side, execution_price, execution_qty, cum_qty, remaining_qty
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        event.event_id,
-                        event.execution_id,
-                        event.order_id,
-                        event.trading_date.isoformat(),
-                        event.occurred_at.isoformat(),
-                        event.symbol,
-                        event.side,
-                        str(event.execution_price),
-                        event.execution_qty,
-                        event.cum_qty,
-                        event.remaining_qty,
-                    ),
-                )
+            return self.append_execution_events([event])[0]
         except sqlite3.IntegrityError:
             return False
-        return True
+
+    def append_execution_events(self, events: Sequence[ExecutionEvent]) -> list[bool]:
+        if not events:
+            return []
+        known = self.existing_execution_ids([event.execution_id for event in events])
+        accepted: list[bool] = []
+        fresh: list[ExecutionEvent] = []
+        for event in events:
+            if event.execution_id in known:
+                accepted.append(False)
+                continue
+            known.add(event.execution_id)
+            fresh.append(event)
+            accepted.append(True)
+        if fresh:
+            with self.unit_of_work():
+                self.conn.executemany(_INSERT_EXECUTION_EVENT_SQL, [_execution_event_row(event) for event in fresh])
+                self._apply_executions_to_report(fresh)
+        return accepted
+
+    def _apply_executions_to_report(self, events: Sequence[ExecutionEvent]) -> None:
+        events_by_date: dict[date, list[ExecutionEvent]] = {}
+        for event in events:
+            events_by_date.setdefault(event.trading_date, []).append(event)
+        for trading_date, date_events in events_by_date.items():
+            base = self.load_daily_report(trading_date)
+            if base is None or self._report_lots_missing(trading_date, date_events):
+                self._rebuild_daily_report(trading_date)
+                continue
+            details = self._match_report_executions(date_events)
+            if details:
+                self._upsert_daily_report(aggregate_daily_report(details, trading_date, base=base))
+
+    def _report_lots_missing(self, trading_date: date, events: Sequence[ExecutionEvent]) -> bool:
+        sell_symbols = sorted({event.symbol for event in events if event.side.upper() == "SELL"})
+        if not sell_symbols:
+            return False
+        execution_ids = [event.execution_id for event in events]
+        row = self.conn.execute(
+            f"""
+            SELECT 1 FROM execution_events e
+            WHERE e.trading_date = ?
+              AND UPPER(e.side) = 'BUY'
+              AND e.symbol IN ({",".join("?" for _ in sell_symbols)})
+              AND e.execution_id NOT IN ({",".join("?" for _ in execution_ids)})
+              AND NOT EXISTS (
+                SELECT 1 FROM report_open_lots l WHERE l.trading_date = e.trading_date AND l.symbol = e.symbol
+              )
+            LIMIT 1
+            """,
+            (trading_date.isoformat(), *sell_symbols, *execution_ids),
+        ).fetchone()
+        return row is not None
+
+    def _match_report_executions(self, events: Sequence[ExecutionEvent]) -> list[TradeDetail]:
+        details: list[TradeDetail] = []
+        for event in sorted(events, key=lambda item: (item.occurred_at, item.event_id)):
+            side = event.side.upper()
+            if side == "BUY":
+                self.conn.execute(_INSERT_OPEN_LOT_SQL, _open_lot_row(event.trading_date, event.symbol, buy_lot_from_execution(event)))
+            elif side == "SELL":
+                queue = self._load_open_lots(event.trading_date, event.symbol)
+                before = {str(lot["execution_id"]) for lot in queue}
+                matched = match_sell_execution(event, queue)
+                if not matched:
+                    continue
+                remaining = {str(lot["execution_id"]) for lot in queue}
+                self.conn.executemany(
+                    "DELETE FROM report_open_lots WHERE trading_date = ? AND symbol = ? AND execution_id = ?",
+                    [(event.trading_date.isoformat(), event.symbol, execution_id) for execution_id in before - remaining],
+                )
+                if queue:
+                    self.conn.execute(_INSERT_OPEN_LOT_SQL, _open_lot_row(event.trading_date, event.symbol, queue[0]))
+                self.conn.executemany(_INSERT_TRADE_DETAIL_SQL, [_trade_detail_row(detail) for detail in matched])
+                details.extend(matched)
+        return details
+
+    def _load_open_lots(self, trading_date: date, symbol: str) -> deque[dict[str, object]]:
+        rows = self.conn.execute(
+            """
+            SELECT execution_id, event_id, occurred_at, price, remaining_qty
+            FROM report_open_lots
+            WHERE trading_date = ? AND symbol = ?
+            ORDER BY occurred_at ASC, event_id ASC
+            """,
+            (trading_date.isoformat(), symbol),
+        ).fetchall()
+        return deque(
+            {
+                "execution_id": row["execution_id"],
+                "event_id": row["event_id"],
+                "occurred_at": decode_timestamp(row["occurred_at"]),
+                "price": decode_decimal(row["price"]),
+                "remaining_qty": int(row["remaining_qty"]),
+            }
+            for row in rows
+        )
+
+    def existing_execution_ids(self, execution_ids: Sequence[str]) -> set[str]:
+        if not execution_ids:
+            return set()
+        placeholders = ",".join("?" for _ in execution_ids)
+        rows = self.conn.execute(
+            f"SELECT execution_id FROM execution_events WHERE execution_id IN ({placeholders})",
+            tuple(execution_ids),
+        ).fetchall()
+        return {row[0] for row in rows}
 
     def save_state_snapshot(self, snapshot: PositionSnapshot) -> None:
-        with self.conn:
-            self.conn.execute(
-                """
-                INSERT INTO position_snapshots(
-                    snapshot_id, saved_at, trading_date, symbol, avg_buy_price, quantity,
-                    current_profit_rate, max_profit_rate, min_profit_locked, last_order_id, state_version
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.snapshot_id,
-                    snapshot.saved_at.isoformat(),
-                    snapshot.trading_date.isoformat(),
-                    snapshot.symbol,
-                    str(snapshot.avg_buy_price),
-                    snapshot.quantity,
-                    str(snapshot.current_profit_rate),
-                    str(snapshot.max_profit_rate),
-                    1 if snapshot.min_profit_locked else 0,
-                    snapshot.last_order_id,
-                    snapshot.state_version,
-                ),
-            )
+        self.save_state_snapshots([snapshot])
+
+    def save_state_snapshots(self, snapshots: Sequence[PositionSnapshot]) -> None:
+        if not snapshots:
+            return
+        with self._transaction() as conn:
+            conn.executemany(_INSERT_POSITION_SNAPSHOT_SQL, [_position_snapshot_row(snapshot) for snapshot in snapshots])
+
+    def write_journal_rows(self, entries: Sequence[tuple[str, tuple]]) -> None:
+        if not entries:
+            return
+        grouped: dict[str, list[tuple]] = {}
+        for kind, row in entries:
+            if kind not in _JOURNAL_INSERT_SQL:
+                raise ValueError(f"unknown journal row kind: {kind}")
+            grouped.setdefault(kind, []).append(tuple(row))
+        with self._transaction() as conn:
+            for kind, rows in grouped.items():
+                conn.executemany(_JOURNAL_INSERT_SQL[kind].replace("INSERT INTO", "INSERT OR IGNORE INTO", 1), rows)
 
     def load_latest_state_snapshot(self, trading_date: date) -> PositionSnapshot | None:
         row = self.conn.execute(
@@ -150,13 +429,13 @@ class PrpRepository:
 
         return PositionSnapshot(
             snapshot_id=row["snapshot_id"],
-            saved_at=datetime.fromisoformat(row["saved_at"]),
+            saved_at=decode_timestamp(row["saved_at"]),
             trading_date=date.fromisoformat(row["trading_date"]),
             symbol=row["symbol"],
-            avg_buy_price=_to_decimal(row["avg_buy_price"]),
+            avg_buy_price=decode_decimal(row["avg_buy_price"]),
             quantity=int(row["quantity"]),
-            current_profit_rate=_to_decimal(row["current_profit_rate"]),
-            max_profit_rate=_to_decimal(row["max_profit_rate"]),
+            current_profit_rate=decode_decimal(row["current_profit_rate"]),
+            max_profit_rate=decode_decimal(row["max_profit_rate"]),
             min_profit_locked=bool(row["min_profit_locked"]),
             last_order_id=row["last_order_id"],
             state_version=int(row["state_version"]),
@@ -218,18 +497,79 @@ class PrpRepository:
             result.append(
                 StrategyEvent(
                     event_id=row["event_id"],
-                    occurred_at=datetime.fromisoformat(row["occurred_at"]),
+                    occurred_at=decode_timestamp(row["occurred_at"]),
                     trading_date=date.fromisoformat(row["trading_date"]),
                     symbol=row["symbol"],
                     event_type=row["event_type"],
-                    base_price=_to_decimal(row["base_price"]) if row["base_price"] is not None else None,
-                    local_low=_to_decimal(row["local_low"]) if row["local_low"] is not None else None,
-                    current_price=_to_decimal(row["current_price"]) if row["current_price"] is not None else None,
+                    base_price=decode_optional_decimal(row["base_price"]),
+                    local_low=decode_optional_decimal(row["local_low"]),
+                    current_price=decode_optional_decimal(row["current_price"]),
                     payload=payload,
                 )
             )
         return result
 
+    def last_execution_rowid(self, trading_date: date) -> int:
+        row = self.conn.execute(
+            "SELECT MAX(rowid) FROM execution_events WHERE trading_date = ?",
+            (trading_date.isoformat(),),
+        ).fetchone()
+        return int(row[0] or 0)
+
+    def list_unreported_trading_dates(self, from_date: date, to_date: date) -> list[date]:
+        rows = self.conn.execute(
+            """
+            SELECT DISTINCT trading_date FROM execution_events
+            WHERE trading_date BETWEEN ? AND ?
+              AND trading_date NOT IN (SELECT trading_date FROM daily_reports WHERE trading_date BETWEEN ? AND ?)
+            ORDER BY trading_date ASC
+            """,
+            (from_date.isoformat(), to_date.isoformat(), from_date.isoformat(), to_date.isoformat()),
+        ).fetchall()
+        return [date.fromisoformat(row[0]) for row in rows]
+
+    def load_range_report(self, from_date: date, to_date: date) -> RangeReport:
+        if from_date > to_date:
+            raise ValueError("from_date must be <= to_date")
+        bounds = (from_date.isoformat(), to_date.isoformat())
+        totals = self.conn.execute(_RANGE_TOTALS_SQL, bounds).fetchone()
+        trade_stats = self.conn.execute(_RANGE_TRADE_STATS_SQL, bounds).fetchone()
+        days = tuple(
+            RangeReportDay(
+                trading_date=date.fromisoformat(row["trading_date"]),
+                net_pnl=q_amount(decode_decimal(row["total_net_pnl"])),
+                cumulative_net_pnl=q_amount(decode_decimal(row["cumulative_net_pnl"])),
+                drawdown=q_amount(decode_decimal(row["drawdown"])),
+            )
+            for row in self.conn.execute(_RANGE_SERIES_SQL, bounds)
+        )
+
+        total_buy_amount = q_amount(decode_decimal(totals["total_buy_amount"]))
+        total_net_pnl = q_amount(decode_decimal(totals["total_net_pnl"]))
+        trade_count = int(trade_stats["trade_count"])
+        win_count = int(trade_stats["win_count"])
+        return RangeReport(
+            from_date=from_date,
+            to_date=to_date,
+            trading_days=int(totals["trading_days"]),
+            total_buy_amount=total_buy_amount,
+            total_sell_amount=q_amount(decode_decimal(totals["total_sell_amount"])),
+            total_sell_tax=q_amount(decode_decimal(totals["total_sell_tax"])),
+            total_sell_fee=q_amount(decode_decimal(totals["total_sell_fee"])),
+            total_net_pnl=total_net_pnl,
+            total_return_rate=calc_return_rate(total_net_pnl, total_buy_amount),
+            trade_count=trade_count,
+            win_count=win_count,
+            win_rate=q_return(Decimal(win_count * 100) / Decimal(trade_count)) if trade_count else Decimal("0.0000"),
+            average_return_rate=q_return(Decimal(str(trade_stats["average_return_rate"])).scaleb(-PRICE_SCALE_DIGITS)),
+            max_drawdown=min((day.drawdown for day in days), default=Decimal("0.00")),
+            days=days,
+        )
+
+    def list_execution_trading_dates(self) -> list[date]:
+        rows = self.conn.execute("SELECT DISTINCT trading_date FROM execution_events ORDER BY trading_date ASC").fetchall()
+        return [date.fromisoformat(row[0]) for row in rows]
+
     def _list_executions_for_date(self, trading_date: date) -> list[ExecutionEvent]:
         rows = self.conn.execute(
             """
@@ -250,10 +590,10 @@ class PrpRepository:
                     execution_id=row["execution_id"],
                     order_id=row["order_id"],
                     trading_date=date.fromisoformat(row["trading_date"]),
-                    occurred_at=datetime.fromisoformat(row["occurred_at"]),
+                    occurred_at=decode_timestamp(row["occurred_at"]),
                     symbol=row["symbol"],
                     side=row["side"],
-                    execution_price=_to_decimal(row["execution_price"]),
+                    execution_price=decode_decimal(row["execution_price"]),
                     execution_qty=int(row["execution_qty"]),
                     cum_qty=int(row["cum_qty"]),
                     remaining_qty=int(row["remaining_qty"]),
@@ -261,39 +601,24 @@ class PrpRepository:
             )
         return executions
 
-    def _upsert_trade_details(self, trading_date: date, details: list[TradeDetail]) -> None:
-        with self.conn:
-            self.conn.execute("DELETE FROM trade_details WHERE trading_date = ?", (trading_date.isoformat(),))
-            for detail in details:
-                self.conn.execute(
-                    """
-                    INSERT INTO trade_details(
-                        id, trading_date, symbol, buy_executed_at, sell_executed_at,
-                        quantity, buy_price, sell_price, buy_amount, sell_amount,
-                        sell_tax, sell_fee, net_pnl, return_rate
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        detail.id,
-                        detail.trading_date.isoformat(),
-                        detail.symbol,
-                        detail.buy_executed_at.isoformat(),
-                        detail.sell_executed_at.isoformat(),
-                        detail.quantity,
-                        str(detail.buy_price),
-                        str(detail.sell_price),
-                        str(detail.buy_amount),
-                        str(detail.sell_amount),
-                        str(detail.sell_tax),
-                        str(detail.sell_fee),
-                        str(detail.net_pnl),
-                        str(detail.return_rate),
-                    ),
-                )
+    def _replace_report_state(
+        self,
+        trading_date: date,
+        details: list[TradeDetail],
+        open_lots: dict[str, deque[dict[str, object]]],
+    ) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM trade_details WHERE trading_date = ?", (trading_date.isoformat(),))
+            conn.execute("DELETE FROM report_open_lots WHERE trading_date = ?", (trading_date.isoformat(),))
+            conn.executemany(_INSERT_TRADE_DETAIL_SQL, [_trade_detail_row(detail) for detail in details])
+            conn.executemany(
+                _INSERT_OPEN_LOT_SQL,
+                [_open_lot_row(trading_date, symbol, lot) for symbol, queue in open_lots.items() for lot in queue],
+            )
 
     def _upsert_daily_report(self, report: DailyReport) -> None:
-        with self.conn:
-            self.conn.execute(
+        with self._transaction() as conn:
+            conn.execute(
                 """
                 INSERT INTO daily_reports(
                     trading_date, total_buy_amount, total_sell_amount, total_sell_tax,
@@ -310,23 +635,51 @@ class PrpRepository:
                 """,
                 (
                     report.trading_date.isoformat(),
-                    str(report.total_buy_amount),
-                    str(report.total_sell_amount),
-                    str(report.total_sell_tax),
-                    str(report.total_sell_fee),
-                    str(report.total_net_pnl),
-                    str(report.total_return_rate),
-                    report.generated_at.isoformat(),
+                    encode_decimal(report.total_buy_amount),
+                    encode_decimal(report.total_sell_amount),
+                    encode_decimal(report.total_sell_tax),
+                    encode_decimal(report.total_sell_fee),
+                    encode_decimal(report.total_net_pnl),
+                    encode_decimal(report.total_return_rate),
+                    encode_timestamp(report.generated_at),
                 ),
             )
 
     def generate_daily_report(self, trading_date: date) -> DailyReport:
+        with self.unit_of_work():
+            return self._rebuild_daily_report(trading_date)
+
+    def _rebuild_daily_report(self, trading_date: date) -> DailyReport:
         executions = self._list_executions_for_date(trading_date)
-        details, report = generate_daily_report(executions, trading_date)
-        self._upsert_trade_details(trading_date, details)
+        details, open_lots = replay_fifo(executions)
+        report = aggregate_daily_report(details, trading_date)
+        self._replace_report_state(trading_date, details, open_lots)
         self._upsert_daily_report(report)
         return report
 
+    def load_daily_report(self, trading_date: date) -> DailyReport | None:
+        row = self.conn.execute(
+            """
+            SELECT trading_date, total_buy_amount, total_sell_amount, total_sell_tax,
+                   total_sell_fee, total_net_pnl, total_return_rate, generated_at
+            FROM daily_reports
+            WHERE trading_date = ?
+            """,
+            (trading_date.isoformat(),),
+        ).fetchone()
+        if row is None:
+            return None
+        return DailyReport(
+            trading_date=date.fromisoformat(row["trading_date"]),
+            total_buy_amount=decode_decimal(row["total_buy_amount"]),
+            total_sell_amount=decode_decimal(row["total_sell_amount"]),
+            total_sell_tax=decode_decimal(row["total_sell_tax"]),
+            total_sell_fee=decode_decimal(row["total_sell_fee"]),
+            total_net_pnl=decode_decimal(row["total_net_pnl"]),
+            total_return_rate=decode_decimal(row["total_return_rate"]),
+            generated_at=decode_timestamp(row["generated_at"]),
+        )
+
     def list_trade_details(self, trading_date: date, symbol: str | None = None) -> list[TradeDetail]:
         if symbol:
             rows = self.conn.execute(
@@ -360,17 +713,17 @@ class PrpRepository:
                     id=row["id"],
                     trading_date=date.fromisoformat(row["trading_date"]),
                     symbol=row["symbol"],
-                    buy_executed_at=datetime.fromisoformat(row["buy_executed_at"]),
-                    sell_executed_at=datetime.fromisoformat(row["sell_executed_at"]),
+                    buy_executed_at=decode_timestamp(row["buy_executed_at"]),
+                    sell_executed_at=decode_timestamp(row["sell_executed_at"]),
                     quantity=int(row["quantity"]),
-                    buy_price=_to_decimal(row["buy_price"]),
-                    sell_price=_to_decimal(row["sell_price"]),
-                    buy_amount=_to_decimal(row["buy_amount"]),
-                    sell_amount=_to_decimal(row["sell_amount"]),
-                    sell_tax=_to_decimal(row["sell_tax"]),
-                    sell_fee=_to_decimal(row["sell_fee"]),
-                    net_pnl=_to_decimal(row["net_pnl"]),
-                    return_rate=_to_decimal(row["return_rate"]),
+                    buy_price=decode_decimal(row["buy_price"]),
+                    sell_price=decode_decimal(row["sell_price"]),
+                    buy_amount=decode_decimal(row["buy_amount"]),
+                    sell_amount=decode_decimal(row["sell_amount"]),
+                    sell_tax=decode_decimal(row["sell_tax"]),
+                    sell_fee=decode_decimal(row["sell_fee"]),
+                    net_pnl=decode_decimal(row["net_pnl"]),
+                    return_rate=decode_decimal(row["return_rate"]),
                 )
             )
         return result
@@ -1,4 +1,4 @@
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
 
 SCHEMA_SQL = """
 PRAGMA foreign_keys = ON;
@@ -11,12 +11,12 @@ CREATE TABLE IF NOT EXISTS schema_version (
 CREATE TABLE IF NOT EXISTS strategy_events (
   event_id TEXT PRIMARY KEY,
   trading_date TEXT NOT NULL,
-  occurred_at TEXT NOT NULL,
+  occurred_at INTEGER NOT NULL,
   symbol TEXT NOT NULL,
   event_type TEXT NOT NULL,
-  base_price NUMERIC NULL,
-  local_low NUMERIC NULL,
-  current_price NUMERIC NULL,
+  base_price INTEGER NULL,
+  local_low INTEGER NULL,
+  current_price INTEGER NULL,
   payload_json TEXT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_strategy_events_date_symbol
@@ -26,11 +26,11 @@ CREATE TABLE IF NOT EXISTS order_events (
   event_id TEXT PRIMARY KEY,
   order_id TEXT NOT NULL,
   trading_date TEXT NOT NULL,
-  occurred_at TEXT NOT NULL,
+  occurred_at INTEGER NOT NULL,
   symbol TEXT NOT NULL,
   side TEXT NOT NULL,
   order_type TEXT NOT NULL,
-  order_price NUMERIC NOT NULL,
+  order_price INTEGER NOT NULL,
   quantity INTEGER NOT NULL,
   status TEXT NOT NULL,
   client_order_key TEXT NOT NULL,
@@ -44,24 +44,26 @@ CREATE TABLE IF NOT EXISTS execution_events (
   execution_id TEXT NOT NULL UNIQUE,
   order_id TEXT NOT NULL,
   trading_date TEXT NOT NULL,
-  occurred_at TEXT NOT NULL,
+  occurred_at INTEGER NOT NULL,
   symbol TEXT NOT NULL,
   side TEXT NOT NULL,
-  execution_price NUMERIC NOT NULL,
+  execution_price INTEGER NOT NULL,
   execution_qty INTEGER NOT NULL,
   cum_qty INTEGER NOT NULL,
   remaining_qty INTEGER NOT NULL
 );
+CREATE INDEX IF NOT EXISTS idx_execution_events_date
+ON execution_events(trading_date);
 
 CREATE TABLE IF NOT EXISTS position_snapshots (
   snapshot_id TEXT PRIMARY KEY,
-  saved_at TEXT NOT NULL,
+  saved_at INTEGER NOT NULL,
   trading_date TEXT NOT NULL,
   symbol TEXT NOT NULL,
-  avg_buy_price NUMERIC NOT NULL,
+  avg_buy_price INTEGER NOT NULL,
   quantity INTEGER NOT NULL,
-  current_profit_rate NUMERIC NOT NULL,
-  max_profit_rate NUMERIC NOT NULL,
+  current_profit_rate INTEGER NOT NULL,
+  max_profit_rate INTEGER NOT NULL,
   min_profit_locked INTEGER NOT NULL,
   last_order_id TEXT NULL,
   state_version INTEGER NOT NULL
@@ -71,31 +73,73 @@ ON position_snapshots(trading_date, saved_at DESC);
 
 CREATE TABLE IF NOT EXISTS daily_reports (
   trading_date TEXT PRIMARY KEY,
-  total_buy_amount NUMERIC NOT NULL,
-  total_sell_amount NUMERIC NOT NULL,
-  total_sell_tax NUMERIC NOT NULL,
-  total_sell_fee NUMERIC NOT NULL,
-  total_net_pnl NUMERIC NOT NULL,
-  total_return_rate NUMERIC NOT NULL,
-  generated_at TEXT NOT NULL
+  total_buy_amount INTEGER NOT NULL,
+  total_sell_amount INTEGER NOT NULL,
+  total_sell_tax INTEGER NOT NULL,
+  total_sell_fee INTEGER NOT NULL,
+  total_net_pnl INTEGER NOT NULL,
+  total_return_rate INTEGER NOT NULL,
+  generated_at INTEGER NOT NULL
 );
+CREATE INDEX IF NOT EXISTS idx_daily_reports_range
+ON daily_reports(trading_date, total_net_pnl, total_buy_amount, total_sell_amount, total_sell_tax, total_sell_fee);
 
 CREATE TABLE IF NOT EXISTS trade_details (
   id TEXT PRIMARY KEY,
   trading_date TEXT NOT NULL,
   symbol TEXT NOT NULL,
-  buy_executed_at TEXT NOT NULL,
-  sell_executed_at TEXT NOT NULL,
+  buy_executed_at INTEGER NOT NULL,
+  sell_executed_at INTEGER NOT NULL,
   quantity INTEGER NOT NULL,
-  buy_price NUMERIC NOT NULL,
-  sell_price NUMERIC NOT NULL,
-  buy_amount NUMERIC NOT NULL,
-  sell_amount NUMERIC NOT NULL,
-  sell_tax NUMERIC NOT NULL,
-  sell_fee NUMERIC NOT NULL,
-  net_pnl NUMERIC NOT NULL,
-  return_rate NUMERIC NOT NULL
+  buy_price INTEGER NOT NULL,
+  sell_price INTEGER NOT NULL,
+  buy_amount INTEGER NOT NULL,
+  sell_amount INTEGER NOT NULL,
+  sell_tax INTEGER NOT NULL,
+  sell_fee INTEGER NOT NULL,
+  net_pnl INTEGER NOT NULL,
+  return_rate INTEGER NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_trade_details_date_symbol
 ON trade_details(trading_date, symbol);
+CREATE INDEX IF NOT EXISTS idx_trade_details_date_pnl
+ON trade_details(trading_date, net_pnl, return_rate);
+
+CREATE TABLE IF NOT EXISTS report_open_lots (
+  trading_date TEXT NOT NULL,
+  symbol TEXT NOT NULL,
+  execution_id TEXT NOT NULL,
+  event_id TEXT NOT NULL,
+  occurred_at INTEGER NOT NULL,
+  price INTEGER NOT NULL,
+  remaining_qty INTEGER NOT NULL,
+  PRIMARY KEY (trading_date, symbol, execution_id)
+);
 """
+
+SCALED_DECIMAL_COLUMNS: dict[str, tuple[str, ...]] = {
+    "strategy_events": ("base_price", "local_low", "current_price"),
+    "order_events": ("order_price",),
+    "execution_events": ("execution_price",),
+    "position_snapshots": ("avg_buy_price", "current_profit_rate", "max_profit_rate"),
+    "daily_reports": (
+        "total_buy_amount",
+        "total_sell_amount",
+        "total_sell_tax",
+        "total_sell_fee",
+        "total_net_pnl",
+        "total_return_rate",
+    ),
+    "trade_details": ("buy_price", "sell_price", "buy_amount", "sell_amount", "sell_tax", "sell_fee", "net_pnl", "return_rate"),
+    "report_open_lots": ("price",),
+}
+
+EPOCH_MICROS_COLUMNS: dict[str, tuple[str, ...]] = {
+    "strategy_events": ("occurred_at",),
+    "order_events": ("occurred_at",),
+    "execution_events": ("occurred_at",),
+    "position_snapshots": ("saved_at",),
+    "daily_reports": ("generated_at",),
+    "trade_details": ("buy_executed_at", "sell_executed_at"),
+    "report_open_lots": ("occurred_at",),
+}
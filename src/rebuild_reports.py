@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from datetime import date
+
+from prp.bootstrap import initialize_database
+from prp.repository import PrpRepository
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild PRP trade details and daily reports from execution events.")
+    parser.add_argument("--db", default="runtime/state/prp.db")
+    parser.add_argument("--date", action="append", default=[], type=date.fromisoformat, dest="dates")
+    parser.add_argument("--all", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    logger = logging.getLogger("privatetrade.rebuild_reports")
+
+    with PrpRepository(conn=initialize_database(args.db)) as repo:
+        trading_dates = list(args.dates)
+        if args.all:
+            trading_dates.extend(repo.list_execution_trading_dates())
+        if not trading_dates:
+            parser.error("pass --date YYYY-MM-DD or --all")
+        for trading_date in sorted(set(trading_dates)):
+            report = repo.generate_daily_report(trading_date)
+            logger.info(
+                "Rebuilt daily report: trading_date=%s trades=%s total_net_pnl=%s",
+                trading_date.isoformat(),
+                len(repo.list_trade_details(trading_date)),
+                report.total_net_pnl,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,7 @@ from .constants import (
     MAX_WATCH_SYMBOLS,
     MIN_PROFIT_LOCK_PCT,
     PROFIT_PRESERVATION_SELL_PCT,
+    QUOTE_BATCH_MAX_SYMBOLS,
     REBOUND_THRESHOLD_PCT,
     REFERENCE_CAPTURE_TIME,
 )
@@ -16,10 +17,17 @@ from .models import (
     QuoteEvent,
     ServiceOutput,
     StrategyEvent,
+    StrategyParams,
     SymbolContext,
 )
 from .opm_bridge import map_opm_position_event
-from .quote_monitoring import QuoteCycleResult, QuoteMonitoringConfig, QuoteMonitoringLoop
+from .quote_monitoring import (
+    AsyncQuoteMonitoringLoop,
+    QuoteCycleResult,
+    QuoteMonitoringConfig,
+    QuoteMonitoringLoop,
+    QuoteStreamMonitor,
+)
 from .rules import (
     calc_drop_rate,
     calc_profit_preservation_rate,
@@ -32,6 +40,12 @@ from .rules import (
     should_trigger_rebound_buy,
 )
 from .service import TseService
+from .sharding import (
+    AsyncShardedQuoteMonitoringLoop,
+    ShardedQuoteMonitoringLoop,
+    ShardedTseService,
+    partition_watch_symbols,
+)
 
 __all__ = [
     "DROP_THRESHOLD_PCT",
@@ -39,6 +53,7 @@ __all__ = [
     "MAX_WATCH_SYMBOLS",
     "MIN_PROFIT_LOCK_PCT",
     "PROFIT_PRESERVATION_SELL_PCT",
+    "QUOTE_BATCH_MAX_SYMBOLS",
     "REBOUND_THRESHOLD_PCT",
     "REFERENCE_CAPTURE_TIME",
     "DailyContext",
@@ -49,8 +64,10 @@ __all__ = [
     "QuoteEvent",
     "ServiceOutput",
     "StrategyEvent",
+    "StrategyParams",
     "SymbolContext",
     "TseService",
+    "ShardedTseService",
     "calc_drop_rate",
     "calc_profit_preservation_rate",
     "calc_rebound_rate",
@@ -60,6 +77,11 @@ __all__ = [
     "QuoteMonitoringConfig",
     "QuoteCycleResult",
     "QuoteMonitoringLoop",
+    "AsyncQuoteMonitoringLoop",
+    "QuoteStreamMonitor",
+    "ShardedQuoteMonitoringLoop",
+    "AsyncShardedQuoteMonitoringLoop",
+    "partition_watch_symbols",
     "should_emit_sell_signal",
     "should_enter_buy_candidate",
     "should_lock_min_profit",
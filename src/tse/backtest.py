@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_DOWN
+from itertools import count
+from typing import Any, Iterable, Iterator, Literal
+
+from kia.contracts import MarketQuote
+from opm.models import ExecutionFill, OrderAggregate, PositionModel, create_empty_position
+from opm.service import OpmService
+from prp.models import DailyReport, ExecutionEvent, TradeDetail
+from prp.reporting import calc_trade_detail, generate_daily_report, q_return
+
+from .models import PlaceBuyOrderCommand, PlaceSellOrderCommand, PositionUpdateEvent, QuoteEvent, StrategyParams
+from .service import TseService
+from .tick_log import RecordedPollCycle, TickLogReader
+
+PricePath = Literal["close", "ohlc"]
+
+_OHLC_OFFSETS = (timedelta(seconds=0), timedelta(seconds=20), timedelta(seconds=40), timedelta(seconds=59))
+
+
+@dataclass(frozen=True)
+class MinuteBar:
+    symbol: str
+    at: datetime
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    volume: int = 0
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    budget: Decimal | None = Decimal("10000000")
+    price_path: PricePath = "ohlc"
+    liquidate_at_end: bool = True
+    params: StrategyParams | None = None
+
+
+@dataclass(frozen=True)
+class EquityPoint:
+    at: datetime
+    equity: Decimal
+    drawdown: Decimal
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    trading_date: date
+    trades: list[TradeDetail]
+    report: DailyReport
+    equity_curve: list[EquityPoint]
+    max_drawdown: Decimal
+    commands: list[PlaceBuyOrderCommand | PlaceSellOrderCommand]
+    executions: list[ExecutionEvent]
+    quote_count: int
+
+
+class _SimulatedPrpRepository:
+    def __init__(self) -> None:
+        self.executions: list[ExecutionEvent] = []
+        self._execution_ids: set[str] = set()
+
+    def append_execution_event(self, event: ExecutionEvent) -> bool:
+        if event.execution_id in self._execution_ids:
+            return False
+        self._execution_ids.add(event.execution_id)
+        self.executions.append(event)
+        return True
+
+    def append_execution_events(self, events: list[ExecutionEvent]) -> list[bool]:
+        return [self.append_execution_event(event) for event in events]
+
+    def existing_execution_ids(self, execution_ids: list[str]) -> set[str]:
+        return self._execution_ids.intersection(execution_ids)
+
+    def append_order_event(self, event: Any) -> None:
+        return None
+
+    def save_state_snapshot(self, snapshot: Any) -> None:
+        return None
+
+
+@dataclass
+class _WorkingOrder:
+    command: PlaceBuyOrderCommand | PlaceSellOrderCommand
+    order: OrderAggregate
+
+
+@dataclass
+class _OpenPosition:
+    model: PositionModel
+    max_price: Decimal
+    working_sell: _WorkingOrder | None = None
+    closed: bool = False
+
+
+def bars_to_quotes(bars: Iterable[MinuteBar], *, price_path: PricePath = "ohlc") -> list[MarketQuote]:
+    quotes: list[tuple[datetime, int, MarketQuote]] = []
+    order = 0
+    for bar in bars:
+        if price_path == "close":
+            path: tuple[Decimal, ...] = (bar.close,)
+            offsets: tuple[timedelta, ...] = (_OHLC_OFFSETS[-1],)
+        elif bar.close >= bar.open:
+            path = (bar.open, bar.low, bar.high, bar.close)
+            offsets = _OHLC_OFFSETS
+        else:
+            path = (bar.open, bar.high, bar.low, bar.close)
+            offsets = _OHLC_OFFSETS
+        for price, offset in zip(path, offsets):
+            at = bar.at + offset
+            quotes.append((at, order, MarketQuote(symbol=bar.symbol, price=price, tick_size=1, as_of=at)))
+            order += 1
+    quotes.sort(key=lambda item: (item[0], item[1]))
+    return [quote for _at, _order, quote in quotes]
+
+
+def quotes_from_tick_log(reader: TickLogReader) -> Iterator[MarketQuote]:
+    for recorded in reader:
+        if isinstance(recorded, RecordedPollCycle) and recorded.result is not None:
+            yield from recorded.result.quotes
+
+
+class BacktestEngine:
+    def __init__(
+        self,
+        *,
+        trading_date: date,
+        watch_symbols: list[str],
+        config: BacktestConfig | None = None,
+    ) -> None:
+        self.trading_date = trading_date
+        self.config = config or BacktestConfig()
+        self.tse_service = TseService(trading_date=trading_date, watch_symbols=watch_symbols, params=self.config.params)
+        self._repository = _SimulatedPrpRepository()
+        self._opm = OpmService(self._repository)
+        self._fill_ids = count(1)
+        self._commands: list[PlaceBuyOrderCommand | PlaceSellOrderCommand] = []
+        self._working_buys: dict[str, _WorkingOrder] = {}
+        self._positions: dict[str, _OpenPosition] = {}
+        self._last_prices: dict[str, Decimal] = {}
+        self.tse_service.set_command_listener(self._on_command)
+
+    def run_bars(self, bars: Iterable[MinuteBar]) -> BacktestResult:
+        return self.run_quotes(bars_to_quotes(bars, price_path=self.config.price_path))
+
+    def run_quotes(self, quotes: Iterable[MarketQuote]) -> BacktestResult:
+        equity_curve: list[EquityPoint] = []
+        peak = Decimal("0")
+        realized = Decimal("0")
+        current_minute: datetime | None = None
+        last_at: datetime | None = None
+        quote_count = 0
+
+        for sequence, quote in enumerate(quotes, start=1):
+            minute = quote.as_of.replace(second=0, microsecond=0)
+            if current_minute is not None and minute != current_minute and last_at is not None:
+                peak = self._append_equity(equity_curve, last_at, realized, peak)
+            current_minute = minute
+            last_at = quote.as_of
+            quote_count += 1
+            self._last_prices[quote.symbol] = quote.price
+            realized += self._match_orders(quote)
+            self.tse_service.on_quote(
+                QuoteEvent(
+                    trading_date=self.trading_date,
+                    occurred_at=quote.as_of,
+                    symbol=quote.symbol,
+                    current_price=quote.price,
+                    sequence=sequence,
+                )
+            )
+            self._update_position(quote)
+
+        if last_at is not None:
+            if self.config.liquidate_at_end:
+                realized += self._liquidate(last_at)
+            self._append_equity(equity_curve, last_at, realized, peak)
+
+        trades, report = generate_daily_report(self._repository.executions, self.trading_date)
+        return BacktestResult(
+            trading_date=self.trading_date,
+            trades=trades,
+            report=report,
+            equity_curve=equity_curve,
+            max_drawdown=min((point.drawdown for point in equity_curve), default=Decimal("0")),
+            commands=list(self._commands),
+            executions=list(self._repository.executions),
+            quote_count=quote_count,
+        )
+
+    def _on_command(self, command: PlaceBuyOrderCommand | PlaceSellOrderCommand) -> None:
+        self._commands.append(command)
+        if isinstance(command, PlaceBuyOrderCommand):
+            quantity = self._buy_quantity(command.order_price)
+            if quantity <= 0:
+                return
+            self._working_buys[command.symbol] = _WorkingOrder(command=command, order=self._open_order(command, "BUY", quantity))
+            return
+        position = self._positions.get(command.symbol)
+        if position is None or position.closed or position.working_sell is not None:
+            return
+        position.working_sell = _WorkingOrder(
+            command=command,
+            order=self._open_order(command, "SELL", position.model.quantity),
+        )
+
+    def _open_order(self, command: PlaceBuyOrderCommand | PlaceSellOrderCommand, side: str, quantity: int) -> OrderAggregate:
+        now = self._command_time(command)
+        order = self._opm.create_order(
+            trading_date=command.trading_date,
+            symbol=command.symbol,
+            side=side,
+            requested_price=command.order_price,
+            requested_qty=quantity,
+            now=now,
+            client_order_id=command.command_id,
+        )
+        order = self._opm.move_order_status(order=order, next_status="SUBMITTED", now=now)
+        return self._opm.move_order_status(order=order, next_status="ACCEPTED", now=now, broker_order_id=command.command_id)
+
+    def _command_time(self, command: PlaceBuyOrderCommand | PlaceSellOrderCommand) -> datetime:
+        symbol_ctx = self.tse_service.ctx.symbols.get(command.symbol)
+        if symbol_ctx is not None and symbol_ctx.last_quote_at is not None:
+            return symbol_ctx.last_quote_at
+        return datetime.combine(command.trading_date, datetime.min.time())
+
+    def _buy_quantity(self, order_price: Decimal) -> int:
+        budget = self.config.budget
+        if budget is None:
+            return 1
+        if budget <= 0 or order_price <= 0:
+            return 0
+        return int((budget / order_price).to_integral_value(rounding=ROUND_DOWN))
+
+    def _match_orders(self, quote: MarketQuote) -> Decimal:
+        working_buy = self._working_buys.get(quote.symbol)
+        if working_buy is not None and quote.price <= working_buy.command.order_price:
+            del self._working_buys[quote.symbol]
+            position = _OpenPosition(
+                model=create_empty_position(trading_date=self.trading_date, symbol=quote.symbol, now=quote.as_of),
+                max_price=quote.price,
+            )
+            self._fill(working_buy, position.model, price=quote.price, at=quote.as_of)
+            self._positions[quote.symbol] = position
+            return Decimal("0")
+
+        position = self._positions.get(quote.symbol)
+        if position is None or position.working_sell is None or position.closed:
+            return Decimal("0")
+        if quote.price < position.working_sell.command.order_price:
+            return Decimal("0")
+        return self._close(position, price=quote.price, at=quote.as_of)
+
+    def _close(self, position: _OpenPosition, *, price: Decimal, at: datetime) -> Decimal:
+        working = position.working_sell
+        if working is None:
+            working = _WorkingOrder(
+                command=PlaceSellOrderCommand(
+                    command_id=f"{self.trading_date.isoformat()}-{position.model.symbol}-LIQUIDATE",
+                    trading_date=self.trading_date,
+                    symbol=position.model.symbol,
+                    order_price=price,
+                    reason_code="BACKTEST_END_OF_DAY",
+                ),
+                order=self._opm.create_order(
+                    trading_date=self.trading_date,
+                    symbol=position.model.symbol,
+                    side="SELL",
+                    requested_price=price,
+                    requested_qty=position.model.quantity,
+                    now=at,
+                ),
+            )
+            working.order = self._opm.move_order_status(order=working.order, next_status="SUBMITTED", now=at)
+            working.order = self._opm.move_order_status(order=working.order, next_status="ACCEPTED", now=at)
+        quantity = position.model.quantity
+        buy_price = position.model.avg_buy_price
+        self._fill(working, position.model, price=price, at=at)
+        position.closed = True
+        position.working_sell = None
+        self.tse_service.on_position_update(self._position_event(position, price=price, at=at, state="CLOSED"))
+        return calc_trade_detail(buy_price=buy_price, sell_price=price, quantity=quantity)[4]
+
+    def _fill(self, working: _WorkingOrder, position: PositionModel, *, price: Decimal, at: datetime) -> None:
+        fill = ExecutionFill(
+            execution_id=f"bt-exe-{next(self._fill_ids)}",
+            broker_order_id=working.order.broker_order_id or working.order.order_aggregate_id,
+            symbol=working.order.symbol,
+            side=working.order.side,
+            price=price,
+            qty=working.order.requested_qty,
+            executed_at=at,
+        )
+        working.order, _position, _applied = self._opm.reconcile_execution_events(
+            order=working.order,
+            position=position,
+            fills=[fill],
+            broker_remaining_qty=0,
+            latest_market_price=price,
+        )
+
+    def _update_position(self, quote: MarketQuote) -> None:
+        position = self._positions.get(quote.symbol)
+        if position is None or position.closed:
+            return
+        position.max_price = max(position.max_price, quote.price)
+        self.tse_service.on_position_update(self._position_event(position, price=quote.price, at=quote.as_of, state="LONG_OPEN"))
+
+    def _position_event(self, position: _OpenPosition, *, price: Decimal, at: datetime, state: str) -> PositionUpdateEvent:
+        avg_buy_price = position.model.avg_buy_price
+        current_profit_rate = self._profit_rate(avg_buy_price, price)
+        return PositionUpdateEvent(
+            trading_date=self.trading_date,
+            symbol=position.model.symbol,
+            position_state=state,
+            avg_buy_price=avg_buy_price,
+            current_price=price,
+            current_profit_rate=current_profit_rate,
+            max_profit_rate=self._profit_rate(avg_buy_price, position.max_price),
+            min_profit_locked=position.model.min_profit_locked,
+            updated_at=at,
+        )
+
+    @staticmethod
+    def _profit_rate(buy_price: Decimal, price: Decimal) -> Decimal:
+        if buy_price <= 0:
+            return Decimal("0")
+        return q_return(((price - buy_price) / buy_price) * Decimal("100"))
+
+    def _liquidate(self, at: datetime) -> Decimal:
+        realized = Decimal("0")
+        for symbol, position in self._positions.items():
+            if position.closed:
+                continue
+            realized += self._close(position, price=self._last_prices[symbol], at=at)
+        return realized
+
+    def _append_equity(self, curve: list[EquityPoint], at: datetime, realized: Decimal, peak: Decimal) -> Decimal:
+        equity = realized
+        for symbol, position in self._positions.items():
+            if position.closed:
+                continue
+            equity += calc_trade_detail(
+                buy_price=position.model.avg_buy_price,
+                sell_price=self._last_prices[symbol],
+                quantity=position.model.quantity,
+            )[4]
+        peak = max(peak, equity)
+        curve.append(EquityPoint(at=at, equity=equity, drawdown=equity - peak))
+        return peak
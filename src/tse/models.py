@@ -5,6 +5,13 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Any, Literal
 
+from .constants import (
+    DROP_THRESHOLD_PCT,
+    MIN_PROFIT_LOCK_PCT,
+    PROFIT_PRESERVATION_SELL_PCT,
+    REBOUND_THRESHOLD_PCT,
+)
+
 SymbolState = Literal[
     "WAIT_REFERENCE",
     "TRACKING",
@@ -22,6 +29,24 @@ PortfolioState = Literal[
 ]
 
 
+@dataclass(frozen=True)
+class StrategyParams:
+    drop_threshold_pct: Decimal = DROP_THRESHOLD_PCT
+    rebound_threshold_pct: Decimal = REBOUND_THRESHOLD_PCT
+    min_profit_lock_pct: Decimal = MIN_PROFIT_LOCK_PCT
+    profit_preservation_sell_pct: Decimal = PROFIT_PRESERVATION_SELL_PCT
+
+    def __post_init__(self) -> None:
+        if self.drop_threshold_pct <= 0:
+            raise ValueError("drop_threshold_pct must be > 0")
+        if self.rebound_threshold_pct <= 0:
+            raise ValueError("rebound_threshold_pct must be > 0")
+        if self.min_profit_lock_pct <= 0:
+            raise ValueError("min_profit_lock_pct must be > 0")
+        if not 0 < self.profit_preservation_sell_pct < 100:
+            raise ValueError("profit_preservation_sell_pct must be between 0 and 100")
+
+
 @dataclass
 class SymbolContext:
     symbol: str
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from multiprocessing import shared_memory
+from typing import Callable, Sequence
+
+import numpy as np
+
+from kia.contracts import MarketQuote, PollQuoteError, PollQuotesResult
+
+from .quote_monitoring import QuoteCycleResult, QuoteMonitoringConfig, TickRecorder, _QuoteMonitoringLoopBase
+from .service import TseService
+from .tick_log import from_epoch_us, to_epoch_us
+from .vector_rules import PRICE_SCALE, to_scaled_price
+
+QUOTE_SLOT_DTYPE = np.dtype(
+    [
+        ("version", np.int64),
+        ("price", np.int64),
+        ("tick_size", np.int64),
+        ("as_of_us", np.int64),
+        ("sequence", np.int64),
+    ]
+)
+WORKER_SLOT_DTYPE = np.dtype(
+    [
+        ("slot_start", np.int64),
+        ("slot_end", np.int64),
+        ("cycles", np.int64),
+        ("failures", np.int64),
+        ("heartbeat_us", np.int64),
+    ]
+)
+
+
+def _partition_slots(slot_count: int, worker_count: int) -> list[tuple[int, int]]:
+    base, extra = divmod(slot_count, worker_count)
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    for index in range(worker_count):
+        end = start + base + (1 if index < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+class SharedPriceTable:
+    def __init__(self, *, symbols: Sequence[str], worker_count: int, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self.symbols = tuple(symbols)
+        self.worker_count = worker_count
+        self._shm = shm
+        self._owner = owner
+        quote_bytes = len(self.symbols) * QUOTE_SLOT_DTYPE.itemsize
+        self.quotes = np.ndarray((len(self.symbols),), dtype=QUOTE_SLOT_DTYPE, buffer=shm.buf, offset=0)
+        self.workers = np.ndarray((worker_count,), dtype=WORKER_SLOT_DTYPE, buffer=shm.buf, offset=quote_bytes)
+        self._slot_by_symbol = {symbol: index for index, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def create(cls, *, symbols: Sequence[str], worker_count: int) -> SharedPriceTable:
+        if not symbols:
+            raise ValueError("symbols must not be empty")
+        if len(set(symbols)) != len(symbols):
+            raise ValueError("symbols must not contain duplicates")
+        worker_count = max(1, min(worker_count, len(symbols)))
+        size = len(symbols) * QUOTE_SLOT_DTYPE.itemsize + worker_count * WORKER_SLOT_DTYPE.itemsize
+        table = cls(
+            symbols=symbols,
+            worker_count=worker_count,
+            shm=shared_memory.SharedMemory(create=True, size=size),
+            owner=True,
+        )
+        table.quotes[:] = np.zeros(len(symbols), dtype=QUOTE_SLOT_DTYPE)
+        table.workers[:] = np.zeros(worker_count, dtype=WORKER_SLOT_DTYPE)
+        for index, (start, end) in enumerate(_partition_slots(len(symbols), worker_count)):
+            table.workers["slot_start"][index] = start
+            table.workers["slot_end"][index] = end
+        return table
+
+    @classmethod
+    def attach(cls, *, name: str, symbols: Sequence[str], worker_count: int) -> SharedPriceTable:
+        return cls(symbols=symbols, worker_count=worker_count, shm=shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def slot_for(self, symbol: str) -> int | None:
+        return self._slot_by_symbol.get(symbol)
+
+    def worker_symbols(self, worker_index: int) -> list[str]:
+        start = int(self.workers["slot_start"][worker_index])
+        end = int(self.workers["slot_end"][worker_index])
+        return list(self.symbols[start:end])
+
+    def write(self, slot: int, *, price: Decimal, tick_size: int, as_of: datetime) -> int:
+        scaled_price = to_scaled_price(price)
+        as_of_us = to_epoch_us(as_of)
+        versions = self.quotes["version"]
+        version = int(versions[slot])
+        versions[slot] = version + 1
+        self.quotes["price"][slot] = scaled_price
+        self.quotes["tick_size"][slot] = tick_size
+        self.quotes["as_of_us"][slot] = as_of_us
+        sequence = int(self.quotes["sequence"][slot]) + 1
+        self.quotes["sequence"][slot] = sequence
+        versions[slot] = version + 2
+        return sequence
+
+    def record_worker_cycle(self, worker_index: int, *, failed: bool, now: datetime) -> None:
+        self.workers["cycles"][worker_index] += 1
+        if failed:
+            self.workers["failures"][worker_index] += 1
+        self.workers["heartbeat_us"][worker_index] = to_epoch_us(now)
+
+    def release_worker_slots(self, worker_index: int) -> int:
+        start = int(self.workers["slot_start"][worker_index])
+        end = int(self.workers["slot_end"][worker_index])
+        versions = self.quotes["version"][start:end]
+        torn = versions % 2 == 1
+        versions[torn] += 1
+        return int(torn.sum())
+
+    def touch_worker(self, worker_index: int, *, now: datetime) -> None:
+        self.workers["heartbeat_us"][worker_index] = to_epoch_us(now)
+
+    def mark_worker_dead(self, worker_index: int) -> None:
+        self.workers["failures"][worker_index] += 1
+        self.workers["heartbeat_us"][worker_index] = -1
+
+    def snapshot(self, *, max_retries: int = 8) -> np.ndarray:
+        data = self.quotes.copy()
+        torn = (data["version"] % 2 == 1) | (data["version"] != self.quotes["version"])
+        attempts = 0
+        while torn.any() and attempts < max_retries:
+            index = np.flatnonzero(torn)
+            data[index] = self.quotes[index]
+            torn[index] = (data["version"][index] % 2 == 1) | (data["version"][index] != self.quotes["version"][index])
+            attempts += 1
+        data["sequence"][torn] = 0
+        return data
+
+    def worker_snapshot(self) -> np.ndarray:
+        return self.workers.copy()
+
+    def close(self) -> None:
+        del self.quotes
+        del self.workers
+        self._shm.close()
+
+    def unlink(self) -> None:
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedPriceTableMonitoringLoop(_QuoteMonitoringLoopBase):
+    def __init__(
+        self,
+        *,
+        tse_service: TseService,
+        price_table: SharedPriceTable,
+        config: QuoteMonitoringConfig,
+        now_fn: Callable[[], datetime] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        recorder: TickRecorder | None = None,
+        stale_after_ms: int | None = None,
+        supervisor: Callable[[Sequence[int]], None] | None = None,
+    ) -> None:
+        super().__init__(
+            tse_service=tse_service,
+            config=config,
+            now_fn=now_fn,
+            monotonic_fn=monotonic_fn,
+            recorder=recorder,
+        )
+        self._price_table = price_table
+        self._last_sequences = np.zeros(len(price_table.symbols), dtype=np.int64)
+        self._last_failures = np.zeros(price_table.worker_count, dtype=np.int64)
+        if stale_after_ms is None:
+            stale_after_ms = 3 * max(config.poll_interval_ms, config.poll_timeout_ms)
+        self._stale_after_us = stale_after_ms * 1000
+        self._supervisor = supervisor
+        self._first_cycle_us: int | None = None
+
+    def run_cycle(self) -> QuoteCycleResult:
+        poll_cycle_id = self._next_cycle_id("shm")
+        data = self._price_table.snapshot()
+        fresh = np.flatnonzero(data["sequence"] > self._last_sequences)
+        self._last_sequences[fresh] = data["sequence"][fresh]
+        symbols = self._price_table.symbols
+        quotes = [
+            MarketQuote(
+                symbol=symbols[index],
+                price=Decimal(int(data["price"][index])) / PRICE_SCALE,
+                tick_size=int(data["tick_size"][index]),
+                as_of=from_epoch_us(data["as_of_us"][index]),
+            )
+            for index in fresh
+        ]
+
+        workers = self._price_table.worker_snapshot()
+        failed_workers = np.flatnonzero(workers["failures"] > self._last_failures)
+        self._last_failures = workers["failures"].copy()
+        stale_workers = self._stale_workers(workers)
+        errors = [
+            PollQuoteError(symbol=symbol, code="KIA_QUOTE_WORKER_FAILED", retryable=True)
+            for worker_index in failed_workers
+            if worker_index not in stale_workers
+            for symbol in self._price_table.worker_symbols(int(worker_index))
+        ]
+        errors.extend(
+            PollQuoteError(symbol=symbol, code="KIA_QUOTE_WORKER_STALE", retryable=True)
+            for worker_index in stale_workers
+            for symbol in self._price_table.worker_symbols(worker_index)
+        )
+        if stale_workers:
+            self._logger.warning(
+                "Quote ingestion workers stale: workers=%s stale_after_ms=%s",
+                ",".join(str(index) for index in stale_workers),
+                self._stale_after_us // 1000,
+            )
+            if self._supervisor is not None:
+                self._supervisor(stale_workers)
+        return self._apply_poll_result(
+            poll_cycle_id,
+            PollQuotesResult(poll_cycle_id=poll_cycle_id, quotes=quotes, errors=errors, partial=bool(errors)),
+        )
+
+    def _stale_workers(self, workers: np.ndarray) -> list[int]:
+        now_us = to_epoch_us(self._now_fn())
+        if self._first_cycle_us is None:
+            self._first_cycle_us = now_us
+        heartbeats = workers["heartbeat_us"]
+        elapsed = now_us - np.where(heartbeats > 0, heartbeats, self._first_cycle_us)
+        return [int(index) for index in np.flatnonzero((heartbeats < 0) | (elapsed > self._stale_after_us))]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from datetime import datetime, timezone
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Sequence
+
+from kia.contracts import KiaGateway, Mode, PollQuotesRequest
+
+from .constants import QUOTE_BATCH_MAX_SYMBOLS
+from .price_table import SharedPriceTable
+from .quote_monitoring import QuoteMonitoringConfig
+from .scheduler import FixedRateScheduler
+
+GatewayFactory = Callable[[], KiaGateway]
+
+
+def run_quote_ingestion_worker(
+    *,
+    table_name: str,
+    symbols: Sequence[str],
+    worker_count: int,
+    worker_index: int,
+    gateway_factory: GatewayFactory,
+    mode: Mode | None,
+    poll_interval_ms: int,
+    poll_timeout_ms: int,
+    stop_event: Any,
+) -> None:
+    logger = logging.getLogger("privatetrade.tse.quote_ingestion")
+    table = SharedPriceTable.attach(name=table_name, symbols=symbols, worker_count=worker_count)
+    try:
+        gateway = gateway_factory()
+        owned = table.worker_symbols(worker_index)
+        scheduler = FixedRateScheduler(interval_seconds=poll_interval_ms / 1000)
+        batch_seq = 0
+        while not stop_event.is_set():
+            scheduler.begin_cycle()
+            failed = False
+            for start in range(0, len(owned), QUOTE_BATCH_MAX_SYMBOLS):
+                batch_seq += 1
+                request = PollQuotesRequest(
+                    mode=mode,
+                    symbols=owned[start : start + QUOTE_BATCH_MAX_SYMBOLS],
+                    poll_cycle_id=f"ingest-{worker_index}-{batch_seq:06d}",
+                    timeout_ms=poll_timeout_ms,
+                )
+                try:
+                    result = gateway.fetch_quotes_batch(request)
+                    for quote in result.quotes:
+                        slot = table.slot_for(quote.symbol)
+                        if slot is not None:
+                            table.write(slot, price=quote.price, tick_size=quote.tick_size, as_of=quote.as_of)
+                except Exception:
+                    failed = True
+                    logger.exception("Quote ingestion batch failed: worker=%s cycle_id=%s", worker_index, request.poll_cycle_id)
+                    continue
+                failed = failed or result.partial
+            table.record_worker_cycle(worker_index, failed=failed, now=datetime.now(timezone.utc))
+            delay = scheduler.complete_cycle()
+            if delay > 0:
+                stop_event.wait(delay)
+    except Exception:
+        logger.exception("Quote ingestion worker crashed: worker=%s", worker_index)
+        table.mark_worker_dead(worker_index)
+    finally:
+        table.close()
+
+
+class QuoteIngestionPool:
+    def __init__(
+        self,
+        *,
+        symbols: Sequence[str],
+        gateway_factory: GatewayFactory,
+        config: QuoteMonitoringConfig,
+        worker_count: int = 2,
+        start_method: str = "spawn",
+    ) -> None:
+        self._gateway_factory = gateway_factory
+        self._config = config
+        self._context = multiprocessing.get_context(start_method)
+        self._logger = logging.getLogger("privatetrade.tse.quote_ingestion")
+        self.price_table = SharedPriceTable.create(symbols=symbols, worker_count=worker_count)
+        self._stop_event = self._context.Event()
+        self._processes: list[BaseProcess] = []
+        self._restarts = 0
+        self._closed = False
+
+    @property
+    def alive_workers(self) -> int:
+        return sum(1 for process in self._processes if process.is_alive())
+
+    @property
+    def restarts(self) -> int:
+        return self._restarts
+
+    def start(self) -> None:
+        if self._processes:
+            return
+        self._processes = [self._spawn(worker_index) for worker_index in range(self.price_table.worker_count)]
+        self._logger.info(
+            "Quote ingestion started: workers=%s symbols=%s table=%s",
+            len(self._processes),
+            len(self.price_table.symbols),
+            self.price_table.name,
+        )
+
+    def restart_workers(self, worker_indexes: Sequence[int], *, timeout_seconds: float = 2.0) -> None:
+        if self._closed or not self._processes:
+            return
+        for worker_index in worker_indexes:
+            process = self._processes[worker_index]
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=timeout_seconds)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout=timeout_seconds)
+            released = self.price_table.release_worker_slots(worker_index)
+            if released:
+                self._logger.warning("Quote ingestion worker left torn slots: worker=%s slots=%s", worker_index, released)
+            self._processes[worker_index] = self._spawn(worker_index)
+            self._restarts += 1
+            self._logger.warning(
+                "Quote ingestion worker restarted: worker=%s exitcode=%s restarts=%s",
+                worker_index,
+                process.exitcode,
+                self._restarts,
+            )
+
+    def _spawn(self, worker_index: int) -> BaseProcess:
+        self.price_table.touch_worker(worker_index, now=datetime.now(timezone.utc))
+        process = self._context.Process(
+            target=run_quote_ingestion_worker,
+            kwargs={
+                "table_name": self.price_table.name,
+                "symbols": list(self.price_table.symbols),
+                "worker_count": self.price_table.worker_count,
+                "worker_index": worker_index,
+                "gateway_factory": self._gateway_factory,
+                "mode": self._config.mode,
+                "poll_interval_ms": self._config.poll_interval_ms,
+                "poll_timeout_ms": self._config.poll_timeout_ms,
+                "stop_event": self._stop_event,
+            },
+            name=f"tse-quote-ingest-{worker_index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def stop(self, *, timeout_seconds: float = 2.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout=timeout_seconds)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=timeout_seconds)
+        self._processes = []
+        self.price_table.close()
+        self.price_table.unlink()
+        self._logger.info("Quote ingestion stopped")
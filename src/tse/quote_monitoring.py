@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from time import sleep as default_sleep
-from typing import Callable, Literal
+from typing import Awaitable, Callable, Literal, Protocol
 
-from kia.contracts import KiaGateway, Mode, PollQuotesRequest
+from kia.contracts import AsyncKiaGateway, KiaGateway, Mode, PollQuotesRequest, PollQuotesResult
 from kia.contracts import MarketQuote
 
 from .constants import (
@@ -15,12 +16,21 @@ from .constants import (
     QUOTE_POLL_TIMEOUT_MS,
     QUOTE_RECOVERY_SUCCESS_THRESHOLD,
 )
-from .models import QuoteEvent, ServiceOutput
+from .models import PositionUpdateEvent, QuoteEvent, ServiceOutput
+from .scheduler import FixedRateScheduler, OverrunPolicy
 from .service import TseService
 
 LoopState = Literal["RUNNING", "DEGRADED", "STOPPED"]
 
 
+class TickRecorder(Protocol):
+    def record_poll_result(self, result: PollQuotesResult, *, recorded_at: datetime) -> None: ...
+
+    def record_fetch_failure(self, error: str, *, recorded_at: datetime) -> None: ...
+
+    def record_position_update(self, event: PositionUpdateEvent, *, recorded_at: datetime) -> None: ...
+
+
 @dataclass(frozen=True)
 class QuoteMonitoringConfig:
     mode: Mode | None
@@ -28,6 +38,7 @@ class QuoteMonitoringConfig:
     poll_timeout_ms: int = QUOTE_POLL_TIMEOUT_MS
     consecutive_error_threshold: int = QUOTE_CONSECUTIVE_ERROR_THRESHOLD
     recovery_success_threshold: int = QUOTE_RECOVERY_SUCCESS_THRESHOLD
+    overrun_policy: OverrunPolicy = "coalesce"
 
 
 @dataclass
@@ -42,21 +53,22 @@ class QuoteCycleResult:
     fetch_error: str | None = None
 
 
-class QuoteMonitoringLoop:
+class _QuoteMonitoringLoopBase:
     def __init__(
         self,
         *,
         tse_service: TseService,
-        kia_gateway: KiaGateway,
         config: QuoteMonitoringConfig,
         now_fn: Callable[[], datetime] | None = None,
-        sleep_fn: Callable[[float], None] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        recorder: TickRecorder | None = None,
     ) -> None:
         self._tse_service = tse_service
-        self._kia_gateway = kia_gateway
         self._config = config
         self._now_fn = now_fn or (lambda: datetime.now(timezone.utc))
-        self._sleep_fn = sleep_fn or default_sleep
+        self._monotonic_fn = monotonic_fn
+        self._recorder = recorder
+        self.scheduler: FixedRateScheduler | None = None
         self._logger = logging.getLogger("privatetrade.tse.quote_monitoring")
 
         self.state: LoopState = "STOPPED"
@@ -68,6 +80,14 @@ class QuoteMonitoringLoop:
     def poll_interval_seconds(self) -> float:
         return self._config.poll_interval_ms / 1000
 
+    def new_scheduler(self) -> FixedRateScheduler:
+        self.scheduler = FixedRateScheduler(
+            interval_seconds=self.poll_interval_seconds,
+            overrun_policy=self._config.overrun_policy,
+            monotonic_fn=self._monotonic_fn,
+        )
+        return self.scheduler
+
     def start(self) -> None:
         self.state = "RUNNING"
         self._consecutive_errors = 0
@@ -81,39 +101,42 @@ class QuoteMonitoringLoop:
         self._tse_service.set_buy_entry_blocked_by_degraded(False)
         self._logger.info("Quote monitoring stopped: state=%s", self.state)
 
-    def run_cycle(self) -> QuoteCycleResult:
+    def _next_cycle_id(self, prefix: str) -> str:
         if self.state == "STOPPED":
             self.start()
 
         self._cycle_seq += 1
         now = self._now_fn()
-        poll_cycle_id = f"poll-{self._tse_service.ctx.trading_date.strftime('%Y%m%d')}-{now.strftime('%H%M%S')}-{self._cycle_seq:03d}"
+        return f"{prefix}-{self._tse_service.ctx.trading_date.strftime('%Y%m%d')}-{now.strftime('%H%M%S')}-{self._cycle_seq:03d}"
 
-        try:
-            result = self._kia_gateway.fetch_quotes_batch(
-                PollQuotesRequest(
-                    mode=self._config.mode,
-                    symbols=self._watch_symbols(),
-                    poll_cycle_id=poll_cycle_id,
-                    timeout_ms=self._config.poll_timeout_ms,
-                )
-            )
-        except Exception as exc:
-            self._on_cycle_failure()
-            return QuoteCycleResult(
-                poll_cycle_id=poll_cycle_id,
-                state=self.state,
-                partial=True,
-                quote_count=0,
-                error_count=1,
-                quotes=[],
-                outputs=[],
-                fetch_error=str(exc),
-            )
+    def _next_poll_request(self) -> PollQuotesRequest:
+        return PollQuotesRequest(
+            mode=self._config.mode,
+            symbols=self._watch_symbols(),
+            poll_cycle_id=self._next_cycle_id("poll"),
+            timeout_ms=self._config.poll_timeout_ms,
+        )
 
-        outputs: list[ServiceOutput] = []
-        for index, quote in enumerate(result.quotes, start=1):
-            output = self._tse_service.on_quote(
+    def _fetch_failed(self, poll_cycle_id: str, exc: Exception) -> QuoteCycleResult:
+        if self._recorder is not None:
+            self._recorder.record_fetch_failure(str(exc), recorded_at=self._now_fn())
+        self._on_cycle_failure()
+        return QuoteCycleResult(
+            poll_cycle_id=poll_cycle_id,
+            state=self.state,
+            partial=True,
+            quote_count=0,
+            error_count=1,
+            quotes=[],
+            outputs=[],
+            fetch_error=str(exc),
+        )
+
+    def _apply_poll_result(self, poll_cycle_id: str, result: PollQuotesResult) -> QuoteCycleResult:
+        if self._recorder is not None:
+            self._recorder.record_poll_result(result, recorded_at=self._now_fn())
+        outputs = self._tse_service.on_quotes(
+            [
                 QuoteEvent(
                     trading_date=self._tse_service.ctx.trading_date,
                     occurred_at=quote.as_of,
@@ -121,8 +144,9 @@ class QuoteMonitoringLoop:
                     current_price=quote.price,
                     sequence=index,
                 )
-            )
-            outputs.append(output)
+                for index, quote in enumerate(result.quotes, start=1)
+            ]
+        )
 
         if result.partial:
             self._on_cycle_failure()
@@ -140,20 +164,6 @@ class QuoteMonitoringLoop:
             fetch_error=None,
         )
 
-    def run_forever(self, *, max_cycles: int | None = None) -> list[QuoteCycleResult]:
-        if self.state == "STOPPED":
-            self.start()
-
-        cycles: list[QuoteCycleResult] = []
-        while self.state in {"RUNNING", "DEGRADED"}:
-            if max_cycles is not None and len(cycles) >= max_cycles:
-                break
-            cycles.append(self.run_cycle())
-            if self.state == "STOPPED":
-                break
-            self._sleep_fn(self._config.poll_interval_ms / 1000)
-        return cycles
-
     def _watch_symbols(self) -> list[str]:
         return [ctx.symbol for ctx in sorted(self._tse_service.ctx.symbols.values(), key=lambda item: item.watch_rank)]
 
@@ -184,3 +194,125 @@ class QuoteMonitoringLoop:
                 self._consecutive_errors,
                 self._config.consecutive_error_threshold,
             )
+
+
+class QuoteMonitoringLoop(_QuoteMonitoringLoopBase):
+    def __init__(
+        self,
+        *,
+        tse_service: TseService,
+        kia_gateway: KiaGateway,
+        config: QuoteMonitoringConfig,
+        now_fn: Callable[[], datetime] | None = None,
+        sleep_fn: Callable[[float], None] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        recorder: TickRecorder | None = None,
+    ) -> None:
+        super().__init__(
+            tse_service=tse_service,
+            config=config,
+            now_fn=now_fn,
+            monotonic_fn=monotonic_fn,
+            recorder=recorder,
+        )
+        self._kia_gateway = kia_gateway
+        self._sleep_fn = sleep_fn or default_sleep
+
+    def run_cycle(self) -> QuoteCycleResult:
+        request = self._next_poll_request()
+        try:
+            result = self._kia_gateway.fetch_quotes_batch(request)
+        except Exception as exc:
+            return self._fetch_failed(request.poll_cycle_id, exc)
+        return self._apply_poll_result(request.poll_cycle_id, result)
+
+    def run_forever(self, *, max_cycles: int | None = None) -> list[QuoteCycleResult]:
+        if self.state == "STOPPED":
+            self.start()
+
+        scheduler = self.new_scheduler()
+        cycles: list[QuoteCycleResult] = []
+        while self.state in {"RUNNING", "DEGRADED"}:
+            if max_cycles is not None and len(cycles) >= max_cycles:
+                break
+            scheduler.begin_cycle()
+            cycles.append(self.run_cycle())
+            delay = scheduler.complete_cycle()
+            if self.state == "STOPPED":
+                break
+            if delay > 0:
+                self._sleep_fn(delay)
+        return cycles
+
+
+class AsyncQuoteMonitoringLoop(_QuoteMonitoringLoopBase):
+    def __init__(
+        self,
+        *,
+        tse_service: TseService,
+        kia_gateway: AsyncKiaGateway,
+        config: QuoteMonitoringConfig,
+        now_fn: Callable[[], datetime] | None = None,
+        sleep_fn: Callable[[float], Awaitable[None]] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        recorder: TickRecorder | None = None,
+    ) -> None:
+        super().__init__(
+            tse_service=tse_service,
+            config=config,
+            now_fn=now_fn,
+            monotonic_fn=monotonic_fn,
+            recorder=recorder,
+        )
+        self._kia_gateway = kia_gateway
+        self._sleep_fn = sleep_fn or asyncio.sleep
+
+    async def run_cycle(self) -> QuoteCycleResult:
+        request = self._next_poll_request()
+        try:
+            result = await self._kia_gateway.fetch_quotes_batch(request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            return self._fetch_failed(request.poll_cycle_id, exc)
+        return self._apply_poll_result(request.poll_cycle_id, result)
+
+    async def run_forever(
+        self,
+        *,
+        max_cycles: int | None = None,
+        on_cycle: Callable[[QuoteCycleResult], Awaitable[None]] | None = None,
+    ) -> list[QuoteCycleResult]:
+        if self.state == "STOPPED":
+            self.start()
+
+        scheduler = self.new_scheduler()
+        cycles: list[QuoteCycleResult] = []
+        while self.state in {"RUNNING", "DEGRADED"}:
+            if max_cycles is not None and len(cycles) >= max_cycles:
+                break
+            scheduler.begin_cycle()
+            cycle = await self.run_cycle()
+            cycles.append(cycle)
+            if on_cycle is not None:
+                await on_cycle(cycle)
+            delay = scheduler.complete_cycle()
+            if self.state == "STOPPED":
+                break
+            await self._sleep_fn(delay)
+        return cycles
+
+
+class QuoteStreamMonitor(_QuoteMonitoringLoopBase):
+    def on_quote(self, quote: MarketQuote) -> QuoteCycleResult:
+        poll_cycle_id = self._next_cycle_id("stream")
+        return self._apply_poll_result(
+            poll_cycle_id,
+            PollQuotesResult(poll_cycle_id=poll_cycle_id, quotes=[quote], errors=[], partial=False),
+        )
+
+    def on_disconnect(self, exc: Exception) -> None:
+        if self.state == "STOPPED":
+            return
+        self._logger.warning("Quote stream disconnected: state=%s error=%s", self.state, exc)
+        self._on_cycle_failure()
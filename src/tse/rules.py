@@ -46,20 +46,20 @@ def le_with_eps(left: Decimal, right: Decimal, eps: Decimal = EPS) -> bool:
     return left <= (right + eps)
 
 
-def should_enter_buy_candidate(drop_rate: Decimal) -> bool:
-    return ge_with_eps(drop_rate, DROP_THRESHOLD_PCT)
+def should_enter_buy_candidate(drop_rate: Decimal, threshold_pct: Decimal = DROP_THRESHOLD_PCT) -> bool:
+    return ge_with_eps(drop_rate, threshold_pct)
 
 
 def should_update_tracked_low(current_price: Decimal, tracked_low: Decimal) -> bool:
     return current_price < tracked_low
 
 
-def should_trigger_rebound_buy(rebound_rate: Decimal) -> bool:
-    return ge_with_eps(rebound_rate, REBOUND_THRESHOLD_PCT)
+def should_trigger_rebound_buy(rebound_rate: Decimal, threshold_pct: Decimal = REBOUND_THRESHOLD_PCT) -> bool:
+    return ge_with_eps(rebound_rate, threshold_pct)
 
 
-def should_lock_min_profit(current_profit_rate: Decimal) -> bool:
-    return ge_with_eps(current_profit_rate, MIN_PROFIT_LOCK_PCT)
+def should_lock_min_profit(current_profit_rate: Decimal, threshold_pct: Decimal = MIN_PROFIT_LOCK_PCT) -> bool:
+    return ge_with_eps(current_profit_rate, threshold_pct)
 
 
 def should_emit_sell_signal(
@@ -67,10 +67,11 @@ def should_emit_sell_signal(
     min_profit_locked: bool,
     current_profit_rate: Decimal,
     max_profit_rate: Decimal,
+    sell_threshold_pct: Decimal = PROFIT_PRESERVATION_SELL_PCT,
 ) -> bool:
     if not min_profit_locked:
         return False
     if max_profit_rate <= 0:
         return False
     preservation = calc_profit_preservation_rate(current_profit_rate, max_profit_rate)
-    return le_with_eps(preservation, PROFIT_PRESERVATION_SELL_PCT)
+    return le_with_eps(preservation, sell_threshold_pct)
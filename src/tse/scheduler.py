@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from heapq import heappop, heappush
+from typing import Callable, Literal
 
 
 @dataclass(frozen=True, order=True)
@@ -56,3 +58,82 @@ class SymbolScanScheduler:
 
     def clear(self) -> None:
         self._heap.clear()
+
+
+OverrunPolicy = Literal["skip", "coalesce"]
+
+
+@dataclass(frozen=True)
+class ScheduledCycle:
+    sequence: int
+    scheduled_at: float
+    started_at: float
+    lateness_seconds: float
+
+
+class FixedRateScheduler:
+    def __init__(
+        self,
+        *,
+        interval_seconds: float,
+        overrun_policy: OverrunPolicy = "coalesce",
+        monotonic_fn: Callable[[], float] | None = None,
+    ) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be > 0")
+        if overrun_policy not in {"skip", "coalesce"}:
+            raise ValueError(f"unsupported overrun_policy: {overrun_policy}")
+        self._interval_seconds = interval_seconds
+        self._overrun_policy = overrun_policy
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self._next_at: float | None = None
+        self._current: ScheduledCycle | None = None
+        self._sequence = 0
+        self.overrun_count = 0
+        self.skipped_cycles = 0
+        self.last_lateness_seconds = 0.0
+        self.max_lateness_seconds = 0.0
+        self.last_duration_seconds = 0.0
+
+    @property
+    def interval_seconds(self) -> float:
+        return self._interval_seconds
+
+    def begin_cycle(self) -> ScheduledCycle:
+        now = self._monotonic_fn()
+        if self._next_at is None:
+            self._next_at = now
+        self._sequence += 1
+        lateness = max(0.0, now - self._next_at)
+        self._current = ScheduledCycle(
+            sequence=self._sequence,
+            scheduled_at=self._next_at,
+            started_at=now,
+            lateness_seconds=lateness,
+        )
+        self.last_lateness_seconds = lateness
+        self.max_lateness_seconds = max(self.max_lateness_seconds, lateness)
+        return self._current
+
+    def complete_cycle(self) -> float:
+        if self._current is None or self._next_at is None:
+            raise RuntimeError("complete_cycle called before begin_cycle")
+        now = self._monotonic_fn()
+        self.last_duration_seconds = max(0.0, now - self._current.started_at)
+        next_at = self._current.scheduled_at + self._interval_seconds
+        self._current = None
+
+        if now < next_at:
+            self._next_at = next_at
+            return next_at - now
+
+        self.overrun_count += 1
+        missed = int((now - next_at) // self._interval_seconds)
+        if self._overrun_policy == "skip":
+            self.skipped_cycles += missed + 1
+            self._next_at = next_at + (missed + 1) * self._interval_seconds
+            return self._next_at - now
+
+        self.skipped_cycles += missed
+        self._next_at = next_at + missed * self._interval_seconds
+        return 0.0
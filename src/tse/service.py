@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from contextlib import nullcontext
 from datetime import date, datetime, time as dt_time, timedelta, timezone
 from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Sequence
+from uuid import uuid4
 
 from opm.tick_rules import compute_buy_limit_price, resolve_kospi_tick_size
 
@@ -15,6 +18,7 @@ from .models import (
     QuoteEvent,
     ServiceOutput,
     StrategyEvent,
+    StrategyParams,
     SymbolContext,
 )
 from .rules import (
@@ -30,8 +34,13 @@ from .rules import (
 )
 from .scheduler import SymbolScanScheduler
 
+if TYPE_CHECKING:
+    from .vector_rules import VectorRuleEngine, VectorRuleVerdict
+
 _MARKET_TIMEZONE = timezone(timedelta(hours=9))
 
+CommandListener = Callable[[PlaceBuyOrderCommand | PlaceSellOrderCommand], None]
+
 
 def _to_market_time(value: datetime) -> dt_time:
     if value.tzinfo is None:
@@ -40,25 +49,65 @@ def _to_market_time(value: datetime) -> dt_time:
 
 
 class TseService:
-    def __init__(self, *, trading_date: date, watch_symbols: list[str]) -> None:
+    def __init__(
+        self,
+        *,
+        trading_date: date,
+        watch_symbols: list[str],
+        portfolio: PortfolioContext | None = None,
+        rank_offset: int = 0,
+        portfolio_lock: ContextManager[Any] | None = None,
+        params: StrategyParams | None = None,
+        session_id: str | None = None,
+        vector_rules: bool = False,
+    ) -> None:
         if not 1 <= len(watch_symbols) <= MAX_WATCH_SYMBOLS:
-            raise ValueError("watch_symbols size must be between 1 and 20")
+            raise ValueError(f"watch_symbols size must be between 1 and {MAX_WATCH_SYMBOLS}")
 
+        self.session_id = session_id or uuid4().hex[:6]
         self.ctx = DailyContext(
             trading_date=trading_date,
             symbols={
-                symbol: SymbolContext(symbol=symbol, watch_rank=index + 1)
+                symbol: SymbolContext(symbol=symbol, watch_rank=rank_offset + index + 1)
                 for index, symbol in enumerate(watch_symbols)
             },
-            portfolio=PortfolioContext(),
+            portfolio=portfolio if portfolio is not None else PortfolioContext(),
         )
+        self.params = params or StrategyParams()
         self.scheduler = SymbolScanScheduler()
+        self._rank_offset = rank_offset
+        self._portfolio_lock: ContextManager[Any] = portfolio_lock if portfolio_lock is not None else nullcontext()
         self._command_sequence = 0
         self._buy_entry_blocked_by_degraded = False
+        self._command_listener: CommandListener | None = None
+        self._vector_engine: VectorRuleEngine | None = None
+        if vector_rules:
+            from .vector_rules import VectorRuleEngine
 
-    def on_day_changed(self, trading_date: date) -> None:
+            self._vector_engine = VectorRuleEngine(watch_symbols=list(watch_symbols), params=self.params)
+        self._vector_verdicts: dict[str, tuple[QuoteEvent, tuple[Any, ...], VectorRuleVerdict]] = {}
+
+    @property
+    def vector_rules(self) -> bool:
+        return self._vector_engine is not None
+
+    def on_day_changed(self, trading_date: date, *, portfolio: PortfolioContext | None = None) -> None:
         watch_symbols = [ctx.symbol for ctx in sorted(self.ctx.symbols.values(), key=lambda item: item.watch_rank)]
-        self.__init__(trading_date=trading_date, watch_symbols=watch_symbols)
+        command_listener = self._command_listener
+        self.__init__(
+            trading_date=trading_date,
+            watch_symbols=watch_symbols,
+            portfolio=portfolio,
+            rank_offset=self._rank_offset,
+            portfolio_lock=self._portfolio_lock,
+            params=self.params,
+            session_id=self.session_id,
+            vector_rules=self.vector_rules,
+        )
+        self._command_listener = command_listener
+
+    def set_command_listener(self, listener: CommandListener | None) -> None:
+        self._command_listener = listener
 
     def set_buy_entry_blocked_by_degraded(self, blocked: bool) -> None:
         self._buy_entry_blocked_by_degraded = blocked
@@ -68,6 +117,46 @@ class TseService:
         return self._buy_entry_blocked_by_degraded
 
     def on_quote(self, event: QuoteEvent) -> ServiceOutput:
+        with self._portfolio_lock:
+            return self._handle_quote(event)
+
+    def on_position_update(self, event: PositionUpdateEvent) -> ServiceOutput:
+        with self._portfolio_lock:
+            return self._handle_position_update(event)
+
+    def on_quotes(self, events: Sequence[QuoteEvent]) -> list[ServiceOutput]:
+        with self._portfolio_lock:
+            self.prepare_quote_batch(events)
+            try:
+                return [self._handle_quote(event) for event in events]
+            finally:
+                self.clear_quote_batch()
+
+    def prepare_quote_batch(self, events: Sequence[QuoteEvent]) -> None:
+        if self._vector_engine is None:
+            return
+        first: dict[str, QuoteEvent] = {}
+        for event in events:
+            if event.trading_date == self.ctx.trading_date and event.symbol in self.ctx.symbols and is_positive_price(event.current_price):
+                first.setdefault(event.symbol, event)
+        if not first:
+            return
+        try:
+            self._vector_engine.sync(self.ctx, list(first))
+            evaluation = self._vector_engine.evaluate(
+                self._vector_engine.scale_prices({symbol: event.current_price for symbol, event in first.items()})
+            )
+        except ValueError:
+            return
+        self._vector_verdicts = {
+            symbol: (event, self._vector_snapshot(self.ctx.symbols[symbol]), evaluation.verdict(symbol))
+            for symbol, event in first.items()
+        }
+
+    def clear_quote_batch(self) -> None:
+        self._vector_verdicts = {}
+
+    def _handle_quote(self, event: QuoteEvent) -> ServiceOutput:
         output = ServiceOutput()
 
         if event.trading_date != self.ctx.trading_date:
@@ -102,7 +191,7 @@ class TseService:
 
         return output
 
-    def on_position_update(self, event: PositionUpdateEvent) -> ServiceOutput:
+    def _handle_position_update(self, event: PositionUpdateEvent) -> ServiceOutput:
         output = ServiceOutput()
 
         if event.trading_date != self.ctx.trading_date:
@@ -123,7 +212,7 @@ class TseService:
             self.ctx.portfolio.gate_open = True
             self.ctx.portfolio.active_symbol = None
 
-        if should_lock_min_profit(event.current_profit_rate) and not self.ctx.portfolio.min_profit_locked:
+        if should_lock_min_profit(event.current_profit_rate, self.params.min_profit_lock_pct) and not self.ctx.portfolio.min_profit_locked:
             self.ctx.portfolio.min_profit_locked = True
             output.strategy_events.append(
                 StrategyEvent(
@@ -140,6 +229,7 @@ class TseService:
             min_profit_locked=self.ctx.portfolio.min_profit_locked,
             current_profit_rate=event.current_profit_rate,
             max_profit_rate=event.max_profit_rate,
+            sell_threshold_pct=self.params.profit_preservation_sell_pct,
         ) and not self.ctx.portfolio.sell_signaled:
             self.ctx.portfolio.sell_signaled = True
             command = PlaceSellOrderCommand(
@@ -149,7 +239,7 @@ class TseService:
                 order_price=event.current_price,
                 reason_code="TSE_PROFIT_PRESERVATION_BREAK",
             )
-            output.commands.append(command)
+            self._emit_command(output, command)
             output.strategy_events.append(
                 StrategyEvent(
                     event_type="SELL_SIGNAL",
@@ -174,9 +264,15 @@ class TseService:
         if symbol_ctx.reference_price is None:
             return
 
-        drop_rate = calc_drop_rate(symbol_ctx.reference_price, event.current_price)
+        verdict = self._take_vector_verdict(symbol_ctx=symbol_ctx, event=event)
+        if verdict is None:
+            drop_rate = calc_drop_rate(symbol_ctx.reference_price, event.current_price)
+            enter_candidate = should_enter_buy_candidate(drop_rate, self.params.drop_threshold_pct)
+        else:
+            drop_rate = verdict.drop_rate
+            enter_candidate = verdict.enter_candidate
 
-        if symbol_ctx.state in {"TRACKING", "BUY_CANDIDATE"} and should_enter_buy_candidate(drop_rate):
+        if symbol_ctx.state in {"TRACKING", "BUY_CANDIDATE"} and enter_candidate:
             if symbol_ctx.state != "BUY_CANDIDATE":
                 symbol_ctx.state = "BUY_CANDIDATE"
                 symbol_ctx.tracked_low = event.current_price
@@ -194,7 +290,8 @@ class TseService:
         if symbol_ctx.state != "BUY_CANDIDATE" or symbol_ctx.tracked_low is None:
             return
 
-        if should_update_tracked_low(event.current_price, symbol_ctx.tracked_low):
+        new_low = should_update_tracked_low(event.current_price, symbol_ctx.tracked_low) if verdict is None else verdict.new_low
+        if new_low:
             symbol_ctx.tracked_low = event.current_price
             output.strategy_events.append(
                 StrategyEvent(
@@ -207,11 +304,18 @@ class TseService:
                 )
             )
 
-        rebound_rate = calc_rebound_rate(symbol_ctx.tracked_low, event.current_price)
-        if should_trigger_rebound_buy(rebound_rate) and self._is_within_rebound_entry_price_band(
-            tracked_low=symbol_ctx.tracked_low,
-            current_price=event.current_price,
-        ):
+        if verdict is None:
+            rebound_rate = calc_rebound_rate(symbol_ctx.tracked_low, event.current_price)
+            rebound_trigger = should_trigger_rebound_buy(rebound_rate, self.params.rebound_threshold_pct) and self._is_within_rebound_entry_price_band(
+                tracked_low=symbol_ctx.tracked_low,
+                current_price=event.current_price,
+                rebound_threshold_pct=self.params.rebound_threshold_pct,
+            )
+        else:
+            rebound_rate = verdict.rebound_rate
+            rebound_trigger = verdict.rebound_trigger
+
+        if rebound_trigger:
             self.scheduler.enqueue_candidate(
                 occurred_at=event.occurred_at,
                 sequence=event.sequence,
@@ -221,6 +325,19 @@ class TseService:
                 rebound_rate=rebound_rate,
             )
 
+    def _take_vector_verdict(self, *, symbol_ctx: SymbolContext, event: QuoteEvent) -> VectorRuleVerdict | None:
+        entry = self._vector_verdicts.pop(event.symbol, None)
+        if entry is None:
+            return None
+        prepared_event, snapshot, verdict = entry
+        if prepared_event is not event or snapshot != self._vector_snapshot(symbol_ctx):
+            return None
+        return verdict
+
+    @staticmethod
+    def _vector_snapshot(symbol_ctx: SymbolContext) -> tuple[Any, ...]:
+        return (symbol_ctx.state, symbol_ctx.reference_price, symbol_ctx.tracked_low)
+
     def _flush_buy_candidate(self, *, event: QuoteEvent, output: ServiceOutput) -> None:
         if not self.ctx.portfolio.gate_open or self.ctx.portfolio.state != "NO_POSITION":
             return
@@ -245,7 +362,7 @@ class TseService:
             order_price=compute_buy_limit_price(candidate.current_price, ticks_up=2),
             reason_code="TSE_REBOUND_BUY_SIGNAL",
         )
-        output.commands.append(command)
+        self._emit_command(output, command)
         output.strategy_events.append(
             StrategyEvent(
                 event_type="BUY_SIGNAL",
@@ -257,13 +374,23 @@ class TseService:
             )
         )
 
+    def _emit_command(self, output: ServiceOutput, command: PlaceBuyOrderCommand | PlaceSellOrderCommand) -> None:
+        output.commands.append(command)
+        if self._command_listener is not None:
+            self._command_listener(command)
+
     def _next_command_id(self, trading_date: date, symbol: str, side: str) -> str:
         self._command_sequence += 1
-        return f"{trading_date.isoformat()}-{symbol}-{side}-{self._command_sequence}"
+        return f"{trading_date.isoformat()}-{symbol}-{side}-{self.session_id}-{self._command_sequence}"
 
     @staticmethod
-    def _is_within_rebound_entry_price_band(*, tracked_low: Decimal, current_price: Decimal) -> bool:
-        trigger_price = tracked_low * (Decimal("1") + (REBOUND_THRESHOLD_PCT / Decimal("100")))
+    def _is_within_rebound_entry_price_band(
+        *,
+        tracked_low: Decimal,
+        current_price: Decimal,
+        rebound_threshold_pct: Decimal = REBOUND_THRESHOLD_PCT,
+    ) -> bool:
+        trigger_price = tracked_low * (Decimal("1") + (rebound_threshold_pct / Decimal("100")))
         tick = resolve_kospi_tick_size(trigger_price)
         max_allowed_price = trigger_price + (tick * Decimal("2"))
         return current_price < max_allowed_price
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Callable, Sequence
+from uuid import uuid4
+
+from kia.contracts import AsyncKiaGateway, KiaGateway
+
+from .constants import MAX_WATCH_SYMBOLS, QUOTE_BATCH_MAX_SYMBOLS
+from .models import DailyContext, PortfolioContext, PositionUpdateEvent, QuoteEvent, ServiceOutput, StrategyParams
+from .quote_monitoring import (
+    AsyncQuoteMonitoringLoop,
+    LoopState,
+    QuoteCycleResult,
+    QuoteMonitoringConfig,
+    QuoteMonitoringLoop,
+    TickRecorder,
+)
+from .scheduler import FixedRateScheduler
+from .service import CommandListener, TseService
+
+
+def partition_watch_symbols(watch_symbols: Sequence[str], *, shard_size: int = QUOTE_BATCH_MAX_SYMBOLS) -> list[list[str]]:
+    if not 1 <= shard_size <= QUOTE_BATCH_MAX_SYMBOLS:
+        raise ValueError(f"shard_size must be between 1 and {QUOTE_BATCH_MAX_SYMBOLS}")
+    symbols = list(watch_symbols)
+    return [symbols[start : start + shard_size] for start in range(0, len(symbols), shard_size)]
+
+
+class ShardedTseService:
+    def __init__(
+        self,
+        *,
+        trading_date: date,
+        watch_symbols: list[str],
+        shard_size: int = QUOTE_BATCH_MAX_SYMBOLS,
+        params: StrategyParams | None = None,
+        session_id: str | None = None,
+        vector_rules: bool = False,
+    ) -> None:
+        if not 1 <= len(watch_symbols) <= MAX_WATCH_SYMBOLS:
+            raise ValueError(f"watch_symbols size must be between 1 and {MAX_WATCH_SYMBOLS}")
+        if len(set(watch_symbols)) != len(watch_symbols):
+            raise ValueError("watch_symbols must not contain duplicates")
+
+        self.session_id = session_id or uuid4().hex[:6]
+        self.params = params or StrategyParams()
+        self.portfolio_lock = threading.RLock()
+        portfolio = PortfolioContext()
+        self.shards = [
+            TseService(
+                trading_date=trading_date,
+                watch_symbols=chunk,
+                portfolio=portfolio,
+                rank_offset=index * shard_size,
+                portfolio_lock=self.portfolio_lock,
+                params=self.params,
+                session_id=self.session_id,
+                vector_rules=vector_rules,
+            )
+            for index, chunk in enumerate(partition_watch_symbols(watch_symbols, shard_size=shard_size))
+        ]
+        self._reindex()
+
+    @property
+    def buy_entry_blocked_by_degraded(self) -> bool:
+        return any(shard.buy_entry_blocked_by_degraded for shard in self.shards)
+
+    def shard_for(self, symbol: str) -> TseService | None:
+        return self._shard_by_symbol.get(symbol)
+
+    def on_day_changed(self, trading_date: date) -> None:
+        with self.portfolio_lock:
+            portfolio = PortfolioContext()
+            for shard in self.shards:
+                shard.on_day_changed(trading_date, portfolio=portfolio)
+            self._reindex()
+
+    def set_command_listener(self, listener: CommandListener | None) -> None:
+        for shard in self.shards:
+            shard.set_command_listener(listener)
+
+    def set_buy_entry_blocked_by_degraded(self, blocked: bool) -> None:
+        for shard in self.shards:
+            shard.set_buy_entry_blocked_by_degraded(blocked)
+
+    def on_quote(self, event: QuoteEvent) -> ServiceOutput:
+        shard = self._shard_by_symbol.get(event.symbol)
+        if shard is None:
+            return ServiceOutput()
+        return shard.on_quote(event)
+
+    def on_quotes(self, events: Sequence[QuoteEvent]) -> list[ServiceOutput]:
+        with self.portfolio_lock:
+            for shard in self.shards:
+                shard.prepare_quote_batch(events)
+            try:
+                return [self.on_quote(event) for event in events]
+            finally:
+                for shard in self.shards:
+                    shard.clear_quote_batch()
+
+    def on_position_update(self, event: PositionUpdateEvent) -> ServiceOutput:
+        with self.portfolio_lock:
+            shard = self._shard_by_symbol.get(event.symbol)
+            if shard is None and self.ctx.portfolio.active_symbol is not None:
+                shard = self._shard_by_symbol.get(self.ctx.portfolio.active_symbol)
+            return (shard or self.shards[0]).on_position_update(event)
+
+    def _reindex(self) -> None:
+        self._shard_by_symbol = {symbol: shard for shard in self.shards for symbol in shard.ctx.symbols}
+        first = self.shards[0].ctx
+        self.ctx = DailyContext(
+            trading_date=first.trading_date,
+            symbols={symbol: symbol_ctx for shard in self.shards for symbol, symbol_ctx in shard.ctx.symbols.items()},
+            portfolio=first.portfolio,
+        )
+
+
+def _merge_state(states: list[LoopState]) -> LoopState:
+    if all(state == "STOPPED" for state in states):
+        return "STOPPED"
+    if any(state == "DEGRADED" for state in states):
+        return "DEGRADED"
+    return "RUNNING"
+
+
+def _merge_cycles(state: LoopState, cycles: list[QuoteCycleResult]) -> QuoteCycleResult:
+    fetch_errors = [cycle.fetch_error for cycle in cycles if cycle.fetch_error]
+    return QuoteCycleResult(
+        poll_cycle_id=cycles[0].poll_cycle_id,
+        state=state,
+        partial=any(cycle.partial for cycle in cycles),
+        quote_count=sum(cycle.quote_count for cycle in cycles),
+        error_count=sum(cycle.error_count for cycle in cycles),
+        quotes=[quote for cycle in cycles for quote in cycle.quotes],
+        outputs=[output for cycle in cycles for output in cycle.outputs],
+        fetch_error="; ".join(fetch_errors) or None,
+    )
+
+
+class _ShardedQuoteMonitoringBase:
+    loops: Sequence[QuoteMonitoringLoop | AsyncQuoteMonitoringLoop]
+
+    def __init__(self, *, config: QuoteMonitoringConfig, monotonic_fn: Callable[[], float] | None) -> None:
+        self._config = config
+        self._monotonic_fn = monotonic_fn
+        self.scheduler: FixedRateScheduler | None = None
+
+    @property
+    def state(self) -> LoopState:
+        return _merge_state([loop.state for loop in self.loops])
+
+    @property
+    def poll_interval_seconds(self) -> float:
+        return self._config.poll_interval_ms / 1000
+
+    def new_scheduler(self) -> FixedRateScheduler:
+        self.scheduler = FixedRateScheduler(
+            interval_seconds=self.poll_interval_seconds,
+            overrun_policy=self._config.overrun_policy,
+            monotonic_fn=self._monotonic_fn,
+        )
+        return self.scheduler
+
+    def start(self) -> None:
+        for loop in self.loops:
+            loop.start()
+
+    def stop(self) -> None:
+        for loop in self.loops:
+            loop.stop()
+
+
+class ShardedQuoteMonitoringLoop(_ShardedQuoteMonitoringBase):
+    def __init__(
+        self,
+        *,
+        tse_service: ShardedTseService,
+        kia_gateways: Sequence[KiaGateway],
+        config: QuoteMonitoringConfig,
+        now_fn: Callable[[], datetime] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        recorder: TickRecorder | None = None,
+    ) -> None:
+        if len(kia_gateways) != len(tse_service.shards):
+            raise ValueError("kia_gateways must provide one gateway per shard")
+        super().__init__(config=config, monotonic_fn=monotonic_fn)
+        self.loops: list[QuoteMonitoringLoop] = [
+            QuoteMonitoringLoop(
+                tse_service=shard,
+                kia_gateway=gateway,
+                config=config,
+                now_fn=now_fn,
+                monotonic_fn=monotonic_fn,
+                recorder=recorder,
+            )
+            for shard, gateway in zip(tse_service.shards, kia_gateways)
+        ]
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def stop(self) -> None:
+        super().stop()
+        with self._executor_lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_cycle(self) -> QuoteCycleResult:
+        if len(self.loops) == 1:
+            return _merge_cycles(self.state, [self.loops[0].run_cycle()])
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self.loops), thread_name_prefix="tse-quote-shard")
+            executor = self._executor
+        cycles = list(executor.map(lambda loop: loop.run_cycle(), self.loops))
+        return _merge_cycles(self.state, cycles)
+
+
+class AsyncShardedQuoteMonitoringLoop(_ShardedQuoteMonitoringBase):
+    def __init__(
+        self,
+        *,
+        tse_service: ShardedTseService,
+        kia_gateways: Sequence[AsyncKiaGateway],
+        config: QuoteMonitoringConfig,
+        now_fn: Callable[[], datetime] | None = None,
+        monotonic_fn: Callable[[], float] | None = None,
+        recorder: TickRecorder | None = None,
+    ) -> None:
+        if len(kia_gateways) != len(tse_service.shards):
+            raise ValueError("kia_gateways must provide one gateway per shard")
+        super().__init__(config=config, monotonic_fn=monotonic_fn)
+        self.loops: list[AsyncQuoteMonitoringLoop] = [
+            AsyncQuoteMonitoringLoop(
+                tse_service=shard,
+                kia_gateway=gateway,
+                config=config,
+                now_fn=now_fn,
+                monotonic_fn=monotonic_fn,
+                recorder=recorder,
+            )
+            for shard, gateway in zip(tse_service.shards, kia_gateways)
+        ]
+
+    async def run_cycle(self) -> QuoteCycleResult:
+        cycles = await asyncio.gather(*(loop.run_cycle() for loop in self.loops))
+        return _merge_cycles(self.state, list(cycles))
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Sequence
+
+from kia.contracts import MarketQuote
+
+from .backtest import BacktestConfig, BacktestEngine, MinuteBar, bars_to_quotes
+from .constants import PCT_Q
+from .models import StrategyParams
+
+_PARAM_NAMES = tuple(item.name for item in fields(StrategyParams))
+
+
+@dataclass(frozen=True)
+class SweepDay:
+    trading_date: date
+    bars: tuple[MinuteBar, ...]
+
+
+@dataclass(frozen=True)
+class SweepDayResult:
+    trading_date: date
+    net_pnl: Decimal
+    trade_count: int
+    win_count: int
+    max_drawdown: Decimal
+
+
+@dataclass(frozen=True)
+class SweepOutcome:
+    params: StrategyParams
+    total_net_pnl: Decimal
+    trade_count: int
+    win_count: int
+    max_drawdown: Decimal
+    days: tuple[SweepDayResult, ...]
+
+
+def _validate_axes(names: Iterable[str]) -> None:
+    unknown = sorted(set(names) - set(_PARAM_NAMES))
+    if unknown:
+        raise ValueError(f"unknown strategy parameters: {', '.join(unknown)}")
+
+
+def grid_parameter_sets(**axes: Sequence[Decimal]) -> list[StrategyParams]:
+    _validate_axes(axes)
+    names = list(axes)
+    return [StrategyParams(**dict(zip(names, values))) for values in itertools.product(*(axes[name] for name in names))]
+
+
+def random_parameter_sets(*, count: int, seed: int | None = None, **ranges: tuple[Decimal, Decimal]) -> list[StrategyParams]:
+    _validate_axes(ranges)
+    rng = random.Random(seed)
+    param_sets: list[StrategyParams] = []
+    for _ in range(count):
+        values = {
+            name: (low + (high - low) * Decimal(str(rng.random()))).quantize(PCT_Q)
+            for name, (low, high) in ranges.items()
+        }
+        param_sets.append(StrategyParams(**values))
+    return param_sets
+
+
+class _SweepWorkerState:
+    def __init__(self, *, days: Sequence[SweepDay], config: BacktestConfig) -> None:
+        self.config = config
+        self.days = list(days)
+        self._symbols: dict[date, list[str]] = {}
+        self._quotes: dict[tuple[str, date], list[MarketQuote]] = {}
+        self._results: dict[tuple[StrategyParams, date], SweepDayResult] = {}
+
+    def evaluate(self, params: StrategyParams) -> SweepOutcome:
+        results = [self._evaluate_day(params, day) for day in self.days]
+        return SweepOutcome(
+            params=params,
+            total_net_pnl=sum((result.net_pnl for result in results), Decimal("0")),
+            trade_count=sum(result.trade_count for result in results),
+            win_count=sum(result.win_count for result in results),
+            max_drawdown=min((result.max_drawdown for result in results), default=Decimal("0")),
+            days=tuple(results),
+        )
+
+    def _evaluate_day(self, params: StrategyParams, day: SweepDay) -> SweepDayResult:
+        key = (params, day.trading_date)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+        symbols = self._day_symbols(day)
+        engine = BacktestEngine(
+            trading_date=day.trading_date,
+            watch_symbols=symbols,
+            config=replace(self.config, params=params),
+        )
+        streams = [self._symbol_quotes(symbol, day) for symbol in symbols]
+        result = engine.run_quotes(heapq.merge(*streams, key=lambda quote: quote.as_of))
+        day_result = SweepDayResult(
+            trading_date=day.trading_date,
+            net_pnl=result.report.total_net_pnl,
+            trade_count=len(result.trades),
+            win_count=sum(1 for trade in result.trades if trade.net_pnl > 0),
+            max_drawdown=result.max_drawdown,
+        )
+        self._results[key] = day_result
+        return day_result
+
+    def _day_symbols(self, day: SweepDay) -> list[str]:
+        symbols = self._symbols.get(day.trading_date)
+        if symbols is None:
+            symbols = list(dict.fromkeys(bar.symbol for bar in day.bars))
+            self._symbols[day.trading_date] = symbols
+        return symbols
+
+    def _symbol_quotes(self, symbol: str, day: SweepDay) -> list[MarketQuote]:
+        key = (symbol, day.trading_date)
+        quotes = self._quotes.get(key)
+        if quotes is None:
+            quotes = bars_to_quotes(
+                (bar for bar in day.bars if bar.symbol == symbol),
+                price_path=self.config.price_path,
+            )
+            self._quotes[key] = quotes
+        return quotes
+
+
+_worker_state: _SweepWorkerState | None = None
+
+
+def _init_sweep_worker(days: Sequence[SweepDay], config: BacktestConfig) -> None:
+    global _worker_state
+    _worker_state = _SweepWorkerState(days=days, config=config)
+
+
+def _evaluate_in_worker(params: StrategyParams) -> SweepOutcome:
+    if _worker_state is None:
+        raise RuntimeError("sweep worker is not initialized")
+    return _worker_state.evaluate(params)
+
+
+class ParameterSweep:
+    def __init__(
+        self,
+        *,
+        days: Sequence[SweepDay],
+        config: BacktestConfig | None = None,
+        max_workers: int | None = None,
+        start_method: str = "spawn",
+    ) -> None:
+        if not days:
+            raise ValueError("days must not be empty")
+        self.days = list(days)
+        self.config = config or BacktestConfig()
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._start_method = start_method
+        self._local_state: _SweepWorkerState | None = None
+
+    def run(self, param_sets: Iterable[StrategyParams]) -> list[SweepOutcome]:
+        param_sets = list(param_sets)
+        if not param_sets:
+            return []
+        workers = min(self._max_workers, len(param_sets))
+        if workers <= 1:
+            if self._local_state is None:
+                self._local_state = _SweepWorkerState(days=self.days, config=self.config)
+            outcomes = [self._local_state.evaluate(params) for params in param_sets]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(self._start_method),
+                initializer=_init_sweep_worker,
+                initargs=(self.days, self.config),
+            ) as executor:
+                chunksize = max(1, len(param_sets) // (workers * 4))
+                outcomes = list(executor.map(_evaluate_in_worker, param_sets, chunksize=chunksize))
+        return sorted(outcomes, key=lambda outcome: (-outcome.total_net_pnl, -outcome.max_drawdown))
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Iterator
+
+from kia.contracts import MarketQuote, PollQuoteError, PollQuotesRequest, PollQuotesResult
+
+from .models import PositionUpdateEvent, ServiceOutput
+from .quote_monitoring import QuoteMonitoringConfig, QuoteMonitoringLoop
+from .service import TseService
+
+TICK_LOG_MAGIC = b"PTTICK\x00\x01"
+TICK_LOG_VERSION = 1
+_HEADER = struct.Struct("<8sHHI16x")
+_RECORD = struct.Struct("<BBHII4xqqqqqq")
+TICK_LOG_HEADER_SIZE = _HEADER.size
+TICK_LOG_RECORD_SIZE = _RECORD.size
+
+_KIND_CYCLE = 1
+_KIND_QUOTE = 2
+_KIND_QUOTE_ERROR = 3
+_KIND_FETCH_FAILURE = 4
+_KIND_POSITION = 5
+
+_FLAG_SET = 1
+_PRICE_SCALE = 100
+_RATE_SCALE = 10_000
+_POSITION_STATES = ("BUY_REQUESTED", "LONG_OPEN", "SELL_REQUESTED", "CLOSED", "BUY_FAILED")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MARKET_TIMEZONE = timezone(timedelta(hours=9))
+
+
+def to_epoch_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=_MARKET_TIMEZONE)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value: int) -> datetime:
+    return (_EPOCH + timedelta(microseconds=int(value))).astimezone(_MARKET_TIMEZONE)
+
+
+def _to_scaled(value: Decimal, scale: int) -> int:
+    scaled = value * scale
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"value has more precision than scale {scale}: {value}")
+    return int(scaled)
+
+
+def tick_log_path(directory: str, trading_date: date) -> str:
+    return os.path.join(directory, f"ticks-{trading_date.strftime('%Y%m%d')}.bin")
+
+
+def _dictionary_path(log_path: str) -> str:
+    return f"{log_path}.dict"
+
+
+@dataclass(frozen=True)
+class RecordedPollCycle:
+    recorded_at: datetime
+    result: PollQuotesResult | None
+    fetch_error: str | None = None
+
+
+@dataclass(frozen=True)
+class RecordedPositionUpdate:
+    recorded_at: datetime
+    event: PositionUpdateEvent
+
+
+RecordedEvent = RecordedPollCycle | RecordedPositionUpdate
+
+
+class TickLogWriter:
+    def __init__(self, *, directory: str, trading_date: date) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.trading_date = trading_date
+        self.path = tick_log_path(directory, trading_date)
+        self._logger = logging.getLogger("privatetrade.tse.tick_log")
+        self._strings = _load_dictionary(_dictionary_path(self.path))
+        self._string_ids = {value: index for index, value in enumerate(self._strings)}
+        self._prepare_file()
+        self._file = open(self.path, "ab")
+        self._dictionary_file = open(_dictionary_path(self.path), "a", encoding="utf-8")
+        self._queue: queue.Queue[tuple[str, Any, datetime] | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._drain, name="tse-tick-log", daemon=True)
+        self._thread.start()
+
+    def record_poll_result(self, result: PollQuotesResult, *, recorded_at: datetime) -> None:
+        self._queue.put(("poll", result, recorded_at))
+
+    def record_fetch_failure(self, error: str, *, recorded_at: datetime) -> None:
+        self._queue.put(("failure", error, recorded_at))
+
+    def record_position_update(self, event: PositionUpdateEvent, *, recorded_at: datetime) -> None:
+        self._queue.put(("position", event, recorded_at))
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._dictionary_file.close()
+
+    def _prepare_file(self) -> None:
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= TICK_LOG_HEADER_SIZE:
+            size = os.path.getsize(self.path)
+            torn = (size - TICK_LOG_HEADER_SIZE) % TICK_LOG_RECORD_SIZE
+            if torn:
+                with open(self.path, "r+b") as file:
+                    file.truncate(size - torn)
+            return
+        with open(self.path, "wb") as file:
+            file.write(
+                _HEADER.pack(
+                    TICK_LOG_MAGIC,
+                    TICK_LOG_VERSION,
+                    TICK_LOG_RECORD_SIZE,
+                    int(self.trading_date.strftime("%Y%m%d")),
+                )
+            )
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                kind, payload, recorded_at = item
+                try:
+                    records = self._encode(kind, payload, recorded_at)
+                except ValueError:
+                    self._logger.exception("Dropped unencodable tick log entry: kind=%s", kind)
+                    continue
+                self._dictionary_file.flush()
+                self._file.write(b"".join(records))
+                if self._queue.empty():
+                    self._file.flush()
+            finally:
+                self._queue.task_done()
+
+    def _string_id(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+            self._dictionary_file.write(json.dumps(value, ensure_ascii=False) + "\n")
+        return string_id
+
+    def _encode(self, kind: str, payload: Any, recorded_at: datetime) -> list[bytes]:
+        recorded_us = to_epoch_us(recorded_at)
+        if kind == "failure":
+            return [_RECORD.pack(_KIND_FETCH_FAILURE, 0, 0, self._string_id(payload), 0, recorded_us, 0, 0, 0, 0, 0)]
+        if kind == "position":
+            event: PositionUpdateEvent = payload
+            return [
+                _RECORD.pack(
+                    _KIND_POSITION,
+                    _FLAG_SET if event.min_profit_locked else 0,
+                    _POSITION_STATES.index(event.position_state),
+                    self._string_id(event.symbol),
+                    0,
+                    recorded_us,
+                    to_epoch_us(event.updated_at),
+                    _to_scaled(event.avg_buy_price, _PRICE_SCALE),
+                    _to_scaled(event.current_price, _PRICE_SCALE),
+                    _to_scaled(event.current_profit_rate, _RATE_SCALE),
+                    _to_scaled(event.max_profit_rate, _RATE_SCALE),
+                )
+            ]
+        result: PollQuotesResult = payload
+        records = [
+            _RECORD.pack(
+                _KIND_CYCLE,
+                _FLAG_SET if result.partial else 0,
+                len(result.errors),
+                0,
+                len(result.quotes),
+                recorded_us,
+                0,
+                0,
+                0,
+                0,
+                0,
+            )
+        ]
+        for quote in result.quotes:
+            records.append(
+                _RECORD.pack(
+                    _KIND_QUOTE,
+                    0,
+                    0,
+                    self._string_id(quote.symbol),
+                    quote.tick_size,
+                    recorded_us,
+                    to_epoch_us(quote.as_of),
+                    _to_scaled(quote.price, _PRICE_SCALE),
+                    self._string_id(quote.symbol_name) + 1 if quote.symbol_name is not None else 0,
+                    0,
+                    0,
+                )
+            )
+        for error in result.errors:
+            records.append(
+                _RECORD.pack(
+                    _KIND_QUOTE_ERROR,
+                    _FLAG_SET if error.retryable else 0,
+                    0,
+                    self._string_id(error.symbol),
+                    0,
+                    recorded_us,
+                    0,
+                    0,
+                    self._string_id(error.code),
+                    0,
+                    0,
+                )
+            )
+        return records
+
+
+def _load_dictionary(path: str) -> list[str]:
+    if not os.path.exists(path):
+        return []
+    strings: list[str] = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                strings.append(json.loads(line))
+            except ValueError:
+                break
+    return strings
+
+
+class TickLogReader:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._strings = _load_dictionary(_dictionary_path(path))
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, yyyymmdd = _HEADER.unpack_from(self._mmap, 0)
+        if magic != TICK_LOG_MAGIC or version != TICK_LOG_VERSION or record_size != TICK_LOG_RECORD_SIZE:
+            self.close()
+            raise ValueError(f"not a tick log: {path}")
+        self.trading_date = datetime.strptime(str(yyyymmdd), "%Y%m%d").date()
+        self.record_count = (len(self._mmap) - TICK_LOG_HEADER_SIZE) // TICK_LOG_RECORD_SIZE
+
+    def __enter__(self) -> TickLogReader:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __iter__(self) -> Iterator[RecordedEvent]:
+        records = _RECORD.iter_unpack(
+            self._mmap[TICK_LOG_HEADER_SIZE : TICK_LOG_HEADER_SIZE + self.record_count * TICK_LOG_RECORD_SIZE]
+        )
+        for kind, flags, code, ref, count, recorded_us, v1, v2, v3, v4, v5 in records:
+            recorded_at = from_epoch_us(recorded_us)
+            if kind == _KIND_FETCH_FAILURE:
+                yield RecordedPollCycle(recorded_at=recorded_at, result=None, fetch_error=self._strings[ref])
+            elif kind == _KIND_POSITION:
+                yield RecordedPositionUpdate(
+                    recorded_at=recorded_at,
+                    event=PositionUpdateEvent(
+                        trading_date=self.trading_date,
+                        symbol=self._strings[ref],
+                        position_state=_POSITION_STATES[code],
+                        avg_buy_price=Decimal(v2) / _PRICE_SCALE,
+                        current_price=Decimal(v3) / _PRICE_SCALE,
+                        current_profit_rate=Decimal(v4) / _RATE_SCALE,
+                        max_profit_rate=Decimal(v5) / _RATE_SCALE,
+                        min_profit_locked=bool(flags & _FLAG_SET),
+                        updated_at=from_epoch_us(v1),
+                    ),
+                )
+            elif kind == _KIND_CYCLE:
+                quotes = [self._decode_quote(next(records)) for _ in range(count)]
+                errors = [self._decode_error(next(records)) for _ in range(code)]
+                yield RecordedPollCycle(
+                    recorded_at=recorded_at,
+                    result=PollQuotesResult(
+                        poll_cycle_id=f"replay-{recorded_us}",
+                        quotes=quotes,
+                        errors=errors,
+                        partial=bool(flags & _FLAG_SET),
+                    ),
+                )
+
+    def _decode_quote(self, record: tuple[int, ...]) -> MarketQuote:
+        _kind, _flags, _code, ref, tick_size, _recorded_us, as_of_us, price, name_id, _v4, _v5 = record
+        return MarketQuote(
+            symbol=self._strings[ref],
+            price=Decimal(price) / _PRICE_SCALE,
+            tick_size=tick_size,
+            as_of=from_epoch_us(as_of_us),
+            symbol_name=self._strings[name_id - 1] if name_id else None,
+        )
+
+    def _decode_error(self, record: tuple[int, ...]) -> PollQuoteError:
+        _kind, flags, _code, ref, _count, _recorded_us, _v1, _v2, code_id, _v4, _v5 = record
+        return PollQuoteError(symbol=self._strings[ref], code=self._strings[code_id], retryable=bool(flags & _FLAG_SET))
+
+
+class _ReplayGateway:
+    def __init__(self) -> None:
+        self.cycle: RecordedPollCycle | None = None
+
+    def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
+        cycle = self.cycle
+        if cycle is None or cycle.result is None:
+            raise RuntimeError(cycle.fetch_error if cycle is not None else "no recorded cycle")
+        return cycle.result
+
+
+class TickReplayDriver:
+    def __init__(
+        self,
+        *,
+        tse_service: TseService,
+        reader: TickLogReader,
+        config: QuoteMonitoringConfig,
+        speed: float | None = None,
+        sleep_fn: Callable[[float], None] | None = None,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be > 0 or None for max speed")
+        self._tse_service = tse_service
+        self._reader = reader
+        self._speed = speed
+        self._sleep_fn = sleep_fn or time.sleep
+        self._gateway = _ReplayGateway()
+        self._loop = QuoteMonitoringLoop(tse_service=tse_service, kia_gateway=self._gateway, config=config)
+
+    def run(self) -> list[ServiceOutput]:
+        outputs: list[ServiceOutput] = []
+        previous_at: datetime | None = None
+        for recorded in self._reader:
+            if self._speed is not None and previous_at is not None:
+                delay = (recorded.recorded_at - previous_at).total_seconds() / self._speed
+                if delay > 0:
+                    self._sleep_fn(delay)
+            previous_at = recorded.recorded_at
+            if isinstance(recorded, RecordedPositionUpdate):
+                outputs.append(self._tse_service.on_position_update(recorded.event))
+                continue
+            self._gateway.cycle = recorded
+            outputs.extend(self._loop.run_cycle().outputs)
+        return outputs
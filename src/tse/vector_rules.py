@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Sequence
+
+import numpy as np
+
+from .constants import EPS, PCT_Q
+from .models import DailyContext, StrategyParams
+
+PRICE_SCALE = 100
+RATE_SCALE = int(Decimal(1) / PCT_Q)
+
+_RATE_EXPONENT = int(PCT_Q.as_tuple().exponent)
+_PCT_NUMERATOR = 100 * RATE_SCALE
+_EPS_UNITS = int(EPS * RATE_SCALE)
+_BAND_DENOMINATOR = 100 * RATE_SCALE
+_TICK_LIMITS = np.array([1000, 5000, 10000, 50000, 100000, 500000], dtype=np.int64) * PRICE_SCALE
+_TICK_SIZES = np.array([1, 5, 10, 50, 100, 500, 1000], dtype=np.int64) * PRICE_SCALE
+
+
+def to_scaled_price(price: Decimal | None) -> int:
+    if price is None:
+        return 0
+    scaled = price * PRICE_SCALE
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"price has more precision than PRICE_SCALE: {price}")
+    return int(scaled)
+
+
+def rate_from_units(units: int) -> Decimal:
+    return Decimal(int(units)).scaleb(_RATE_EXPONENT)
+
+
+def _div_round_half_up(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    safe = np.where(denominator > 0, denominator, 1)
+    magnitude = (2 * np.abs(numerator) + safe) // (2 * safe)
+    return np.where(denominator > 0, np.sign(numerator) * magnitude, 0)
+
+
+def rate_units(base: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    return _div_round_half_up(delta * _PCT_NUMERATOR, base)
+
+
+def tick_sizes(price_numerator: np.ndarray, price_denominator: int = 1) -> np.ndarray:
+    index = np.zeros(price_numerator.shape, dtype=np.int64)
+    for limit in _TICK_LIMITS:
+        index += price_numerator >= limit * price_denominator
+    return _TICK_SIZES[index]
+
+
+@dataclass(frozen=True)
+class VectorRuleVerdict:
+    drop_rate: Decimal
+    enter_candidate: bool
+    new_low: bool
+    rebound_rate: Decimal
+    rebound_trigger: bool
+
+
+@dataclass(frozen=True)
+class VectorRuleEvaluation:
+    symbols: tuple[str, ...]
+    has_quote: np.ndarray
+    drop_rate_units: np.ndarray
+    enter_candidate: np.ndarray
+    new_low: np.ndarray
+    tracked_low: np.ndarray
+    rebound_rate_units: np.ndarray
+    rebound_trigger: np.ndarray
+    within_entry_band: np.ndarray
+
+    def drop_rate(self, symbol: str) -> Decimal:
+        return rate_from_units(self.drop_rate_units[self.symbols.index(symbol)])
+
+    def rebound_rate(self, symbol: str) -> Decimal:
+        return rate_from_units(self.rebound_rate_units[self.symbols.index(symbol)])
+
+    def verdict(self, symbol: str) -> VectorRuleVerdict:
+        index = self.symbols.index(symbol)
+        return VectorRuleVerdict(
+            drop_rate=rate_from_units(self.drop_rate_units[index]),
+            enter_candidate=bool(self.enter_candidate[index]),
+            new_low=bool(self.new_low[index]),
+            rebound_rate=rate_from_units(self.rebound_rate_units[index]),
+            rebound_trigger=bool(self.rebound_trigger[index] and self.within_entry_band[index]),
+        )
+
+
+class VectorRuleEngine:
+    def __init__(self, *, watch_symbols: list[str], params: StrategyParams | None = None) -> None:
+        self.symbols = tuple(watch_symbols)
+        self.params = params or StrategyParams()
+        self._drop_threshold_units = round(self.params.drop_threshold_pct * RATE_SCALE)
+        self._rebound_threshold_units = round(self.params.rebound_threshold_pct * RATE_SCALE)
+        self._band_numerator = _BAND_DENOMINATOR + self._rebound_threshold_units
+        self._index = {symbol: index for index, symbol in enumerate(self.symbols)}
+        size = len(self.symbols)
+        self.reference_prices = np.zeros(size, dtype=np.int64)
+        self.tracked_lows = np.zeros(size, dtype=np.int64)
+        self.candidate_mask = np.zeros(size, dtype=bool)
+        self.tracking_mask = np.zeros(size, dtype=bool)
+
+    @classmethod
+    def from_context(cls, ctx: DailyContext, *, params: StrategyParams | None = None) -> VectorRuleEngine:
+        ordered = sorted(ctx.symbols.values(), key=lambda item: item.watch_rank)
+        engine = cls(watch_symbols=[item.symbol for item in ordered], params=params)
+        engine.sync(ctx)
+        return engine
+
+    def index_of(self, symbol: str) -> int | None:
+        return self._index.get(symbol)
+
+    def sync(self, ctx: DailyContext, symbols: Sequence[str] | None = None) -> None:
+        for symbol in self.symbols if symbols is None else symbols:
+            index = self._index.get(symbol)
+            if index is None:
+                continue
+            symbol_ctx = ctx.symbols[symbol]
+            self.reference_prices[index] = to_scaled_price(symbol_ctx.reference_price)
+            self.tracked_lows[index] = to_scaled_price(symbol_ctx.tracked_low)
+            self.candidate_mask[index] = symbol_ctx.state == "BUY_CANDIDATE"
+            self.tracking_mask[index] = symbol_ctx.state == "TRACKING"
+
+    def scale_prices(self, prices: dict[str, Decimal]) -> np.ndarray:
+        scaled = np.zeros(len(self.symbols), dtype=np.int64)
+        for symbol, price in prices.items():
+            index = self._index.get(symbol)
+            if index is not None:
+                scaled[index] = to_scaled_price(price)
+        return scaled
+
+    def evaluate(self, current_prices: np.ndarray) -> VectorRuleEvaluation:
+        current = np.asarray(current_prices, dtype=np.int64)
+        has_quote = current > 0
+        has_reference = self.reference_prices > 0
+
+        drop_units = rate_units(self.reference_prices, self.reference_prices - current)
+        enter_candidate = has_quote & has_reference & (drop_units >= self._drop_threshold_units - _EPS_UNITS)
+        becomes_candidate = enter_candidate & self.tracking_mask
+        candidate = has_quote & has_reference & (self.candidate_mask | becomes_candidate)
+
+        tracked_low = np.where(becomes_candidate, current, self.tracked_lows)
+        has_low = candidate & (tracked_low > 0)
+        new_low = has_low & (current < tracked_low)
+        tracked_low = np.where(new_low, current, tracked_low)
+
+        rebound_units = rate_units(tracked_low, current - tracked_low)
+        rebound_trigger = has_low & (rebound_units >= self._rebound_threshold_units - _EPS_UNITS)
+
+        trigger_numerator = tracked_low * self._band_numerator
+        ticks = tick_sizes(trigger_numerator, _BAND_DENOMINATOR)
+        within_band = has_low & (current * _BAND_DENOMINATOR < trigger_numerator + 2 * ticks * _BAND_DENOMINATOR)
+
+        return VectorRuleEvaluation(
+            symbols=self.symbols,
+            has_quote=has_quote,
+            drop_rate_units=np.where(has_quote & has_reference, drop_units, 0),
+            enter_candidate=enter_candidate,
+            new_low=new_low,
+            tracked_low=tracked_low,
+            rebound_rate_units=np.where(has_low, rebound_units, 0),
+            rebound_trigger=rebound_trigger,
+            within_entry_band=within_band,
+        )
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import date
+from typing import AsyncIterator
 from uuid import uuid4
 import json
 
 from fastapi import FastAPI, Header, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 
 from csm.errors import CsmValidationError
+from kia.rate_limit import DEFAULT_REQUEST_BURST, DEFAULT_REQUEST_RATE_PER_SECOND
+from prp.journal import PrpJournalStalledError
 
 from .models import (
     ModeSwitchRequest,
@@ -15,6 +21,7 @@ from .models import (
     TradingStartRequest,
     build_error_envelope,
     build_success_envelope,
+    build_success_envelope_json,
 )
 from .service import UagService, map_csm_error
         
@@ -35,9 +42,36 @@ def create_app(
     settings_path: str = "runtime/config/settings.local.json",
     credentials_path: str = "runtime/config/credentials.local.json",
     prp_db_path: str = "runtime/state/prp.db",
+    quote_runtime: str = "thread",
+    quote_source: str = "rest",
+    quote_workers: int = 2,
+    tick_log_dir: str | None = None,
+    vector_rules: bool = False,
+    kia_request_rate_per_second: float | None = DEFAULT_REQUEST_RATE_PER_SECOND,
+    kia_request_burst: int = DEFAULT_REQUEST_BURST,
 ) -> FastAPI:
-    app = FastAPI(title="PrivateTrade UAG", version="0.1.0")
-    service = UagService(settings_path=settings_path, credentials_path=credentials_path, prp_db_path=prp_db_path)
+    service = UagService(
+        settings_path=settings_path,
+        credentials_path=credentials_path,
+        prp_db_path=prp_db_path,
+        quote_runtime=quote_runtime,
+        quote_source=quote_source,
+        quote_workers=quote_workers,
+        tick_log_dir=tick_log_dir,
+        vector_rules=vector_rules,
+        kia_request_rate_per_second=kia_request_rate_per_second,
+        kia_request_burst=kia_request_burst,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        service.attach_event_loop(asyncio.get_running_loop())
+        try:
+            yield
+        finally:
+            await run_in_threadpool(service.shutdown)
+
+    app = FastAPI(title="PrivateTrade UAG", version="0.1.0", lifespan=lifespan)
 
     @app.exception_handler(CsmValidationError)
     async def _handle_csm_validation(request: Request, exc: CsmValidationError) -> JSONResponse:
@@ -52,9 +86,15 @@ def create_app(
         )
         return JSONResponse(status_code=status_code, content=payload)
 
-    @app.on_event("shutdown")
-    async def _on_shutdown() -> None:
-        service.shutdown()
+    @app.exception_handler(PrpJournalStalledError)
+    async def _handle_prp_journal_stalled(request: Request, exc: PrpJournalStalledError) -> JSONResponse:
+        payload = build_error_envelope(
+            request_id=_request_id(request, None),
+            code="UAG_PRP_JOURNAL_STALLED",
+            message="거래 기록 저장이 지연되고 있습니다. 잠시 후 다시 시도해 주세요.",
+            retryable=True,
+        )
+        return JSONResponse(status_code=503, content=payload)
 
     @app.get("/", response_class=HTMLResponse)
     async def ui_home() -> str:
@@ -357,7 +397,7 @@ def create_app(
     ) -> dict:
         request_id = _request_id(request, x_request_id)
         try:
-            data = service.start_trading(trading_date=body.tradingDate, dry_run=body.dryRun)
+            data = await run_in_threadpool(service.start_trading, trading_date=body.tradingDate, dry_run=body.dryRun)
         except RuntimeError as exc:
             if str(exc) == "UAG_ENGINE_ALREADY_RUNNING":
                 payload = build_error_envelope(
@@ -386,7 +426,20 @@ def create_app(
         x_request_id: str | None = Header(default=None, alias="X-Request-Id"),
     ) -> dict:
         request_id = _request_id(request, x_request_id)
-        data = service.get_daily_report(trading_date=date_value)
+        data = await run_in_threadpool(service.get_daily_report, trading_date=date_value)
+        return build_success_envelope(request_id=request_id, data=data)
+
+    @app.get("/api/reports/range")
+    async def reports_range(
+        request: Request,
+        from_date: date = Query(alias="from"),
+        to_date: date = Query(alias="to"),
+        x_request_id: str | None = Header(default=None, alias="X-Request-Id"),
+    ) -> dict:
+        request_id = _request_id(request, x_request_id)
+        if from_date > to_date:
+            raise HTTPException(status_code=400, detail="from must be on or before to")
+        data = await run_in_threadpool(service.get_range_report, from_date=from_date, to_date=to_date)
         return build_success_envelope(request_id=request_id, data=data)
 
     @app.get("/api/reports/trades")
@@ -394,10 +447,18 @@ def create_app(
         request: Request,
         date_value: date = Query(alias="date"),
         x_request_id: str | None = Header(default=None, alias="X-Request-Id"),
-    ) -> dict:
+        if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    ) -> Response:
         request_id = _request_id(request, x_request_id)
-        data = service.get_trades_report(trading_date=date_value)
-        return build_success_envelope(request_id=request_id, data=data)
+        etag, data_json = await run_in_threadpool(service.get_trades_report_json, trading_date=date_value)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=build_success_envelope_json(request_id=request_id, data_json=data_json),
+            media_type="application/json",
+            headers=headers,
+        )
 
     @app.get("/backtest", response_class=HTMLResponse)
     async def backtest_ui() -> str:
@@ -620,22 +681,16 @@ def create_app(
         symbol: str = Query(...),
         date_value: date = Query(alias="date"),
         timeframe: int = Query(default=1, alias="timeframe"),
+        simulate: bool = Query(default=False),
         x_request_id: str | None = Header(default=None, alias="X-Request-Id"),
     ) -> dict:
         request_id = _request_id(request, x_request_id)
 
-        # Try to fetch minute chart from Kiwoom chart API (ka10080). Fall back to synthetic data.
+        # Try to fetch minute chart from Kiwoom chart API (ka10080), served from the local bar cache for past days. Fall back to synthetic data.
         try:
-            from kia.api_client import RoutingKiaApiClient
-
-            settings = service.repository.read_settings()
-            mode = settings.get("mode", "mock")
-            client = RoutingKiaApiClient(csm_repository=service.repository)
-            base_dt = date_value.strftime("%Y%m%d")
             # Request the API for the desired timeframe (tic_scope). Do not force 1-minute and re-aggregate locally.
             tic_scope = str(timeframe) if timeframe and timeframe > 1 else "1"
-            payload = {"stk_cd": symbol, "tic_scope": tic_scope, "upd_stkpc_tp": "1", "base_dt": base_dt}
-            raw = client.call(service_type="chart", mode=mode, payload=payload, api_id="ka10080")
+            raw = await run_in_threadpool(service.fetch_minute_chart, symbol=symbol, trading_date=date_value, tic_scope=tic_scope)
             try:
               raw_text = json.dumps(raw, ensure_ascii=False, default=str)
             except Exception:
@@ -707,7 +762,7 @@ def create_app(
             # Assume the API returned bars at the requested `tic_scope` (timeframe).
             minutes = bars
 
-            return build_success_envelope(request_id=request_id, data={"minutes": minutes, "symbol": symbol, "date": date_value.isoformat(), "timeframe": timeframe, "raw": raw_text})
+            raw_value: str | None = raw_text
         except Exception:
             # fallback to deterministic synthetic data
             from random import Random
@@ -764,7 +819,29 @@ def create_app(
                   }
                 )
 
-            return build_success_envelope(request_id=request_id, data={"minutes": minutes, "symbol": symbol, "date": date_value.isoformat(), "timeframe": timeframe, "raw": None})
+            raw_value = None
+
+        data = {"minutes": minutes, "symbol": symbol, "date": date_value.isoformat(), "timeframe": timeframe, "raw": raw_value}
+        if simulate:
+            data["backtest"] = await run_in_threadpool(
+                service.run_minute_backtest, symbol=symbol, trading_date=date_value, minutes=minutes
+            )
+        return build_success_envelope(request_id=request_id, data=data)
+
+    @app.get("/api/backtest/ticks")
+    async def backtest_ticks(
+        request: Request,
+        date_value: date = Query(alias="date"),
+        symbols: str | None = Query(default=None),
+        x_request_id: str | None = Header(default=None, alias="X-Request-Id"),
+    ) -> dict:
+        request_id = _request_id(request, x_request_id)
+        symbol_list = [symbol.strip() for symbol in (symbols or "").split(",") if symbol.strip()] or None
+        try:
+            data = await run_in_threadpool(service.run_tick_log_backtest, trading_date=date_value, symbols=symbol_list)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="해당 날짜의 틱 로그가 없습니다.")
+        return build_success_envelope(request_id=request_id, data=data)
 
     @app.exception_handler(HTTPException)
     async def _handle_http_exception(request: Request, exc: HTTPException) -> JSONResponse:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal
@@ -19,7 +20,7 @@ class CredentialInput(BaseModel):
 
 
 class SettingsSaveRequest(BaseModel):
-    watchSymbols: list[str] = Field(min_length=1, max_length=20)
+    watchSymbols: list[str] = Field(min_length=1, max_length=200)
     mode: Mode
     liveModeConfirmed: bool
     buyBudget: str | None = None
@@ -56,6 +57,13 @@ class RuntimeState:
     quote_last_command_count: int = 0
     quote_last_strategy_event_count: int = 0
     quote_last_cycle_error: str | None = None
+    quote_last_cycle_duration_ms: int = 0
+    quote_last_lateness_ms: int = 0
+    quote_max_lateness_ms: int = 0
+    quote_overrun_count: int = 0
+    quote_skipped_cycles: int = 0
+    quote_source: Literal["rest", "stream"] = "rest"
+    quote_stream_reconnects: int = 0
     monitoring_snapshots: dict[str, "MonitoringSnapshot"] = field(default_factory=dict)
 
 
@@ -86,6 +94,13 @@ def build_success_envelope(*, request_id: str, data: dict[str, Any]) -> dict[str
     }
 
 
+def build_success_envelope_json(*, request_id: str, data_json: str) -> str:
+    return (
+        f'{{"success":true,"requestId":{json.dumps(request_id)},"data":{data_json},'
+        f'"meta":{{"timestamp":{json.dumps(datetime.now().astimezone().isoformat())}}}}}'
+    )
+
+
 def build_error_envelope(
     *,
     request_id: str,
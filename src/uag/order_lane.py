@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Callable
+
+from kia.contracts import OrderResult
+from tse.models import PlaceBuyOrderCommand, PlaceSellOrderCommand
+
+OrderCommand = PlaceBuyOrderCommand | PlaceSellOrderCommand
+OrderExecuteFn = Callable[[OrderCommand], OrderResult | None]
+
+LATENCY_BUCKETS_MS: tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+DEFAULT_MAX_TRACKED_COMMAND_IDS = 4096
+
+_SELL_PRIORITY = 0
+_BUY_PRIORITY = 1
+_STOP_PRIORITY = 2
+
+
+class LatencyHistogram:
+    def __init__(self, *, bounds_ms: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self._bounds_ms = tuple(sorted(bounds_ms))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self._bounds_ms) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        value_ms = max(seconds, 0.0) * 1000
+        with self._lock:
+            self._counts[bisect.bisect_left(self._bounds_ms, value_ms)] += 1
+            self._count += 1
+            self._sum_ms += value_ms
+            self._max_ms = max(self._max_ms, value_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            buckets = [{"leMs": bound, "count": self._counts[index]} for index, bound in enumerate(self._bounds_ms)]
+            buckets.append({"leMs": None, "count": self._counts[-1]})
+            return {
+                "count": self._count,
+                "sumMs": round(self._sum_ms, 3),
+                "maxMs": round(self._max_ms, 3),
+                "buckets": buckets,
+            }
+
+
+class OrderExecutionLane:
+    def __init__(
+        self,
+        *,
+        execute_fn: OrderExecuteFn,
+        monotonic_fn: Callable[[], float] | None = None,
+        histogram: LatencyHistogram | None = None,
+        max_tracked_command_ids: int = DEFAULT_MAX_TRACKED_COMMAND_IDS,
+    ) -> None:
+        if max_tracked_command_ids <= 0:
+            raise ValueError("max_tracked_command_ids must be > 0")
+        self._execute_fn = execute_fn
+        self._monotonic_fn = monotonic_fn or time.monotonic
+        self.histogram = histogram or LatencyHistogram()
+        self._logger = logging.getLogger("privatetrade.uag.order_lane")
+        self._queue: queue.PriorityQueue[tuple[int, int, OrderCommand | None, float]] = queue.PriorityQueue()
+        self._sequence = count()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._max_tracked_command_ids = max_tracked_command_ids
+        self._seen_command_ids: OrderedDict[str, None] = OrderedDict()
+        self._pending = 0
+        self._submitted = 0
+        self._acknowledged = 0
+        self._failed = 0
+        self._duplicates = 0
+
+    @property
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._seen_command_ids.clear()
+            self._thread = threading.Thread(target=self._worker, args=(self._queue,), name="uag-order-lane", daemon=True)
+            self._thread.start()
+
+    def stop(self, *, timeout_seconds: float = 2.0) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            if thread is None:
+                return
+            lane_queue = self._queue
+            self._queue = queue.PriorityQueue()
+        lane_queue.put((_STOP_PRIORITY, next(self._sequence), None, self._monotonic_fn()))
+        if thread is not threading.current_thread():
+            thread.join(timeout=timeout_seconds)
+
+    def submit(self, command: OrderCommand) -> bool:
+        signaled_at = self._monotonic_fn()
+        with self._lock:
+            duplicate = command.command_id in self._seen_command_ids
+            if duplicate:
+                self._duplicates += 1
+            else:
+                self._seen_command_ids[command.command_id] = None
+                if len(self._seen_command_ids) > self._max_tracked_command_ids:
+                    self._seen_command_ids.popitem(last=False)
+                self._pending += 1
+                self._submitted += 1
+            lane_queue = self._queue
+        if duplicate:
+            self._logger.warning(
+                "Order lane rejected duplicate command: command_id=%s symbol=%s",
+                command.command_id,
+                command.symbol,
+            )
+            return False
+        priority = _SELL_PRIORITY if isinstance(command, PlaceSellOrderCommand) else _BUY_PRIORITY
+        lane_queue.put((priority, next(self._sequence), command, signaled_at))
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "pending": self._pending,
+                "submitted": self._submitted,
+                "acknowledged": self._acknowledged,
+                "failed": self._failed,
+                "duplicates": self._duplicates,
+                "signalToAckMs": self.histogram.snapshot(),
+            }
+
+    def _worker(self, lane_queue: queue.PriorityQueue[tuple[int, int, OrderCommand | None, float]]) -> None:
+        while True:
+            _priority, _seq, command, signaled_at = lane_queue.get()
+            if command is None:
+                return
+            try:
+                result = self._execute_fn(command)
+            except Exception:
+                result = None
+                self._logger.exception("Order lane command failed: command_id=%s", command.command_id)
+            elapsed = self._monotonic_fn() - signaled_at
+            with self._lock:
+                self._pending -= 1
+                if result is None:
+                    self._failed += 1
+                else:
+                    self._acknowledged += 1
+            if result is not None:
+                self.histogram.observe(elapsed)
+                self._logger.info(
+                    "Order lane acknowledged: command_id=%s status=%s signal_to_ack_ms=%.1f",
+                    command.command_id,
+                    result.status,
+                    elapsed * 1000,
+                )
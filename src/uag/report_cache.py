@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+
+
+@dataclass(frozen=True)
+class CachedTradesReport:
+    trading_date: date
+    version: int
+    count: int
+    items_json: str
+
+
+class TradesReportCache:
+    def __init__(self, *, max_dates: int = 32) -> None:
+        if max_dates <= 0:
+            raise ValueError("max_dates must be > 0")
+        self._max_dates = max_dates
+        self._entries: OrderedDict[date, CachedTradesReport] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, trading_date: date, version: int) -> CachedTradesReport | None:
+        with self._lock:
+            entry = self._entries.get(trading_date)
+            if entry is None or entry.version != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(trading_date)
+            self._hits += 1
+            return entry
+
+    def put(self, entry: CachedTradesReport) -> None:
+        with self._lock:
+            self._entries[entry.trading_date] = entry
+            self._entries.move_to_end(entry.trading_date)
+            while len(self._entries) > self._max_dates:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
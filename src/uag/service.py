@@ -1,34 +1,63 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import multiprocessing
 import os
 import threading
-import time
 import logging
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime, time as dt_time, timedelta, timezone
 from decimal import Decimal, InvalidOperation, ROUND_DOWN, ROUND_HALF_UP
+from functools import partial
 from typing import Any, cast
 
 from csm.errors import CsmValidationError
 from csm.masking import to_masked_credential
-from csm.repository import CsmRuntimeRepository
+from csm.repository import CachedCsmRuntimeRepository
 from csm.service import CsmService
-from kia.contracts import Mode, SubmitOrderRequest
-from kia.gateway import DefaultKiaGateway
+from kia.api_client import RoutingKiaApiClient
+from kia.chart_cache import ChartBarCache, ChartBarStore
+from kia.contracts import MarketQuote, Mode, OrderResult, SubmitOrderRequest
+from kia.gateway import DefaultAsyncKiaGateway, DefaultKiaGateway
+from kia.http_pool import PooledHttpTransport
+from kia.idempotency import JournaledIdempotencyStore
+from kia.rate_limit import DEFAULT_QUOTE_RATE_PER_SECOND, DEFAULT_REQUEST_BURST, DEFAULT_REQUEST_RATE_PER_SECOND
+from kia.realtime import KiaRealtimeQuoteClient, WebSocketFactory, create_websocket_connection
+from kia.token_provider import InMemoryTokenProvider, SharedAccessToken
+from opm.models import OrderAggregate
 from opm.service import OpmService
-from prp.repository import PrpRepository
+from prp.connections import PrpConnectionManager
+from prp.journal import PrpWriteBehindJournal
+from tse.backtest import BacktestConfig, BacktestEngine, BacktestResult, MinuteBar, quotes_from_tick_log
 from tse.constants import MIN_PROFIT_LOCK_PCT
 from tse.rules import calc_drop_rate, should_enter_buy_candidate
+from tse.scheduler import FixedRateScheduler
 from tse.models import PlaceBuyOrderCommand, PlaceSellOrderCommand, PositionUpdateEvent
-from tse.quote_monitoring import QuoteMonitoringConfig, QuoteMonitoringLoop
+from tse.quote_monitoring import (
+    AsyncQuoteMonitoringLoop,
+    QuoteCycleResult,
+    QuoteMonitoringConfig,
+    QuoteMonitoringLoop,
+    QuoteStreamMonitor,
+)
+from tse.price_table import SharedPriceTableMonitoringLoop
+from tse.quote_ingestion import QuoteIngestionPool
 from tse.service import TseService
+from tse.tick_log import TickLogReader, TickLogWriter, tick_log_path
+from tse.sharding import AsyncShardedQuoteMonitoringLoop, ShardedQuoteMonitoringLoop, ShardedTseService
 
 from .models import MonitoringSnapshot, RuntimeState
+from .order_lane import OrderExecutionLane
+from .report_cache import CachedTradesReport, TradesReportCache
 
 
 REFERENCE_CAPTURE_TIME = dt_time(hour=8, minute=30, second=0)
 MARKET_CLOSE_TIME = dt_time(hour=15, minute=30, second=0)
 MARKET_TIMEZONE = timezone(timedelta(hours=9))
+QUOTE_RUNTIMES = {"thread", "asyncio", "process"}
+QUOTE_SOURCES = {"rest", "stream"}
 
 
 def _to_market_time(value: datetime) -> dt_time:
@@ -37,6 +66,27 @@ def _to_market_time(value: datetime) -> dt_time:
     return value.astimezone(MARKET_TIMEZONE).time()
 
 
+def _build_ingestion_gateway(
+    settings_path: str,
+    credentials_path: str,
+    shared_token: SharedAccessToken,
+    worker_count: int,
+    request_rate_per_second: float | None,
+    request_burst: int,
+) -> DefaultKiaGateway:
+    repository = CachedCsmRuntimeRepository(settings_path=settings_path, credentials_path=credentials_path)
+    return DefaultKiaGateway(
+        RoutingKiaApiClient(
+            csm_repository=repository,
+            token_provider=InMemoryTokenProvider(shared_token.issue),
+            quote_batch_rate_per_second=DEFAULT_QUOTE_RATE_PER_SECOND / worker_count,
+            request_rate_per_second=request_rate_per_second / worker_count if request_rate_per_second else None,
+            request_burst=max(1, request_burst // worker_count),
+            order_priority_reserve=0,
+        )
+    )
+
+
 class UagService:
     def __init__(
         self,
@@ -45,20 +95,70 @@ class UagService:
         credentials_path: str = "runtime/config/credentials.local.json",
         prp_db_path: str = "runtime/state/prp.db",
         monitoring_state_path: str = "runtime/state/uag_monitoring_state.json",
+        quote_runtime: str = "thread",
+        quote_source: str = "rest",
+        quote_workers: int = 2,
+        tick_log_dir: str | None = None,
+        vector_rules: bool = False,
+        kia_request_rate_per_second: float | None = DEFAULT_REQUEST_RATE_PER_SECOND,
+        kia_request_burst: int = DEFAULT_REQUEST_BURST,
+        realtime_websocket_factory: WebSocketFactory = create_websocket_connection,
     ) -> None:
+        if quote_runtime not in QUOTE_RUNTIMES:
+            raise ValueError(f"unsupported quote_runtime: {quote_runtime}")
+        if quote_source not in QUOTE_SOURCES:
+            raise ValueError(f"unsupported quote_source: {quote_source}")
         self._logger = logging.getLogger("privatetrade.uag")
-        self.repository = CsmRuntimeRepository(settings_path=settings_path, credentials_path=credentials_path)
+        self.quote_runtime = quote_runtime
+        self.quote_source = quote_source
+        self.quote_workers = max(1, quote_workers)
+        self.tick_log_dir = tick_log_dir
+        self.vector_rules = vector_rules
+        self.kia_request_rate_per_second = kia_request_rate_per_second
+        self.kia_request_burst = kia_request_burst
+        self._realtime_websocket_factory = realtime_websocket_factory
+        self.repository = CachedCsmRuntimeRepository(settings_path=settings_path, credentials_path=credentials_path)
         self.csm_service = CsmService(repository=self.repository)
         self.prp_db_path = prp_db_path
         self.monitoring_state_path = monitoring_state_path
         self.state = RuntimeState()
-        self._quote_loop: QuoteMonitoringLoop | None = None
-        self._tse_service: TseService | None = None
+        self._quote_loop: (
+            QuoteMonitoringLoop
+            | AsyncQuoteMonitoringLoop
+            | ShardedQuoteMonitoringLoop
+            | AsyncShardedQuoteMonitoringLoop
+            | SharedPriceTableMonitoringLoop
+            | None
+        ) = None
+        self._quote_ingestion: QuoteIngestionPool | None = None
+        self._tick_recorder: TickLogWriter | None = None
+        self._tse_service: TseService | ShardedTseService | None = None
         self._quote_loop_thread: threading.Thread | None = None
         self._quote_loop_stop = threading.Event()
         self._quote_loop_lock = threading.Lock()
         self._order_gateway: DefaultKiaGateway | None = None
+        self._order_transport: PooledHttpTransport | None = None
+        self._token_provider: InMemoryTokenProvider | None = None
+        self._order_lane = OrderExecutionLane(execute_fn=self._execute_tse_command)
+        self._async_gateways: list[DefaultAsyncKiaGateway] = []
+        self._async_order_gateway: DefaultAsyncKiaGateway | None = None
+        self._event_loop: asyncio.AbstractEventLoop | None = None
+        self._quote_loop_future: Future | None = None
+        self._quote_loop_start_pending = False
+        self._quote_stream_thread: threading.Thread | None = None
+        self._quote_stream_client: KiaRealtimeQuoteClient | None = None
+        self._quote_stream_monitor: QuoteStreamMonitor | None = None
         self._ensure_runtime_files()
+        self.prp = PrpConnectionManager(self.prp_db_path)
+        self.prp_journal = PrpWriteBehindJournal(
+            self.prp,
+            os.path.join(os.path.dirname(self.prp_db_path), "prp_write_behind.jsonl"),
+        )
+        self._idempotency_store = JournaledIdempotencyStore(
+            journal_path=os.path.join(os.path.dirname(self.prp_db_path), "kia_idempotency.jsonl")
+        )
+        self._trades_report_cache = TradesReportCache()
+        self.chart_cache = ChartBarCache(ChartBarStore(os.path.join(os.path.dirname(self.prp_db_path), "chart_bars.db")))
         self._restore_monitoring_state()
         self._resume_trading_if_needed()
 
@@ -145,6 +245,7 @@ class UagService:
     def monitor_status(self) -> dict[str, Any]:
         settings = self.repository.read_settings()
         watch_symbols = settings.get("watchSymbols", [])
+        quote_ingestion = self._quote_ingestion
 
         return {
             "engineState": self.state.engine_state,
@@ -158,6 +259,9 @@ class UagService:
             "openPositions": 0,
             "monitoringRows": self._build_monitoring_rows(watch_symbols=watch_symbols, use_close_price_current=False),
             "quoteMonitoring": {
+                "runtime": self.quote_runtime,
+                "source": self.state.quote_source,
+                "streamReconnects": self.state.quote_stream_reconnects,
                 "loopState": self.state.quote_loop_state,
                 "cyclesTotal": self.state.quote_cycles_total,
                 "lastPollCycleId": self.state.quote_last_poll_cycle_id,
@@ -168,15 +272,42 @@ class UagService:
                 "lastCommandCount": self.state.quote_last_command_count,
                 "lastStrategyEventCount": self.state.quote_last_strategy_event_count,
                 "lastCycleError": self.state.quote_last_cycle_error,
+                "lastCycleDurationMs": self.state.quote_last_cycle_duration_ms,
+                "lastLatenessMs": self.state.quote_last_lateness_ms,
+                "maxLatenessMs": self.state.quote_max_lateness_ms,
+                "overrunCount": self.state.quote_overrun_count,
+                "skippedCycles": self.state.quote_skipped_cycles,
+                "ingestionWorkersAlive": quote_ingestion.alive_workers if quote_ingestion is not None else None,
+                "ingestionWorkerRestarts": quote_ingestion.restarts if quote_ingestion is not None else 0,
             },
+            "orderExecution": self._order_lane.stats(),
+            "csmCache": self.repository.cache_stats(),
+            "tokenRefresh": self._token_provider.metrics() if self._token_provider is not None else {},
+            "prpJournal": self.prp_journal.stats(),
+            "tradesReportCache": self._trades_report_cache.stats(),
         }
 
     def shutdown(self) -> None:
         self._logger.info("Shutdown requested: stopping quote monitoring loop")
         was_running = self.state.engine_state == "RUNNING"
         self._stop_quote_monitoring_loop()
+        if not self.prp_journal.flush(timeout=5.0):
+            self._logger.warning("PRP journal did not drain before shutdown: stats=%s", self.prp_journal.stats())
+        self.prp_journal.close(timeout=5.0)
         self.state.engine_state = "RUNNING" if was_running else "IDLE"
         self._persist_monitoring_state()
+        self.prp.close()
+        self.chart_cache.store.close()
+        self._logger.info("Shutdown complete: PRP connections and chart bar store closed")
+
+    def attach_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._event_loop = loop
+        if self.quote_runtime != "asyncio" or not self._quote_loop_start_pending:
+            return
+        with self._quote_loop_lock:
+            self._quote_loop_start_pending = False
+            if self._quote_loop is not None and self.state.engine_state == "RUNNING":
+                self._quote_loop_future = asyncio.run_coroutine_threadsafe(self._quote_monitor_task(), loop)
 
     def _resume_trading_if_needed(self) -> None:
         if self.state.engine_state != "RUNNING":
@@ -210,8 +341,12 @@ class UagService:
         self._persist_monitoring_state()
 
     def get_daily_report(self, trading_date: date) -> dict[str, Any]:
-        with PrpRepository(db_path=self.prp_db_path) as repo:
-            report = repo.generate_daily_report(trading_date)
+        self.prp_journal.require_drained()
+        with self.prp.reader() as repo:
+            report = repo.load_daily_report(trading_date)
+        if report is None:
+            with self.prp.writer() as repo:
+                report = repo.generate_daily_report(trading_date)
 
         settings = self.repository.read_settings()
         watch_symbols = settings.get("watchSymbols", [])
@@ -232,42 +367,191 @@ class UagService:
             ),
         }
 
+    def get_range_report(self, *, from_date: date, to_date: date) -> dict[str, Any]:
+        with self.prp.reader() as repo:
+            unreported = repo.list_unreported_trading_dates(from_date, to_date)
+        if unreported:
+            with self.prp.writer() as repo:
+                for trading_date in unreported:
+                    repo.generate_daily_report(trading_date)
+        with self.prp.reader() as repo:
+            report = repo.load_range_report(from_date, to_date)
+
+        return {
+            "from": report.from_date.isoformat(),
+            "to": report.to_date.isoformat(),
+            "tradingDays": report.trading_days,
+            "totalBuyAmount": str(report.total_buy_amount),
+            "totalSellAmount": str(report.total_sell_amount),
+            "totalSellTax": str(report.total_sell_tax),
+            "totalSellFee": str(report.total_sell_fee),
+            "totalNetPnl": str(report.total_net_pnl),
+            "totalReturnRate": str(report.total_return_rate),
+            "tradeCount": report.trade_count,
+            "winCount": report.win_count,
+            "winRate": str(report.win_rate),
+            "averageReturnRate": str(report.average_return_rate),
+            "maxDrawdown": str(report.max_drawdown),
+            "days": [
+                {
+                    "tradingDate": day.trading_date.isoformat(),
+                    "netPnl": str(day.net_pnl),
+                    "cumulativeNetPnl": str(day.cumulative_net_pnl),
+                    "drawdown": str(day.drawdown),
+                }
+                for day in report.days
+            ],
+        }
+
     def get_trades_report(self, trading_date: date) -> dict[str, Any]:
-        with PrpRepository(db_path=self.prp_db_path) as repo:
-            details = repo.list_trade_details(trading_date)
-            if not details:
-                repo.generate_daily_report(trading_date)
-                details = repo.list_trade_details(trading_date)
+        _, data_json = self.get_trades_report_json(trading_date)
+        return json.loads(data_json)
+
+    def get_trades_report_json(self, trading_date: date) -> tuple[str, str]:
+        self.prp_journal.require_drained()
+        with self.prp.reader() as repo:
+            version = repo.last_execution_rowid(trading_date)
+            cached = self._trades_report_cache.get(trading_date, version)
+            if cached is None:
+                built = repo.load_daily_report(trading_date) is not None
+                details = repo.list_trade_details(trading_date) if built else None
+        if cached is None:
+            if details is None:
+                with self.prp.writer() as repo:
+                    repo.generate_daily_report(trading_date)
+                    details = repo.list_trade_details(trading_date)
+            cached = CachedTradesReport(
+                trading_date=trading_date,
+                version=version,
+                count=len(details),
+                items_json=json.dumps(
+                    [
+                        {
+                            "id": detail.id,
+                            "symbol": detail.symbol,
+                            "buyExecutedAt": detail.buy_executed_at.isoformat(),
+                            "sellExecutedAt": detail.sell_executed_at.isoformat(),
+                            "quantity": detail.quantity,
+                            "buyPrice": str(detail.buy_price),
+                            "sellPrice": str(detail.sell_price),
+                            "buyAmount": str(detail.buy_amount),
+                            "sellAmount": str(detail.sell_amount),
+                            "sellTax": str(detail.sell_tax),
+                            "sellFee": str(detail.sell_fee),
+                            "netPnl": str(detail.net_pnl),
+                            "returnRate": str(detail.return_rate),
+                        }
+                        for detail in details
+                    ],
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ),
+            )
+            self._trades_report_cache.put(cached)
 
         settings = self.repository.read_settings()
         watch_symbols = settings.get("watchSymbols", [])
+        monitoring_json = json.dumps(
+            self._build_monitoring_rows(
+                watch_symbols=watch_symbols,
+                use_close_price_current=True,
+                trading_date=trading_date,
+            ),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        etag = f'W/"trades-{trading_date.isoformat()}-{version}-{zlib.crc32(monitoring_json.encode("utf-8")):08x}"'
+        data_json = (
+            f'{{"tradingDate":"{trading_date.isoformat()}","count":{cached.count},'
+            f'"items":{cached.items_json},"monitoringRows":{monitoring_json}}}'
+        )
+        return etag, data_json
+
+    def fetch_minute_chart(self, *, symbol: str, trading_date: date, tic_scope: str) -> dict[str, Any]:
+        settings = self.repository.read_settings()
+        mode_raw = str(settings.get("mode", "mock"))
+        mode: Mode = cast(Mode, mode_raw) if mode_raw in {"mock", "live"} else "mock"
+        return self.chart_cache.fetch(
+            self._routing_client(),
+            mode=mode,
+            symbol=symbol,
+            trading_date=trading_date,
+            tic_scope=tic_scope,
+        )
+
+    def run_minute_backtest(self, *, symbol: str, trading_date: date, minutes: list[dict[str, Any]]) -> dict[str, Any]:
+        bars = [
+            MinuteBar(
+                symbol=symbol,
+                at=datetime.combine(trading_date, dt_time.fromisoformat(str(item["time"]))),
+                open=Decimal(str(item["open"])),
+                high=Decimal(str(item["high"])),
+                low=Decimal(str(item["low"])),
+                close=Decimal(str(item["close"])),
+                volume=int(item.get("volume") or 0),
+            )
+            for item in minutes
+        ]
+        engine = BacktestEngine(
+            trading_date=trading_date,
+            watch_symbols=[symbol],
+            config=BacktestConfig(budget=self._read_buy_budget()),
+        )
+        return self._backtest_payload(engine.run_bars(bars))
+
+    def run_tick_log_backtest(self, *, trading_date: date, symbols: list[str] | None = None) -> dict[str, Any]:
+        if not self.tick_log_dir:
+            raise FileNotFoundError("UAG_TICK_LOG_NOT_CONFIGURED")
+        path = tick_log_path(self.tick_log_dir, trading_date)
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        wanted = set(symbols) if symbols else None
+        with TickLogReader(path) as reader:
+            quotes = [quote for quote in quotes_from_tick_log(reader) if wanted is None or quote.symbol in wanted]
+        watch_symbols = sorted(wanted) if wanted is not None else sorted({quote.symbol for quote in quotes})
+        engine = BacktestEngine(
+            trading_date=trading_date,
+            watch_symbols=watch_symbols,
+            config=BacktestConfig(budget=self._read_buy_budget()),
+        )
+        payload = self._backtest_payload(engine.run_quotes(quotes))
+        payload["symbols"] = watch_symbols
+        return payload
 
+    def _backtest_payload(self, result: BacktestResult) -> dict[str, Any]:
+        report = result.report
         return {
-            "tradingDate": trading_date.isoformat(),
-            "count": len(details),
-            "items": [
+            "tradingDate": result.trading_date.isoformat(),
+            "quoteCount": result.quote_count,
+            "commands": [
+                {
+                    "commandId": command.command_id,
+                    "side": "BUY" if isinstance(command, PlaceBuyOrderCommand) else "SELL",
+                    "orderPrice": str(command.order_price),
+                    "reasonCode": command.reason_code,
+                }
+                for command in result.commands
+            ],
+            "trades": [
                 {
-                    "id": detail.id,
                     "symbol": detail.symbol,
                     "buyExecutedAt": detail.buy_executed_at.isoformat(),
                     "sellExecutedAt": detail.sell_executed_at.isoformat(),
                     "quantity": detail.quantity,
                     "buyPrice": str(detail.buy_price),
                     "sellPrice": str(detail.sell_price),
-                    "buyAmount": str(detail.buy_amount),
-                    "sellAmount": str(detail.sell_amount),
-                    "sellTax": str(detail.sell_tax),
-                    "sellFee": str(detail.sell_fee),
                     "netPnl": str(detail.net_pnl),
                     "returnRate": str(detail.return_rate),
                 }
-                for detail in details
+                for detail in result.trades
+            ],
+            "totalNetPnl": str(report.total_net_pnl),
+            "totalReturnRate": str(report.total_return_rate),
+            "maxDrawdown": str(result.max_drawdown),
+            "equityCurve": [
+                {"time": point.at.strftime("%H:%M"), "equity": str(point.equity), "drawdown": str(point.drawdown)}
+                for point in result.equity_curve
             ],
-            "monitoringRows": self._build_monitoring_rows(
-                watch_symbols=watch_symbols,
-                use_close_price_current=True,
-                trading_date=trading_date,
-            ),
         }
 
     def get_masked_credentials(self) -> dict[str, str]:
@@ -281,6 +565,14 @@ class UagService:
         }
         return to_masked_credential(normalized)
 
+    def _routing_client(self, **kwargs: Any) -> RoutingKiaApiClient:
+        return RoutingKiaApiClient(
+            csm_repository=self.repository,
+            request_rate_per_second=self.kia_request_rate_per_second,
+            request_burst=self.kia_request_burst,
+            **kwargs,
+        )
+
     def _start_quote_monitoring_loop(self) -> None:
         with self._quote_loop_lock:
             self._stop_quote_monitoring_loop()
@@ -291,49 +583,164 @@ class UagService:
             mode: Mode = cast(Mode, mode_raw) if mode_raw in {"mock", "live"} else "mock"
 
             self._quote_loop_stop.clear()
-            tse_service = TseService(trading_date=self.state.trading_date or date.today(), watch_symbols=watch_symbols)
+            tse_service = ShardedTseService(
+                trading_date=self.state.trading_date or date.today(),
+                watch_symbols=watch_symbols,
+                vector_rules=self.vector_rules,
+            )
             self._tse_service = tse_service
-            self._order_gateway = DefaultKiaGateway(csm_repository=self.repository)
+            api_client = self._routing_client()
+            shard_clients = [api_client] + [
+                self._routing_client(token_provider=api_client.token_provider) for _ in tse_service.shards[1:]
+            ]
+            quote_gateways = [DefaultKiaGateway(client, chart_cache=self.chart_cache) for client in shard_clients]
+            self._order_transport = PooledHttpTransport(max_connections_per_origin=1)
+            order_client = self._routing_client(
+                transport=self._order_transport,
+                token_provider=api_client.token_provider,
+                idempotency_store=self._idempotency_store,
+            )
+            self._order_gateway = DefaultKiaGateway(order_client)
+            if api_client.uses_live_client(mode):
+                try:
+                    api_client.token_provider.get_valid_token(mode)
+                except Exception:
+                    self._logger.warning("Token warm-up before shard fan-out failed: mode=%s", mode)
             self._initialize_reference_prices(
                 tse_service=tse_service,
-                kia_gateway=self._order_gateway,
+                kia_gateways=quote_gateways,
                 mode=mode,
                 watch_symbols=watch_symbols,
             )
-            self._quote_loop = QuoteMonitoringLoop(
-                tse_service=tse_service,
-                kia_gateway=self._order_gateway,
-                config=QuoteMonitoringConfig(mode=mode),
-            )
+            tse_service.set_command_listener(self._dispatch_order_command)
+            self._order_lane.start()
+            self._token_provider = api_client.token_provider
+            self._token_provider.start_background_refresh()
+            if self.tick_log_dir:
+                self._tick_recorder = TickLogWriter(directory=self.tick_log_dir, trading_date=tse_service.ctx.trading_date)
+            if self.quote_runtime == "asyncio":
+                self._async_order_gateway = DefaultAsyncKiaGateway(
+                    order_client,
+                    rate_limiter=order_client.rate_limiter,
+                    idempotency_store=self._idempotency_store,
+                )
+                self._async_gateways = [
+                    DefaultAsyncKiaGateway(client, chart_cache=self.chart_cache, rate_limiter=client.rate_limiter)
+                    for client in shard_clients
+                ]
+                self._quote_loop = AsyncShardedQuoteMonitoringLoop(
+                    tse_service=tse_service,
+                    kia_gateways=self._async_gateways,
+                    config=QuoteMonitoringConfig(mode=mode),
+                    recorder=self._tick_recorder,
+                )
+            elif self.quote_runtime == "process":
+                shared_token = SharedAccessToken(multiprocessing.get_context("spawn"))
+                self._token_provider.add_refresh_listener(shared_token.publish)
+                self._quote_ingestion = QuoteIngestionPool(
+                    symbols=watch_symbols,
+                    gateway_factory=partial(
+                        _build_ingestion_gateway,
+                        self.repository.settings_path,
+                        self.repository.credentials_path,
+                        shared_token,
+                        self.quote_workers,
+                        self.kia_request_rate_per_second,
+                        self.kia_request_burst,
+                    ),
+                    config=QuoteMonitoringConfig(mode=mode),
+                    worker_count=self.quote_workers,
+                )
+                self._quote_loop = SharedPriceTableMonitoringLoop(
+                    tse_service=tse_service,
+                    price_table=self._quote_ingestion.price_table,
+                    config=QuoteMonitoringConfig(mode=mode),
+                    recorder=self._tick_recorder,
+                    supervisor=self._quote_ingestion.restart_workers,
+                )
+            else:
+                self._quote_loop = ShardedQuoteMonitoringLoop(
+                    tse_service=tse_service,
+                    kia_gateways=quote_gateways,
+                    config=QuoteMonitoringConfig(mode=mode),
+                    recorder=self._tick_recorder,
+                )
 
             self._logger.info(
-                "Quote loop starting: trading_date=%s mode=%s symbols=%s dry_run=%s",
+                "Quote loop starting: trading_date=%s mode=%s symbols=%s shards=%s dry_run=%s",
                 (self.state.trading_date or date.today()).isoformat(),
                 mode,
                 ",".join(watch_symbols),
+                len(tse_service.shards),
                 self.state.dry_run,
             )
 
             self.state.quote_loop_state = "RUNNING"
             self.state.quote_last_cycle_error = None
 
-            self._quote_loop_thread = threading.Thread(
-                target=self._quote_monitor_worker,
-                name="uag-quote-monitor",
-                daemon=True,
-            )
-            self._quote_loop_thread.start()
+            if self.quote_source == "stream" and api_client.uses_live_client(mode):
+                self.state.quote_source = "stream"
+                self._quote_stream_monitor = QuoteStreamMonitor(
+                    tse_service=tse_service,
+                    config=QuoteMonitoringConfig(mode=mode),
+                    recorder=self._tick_recorder,
+                )
+                self._quote_stream_client = KiaRealtimeQuoteClient(
+                    api_client=api_client,
+                    mode=mode,
+                    websocket_factory=self._realtime_websocket_factory,
+                )
+                self._quote_stream_thread = threading.Thread(
+                    target=self._quote_stream_worker,
+                    args=(watch_symbols,),
+                    name="uag-quote-stream",
+                    daemon=True,
+                )
+                self._quote_stream_thread.start()
+                return
+
+            self._launch_rest_quote_loop()
+
+    def _launch_rest_quote_loop(self) -> None:
+        self.state.quote_source = "rest"
+        if self.quote_runtime == "asyncio":
+            if self._event_loop is None:
+                self._quote_loop_start_pending = True
+                return
+            self._quote_loop_future = asyncio.run_coroutine_threadsafe(self._quote_monitor_task(), self._event_loop)
+            return
+
+        if self._quote_ingestion is not None:
+            self._quote_ingestion.start()
+        self._quote_loop_thread = threading.Thread(
+            target=self._quote_monitor_worker,
+            name="uag-quote-monitor",
+            daemon=True,
+        )
+        self._quote_loop_thread.start()
 
     def _initialize_reference_prices(
         self,
         *,
-        tse_service: TseService,
-        kia_gateway: DefaultKiaGateway,
+        tse_service: TseService | ShardedTseService,
+        kia_gateways: list[DefaultKiaGateway],
         mode: Mode,
         watch_symbols: list[str],
         now_value: datetime | None = None,
     ) -> None:
         now_market = _to_market_time(now_value or datetime.now(MARKET_TIMEZONE))
+        fetched: dict[str, Decimal | None] = {}
+        if now_market >= REFERENCE_CAPTURE_TIME:
+            fetched = self._fetch_reference_prices(
+                tse_service=tse_service,
+                kia_gateways=kia_gateways,
+                mode=mode,
+                symbols=[
+                    symbol
+                    for symbol in watch_symbols
+                    if symbol in tse_service.ctx.symbols and self._snapshot_for_symbol(symbol).price_at_0830 is None
+                ],
+            )
 
         for symbol in watch_symbols:
             snapshot = self._snapshot_for_symbol(symbol)
@@ -364,21 +771,10 @@ class UagService:
                 symbol_ctx.state = "BUY_CANDIDATE"
                 symbol_ctx.tracked_low = snapshot.previous_low_price
 
-            if now_market < REFERENCE_CAPTURE_TIME:
-                continue
             if snapshot.price_at_0830 is not None:
                 continue
 
-            try:
-                reference_price = kia_gateway.fetch_reference_price_0830(mode=mode, symbol=symbol)
-            except Exception:
-                self._logger.exception(
-                    "Failed to backfill 08:30 reference price from Kiwoom: symbol=%s mode=%s",
-                    symbol,
-                    mode,
-                )
-                continue
-
+            reference_price = fetched.get(symbol)
             if reference_price is None or reference_price <= 0:
                 continue
 
@@ -429,75 +825,227 @@ class UagService:
                 symbol_ctx.state = "BUY_CANDIDATE"
                 symbol_ctx.tracked_low = snapshot.previous_low_price
 
+    def _fetch_reference_prices(
+        self,
+        *,
+        tse_service: TseService | ShardedTseService,
+        kia_gateways: list[DefaultKiaGateway],
+        mode: Mode,
+        symbols: list[str],
+    ) -> dict[str, Decimal | None]:
+        shard_index = {}
+        if isinstance(tse_service, ShardedTseService):
+            shard_index = {symbol: index for index, shard in enumerate(tse_service.shards) for symbol in shard.ctx.symbols}
+        groups: dict[int, list[str]] = {}
+        for symbol in symbols:
+            groups.setdefault(shard_index.get(symbol, 0) % len(kia_gateways), []).append(symbol)
+
+        def fetch_group(index: int, group: list[str]) -> dict[str, Decimal | None]:
+            prices: dict[str, Decimal | None] = {}
+            for symbol in group:
+                try:
+                    prices[symbol] = kia_gateways[index].fetch_reference_price_0830(mode=mode, symbol=symbol)
+                except Exception:
+                    self._logger.exception(
+                        "Failed to backfill 08:30 reference price from Kiwoom: symbol=%s mode=%s shard=%s",
+                        symbol,
+                        mode,
+                        index,
+                    )
+            return prices
+
+        if len(groups) <= 1:
+            return {symbol: price for index, group in groups.items() for symbol, price in fetch_group(index, group).items()}
+        fetched: dict[str, Decimal | None] = {}
+        with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="uag-reference-price") as executor:
+            for prices in executor.map(lambda item: fetch_group(*item), groups.items()):
+                fetched.update(prices)
+        return fetched
+
     def _stop_quote_monitoring_loop(self) -> None:
         self._quote_loop_stop.set()
         thread = self._quote_loop_thread
         if thread is not None and thread.is_alive():
             thread.join(timeout=2.0)
+        if self._quote_loop_future is not None:
+            self._quote_loop_future.cancel()
+        if self._quote_stream_client is not None:
+            self._quote_stream_client.close()
+        stream_thread = self._quote_stream_thread
+        if stream_thread is not None and stream_thread.is_alive() and stream_thread is not threading.current_thread():
+            stream_thread.join(timeout=2.0)
+        if self._quote_stream_monitor is not None:
+            self._quote_stream_monitor.stop()
 
         if self._quote_loop is not None:
             self._quote_loop.stop()
+        if self._quote_ingestion is not None:
+            self._quote_ingestion.stop()
+        if self._tick_recorder is not None:
+            self._tick_recorder.close()
+        self._order_lane.stop()
+        if self._token_provider is not None:
+            self._token_provider.stop_background_refresh()
+        if self._order_transport is not None:
+            self._order_transport.close()
+        for gateway in self._async_gateways:
+            gateway.close()
+        if self._async_order_gateway is not None:
+            self._async_order_gateway.close()
 
         self._quote_loop_thread = None
+        self._quote_loop_future = None
+        self._quote_loop_start_pending = False
+        self._quote_stream_thread = None
+        self._quote_stream_client = None
+        self._quote_stream_monitor = None
         self._quote_loop = None
+        self._quote_ingestion = None
+        self._tick_recorder = None
         self._tse_service = None
         self._order_gateway = None
+        self._order_transport = None
+        self._async_gateways = []
+        self._async_order_gateway = None
         self.state.quote_loop_state = "STOPPED"
         self._logger.info("Quote loop stopped")
 
     def _quote_monitor_worker(self) -> None:
-        if self._quote_loop is None:
+        quote_loop = self._quote_loop
+        if not isinstance(quote_loop, (QuoteMonitoringLoop, ShardedQuoteMonitoringLoop, SharedPriceTableMonitoringLoop)):
             return
 
-        self._quote_loop.start()
-        interval_seconds = self._quote_loop.poll_interval_seconds
+        quote_loop.start()
+        scheduler = quote_loop.new_scheduler()
 
         while not self._quote_loop_stop.is_set() and self.state.engine_state == "RUNNING":
+            scheduler.begin_cycle()
             try:
-                cycle = self._quote_loop.run_cycle()
+                cycle = quote_loop.run_cycle()
             except Exception:
                 self.state.quote_loop_state = "STOPPED"
                 self.state.quote_last_cycle_error = "UAG_QUOTE_LOOP_UNEXPECTED_ERROR"
                 self._logger.exception("Quote loop crashed during run_cycle")
                 break
 
-            self._append_position_update_outputs(cycle)
-            self._update_monitoring_snapshots(cycle)
-            self.state.quote_loop_state = cycle.state
-            self.state.quote_cycles_total += 1
-            self.state.quote_last_poll_cycle_id = cycle.poll_cycle_id
-            self.state.quote_last_cycle_at = datetime.now().astimezone()
-            self.state.quote_last_cycle_partial = cycle.partial
-            self.state.quote_last_quote_count = cycle.quote_count
-            self.state.quote_last_error_count = cycle.error_count
-            self.state.quote_last_cycle_error = cycle.fetch_error
-            self.state.quote_last_command_count = sum(len(output.commands) for output in cycle.outputs)
-            self.state.quote_last_strategy_event_count = sum(len(output.strategy_events) for output in cycle.outputs)
+            self._record_quote_cycle(cycle)
+            delay = scheduler.complete_cycle()
+            self._record_quote_schedule(scheduler)
 
-            self._logger.info(
-                "Quote cycle summary: cycle_id=%s state=%s partial=%s quotes=%s errors=%s commands=%s events=%s fetch_error=%s",
-                cycle.poll_cycle_id,
-                cycle.state,
-                cycle.partial,
-                cycle.quote_count,
-                cycle.error_count,
-                self.state.quote_last_command_count,
-                self.state.quote_last_strategy_event_count,
-                cycle.fetch_error,
-            )
+            if self._quote_loop_stop.is_set() or self.state.engine_state != "RUNNING":
+                break
+            if delay > 0:
+                self._quote_loop_stop.wait(delay)
 
-            if not self.state.dry_run:
-                self._execute_cycle_commands(cycle.outputs)
-            elif self.state.quote_last_command_count > 0:
-                self._logger.info(
-                    "Dry-run active: skipping %s generated commands for cycle=%s",
-                    self.state.quote_last_command_count,
-                    cycle.poll_cycle_id,
-                )
+    async def _quote_monitor_task(self) -> None:
+        quote_loop = self._quote_loop
+        if not isinstance(quote_loop, (AsyncQuoteMonitoringLoop, AsyncShardedQuoteMonitoringLoop)):
+            return
+
+        quote_loop.start()
+        scheduler = quote_loop.new_scheduler()
+
+        while not self._quote_loop_stop.is_set() and self.state.engine_state == "RUNNING":
+            scheduler.begin_cycle()
+            try:
+                cycle = await quote_loop.run_cycle()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.state.quote_loop_state = "STOPPED"
+                self.state.quote_last_cycle_error = "UAG_QUOTE_LOOP_UNEXPECTED_ERROR"
+                self._logger.exception("Quote loop crashed during run_cycle")
+                break
+
+            await asyncio.to_thread(self._record_quote_cycle, cycle)
+            delay = scheduler.complete_cycle()
+            self._record_quote_schedule(scheduler)
 
             if self._quote_loop_stop.is_set() or self.state.engine_state != "RUNNING":
                 break
-            time.sleep(interval_seconds)
+            await asyncio.sleep(delay)
+
+    def _quote_stream_worker(self, watch_symbols: list[str]) -> None:
+        client = self._quote_stream_client
+        monitor = self._quote_stream_monitor
+        if client is None or monitor is None:
+            return
+
+        monitor.start()
+
+        def on_disconnect(exc: Exception) -> None:
+            self.state.quote_stream_reconnects += 1
+            monitor.on_disconnect(exc)
+            self.state.quote_loop_state = monitor.state
+            self.state.quote_last_cycle_error = str(exc)
+
+        try:
+            client.run(
+                symbols=watch_symbols,
+                on_quote=self._on_stream_quote,
+                stop_event=self._quote_loop_stop,
+                on_disconnect=on_disconnect,
+            )
+        except Exception as exc:
+            self.state.quote_last_cycle_error = str(exc)
+            self._logger.exception("Quote stream failed; falling back to REST polling")
+
+        if self._quote_loop_stop.is_set() or self.state.engine_state != "RUNNING":
+            return
+        monitor.stop()
+        with self._quote_loop_lock:
+            if self._quote_loop_stop.is_set() or self._quote_stream_thread is not threading.current_thread():
+                return
+            self._launch_rest_quote_loop()
+
+    def _on_stream_quote(self, quote: MarketQuote) -> None:
+        monitor = self._quote_stream_monitor
+        if monitor is None or self._quote_loop_stop.is_set():
+            return
+        cycle = monitor.on_quote(quote)
+        self._record_quote_cycle(cycle, log_summary=False)
+
+    def _record_quote_schedule(self, scheduler: FixedRateScheduler) -> None:
+        self.state.quote_last_lateness_ms = int(scheduler.last_lateness_seconds * 1000)
+        self.state.quote_max_lateness_ms = int(scheduler.max_lateness_seconds * 1000)
+        self.state.quote_last_cycle_duration_ms = int(scheduler.last_duration_seconds * 1000)
+        self.state.quote_overrun_count = scheduler.overrun_count
+        self.state.quote_skipped_cycles = scheduler.skipped_cycles
+
+    def _record_quote_cycle(self, cycle: QuoteCycleResult, *, log_summary: bool = True) -> None:
+        self._append_position_update_outputs(cycle)
+        self._update_monitoring_snapshots(cycle)
+        self.state.quote_loop_state = cycle.state
+        self.state.quote_cycles_total += 1
+        self.state.quote_last_poll_cycle_id = cycle.poll_cycle_id
+        self.state.quote_last_cycle_at = datetime.now().astimezone()
+        self.state.quote_last_cycle_partial = cycle.partial
+        self.state.quote_last_quote_count = cycle.quote_count
+        self.state.quote_last_error_count = cycle.error_count
+        self.state.quote_last_cycle_error = cycle.fetch_error
+        self.state.quote_last_command_count = sum(len(output.commands) for output in cycle.outputs)
+        self.state.quote_last_strategy_event_count = sum(len(output.strategy_events) for output in cycle.outputs)
+
+        if not log_summary:
+            return
+        self._logger.info(
+            "Quote cycle summary: cycle_id=%s state=%s partial=%s quotes=%s errors=%s commands=%s events=%s fetch_error=%s",
+            cycle.poll_cycle_id,
+            cycle.state,
+            cycle.partial,
+            cycle.quote_count,
+            cycle.error_count,
+            self.state.quote_last_command_count,
+            self.state.quote_last_strategy_event_count,
+            cycle.fetch_error,
+        )
+
+        if self.state.dry_run and self.state.quote_last_command_count > 0:
+            self._logger.info(
+                "Dry-run active: skipping %s generated commands for cycle=%s",
+                self.state.quote_last_command_count,
+                cycle.poll_cycle_id,
+            )
 
     def _append_position_update_outputs(self, cycle: Any) -> None:
         if self._tse_service is None or self.state.trading_date is None:
@@ -526,19 +1074,20 @@ class UagService:
             max_profit_rate = self._calc_profit_rate_pct(buy_price=snapshot.buy_price, target_price=max_price)
             event_time = quote.as_of if quote is not None else datetime.now().astimezone()
 
-            output = self._tse_service.on_position_update(
-                PositionUpdateEvent(
-                    trading_date=self.state.trading_date,
-                    symbol=symbol,
-                    position_state="LONG_OPEN",
-                    avg_buy_price=snapshot.buy_price,
-                    current_price=current_price,
-                    current_profit_rate=current_profit_rate,
-                    max_profit_rate=max_profit_rate,
-                    min_profit_locked=current_profit_rate >= MIN_PROFIT_LOCK_PCT,
-                    updated_at=event_time,
-                )
+            event = PositionUpdateEvent(
+                trading_date=self.state.trading_date,
+                symbol=symbol,
+                position_state="LONG_OPEN",
+                avg_buy_price=snapshot.buy_price,
+                current_price=current_price,
+                current_profit_rate=current_profit_rate,
+                max_profit_rate=max_profit_rate,
+                min_profit_locked=current_profit_rate >= self._tse_service.params.min_profit_lock_pct,
+                updated_at=event_time,
             )
+            if self._tick_recorder is not None:
+                self._tick_recorder.record_position_update(event, recorded_at=datetime.now(timezone.utc))
+            output = self._tse_service.on_position_update(event)
             if output.commands or output.strategy_events:
                 cycle.outputs.append(output)
 
@@ -551,19 +1100,44 @@ class UagService:
             rounding=ROUND_HALF_UP,
         )
 
-    def _execute_cycle_commands(self, outputs: list) -> None:
-        command_count = sum(len(output.commands) for output in outputs)
-        if command_count > 0:
-            self._logger.info("Executing cycle commands: count=%s", command_count)
-        for output in outputs:
-            for command in output.commands:
-                self._execute_tse_command(command)
+    def _dispatch_order_command(self, command: PlaceBuyOrderCommand | PlaceSellOrderCommand) -> None:
+        if self.state.dry_run:
+            return
+        if self._order_lane.submit(command):
+            self._logger.info("Order command dispatched to order lane: command_id=%s symbol=%s", command.command_id, command.symbol)
 
-    def _execute_tse_command(self, command: PlaceBuyOrderCommand | PlaceSellOrderCommand) -> None:
+    def _execute_tse_command(self, command: PlaceBuyOrderCommand | PlaceSellOrderCommand) -> OrderResult | None:
         if self._order_gateway is None:
             self._logger.warning("Skip command execution because order gateway is not initialized")
-            return
+            return None
+        order_gateway = self._order_gateway
+
+        plan = self._plan_order_submission(command)
+        if plan is None:
+            return None
+        side, request = plan
+
+        opm_service = OpmService(prp_repository=self.prp_journal, kia_gateway=order_gateway)
+        order = self._open_order(opm_service=opm_service, command=command, side=side, quantity=request.quantity)
+        try:
+            result = self._submit_order(order_gateway, request)
+        except Exception:
+            self._reject_order(opm_service=opm_service, order=order, command=command, side=side)
+            return None
+        self._complete_order(opm_service=opm_service, order=order, command=command, side=side, result=result)
+        return result
 
+    def _submit_order(self, order_gateway: DefaultKiaGateway, request: SubmitOrderRequest) -> OrderResult:
+        async_gateway = self._async_order_gateway
+        loop = self._event_loop
+        if async_gateway is None or loop is None or not loop.is_running():
+            return order_gateway.submit_order(request)
+        return asyncio.run_coroutine_threadsafe(async_gateway.submit_order(request), loop).result()
+
+    def _plan_order_submission(
+        self,
+        command: PlaceBuyOrderCommand | PlaceSellOrderCommand,
+    ) -> tuple[str, SubmitOrderRequest] | None:
         mode, account_no = self._read_order_execution_context()
         side = "BUY" if isinstance(command, PlaceBuyOrderCommand) else "SELL"
         quantity = self._resolve_order_quantity(side=side, order_price=command.order_price)
@@ -575,8 +1149,7 @@ class UagService:
                 side,
                 command.order_price,
             )
-            return
-        now = datetime.now().astimezone()
+            return None
 
         self._logger.info(
             "Submitting order command: command_id=%s symbol=%s side=%s qty=%s price=%s",
@@ -586,64 +1159,82 @@ class UagService:
             quantity,
             command.order_price,
         )
+        return side, SubmitOrderRequest(
+            mode=mode,
+            account_no=account_no,
+            symbol=command.symbol,
+            side=side,
+            order_type="LIMIT",
+            price=command.order_price,
+            quantity=quantity,
+            client_order_id=command.command_id,
+        )
 
-        with PrpRepository(db_path=self.prp_db_path) as repo:
-            opm_service = OpmService(prp_repository=repo, kia_gateway=self._order_gateway)
-            order = opm_service.create_order(
-                trading_date=command.trading_date,
-                symbol=command.symbol,
-                side=side,
-                requested_price=command.order_price,
-                requested_qty=quantity,
-                now=now,
-                client_order_id=command.command_id,
-            )
-            order = opm_service.move_order_status(order=order, next_status="SUBMITTED", now=datetime.now().astimezone())
+    @staticmethod
+    def _open_order(
+        *,
+        opm_service: OpmService,
+        command: PlaceBuyOrderCommand | PlaceSellOrderCommand,
+        side: str,
+        quantity: int,
+    ) -> OrderAggregate:
+        order = opm_service.create_order(
+            trading_date=command.trading_date,
+            symbol=command.symbol,
+            side=side,
+            requested_price=command.order_price,
+            requested_qty=quantity,
+            now=datetime.now().astimezone(),
+            client_order_id=command.command_id,
+        )
+        return opm_service.move_order_status(order=order, next_status="SUBMITTED", now=datetime.now().astimezone())
 
-            try:
-                result = self._order_gateway.submit_order(
-                    SubmitOrderRequest(
-                        mode=mode,
-                        account_no=account_no,
-                        symbol=command.symbol,
-                        side=side,
-                        order_type="LIMIT",
-                        price=command.order_price,
-                        quantity=quantity,
-                        client_order_id=order.client_order_id,
-                    )
-                )
-            except Exception:
-                self._logger.exception(
-                    "Order submit failed: command_id=%s symbol=%s side=%s",
-                    command.command_id,
-                    command.symbol,
-                    side,
-                )
-                opm_service.move_order_status(
-                    order=order,
-                    next_status="REJECTED",
-                    now=datetime.now().astimezone(),
-                    last_error_code="OPM_KIA_SUBMIT_FAILED",
-                )
-                return
+    def _reject_order(
+        self,
+        *,
+        opm_service: OpmService,
+        order: OrderAggregate,
+        command: PlaceBuyOrderCommand | PlaceSellOrderCommand,
+        side: str,
+    ) -> None:
+        self._logger.exception(
+            "Order submit failed: command_id=%s symbol=%s side=%s",
+            command.command_id,
+            command.symbol,
+            side,
+        )
+        opm_service.move_order_status(
+            order=order,
+            next_status="REJECTED",
+            now=datetime.now().astimezone(),
+            last_error_code="OPM_KIA_SUBMIT_FAILED",
+        )
 
-            final_status = "ACCEPTED" if result.status == "ACCEPTED" else "REJECTED"
-            opm_service.move_order_status(
-                order=order,
-                next_status=final_status,
-                now=datetime.now().astimezone(),
-                broker_order_id=result.broker_order_id or None,
-                last_error_code=None if final_status == "ACCEPTED" else "OPM_KIA_ORDER_REJECTED",
-            )
-            self._logger.info(
-                "Order submit completed: command_id=%s symbol=%s side=%s status=%s broker_order_id=%s",
-                command.command_id,
-                command.symbol,
-                side,
-                final_status,
-                result.broker_order_id,
-            )
+    def _complete_order(
+        self,
+        *,
+        opm_service: OpmService,
+        order: OrderAggregate,
+        command: PlaceBuyOrderCommand | PlaceSellOrderCommand,
+        side: str,
+        result: OrderResult,
+    ) -> None:
+        final_status = "ACCEPTED" if result.status == "ACCEPTED" else "REJECTED"
+        opm_service.move_order_status(
+            order=order,
+            next_status=final_status,
+            now=datetime.now().astimezone(),
+            broker_order_id=result.broker_order_id or None,
+            last_error_code=None if final_status == "ACCEPTED" else "OPM_KIA_ORDER_REJECTED",
+        )
+        self._logger.info(
+            "Order submit completed: command_id=%s symbol=%s side=%s status=%s broker_order_id=%s",
+            command.command_id,
+            command.symbol,
+            side,
+            final_status,
+            result.broker_order_id,
+        )
 
     def _read_order_execution_context(self) -> tuple[Mode | None, str]:
         settings = self.repository.read_settings()
@@ -655,24 +1246,29 @@ class UagService:
         account_no = str(credential.get("accountNo", "")).strip() or "00000000"
         return mode, account_no
 
-    def _resolve_order_quantity(self, *, side: str, order_price: Decimal) -> int:
-        if side != "BUY":
-            return 1
-        if order_price <= 0:
-            return 0
-
+    def _read_buy_budget(self) -> Decimal | None:
         settings = self.repository.read_settings()
         raw_budget = settings.get("buyBudget")
         if raw_budget is None:
-            return 1
+            return None
 
         budget_text = str(raw_budget).strip().replace(",", "")
         if not budget_text:
-            return 1
+            return None
 
         try:
-            budget = Decimal(budget_text)
+            return Decimal(budget_text)
         except (InvalidOperation, ValueError):
+            return None
+
+    def _resolve_order_quantity(self, *, side: str, order_price: Decimal) -> int:
+        if side != "BUY":
+            return 1
+        if order_price <= 0:
+            return 0
+
+        budget = self._read_buy_budget()
+        if budget is None:
             return 1
 
         if budget <= 0:
@@ -1201,7 +1797,8 @@ class UagService:
         if _to_market_time(quote_time) < _to_market_time(snapshot.buy_time):
             return False
 
-        required_price = snapshot.buy_price * (Decimal("1") + (MIN_PROFIT_LOCK_PCT / Decimal("100")))
+        min_profit_lock_pct = self._tse_service.params.min_profit_lock_pct if self._tse_service is not None else MIN_PROFIT_LOCK_PCT
+        required_price = snapshot.buy_price * (Decimal("1") + (min_profit_lock_pct / Decimal("100")))
         return quote_price >= required_price
 
 
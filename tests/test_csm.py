@@ -19,7 +19,7 @@ from csm.errors import (
     CsmSymbolFormatInvalidError,
 )
 from csm.masking import to_masked_credential
-from csm.repository import CsmRuntimeRepository
+from csm.repository import CachedCsmRuntimeRepository, CsmRuntimeRepository
 from csm.service import CsmService
 from csm.validators import validate_watch_symbols
 
@@ -139,3 +139,24 @@ def test_masking_utility_shape() -> None:
     assert masked["appSecret"] == "***masked***"
     assert masked["accountNo"] == "******5678"
     assert masked["userId"] == "ab***"
+
+
+def test_cached_repository_serves_hits_and_invalidates_on_write_or_file_change(tmp_path: Path) -> None:
+    settings_path = str(tmp_path / "runtime" / "config" / "settings.local.json")
+    credentials_path = str(tmp_path / "runtime" / "config" / "credentials.local.json")
+    plain = CsmRuntimeRepository(settings_path=settings_path, credentials_path=credentials_path)
+    plain.write_settings({"mode": "mock", "watchSymbols": ["005930"]})
+    cached = CachedCsmRuntimeRepository(settings_path=settings_path, credentials_path=credentials_path)
+
+    first = cached.read_settings()
+    first["watchSymbols"].append("000660")
+    assert cached.read_settings() == {"mode": "mock", "watchSymbols": ["005930"]}
+    assert cached.cache_stats() == {"hits": 1, "misses": 1, "invalidations": 0}
+
+    cached.write_settings({"mode": "live", "watchSymbols": ["005930"]})
+    assert cached.read_settings()["mode"] == "live"
+    assert cached.cache_stats()["misses"] == 1
+
+    plain.write_settings({"mode": "mock", "watchSymbols": ["035420"], "buyBudget": "1000"})
+    assert cached.read_settings()["watchSymbols"] == ["035420"]
+    assert cached.cache_stats() == {"hits": 2, "misses": 2, "invalidations": 1}
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import http.client
 import json
 import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 import sys
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 import pytest
@@ -18,7 +22,15 @@ from csm.repository import CsmRuntimeRepository
 from kia.api_client import RoutingKiaApiClient
 from kia.contracts import FetchQuoteRequest, PollQuotesRequest, SubmitOrderRequest
 from kia.errors import KiaError
-from kia.gateway import DefaultKiaGateway
+from kia.async_client import AsyncPooledHttpTransport, asyncio_transport
+from kia.gateway import DefaultAsyncKiaGateway, DefaultKiaGateway
+from kia.http_pool import PooledHttpTransport, is_retryable_request
+from kia.idempotency import InMemoryIdempotencyStore, JournaledIdempotencyStore
+from kia.mock_realtime_server import MockKiwoomRealtimeServer
+from kia.rate_limit import KiaRateLimiter, RateLimitRule
+from kia.realtime import KiaRealtimeQuoteClient
+from kia.models import AccessToken
+from kia.token_provider import InMemoryTokenProvider, SharedAccessToken
 
 
 def _write_runtime_files(tmp_path: Path, *, mode: str, credential: dict) -> CsmRuntimeRepository:
@@ -326,7 +338,7 @@ def test_fetch_quotes_batch_enforces_one_request_per_symbol_per_second(tmp_path:
     assert all(delay == pytest.approx(0.25) for delay in sleep_calls)
 
 
-def test_quote_waits_while_order_request_is_in_flight(tmp_path: Path) -> None:
+def test_quote_does_not_wait_for_in_flight_order_request(tmp_path: Path) -> None:
     repo = _write_runtime_files(
         tmp_path,
         mode="live",
@@ -354,7 +366,7 @@ def test_quote_waits_while_order_request_is_in_flight(tmp_path: Path) -> None:
                 "accepted_at": "2026-02-17T09:00:00+00:00",
             }
         if url.endswith("/api/dostk/mrkcond"):
-            assert allow_order_finish.is_set() is True
+            assert allow_order_finish.is_set() is False
             return 200, {
                 "symbol": str((payload or {}).get("stk_cd", "005930")),
                 "cur_prc": "70100",
@@ -411,7 +423,7 @@ def test_quote_waits_while_order_request_is_in_flight(tmp_path: Path) -> None:
     quote_thread = threading.Thread(target=run_quote)
     quote_thread.start()
 
-    time.sleep(0.05)
+    assert quote_done.wait(timeout=1.0)
 
     allow_order_finish.set()
 
@@ -423,6 +435,81 @@ def test_quote_waits_while_order_request_is_in_flight(tmp_path: Path) -> None:
     assert quote_done.is_set() is True
 
 
+def test_rate_limiter_gives_orders_priority_over_queued_quotes() -> None:
+    clock = {"now": 0.0}
+    limiter = KiaRateLimiter(
+        api_rules={"ka10007": RateLimitRule(rate_per_second=4.0)},
+        mode_rule=RateLimitRule(rate_per_second=2.0, burst=2),
+        priority_reserve=1,
+        monotonic_fn=lambda: clock["now"],
+    )
+
+    quote_waits = [limiter.reserve(mode="live", api_id="ka10007") for _ in range(3)]
+    order_wait = limiter.reserve(mode="live", api_id="kt10001", priority=True)
+    next_quote_wait = limiter.reserve(mode="live", api_id="ka10007")
+
+    assert quote_waits == [pytest.approx(0.0), pytest.approx(1.0), pytest.approx(2.0)]
+    assert order_wait == pytest.approx(0.0)
+    assert next_quote_wait == pytest.approx(3.0)
+    assert limiter.reserve(mode="live", api_id="kt10001", priority=True) == pytest.approx(1.0)
+    assert limiter.reserve(mode="mock", api_id="ka10007") == pytest.approx(0.0)
+
+
+def test_rate_limiter_keeps_orders_within_shared_budget_under_mixed_load() -> None:
+    import random
+
+    rng = random.Random(20260217)
+    clock = {"now": 0.0}
+    mode_rule = RateLimitRule(rate_per_second=5.0, burst=3)
+    limiter = KiaRateLimiter(
+        api_rules={"ka10007": RateLimitRule(rate_per_second=4.0)},
+        mode_rule=mode_rule,
+        priority_reserve=1,
+        monotonic_fn=lambda: clock["now"],
+    )
+
+    granted: list[float] = []
+    order_waits: list[float] = []
+    quote_waits: list[float] = []
+    for _ in range(400):
+        clock["now"] += rng.choice([0.0, 0.0, 0.05, 0.1, 0.3])
+        if rng.random() < 0.3:
+            wait = limiter.reserve(mode="live", api_id="kt10000", priority=True)
+            order_waits.append(wait)
+        else:
+            wait = limiter.reserve(mode="live", api_id="ka10007")
+            quote_waits.append(wait)
+        granted.append(clock["now"] + wait)
+
+    granted.sort()
+    interval = mode_rule.interval_seconds
+    for first in range(len(granted)):
+        for last in range(first, min(len(granted), first + 40)):
+            assert last - first + 1 <= mode_rule.burst + (granted[last] - granted[first]) / interval + 1e-9
+
+    assert max(quote_waits) > 1.0
+    assert max(order_waits) < max(quote_waits)
+
+    queued_quote_wait = limiter.reserve(mode="live", api_id="ka10007")
+    jumping_order_wait = limiter.reserve(mode="live", api_id="kt10000", priority=True)
+    assert jumping_order_wait < queued_quote_wait
+
+
+def test_rate_limiter_spaces_keys_and_rejects_past_deadline_without_consuming() -> None:
+    clock = {"now": 10.0}
+    limiter = KiaRateLimiter(
+        api_rules={"ka10007": RateLimitRule(rate_per_second=4.0)},
+        monotonic_fn=lambda: clock["now"],
+    )
+
+    assert limiter.reserve(mode="live", api_id="ka10007", key="005930", key_interval_seconds=1.0) == pytest.approx(0.0)
+    assert limiter.reserve(mode="live", api_id="ka10007", key="000660", key_interval_seconds=1.0) == pytest.approx(0.25)
+    assert limiter.reserve(mode="live", api_id="ka10007", key="005930", key_interval_seconds=1.0, deadline=10.5) is None
+    assert limiter.reserve(mode="live", api_id="ka10007", key="005930", key_interval_seconds=1.0) == pytest.approx(1.0)
+    assert limiter.reserve(mode="live", api_id="ka10007", deadline=11.0) is None
+    assert limiter.reserve(mode="live", api_id="ka10007", deadline=11.25) == pytest.approx(1.25)
+
+
 def test_fetch_quotes_batch_validates_input() -> None:
     gateway = DefaultKiaGateway()
 
@@ -658,3 +745,939 @@ def test_fetch_reference_price_0830_uses_ka10080_chart_and_returns_latest_trade(
     assert len(str(captured_payloads[0]["base_dt"])) == 8
 
 
+
+
+def test_fetch_quotes_batch_concurrent_mode_returns_partial_when_cycle_deadline_expires(tmp_path: Path) -> None:
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+
+    release_slow_symbol = threading.Event()
+    in_flight = 0
+    max_in_flight = 0
+    in_flight_lock = threading.Lock()
+
+    def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        nonlocal in_flight, max_in_flight
+        if url.endswith("/oauth2/token"):
+            return 200, {"token": "token-1", "expires_in": 120}
+        if url.endswith("/api/dostk/mrkcond"):
+            symbol = str((payload or {}).get("stk_cd"))
+            with in_flight_lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            try:
+                if symbol == "035420_AL":
+                    release_slow_symbol.wait(timeout=1.0)
+                else:
+                    time.sleep(0.05)
+                return 200, {
+                    "symbol": symbol,
+                    "cur_prc": "70100",
+                    "tick_size": 1,
+                    "as_of": "2026-02-17T09:00:00+00:00",
+                }
+            finally:
+                with in_flight_lock:
+                    in_flight -= 1
+        raise AssertionError("unexpected URL")
+
+    gateway = DefaultKiaGateway(
+        api_client=RoutingKiaApiClient(
+            csm_repository=repo,
+            transport=transport,
+            retry_base_delay_seconds=0,
+            retry_max_delay_seconds=0,
+            rand_fn=lambda _a, _b: 0,
+            quote_batch_max_workers=4,
+            quote_batch_rate_per_second=100.0,
+            quote_batch_burst=4,
+        )
+    )
+
+    started = time.monotonic()
+    result = gateway.fetch_quotes_batch(
+        PollQuotesRequest(
+            mode="live",
+            symbols=["005930", "000660", "035420", "051910"],
+            poll_cycle_id="cycle-concurrent",
+            timeout_ms=300,
+        )
+    )
+    elapsed = time.monotonic() - started
+    release_slow_symbol.set()
+
+    assert elapsed < 0.6
+    assert max_in_flight >= 2
+    assert [quote.symbol for quote in result.quotes] == ["005930", "000660", "051910"]
+    assert result.partial is True
+    assert [(error.symbol, error.code, error.retryable) for error in result.errors] == [
+        ("035420", "KIA_API_TIMEOUT", True)
+    ]
+
+
+def test_fetch_quotes_batch_concurrent_mode_reports_symbols_outside_token_budget(tmp_path: Path) -> None:
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+    quote_calls = 0
+    quote_calls_lock = threading.Lock()
+
+    def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        nonlocal quote_calls
+        if url.endswith("/oauth2/token"):
+            return 200, {"token": "token-1", "expires_in": 120}
+        if url.endswith("/api/dostk/mrkcond"):
+            with quote_calls_lock:
+                quote_calls += 1
+            return 200, {
+                "symbol": str((payload or {}).get("stk_cd")),
+                "cur_prc": "70100",
+                "tick_size": 1,
+                "as_of": "2026-02-17T09:00:00+00:00",
+            }
+        raise AssertionError("unexpected URL")
+
+    client = RoutingKiaApiClient(
+        csm_repository=repo,
+        transport=transport,
+        retry_base_delay_seconds=0,
+        retry_max_delay_seconds=0,
+        rand_fn=lambda _a, _b: 0,
+        quote_batch_max_workers=3,
+        quote_batch_rate_per_second=1.0,
+        quote_batch_burst=2,
+    )
+
+    raw = client.fetch_quotes_batch_raw(
+        mode="live",
+        symbols=["005930", "000660", "035420"],
+        timeout_ms=200,
+        poll_cycle_id="cycle-budget",
+    )
+
+    assert quote_calls == 2
+    assert len(raw["quotes"]) == 2
+    assert raw["partial"] is True
+    assert [error["code"] for error in raw["errors"]] == ["KIA_API_TIMEOUT"]
+
+
+def test_fetch_quotes_batch_concurrent_mode_honors_symbol_interval_and_stops_after_deadline(tmp_path: Path) -> None:
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+    quote_symbols: list[str] = []
+    release = threading.Event()
+
+    def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        if url.endswith("/oauth2/token"):
+            return 200, {"token": "token-1", "expires_in": 120}
+        symbol = str((payload or {}).get("stk_cd"))
+        quote_symbols.append(symbol)
+        if symbol == "035420_AL":
+            release.wait(timeout=1.0)
+            raise TimeoutError("slow quote")
+        return 200, {"symbol": symbol, "cur_prc": "70100", "tick_size": 1, "as_of": "2026-02-17T09:00:00+00:00"}
+
+    client = RoutingKiaApiClient(
+        csm_repository=repo,
+        transport=transport,
+        retry_base_delay_seconds=0,
+        retry_max_delay_seconds=0,
+        rand_fn=lambda _a, _b: 0,
+        quote_min_interval_seconds=5.0,
+        quote_batch_max_workers=2,
+        quote_batch_rate_per_second=100.0,
+        quote_batch_burst=4,
+    )
+
+    first = client.fetch_quotes_batch_raw(mode="live", symbols=["005930", "000660"], timeout_ms=200, poll_cycle_id="cycle-1")
+    second = client.fetch_quotes_batch_raw(
+        mode="live",
+        symbols=["005930", "035420", "051910"],
+        timeout_ms=100,
+        poll_cycle_id="cycle-2",
+    )
+    release.set()
+    time.sleep(0.1)
+
+    assert len(first["quotes"]) == 2
+    assert [(error["symbol"], error["code"]) for error in second["errors"]] == [
+        ("005930", "KIA_RATE_LIMITED"),
+        ("035420", "KIA_API_TIMEOUT"),
+    ]
+    assert quote_symbols.count("005930_AL") == 1
+    assert quote_symbols.count("035420_AL") == 1
+    assert quote_symbols.count("051910_AL") == 1
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    request_count = 0
+    drop_request_numbers: set[int] = set()
+    client_ports: list[int] = []
+
+    def do_POST(self) -> None:  # noqa: N802
+        cls = type(self)
+        cls.request_count += 1
+        cls.client_ports.append(self.client_address[1])
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if cls.request_count in cls.drop_request_numbers:
+            self.close_connection = True
+            return
+        body = json.dumps({"echo": payload, "api_id": self.headers.get("api-id")}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+
+def _start_keep_alive_server(drop_request_numbers: set[int] | None = None) -> ThreadingHTTPServer:
+    handler = type(
+        "Handler",
+        (_KeepAliveHandler,),
+        {"request_count": 0, "drop_request_numbers": drop_request_numbers or set(), "client_ports": []},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_pooled_transport_reuses_keep_alive_connection() -> None:
+    server = _start_keep_alive_server()
+    transport = PooledHttpTransport(max_connections_per_origin=2)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for index in range(3):
+            status, body = transport(
+                "POST",
+                f"{base_url}/api/dostk/mrkcond",
+                {"Content-Type": "application/json;charset=UTF-8", "api-id": "ka10007"},
+                {"stk_cd": f"00593{index}_AL"},
+                None,
+                1.0,
+            )
+            assert status == 200
+            assert body["echo"] == {"stk_cd": f"00593{index}_AL"}
+            assert body["api_id"] == "ka10007"
+
+        stats = transport.stats()
+        assert stats["connections_created"] == 1
+        assert stats["requests_total"] == 3
+        assert stats["reused_requests"] == 2
+        assert stats["connections"][0]["reuses"] == 2
+        assert len(set(server.RequestHandlerClass.client_ports)) == 1
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_pooled_transport_reconnects_when_reused_connection_is_reset() -> None:
+    server = _start_keep_alive_server(drop_request_numbers={2})
+    transport = PooledHttpTransport()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        headers = {"api-id": "ka10007"}
+        first = transport("POST", f"{base_url}/api/dostk/mrkcond", headers, {"seq": 1}, None, 1.0)
+        second = transport("POST", f"{base_url}/api/dostk/mrkcond", headers, {"seq": 2}, None, 1.0)
+
+        assert first == (200, {"echo": {"seq": 1}, "api_id": "ka10007"})
+        assert second == (200, {"echo": {"seq": 2}, "api_id": "ka10007"})
+        stats = transport.stats()
+        assert stats["reconnects"] == 1
+        assert stats["connections_created"] == 2
+        assert server.RequestHandlerClass.request_count == 3
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_pooled_transport_force_new_keeps_healthy_idle_connections_below_capacity() -> None:
+    class _FakeConnection:
+        def __init__(self) -> None:
+            self.closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    transport = PooledHttpTransport(
+        max_connections_per_origin=3,
+        connection_factory=lambda scheme, host, port, timeout: _FakeConnection(),
+    )
+    key = ("http", "127.0.0.1", 80)
+    first = transport._acquire(key, 1.0)
+    second = transport._acquire(key, 1.0)
+    transport._release(key, first)
+    transport._release(key, second)
+
+    reused = transport._acquire(key, 1.0)
+    fresh = transport._acquire(key, 1.0, force_new=True)
+
+    assert reused is second
+    assert fresh.connection_id not in {first.connection_id, second.connection_id}
+    assert first.conn.closed is False
+    assert list(transport._idle[key]) == [first]
+
+    at_capacity = transport._acquire(key, 1.0, force_new=True)
+    assert first.conn.closed is True
+    assert at_capacity.connection_id not in {first.connection_id, fresh.connection_id}
+    transport.close()
+
+
+def test_pooled_transport_does_not_resend_order_after_reused_connection_is_reset() -> None:
+    server = _start_keep_alive_server(drop_request_numbers={2})
+    transport = PooledHttpTransport(max_connections_per_origin=1)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        headers = {"api-id": "kt10000"}
+        transport("POST", f"{base_url}/api/dostk/ordr", headers, {"seq": 1}, None, 1.0)
+        with pytest.raises(http.client.RemoteDisconnected):
+            transport("POST", f"{base_url}/api/dostk/ordr", headers, {"seq": 2}, None, 1.0)
+
+        assert transport.stats()["reconnects"] == 0
+        assert server.RequestHandlerClass.request_count == 2
+        assert transport("POST", f"{base_url}/api/dostk/ordr", headers, {"seq": 3}, None, 1.0)[0] == 200
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_is_retryable_request_only_allows_reads() -> None:
+    assert is_retryable_request("GET", {}) is True
+    assert is_retryable_request("POST", {"api-id": "ka10080"}) is True
+    assert is_retryable_request("POST", {"api-id": "kt10001"}) is False
+    assert is_retryable_request("POST", {}) is False
+
+
+def test_pooled_transport_evicts_idle_connections() -> None:
+    server = _start_keep_alive_server()
+    clock = {"now": 0.0}
+    transport = PooledHttpTransport(idle_timeout_seconds=5.0, monotonic_fn=lambda: clock["now"])
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        transport("POST", f"{base_url}/api/dostk/mrkcond", {}, {}, None, 1.0)
+        clock["now"] = 10.0
+        transport("POST", f"{base_url}/api/dostk/mrkcond", {}, {}, None, 1.0)
+
+        stats = transport.stats()
+        assert stats["idle_evictions"] == 1
+        assert stats["connections_created"] == 2
+        assert stats["reused_requests"] == 0
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_asyncio_transport_posts_json_and_parses_response() -> None:
+    server = _start_keep_alive_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        status, body = asyncio.run(
+            asyncio_transport(
+                "POST",
+                f"{base_url}/api/dostk/mrkcond",
+                {"Content-Type": "application/json;charset=UTF-8", "api-id": "ka10007"},
+                {"stk_cd": "005930_AL"},
+                None,
+                1.0,
+            )
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert status == 200
+    assert body == {"echo": {"stk_cd": "005930_AL"}, "api_id": "ka10007"}
+
+
+def test_async_pooled_transport_reuses_and_reconnects_keep_alive_connections() -> None:
+    server = _start_keep_alive_server(drop_request_numbers={3})
+    transport = AsyncPooledHttpTransport()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    headers = {"Content-Type": "application/json;charset=UTF-8", "api-id": "ka10007"}
+
+    async def scenario() -> list[tuple[int, dict]]:
+        return [
+            await transport("POST", f"{base_url}/api/dostk/mrkcond", headers, {"seq": seq}, None, 1.0)
+            for seq in range(1, 4)
+        ]
+
+    try:
+        responses = asyncio.run(scenario())
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+    assert responses == [(200, {"echo": {"seq": seq}, "api_id": "ka10007"}) for seq in range(1, 4)]
+    stats = transport.stats()
+    assert stats["requests_total"] == 3
+    assert stats["reused_requests"] == 1
+    assert stats["reconnects"] == 1
+    assert stats["connections_created"] == 2
+
+
+def test_async_gateway_paces_through_the_shared_client_rate_limiter(tmp_path: Path) -> None:
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    def token_transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        return 200, {"token": "token-1", "expires_in": 120}
+
+    async def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        return 200, {"symbol": str((payload or {}).get("stk_cd")), "cur_prc": "70100"}
+
+    api_client = RoutingKiaApiClient(
+        csm_repository=repo,
+        transport=token_transport,
+        request_rate_per_second=2.0,
+        request_burst=1,
+        order_priority_reserve=0,
+        quote_global_min_interval_seconds=0,
+    )
+    gateway = DefaultAsyncKiaGateway(
+        api_client,
+        transport=transport,
+        sleep_fn=fake_sleep,
+        quote_min_interval_seconds=0,
+        rate_limiter=api_client.rate_limiter,
+    )
+
+    assert api_client.rate_limiter.reserve(mode="live", api_id="ka10080") == 0
+    asyncio.run(gateway.fetch_quote(FetchQuoteRequest(mode="live", symbol="005930")))
+
+    assert len(sleeps) == 1
+    assert 0.4 < sleeps[0] <= 0.5
+
+
+def test_async_gateway_reads_and_writes_chart_cache_off_the_event_loop(tmp_path: Path) -> None:
+    import threading
+
+    from kia.chart_cache import ChartBarCache, ChartBarStore
+
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+    cache_threads: list[int] = []
+
+    class _RecordingCache(ChartBarCache):
+        def lookup(self, **kwargs: Any) -> dict[str, Any] | None:
+            cache_threads.append(threading.get_ident())
+            return super().lookup(**kwargs)
+
+        def remember(self, **kwargs: Any) -> None:
+            cache_threads.append(threading.get_ident())
+            super().remember(**kwargs)
+
+    def token_transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        return 200, {"token": "token-1", "expires_in": 120}
+
+    async def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        base_dt = str((payload or {})["base_dt"])
+        return 200, {"stk_min_pole_chart_qry": [{"cntr_tm": f"{base_dt}083005", "cur_prc": "70110"}]}
+
+    api_client = RoutingKiaApiClient(csm_repository=repo, transport=token_transport)
+    store = ChartBarStore(str(tmp_path / "state" / "chart_bars.db"))
+    cache = _RecordingCache(store, now_fn=lambda: datetime(2026, 2, 19, 10, 0, tzinfo=timezone(timedelta(hours=9))))
+    gateway = DefaultAsyncKiaGateway(api_client, transport=transport, chart_cache=cache)
+
+    async def run() -> tuple[int, list[Decimal | None]]:
+        prices = [await gateway.fetch_reference_price_0830(mode="live", symbol="005930") for _ in range(2)]
+        return threading.get_ident(), prices
+
+    loop_thread, prices = asyncio.run(run())
+    store.close()
+
+    assert prices == [Decimal("70110"), Decimal("70110")]
+    assert cache_threads
+    assert loop_thread not in cache_threads
+
+
+def test_async_gateway_polls_symbols_concurrently_with_partial_deadline(tmp_path: Path) -> None:
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+    in_flight = 0
+    max_in_flight = 0
+
+    def token_transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        if url.endswith("/oauth2/token"):
+            return 200, {"token": "token-1", "expires_in": 120}
+        raise AssertionError("unexpected sync URL")
+
+    async def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        nonlocal in_flight, max_in_flight
+        assert url.endswith("/api/dostk/mrkcond")
+        assert headers["authorization"] == "Bearer token-1"
+        symbol = str((payload or {}).get("stk_cd"))
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(1.0 if symbol == "035420_AL" else 0.02)
+        finally:
+            in_flight -= 1
+        return 200, {"symbol": symbol, "cur_prc": "70100", "tick_size": 1, "as_of": "2026-02-17T09:00:00+00:00"}
+
+    gateway = DefaultAsyncKiaGateway(
+        RoutingKiaApiClient(csm_repository=repo, transport=token_transport),
+        transport=transport,
+        quote_min_interval_seconds=0,
+        quote_global_min_interval_seconds=0,
+    )
+
+    started = time.monotonic()
+    result = asyncio.run(
+        gateway.fetch_quotes_batch(
+            PollQuotesRequest(
+                mode="live",
+                symbols=["005930", "000660", "035420"],
+                poll_cycle_id="cycle-async",
+                timeout_ms=200,
+            )
+        )
+    )
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.6
+    assert max_in_flight == 3
+    assert [quote.symbol for quote in result.quotes] == ["005930", "000660"]
+    assert [(error.symbol, error.code) for error in result.errors] == [("035420", "KIA_API_TIMEOUT")]
+    assert result.partial is True
+
+
+def test_async_gateway_spaces_quotes_by_global_interval_without_blocking(tmp_path: Path) -> None:
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+    clock = {"now": 100.0}
+    sleeps: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    def token_transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        return 200, {"token": "token-1", "expires_in": 120}
+
+    async def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        return 200, {"symbol": str((payload or {}).get("stk_cd")), "cur_prc": "70100"}
+
+    gateway = DefaultAsyncKiaGateway(
+        RoutingKiaApiClient(csm_repository=repo, transport=token_transport),
+        transport=transport,
+        sleep_fn=fake_sleep,
+        monotonic_fn=lambda: clock["now"],
+    )
+
+    async def scenario() -> None:
+        await gateway.fetch_quote(FetchQuoteRequest(mode="live", symbol="005930"))
+        await gateway.fetch_quote(FetchQuoteRequest(mode="live", symbol="000660"))
+        await gateway.fetch_quote(FetchQuoteRequest(mode="live", symbol="005930"))
+
+    asyncio.run(scenario())
+
+    assert sleeps == [0.25, 1.0]
+
+
+def _realtime_api_client(tmp_path: Path, server: MockKiwoomRealtimeServer) -> RoutingKiaApiClient:
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "liveWebSocketUrl": server.url,
+        },
+    )
+
+    def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        if url.endswith("/oauth2/token"):
+            return 200, {"token": "ws-token", "expires_in": 3600}
+        raise AssertionError("unexpected URL")
+
+    return RoutingKiaApiClient(csm_repository=repo, transport=transport)
+
+
+def test_realtime_quote_client_streams_ticks_and_resubscribes_after_disconnect(tmp_path: Path) -> None:
+    server = MockKiwoomRealtimeServer(
+        ticks_by_connection=[
+            [MockKiwoomRealtimeServer.tick("005930", "+70100", "090001")],
+            [
+                MockKiwoomRealtimeServer.tick("000660", "-120500", "090002"),
+                MockKiwoomRealtimeServer.tick("005930", "70200", "090003"),
+            ],
+        ],
+    )
+    quotes = []
+    disconnects: list[Exception] = []
+    stop_event = threading.Event()
+
+    def on_quote(quote) -> None:
+        quotes.append(quote)
+        if len(quotes) == 3:
+            stop_event.set()
+
+    with server:
+        client = KiaRealtimeQuoteClient(
+            api_client=_realtime_api_client(tmp_path, server),
+            mode="live",
+            recv_timeout_seconds=2.0,
+            reconnect_base_delay_seconds=0.01,
+        )
+        client.run(symbols=["005930", "000660"], on_quote=on_quote, stop_event=stop_event, on_disconnect=disconnects.append)
+
+    assert [(quote.symbol, quote.price, quote.as_of.strftime("%H%M%S")) for quote in quotes] == [
+        ("005930", Decimal("70100"), "090001"),
+        ("000660", Decimal("120500"), "090002"),
+        ("005930", Decimal("70200"), "090003"),
+    ]
+    assert server.logins == ["ws-token", "ws-token"]
+    assert server.registrations == [["005930", "000660"], ["005930", "000660"]]
+    assert server.pong_count == 2
+    assert len(disconnects) == 1
+    assert client.stats()["reconnects"] == 1
+    assert client.stats()["ticks"] == 3
+
+
+def test_realtime_quote_client_gives_up_after_max_reconnect_attempts(tmp_path: Path) -> None:
+    server = MockKiwoomRealtimeServer(ticks_by_connection=[[]], max_connections=1)
+    with server:
+        client = KiaRealtimeQuoteClient(
+            api_client=_realtime_api_client(tmp_path, server),
+            mode="live",
+            recv_timeout_seconds=2.0,
+            reconnect_base_delay_seconds=0.01,
+            max_reconnect_attempts=2,
+        )
+        with pytest.raises(KiaError) as exc_info:
+            client.run(symbols=["005930"], on_quote=lambda _quote: None, stop_event=threading.Event())
+
+    assert exc_info.value.code == "KIA_REALTIME_UNAVAILABLE"
+    assert exc_info.value.payload.details["attempts"] == 3
+
+
+def test_realtime_quote_client_does_not_retry_rejected_registration(tmp_path: Path) -> None:
+    server = MockKiwoomRealtimeServer(register_return_code=1)
+    with server:
+        client = KiaRealtimeQuoteClient(api_client=_realtime_api_client(tmp_path, server), mode="live")
+        with pytest.raises(KiaError) as exc_info:
+            client.run(symbols=["005930"], on_quote=lambda _quote: None, stop_event=threading.Event())
+
+    assert exc_info.value.code == "KIA_REALTIME_REGISTER_FAILED"
+    assert server.connections == 1
+
+
+def _issued_token(name: str, issued_at: datetime, *, ttl_seconds: int = 120) -> AccessToken:
+    return AccessToken(
+        token=name,
+        issued_at=issued_at,
+        expires_at=issued_at + timedelta(seconds=ttl_seconds),
+        refresh_at=issued_at + timedelta(seconds=ttl_seconds - 60),
+        mode="live",
+    )
+
+
+def test_token_provider_serves_stale_token_while_revalidating() -> None:
+    clock = {"now": datetime(2026, 2, 17, 0, 0, tzinfo=timezone.utc)}
+    release = threading.Event()
+    issued: list[str] = []
+
+    def issuer(_mode: str) -> AccessToken:
+        if issued:
+            assert release.wait(timeout=1.0)
+        issued.append(f"token-{len(issued) + 1}")
+        return _issued_token(issued[-1], clock["now"])
+
+    provider = InMemoryTokenProvider(issuer, now_fn=lambda: clock["now"], refresh_jitter_seconds=0)
+    assert provider.get_valid_token("live").token == "token-1"
+
+    clock["now"] += timedelta(seconds=90)
+    assert provider.get_valid_token("live").token == "token-1"
+    assert provider.peek_valid_token("live").token == "token-1"
+    release.set()
+    for _ in range(100):
+        if provider.peek_valid_token("live").token == "token-2":
+            break
+        time.sleep(0.01)
+
+    metrics = provider.metrics()["live"]
+    assert provider.get_valid_token("live").token == "token-2"
+    assert issued == ["token-1", "token-2"]
+    assert metrics["stale_served"] >= 2
+    assert metrics["revalidate_refreshes"] == 1
+    assert metrics["failures"] == 0
+
+    clock["now"] += timedelta(seconds=200)
+    assert provider.get_valid_token("live").token == "token-3"
+
+
+def test_token_provider_background_refresh_uses_jitter_and_records_failures() -> None:
+    clock = {"now": datetime(2026, 2, 17, 0, 0, tzinfo=timezone.utc)}
+    fail_next = {"value": False}
+    issued = 0
+
+    def issuer(_mode: str) -> AccessToken:
+        nonlocal issued
+        if fail_next["value"]:
+            fail_next["value"] = False
+            raise RuntimeError("auth down")
+        issued += 1
+        return _issued_token(f"token-{issued}", clock["now"])
+
+    provider = InMemoryTokenProvider(
+        issuer,
+        now_fn=lambda: clock["now"],
+        refresh_lead_seconds=10,
+        refresh_jitter_seconds=20,
+        refresh_retry_seconds=5,
+        rand_fn=lambda _a, _b: 15.0,
+    )
+    provider.get_valid_token("live")
+
+    clock["now"] += timedelta(seconds=34)
+    assert provider.refresh_due_tokens() == []
+    clock["now"] += timedelta(seconds=1)
+    fail_next["value"] = True
+    assert provider.refresh_due_tokens() == []
+    assert provider.metrics()["live"]["failures"] == 1
+    assert provider.metrics()["live"]["last_error"] == "auth down"
+    assert provider.get_valid_token("live").token == "token-1"
+
+    clock["now"] += timedelta(seconds=5)
+    assert provider.refresh_due_tokens() == ["live"]
+    metrics = provider.metrics()["live"]
+    assert provider.get_valid_token("live").token == "token-2"
+    assert metrics["background_refreshes"] == 1
+    assert metrics["last_error"] is None
+    assert metrics["last_refresh_latency_ms"] is not None
+    assert metrics["next_refresh_at"] == (clock["now"] + timedelta(seconds=35)).isoformat()
+
+
+def _read_shared_token(shared_token: SharedAccessToken, results) -> None:
+    results.put(InMemoryTokenProvider(shared_token.issue).get_valid_token("live").token)
+
+
+def test_shared_access_token_hands_parent_refreshes_to_worker_processes() -> None:
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    shared_token = SharedAccessToken(context)
+    with pytest.raises(KiaError) as missing:
+        shared_token.issue("live")
+    assert missing.value.code == "KIA_AUTH_TOKEN_EXPIRED"
+
+    issued = 0
+
+    def issuer(_mode: str) -> AccessToken:
+        nonlocal issued
+        issued += 1
+        return _issued_token(f"token-{issued}", datetime.now(timezone.utc))
+
+    provider = InMemoryTokenProvider(issuer, refresh_jitter_seconds=0)
+    provider.get_valid_token("live")
+    provider.add_refresh_listener(shared_token.publish)
+    assert shared_token.issue("live").token == "token-1"
+    with pytest.raises(KiaError):
+        shared_token.issue("mock")
+
+    provider.force_refresh("live")
+    results = context.Queue()
+    worker = context.Process(target=_read_shared_token, args=(shared_token, results))
+    worker.start()
+    worker.join(timeout=10)
+
+    assert results.get(timeout=1) == "token-2"
+    assert issued == 2
+
+
+def test_idempotency_store_is_bounded_by_lru_and_ttl() -> None:
+    clock = {"now": 1000.0}
+    store = InMemoryIdempotencyStore(max_entries=2, ttl_seconds=60, shard_count=1, time_fn=lambda: clock["now"])
+
+    store.save(mode="live", key="CID-1", response={"ord_no": "1"})
+    store.save(mode="live", key="CID-2", response={"ord_no": "2"})
+    assert store.find(mode="live", key="CID-1") == {"ord_no": "1"}
+    store.save(mode="live", key="CID-3", response={"ord_no": "3"})
+
+    assert store.find(mode="live", key="CID-2") is None
+    assert store.find(mode="mock", key="CID-1") is None
+    clock["now"] += 60
+    assert store.find(mode="live", key="CID-3") is None
+    assert store.stats() == {"entries": 1, "evictions": 1, "expirations": 1}
+
+
+def test_journaled_idempotency_store_restores_live_entries_after_restart(tmp_path: Path) -> None:
+    clock = {"now": 1000.0}
+    journal_path = tmp_path / "state" / "kia_idempotency.jsonl"
+    store = JournaledIdempotencyStore(journal_path=str(journal_path), max_entries=2, ttl_seconds=60, time_fn=lambda: clock["now"])
+    store.save(mode="live", key="CID-OLD", response={"ord_no": "0"})
+    clock["now"] += 30
+    for index in range(1, 5):
+        store.save(mode="live", key=f"CID-{index}", response={"ord_no": str(index)})
+    with journal_path.open("a", encoding="utf-8") as file:
+        file.write('{"mode": "live", "key": "CID-TORN"')
+
+    clock["now"] += 31
+    restored = JournaledIdempotencyStore(journal_path=str(journal_path), max_entries=2, ttl_seconds=60, time_fn=lambda: clock["now"])
+
+    assert restored.find(mode="live", key="CID-OLD") is None
+    assert restored.find(mode="live", key="CID-3") == {"ord_no": "3"}
+    assert restored.find(mode="live", key="CID-4") == {"ord_no": "4"}
+    assert [json.loads(line)["key"] for line in journal_path.read_text(encoding="utf-8").splitlines()] == ["CID-3", "CID-4"]
+
+
+def test_chart_cache_serves_past_days_and_covered_reference_minute_from_disk(tmp_path: Path) -> None:
+    from datetime import date
+
+    from kia.chart_cache import ChartBarCache, ChartBarStore
+
+    repo = _write_runtime_files(
+        tmp_path,
+        mode="live",
+        credential={
+            "appKey": "APPKEY",
+            "appSecret": "APPSECRET",
+            "liveBaseUrl": "https://live.example",
+            "mockBaseUrl": "https://mock.example",
+        },
+    )
+    captured_base_dates: list[str] = []
+
+    def transport(method: str, url: str, headers: dict[str, str], payload: dict | None, query: dict | None, timeout: float):
+        if url.endswith("/oauth2/token"):
+            return 200, {"token": "token-1", "expires_in": 120}
+        if url.endswith("/api/dostk/chart"):
+            assert payload is not None
+            base_dt = str(payload["base_dt"])
+            captured_base_dates.append(base_dt)
+            return 200, {
+                "stk_min_pole_chart_qry": [
+                    {"cntr_tm": f"{base_dt}090500", "cur_prc": "70200"},
+                    {"cntr_tm": f"{base_dt}083005", "cur_prc": "70110"},
+                    {"cntr_tm": "20200101083005", "cur_prc": "1"},
+                ]
+            }
+        raise AssertionError("unexpected URL")
+
+    api_client = RoutingKiaApiClient(
+        csm_repository=repo,
+        transport=transport,
+        retry_base_delay_seconds=0,
+        retry_max_delay_seconds=0,
+        sleep_fn=lambda _seconds: None,
+        rand_fn=lambda _a, _b: 0,
+    )
+    store = ChartBarStore(str(tmp_path / "state" / "chart_bars.db"))
+    cache = ChartBarCache(store, now_fn=lambda: datetime(2026, 2, 19, 10, 0, tzinfo=timezone(timedelta(hours=9))))
+    gateway = DefaultKiaGateway(api_client=api_client, chart_cache=cache)
+
+    assert gateway.fetch_reference_price_0830(mode="live", symbol="005930") == Decimal("70110")
+    assert gateway.fetch_reference_price_0830(mode="live", symbol="005930") == Decimal("70110")
+    assert captured_base_dates == ["20260219"]
+
+    past = cache.fetch(api_client, mode="live", symbol="005930", trading_date=date(2026, 2, 18))
+    cached_past = cache.fetch(api_client, mode="live", symbol="005930", trading_date=date(2026, 2, 18))
+    assert captured_base_dates == ["20260219", "20260218"]
+    assert cached_past["stk_min_pole_chart_qry"] == past["stk_min_pole_chart_qry"][:2]
+
+    cache.fetch(api_client, mode="live", symbol="005930", trading_date=date(2026, 2, 19))
+    assert captured_base_dates == ["20260219", "20260218", "20260219"]
+
+    fetched = cache.prefetch(
+        api_client,
+        mode="live",
+        symbols=["005930", "000660"],
+        trading_dates=[date(2026, 2, 18), date(2026, 2, 17), date(2026, 2, 19)],
+    )
+    assert fetched == 3
+    assert captured_base_dates[3:] == ["20260218", "20260217", "20260217"]
+    store.close()
+
+
+def test_chart_bar_store_evicts_least_recently_accessed_days_beyond_size_limit(tmp_path: Path) -> None:
+    from datetime import date
+
+    from kia.chart_cache import ChartBarStore
+
+    clock = iter(float(value) for value in range(100))
+    store = ChartBarStore(str(tmp_path / "chart_bars.db"), max_bytes=10_000, clock_fn=lambda: next(clock))
+    rows = [{"cntr_tm": f"20260218{minute:02d}0000", "cur_prc": str(70000 + minute)} for minute in range(9, 16)]
+    for day in (16, 17, 18):
+        store.put(symbol="005930", trading_date=date(2026, 2, day), tic_scope="1", rows=rows, complete=True)
+    entry_size = store.total_bytes() // 3
+
+    assert store.get(symbol="005930", trading_date=date(2026, 2, 16)) == rows
+    store.max_bytes = entry_size * 3
+    store.put(symbol="000660", trading_date=date(2026, 2, 18), tic_scope="1", rows=rows, complete=True)
+
+    assert store.total_bytes() <= store.max_bytes
+    assert store.contains(symbol="005930", trading_date=date(2026, 2, 16))
+    assert not store.contains(symbol="005930", trading_date=date(2026, 2, 17))
+    assert store.contains(symbol="000660", trading_date=date(2026, 2, 18))
+
+    store.put(symbol="005930", trading_date=date(2026, 2, 19), tic_scope="1", rows=rows, complete=False)
+    assert store.get(symbol="005930", trading_date=date(2026, 2, 19)) is None
+    store.close()
@@ -163,3 +163,58 @@ def test_reconcile_execution_idempotency_position_tracking_and_prp_hooks() -> No
         repo.close()
 
 
+
+
+def test_unit_of_work_groups_order_lifecycle_into_single_commit() -> None:
+    def run_lifecycle(service: OpmService, *, suffix: str) -> None:
+        trading_date = date(2026, 2, 17)
+        order = service.create_order(
+            trading_date=trading_date,
+            symbol="005930",
+            side="BUY",
+            requested_price=Decimal("10000"),
+            requested_qty=10,
+            now=_dt(9, 0),
+        )
+        order = service.move_order_status(order=order, next_status="SUBMITTED", now=_dt(9, 1))
+        order = service.move_order_status(order=order, next_status="ACCEPTED", now=_dt(9, 2), broker_order_id=f"BRK-{suffix}")
+        service.reconcile_execution_events(
+            order=order,
+            position=create_empty_position(trading_date=trading_date, symbol="005930", now=_dt(9, 0)),
+            fills=[
+                ExecutionFill(
+                    execution_id=f"EXE-{suffix}-{index}",
+                    broker_order_id=f"BRK-{suffix}",
+                    symbol="005930",
+                    side="BUY",
+                    price=Decimal("10000"),
+                    qty=5,
+                    executed_at=_dt(9, 5 + index),
+                )
+                for index in range(2)
+            ],
+            broker_remaining_qty=0,
+            latest_market_price=Decimal("10000"),
+        )
+
+    repo = _repo()
+    try:
+        statements: list[str] = []
+        repo.conn.set_trace_callback(statements.append)
+        service = OpmService(prp_repository=repo)
+
+        run_lifecycle(service, suffix="A")
+        per_call_commits = statements.count("COMMIT")
+        statements.clear()
+
+        with service.unit_of_work():
+            run_lifecycle(service, suffix="B")
+        grouped_commits = statements.count("COMMIT")
+
+        assert per_call_commits == 4
+        assert grouped_commits == 1
+        assert repo.conn.execute("SELECT COUNT(*) AS n FROM execution_events").fetchone()["n"] == 4
+        assert repo.conn.execute("SELECT COUNT(*) AS n FROM order_events").fetchone()["n"] == 8
+    finally:
+        repo.conn.set_trace_callback(None)
+        repo.close()
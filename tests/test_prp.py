@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import json
 import sqlite3
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 import sys
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
@@ -167,3 +170,642 @@ def test_generate_daily_report_with_tax_and_fee() -> None:
         assert details[0].sell_fee == Decimal("11.11")
     finally:
         repo.close()
+
+
+def test_bulk_execution_append_dedupes_and_unit_of_work_rolls_back_as_one() -> None:
+    repo = create_repo()
+    try:
+        def execution(event_id: str, execution_id: str) -> ExecutionEvent:
+            return ExecutionEvent(
+                event_id=event_id,
+                execution_id=execution_id,
+                order_id="ord-1",
+                occurred_at=_dt(9),
+                trading_date=date(2026, 2, 17),
+                symbol="005930",
+                side="BUY",
+                execution_price=Decimal("10000"),
+                execution_qty=5,
+                cum_qty=5,
+                remaining_qty=5,
+            )
+
+        assert repo.append_execution_events([execution("evt-1", "exe-1"), execution("evt-2", "exe-2")]) == [True, True]
+        assert repo.append_execution_events(
+            [execution("evt-3", "exe-2"), execution("evt-4", "exe-3"), execution("evt-5", "exe-3")]
+        ) == [False, True, False]
+        assert repo.existing_execution_ids(["exe-1", "exe-3", "exe-9"]) == {"exe-1", "exe-3"}
+
+        try:
+            with repo.unit_of_work():
+                repo.append_execution_events([execution("evt-6", "exe-4")])
+                with repo.unit_of_work():
+                    repo.append_execution_event(execution("evt-7", "exe-5"))
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+
+        assert repo.existing_execution_ids(["exe-4", "exe-5"]) == set()
+        assert repo.conn.execute("SELECT COUNT(*) AS n FROM execution_events").fetchone()["n"] == 3
+    finally:
+        repo.close()
+
+
+def test_connection_manager_shares_one_writer_and_pools_read_only_connections(tmp_path: Path) -> None:
+    import threading
+
+    from prp.connections import PrpConnectionManager
+
+    manager = PrpConnectionManager(tmp_path / "state" / "prp.db", read_pool_size=2)
+    try:
+        with manager.writer() as first_writer:
+            pass
+
+        def write(index: int) -> None:
+            with manager.writer() as repo:
+                assert repo is first_writer
+                repo.append_execution_event(
+                    ExecutionEvent(
+                        event_id=f"evt-{index}",
+                        execution_id=f"exe-{index}",
+                        order_id="ord-1",
+                        occurred_at=_dt(9, index),
+                        trading_date=date(2026, 2, 17),
+                        symbol="005930",
+                        side="BUY",
+                        execution_price=Decimal("10000"),
+                        execution_qty=1,
+                        cum_qty=index + 1,
+                        remaining_qty=0,
+                    )
+                )
+
+        threads = [threading.Thread(target=write, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with manager.reader() as reader:
+            assert reader.conn is not first_writer.conn
+            assert reader.existing_execution_ids([f"exe-{index}" for index in range(8)]) == {f"exe-{index}" for index in range(8)}
+            with pytest.raises(sqlite3.OperationalError):
+                reader.conn.execute("DELETE FROM execution_events")
+            first_reader_conn = reader.conn
+        with manager.reader() as reader:
+            assert reader.conn is first_reader_conn
+    finally:
+        manager.close()
+
+    with pytest.raises(RuntimeError):
+        with manager.writer():
+            pass
+
+
+def test_write_behind_journal_drains_to_sqlite_and_replays_log_on_startup(tmp_path: Path) -> None:
+    from prp.connections import PrpConnectionManager
+    from prp.journal import PrpWriteBehindJournal
+    from prp.models import OrderEvent
+    from prp.repository import _order_event_row
+
+    def order_event(index: int, status: str) -> OrderEvent:
+        return OrderEvent(
+            event_id=f"evt-ord-{index}",
+            order_id="ord-1",
+            occurred_at=_dt(9, index),
+            trading_date=date(2026, 2, 17),
+            symbol="005930",
+            side="BUY",
+            order_type="LIMIT",
+            order_price=Decimal("10000"),
+            quantity=10,
+            status=status,
+            client_order_key="cmd-1",
+        )
+
+    db_path = tmp_path / "prp.db"
+    log_path = tmp_path / "prp_write_behind.jsonl"
+    manager = PrpConnectionManager(db_path)
+    journal = PrpWriteBehindJournal(manager, log_path, batch_size=2)
+    try:
+        journal.append_order_event(order_event(0, "PENDING_SUBMIT"))
+        journal.append_order_event(order_event(1, "SUBMITTED"))
+        journal.save_state_snapshot(
+            PositionSnapshot(
+                snapshot_id="snap-1",
+                saved_at=_dt(9, 2),
+                trading_date=date(2026, 2, 17),
+                symbol="005930",
+                avg_buy_price=Decimal("0"),
+                quantity=0,
+                current_profit_rate=Decimal("0"),
+                max_profit_rate=Decimal("0"),
+                min_profit_locked=False,
+                last_order_id="ord-1",
+                state_version=0,
+            )
+        )
+        assert journal.flush(timeout=5.0)
+        assert journal.pending_count() == 0
+        assert log_path.read_text(encoding="utf-8") == ""
+        with manager.reader() as repo:
+            assert repo.load_latest_state_snapshot(date(2026, 2, 17)).snapshot_id == "snap-1"
+    finally:
+        journal.close()
+
+    legacy_row = list(_order_event_row(order_event(2, "ACCEPTED")))
+    legacy_row[3] = _dt(9, 2).isoformat()
+    legacy_row[7] = "10000"
+    with log_path.open("w", encoding="utf-8") as file:
+        file.write(json.dumps({"seq": 1, "schema": 2, "kind": "order", "row": list(_order_event_row(order_event(1, "SUBMITTED")))}) + "\n")
+        file.write(json.dumps({"seq": 2, "kind": "order", "row": legacy_row}) + "\n")
+        file.write('{"seq": 3, "kind": "ord')
+
+    recovered = PrpWriteBehindJournal(manager, log_path)
+    try:
+        assert recovered.recovered_count == 2
+        assert log_path.read_text(encoding="utf-8") == ""
+        with manager.reader() as repo:
+            statuses = [row[0] for row in repo.conn.execute("SELECT status FROM order_events ORDER BY occurred_at")]
+        assert statuses == ["PENDING_SUBMIT", "SUBMITTED", "ACCEPTED"]
+    finally:
+        recovered.close()
+        manager.close()
+
+
+def test_write_behind_journal_reports_stall_instead_of_blocking(tmp_path: Path) -> None:
+    import sqlite3
+
+    from prp.connections import PrpConnectionManager
+    from prp.journal import PrpJournalStalledError, PrpWriteBehindJournal
+
+    manager = PrpConnectionManager(tmp_path / "prp.db")
+    journal = PrpWriteBehindJournal(manager, tmp_path / "prp_write_behind.jsonl", flush_interval_seconds=0.01)
+    writer = manager._writer
+    healthy_write = writer.write_journal_rows
+
+    def locked(entries):
+        raise sqlite3.OperationalError("database is locked")
+
+    writer.write_journal_rows = locked
+    try:
+        journal.save_state_snapshot(
+            PositionSnapshot(
+                snapshot_id="snap-stalled",
+                saved_at=_dt(9, 0),
+                trading_date=date(2026, 2, 17),
+                symbol="005930",
+                avg_buy_price=Decimal("0"),
+                quantity=0,
+                current_profit_rate=Decimal("0"),
+                max_profit_rate=Decimal("0"),
+                min_profit_locked=False,
+                last_order_id=None,
+                state_version=0,
+            )
+        )
+        assert journal.flush(timeout=0.2) is False
+        with pytest.raises(PrpJournalStalledError):
+            journal.existing_execution_ids(["exe-1"])
+        assert journal.stats()["stalled"] is True
+        assert journal.stats()["pending"] == 1
+
+        writer.write_journal_rows = healthy_write
+        journal.require_drained(timeout=5.0)
+        assert journal.stats()["stalled"] is False
+        with manager.reader() as repo:
+            assert repo.load_latest_state_snapshot(date(2026, 2, 17)).snapshot_id == "snap-stalled"
+    finally:
+        writer.write_journal_rows = healthy_write
+        journal.close()
+        manager.close()
+
+
+def _journal_snapshot(snapshot_id: str, minute: int = 0) -> PositionSnapshot:
+    return PositionSnapshot(
+        snapshot_id=snapshot_id,
+        saved_at=_dt(9, minute),
+        trading_date=date(2026, 2, 17),
+        symbol="005930",
+        avg_buy_price=Decimal("0"),
+        quantity=0,
+        current_profit_rate=Decimal("0"),
+        max_profit_rate=Decimal("0"),
+        min_profit_locked=False,
+        last_order_id=None,
+        state_version=minute,
+    )
+
+
+def test_write_behind_journal_dead_letters_poison_rows_and_keeps_draining(tmp_path: Path) -> None:
+    from prp.connections import PrpConnectionManager
+    from prp.journal import PrpWriteBehindJournal
+
+    manager = PrpConnectionManager(tmp_path / "prp.db")
+    log_path = tmp_path / "prp_write_behind.jsonl"
+    journal = PrpWriteBehindJournal(manager, log_path, flush_interval_seconds=0.01)
+    writer = manager._writer
+    healthy_write = writer.write_journal_rows
+
+    def reject_poison(entries):
+        if any(row[0] == "snap-poison" for _, row in entries):
+            raise sqlite3.IntegrityError("CHECK constraint failed")
+        healthy_write(entries)
+
+    writer.write_journal_rows = reject_poison
+    try:
+        journal.save_state_snapshot(_journal_snapshot("snap-good", 1))
+        journal.save_state_snapshot(_journal_snapshot("snap-poison", 2))
+        journal.save_state_snapshot(_journal_snapshot("snap-after", 3))
+
+        journal.require_drained(timeout=5.0)
+        assert journal.existing_execution_ids(["exe-1"]) == set()
+        stats = journal.stats()
+        assert stats["deadLettered"] == 1
+        assert stats["stalled"] is False
+        assert log_path.read_text(encoding="utf-8") == ""
+        dead = [json.loads(line) for line in journal.dead_letter_path.read_text(encoding="utf-8").splitlines()]
+        assert [(record["seq"], record["row"][0]) for record in dead] == [(2, "snap-poison")]
+        assert "IntegrityError" in dead[0]["error"]
+        with manager.reader() as repo:
+            assert repo.load_latest_state_snapshot(date(2026, 2, 17)).snapshot_id == "snap-after"
+    finally:
+        writer.write_journal_rows = healthy_write
+        journal.close()
+
+    with log_path.open("w", encoding="utf-8") as file:
+        file.write(json.dumps({"seq": 7, "schema": 99, "kind": "unknown", "row": []}) + "\n")
+    recovered = PrpWriteBehindJournal(manager, log_path)
+    try:
+        assert recovered.stats()["deadLettered"] == 1
+        assert len(recovered.dead_letter_path.read_text(encoding="utf-8").splitlines()) == 2
+    finally:
+        recovered.close()
+        manager.close()
+
+
+def test_write_behind_journal_compacts_drained_records_under_steady_load(tmp_path: Path) -> None:
+    import threading
+
+    from prp.connections import PrpConnectionManager
+    from prp.journal import PrpWriteBehindJournal
+
+    manager = PrpConnectionManager(tmp_path / "prp.db")
+    log_path = tmp_path / "prp_write_behind.jsonl"
+    journal = PrpWriteBehindJournal(manager, log_path, batch_size=1, flush_interval_seconds=0.01, compact_bytes=1)
+    writer = manager._writer
+    healthy_write = writer.write_journal_rows
+    entered = [threading.Event(), threading.Event()]
+    release = [threading.Event(), threading.Event()]
+    calls = {"count": 0}
+
+    def gated_write(entries):
+        index = calls["count"]
+        calls["count"] += 1
+        if index < 2:
+            entered[index].set()
+            assert release[index].wait(timeout=5.0)
+        healthy_write(entries)
+
+    writer.write_journal_rows = gated_write
+    try:
+        journal.save_state_snapshot(_journal_snapshot("snap-1", 1))
+        assert entered[0].wait(timeout=5.0)
+        journal.save_state_snapshot(_journal_snapshot("snap-2", 2))
+        journal.save_state_snapshot(_journal_snapshot("snap-3", 3))
+        release[0].set()
+        assert entered[1].wait(timeout=5.0)
+
+        pending_seqs = [json.loads(line)["seq"] for line in log_path.read_text(encoding="utf-8").splitlines()]
+        assert pending_seqs == [2, 3]
+
+        release[1].set()
+        journal.require_drained(timeout=5.0)
+        assert log_path.read_text(encoding="utf-8") == ""
+    finally:
+        release[0].set()
+        release[1].set()
+        writer.write_journal_rows = healthy_write
+        journal.close()
+        manager.close()
+
+
+def test_incremental_report_matches_full_rebuild_and_reads_do_not_write() -> None:
+    repo = create_repo()
+    trading_date = date(2026, 2, 17)
+
+    def fill(index: int, side: str, price: str, qty: int, minute: int, symbol: str = "005930") -> ExecutionEvent:
+        return ExecutionEvent(
+            event_id=f"evt-{index}",
+            execution_id=f"exe-{index}",
+            order_id=f"ord-{index}",
+            occurred_at=_dt(9, minute),
+            trading_date=trading_date,
+            symbol=symbol,
+            side=side,
+            execution_price=Decimal(price),
+            execution_qty=qty,
+            cum_qty=qty,
+            remaining_qty=0,
+        )
+
+    try:
+        repo.append_execution_events([fill(1, "BUY", "10000", 5, 0), fill(2, "BUY", "10100", 5, 1)])
+        repo.append_execution_event(fill(3, "BUY", "50000", 2, 2, symbol="000660"))
+        repo.append_execution_event(fill(4, "SELL", "10300", 7, 3))
+        repo.append_execution_events([fill(5, "SELL", "10200", 3, 4), fill(6, "SELL", "49000", 2, 5, symbol="000660")])
+
+        statements: list[str] = []
+        repo.conn.set_trace_callback(statements.append)
+        incremental = repo.load_daily_report(trading_date)
+        incremental_details = repo.list_trade_details(trading_date)
+        repo.conn.set_trace_callback(None)
+        assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+
+        assert incremental is not None
+        assert [detail.id for detail in incremental_details] == ["exe-4-0", "exe-4-1", "exe-5-0", "exe-6-0"]
+
+        rebuilt = repo.generate_daily_report(trading_date)
+        rebuilt_details = repo.list_trade_details(trading_date)
+        for field in ("total_buy_amount", "total_sell_amount", "total_sell_tax", "total_sell_fee", "total_net_pnl", "total_return_rate"):
+            assert getattr(incremental, field) == getattr(rebuilt, field)
+        assert [(detail.id, detail.quantity, detail.net_pnl) for detail in incremental_details] == [
+            (detail.id, detail.quantity, detail.net_pnl) for detail in rebuilt_details
+        ]
+        assert repo.conn.execute("SELECT COUNT(*) FROM report_open_lots").fetchone()[0] == 0
+    finally:
+        repo.close()
+
+
+def test_incremental_report_rebuilds_dates_without_report_state() -> None:
+    repo = create_repo()
+    trading_date = date(2026, 2, 17)
+
+    def fill(index: int, side: str, price: str, minute: int) -> ExecutionEvent:
+        return ExecutionEvent(
+            event_id=f"evt-{index}",
+            execution_id=f"exe-{index}",
+            order_id=f"ord-{index}",
+            occurred_at=_dt(9, minute),
+            trading_date=trading_date,
+            symbol="005930",
+            side=side,
+            execution_price=Decimal(price),
+            execution_qty=10,
+            cum_qty=10,
+            remaining_qty=0,
+        )
+
+    try:
+        repo.append_execution_event(fill(1, "BUY", "10000", 0))
+        repo.conn.execute("DELETE FROM report_open_lots")
+        repo.conn.execute("DELETE FROM daily_reports")
+        repo.conn.commit()
+
+        repo.append_execution_event(fill(2, "SELL", "10100", 5))
+        incremental = repo.load_daily_report(trading_date)
+        assert incremental is not None
+        assert incremental.total_net_pnl == repo.generate_daily_report(trading_date).total_net_pnl
+        assert incremental.total_net_pnl != Decimal("0")
+        assert [detail.id for detail in repo.list_trade_details(trading_date)] == ["exe-2-0"]
+
+        statements: list[str] = []
+        repo.conn.set_trace_callback(statements.append)
+        repo.append_execution_event(fill(3, "BUY", "10050", 6))
+        repo.conn.set_trace_callback(None)
+        assert not any("daily_reports(" in statement for statement in statements)
+    finally:
+        repo.close()
+
+
+def test_incremental_report_rebuilds_upgraded_dates_with_buys_but_no_open_lots() -> None:
+    repo = create_repo()
+    trading_date = date(2026, 2, 17)
+
+    def fill(index: int, side: str, price: str, qty: int, minute: int) -> ExecutionEvent:
+        return ExecutionEvent(
+            event_id=f"evt-{index}",
+            execution_id=f"exe-{index}",
+            order_id=f"ord-{index}",
+            occurred_at=_dt(9, minute),
+            trading_date=trading_date,
+            symbol="005930",
+            side=side,
+            execution_price=Decimal(price),
+            execution_qty=qty,
+            cum_qty=qty,
+            remaining_qty=0,
+        )
+
+    try:
+        repo.append_execution_events([fill(1, "BUY", "10000", 10, 0), fill(2, "SELL", "10100", 4, 1)])
+        repo.conn.execute("DELETE FROM report_open_lots")
+        repo.conn.commit()
+        assert repo.load_daily_report(trading_date) is not None
+
+        repo.append_execution_event(fill(3, "SELL", "10200", 6, 2))
+        incremental = repo.load_daily_report(trading_date)
+        incremental_details = repo.list_trade_details(trading_date)
+        assert incremental is not None
+        assert [detail.id for detail in incremental_details] == ["exe-2-0", "exe-3-0"]
+        assert incremental.total_net_pnl == repo.generate_daily_report(trading_date).total_net_pnl
+        assert repo.conn.execute("SELECT COUNT(*) FROM report_open_lots").fetchone()[0] == 0
+
+        statements: list[str] = []
+        repo.conn.set_trace_callback(statements.append)
+        repo.append_execution_event(fill(4, "BUY", "10050", 5, 3))
+        repo.append_execution_event(fill(5, "SELL", "10150", 5, 4))
+        repo.conn.set_trace_callback(None)
+        assert not any("DELETE FROM trade_details" in statement for statement in statements)
+    finally:
+        repo.close()
+
+
+def test_range_report_rolls_up_daily_reports_with_drawdown_and_win_rate() -> None:
+    repo = create_repo()
+
+    def round_trip(day: int, buy: str, sell: str, qty: int = 10) -> list[ExecutionEvent]:
+        trading_date = date(2026, 2, day)
+        return [
+            ExecutionEvent(
+                event_id=f"evt-{day}-{side}",
+                execution_id=f"exe-{day}-{side}",
+                order_id=f"ord-{day}-{side}",
+                occurred_at=datetime(2026, 2, day, 9, minute, tzinfo=timezone.utc),
+                trading_date=trading_date,
+                symbol="005930",
+                side=side,
+                execution_price=Decimal(price),
+                execution_qty=qty,
+                cum_qty=qty,
+                remaining_qty=0,
+            )
+            for minute, side, price in ((0, "BUY", buy), (10, "SELL", sell))
+        ]
+
+    try:
+        repo.append_execution_events(round_trip(16, "10000", "10500"))
+        repo.append_execution_events(round_trip(17, "10000", "9000"))
+        repo.append_execution_events(round_trip(18, "10000", "10200"))
+        repo.append_execution_events(round_trip(20, "10000", "10100"))
+
+        per_day = [repo.load_daily_report(date(2026, 2, day)).total_net_pnl for day in (16, 17, 18)]
+        report = repo.load_range_report(date(2026, 2, 16), date(2026, 2, 18))
+
+        assert report.trading_days == 3
+        assert report.trade_count == 3
+        assert report.win_count == 2
+        assert report.win_rate == Decimal("66.6667")
+        assert report.total_net_pnl == sum(per_day, Decimal("0"))
+        assert [day.cumulative_net_pnl for day in report.days] == [
+            per_day[0],
+            per_day[0] + per_day[1],
+            per_day[0] + per_day[1] + per_day[2],
+        ]
+        assert report.max_drawdown == per_day[1]
+        assert report.days[-1].drawdown == per_day[1] + per_day[2]
+        assert repo.load_range_report(date(2026, 3, 1), date(2026, 3, 31)).trading_days == 0
+
+        plan = " ".join(
+            str(row[3])
+            for row in repo.conn.execute(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*), SUM(net_pnl), AVG(return_rate) FROM trade_details WHERE trading_date BETWEEN ? AND ?",
+                ("2026-02-16", "2026-02-18"),
+            )
+        )
+        assert "COVERING INDEX idx_trade_details_date_pnl" in plan
+    finally:
+        repo.close()
+
+
+def _exportable_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "prp.db"
+    with PrpRepository(db_path=str(db_path)) as repo:
+        for day, price in ((16, "10000"), (17, "10050.5"), (17, "10100")):
+            repo.append_execution_event(
+                ExecutionEvent(
+                    event_id=f"evt-{day}-{price}",
+                    execution_id=f"exe-{day}-{price}",
+                    order_id=f"ord-{day}",
+                    occurred_at=datetime(2026, 2, day, 9, 0, tzinfo=timezone.utc),
+                    trading_date=date(2026, 2, day),
+                    symbol="005930",
+                    side="BUY",
+                    execution_price=Decimal(price),
+                    execution_qty=3,
+                    cum_qty=3,
+                    remaining_qty=0,
+                )
+            )
+    return db_path
+
+
+def test_export_batches_are_typed_chunked_and_only_pending_days_are_planned(tmp_path: Path) -> None:
+    from prp.bootstrap import get_readonly_connection
+    from prp.export import PrpColumnarExporter, iter_partition_batches
+
+    db_path = _exportable_db(tmp_path)
+    conn = get_readonly_connection(db_path)
+    try:
+        batches = list(iter_partition_batches(conn, "execution_events", date(2026, 2, 17), chunk_size=1))
+    finally:
+        conn.close()
+
+    assert len(batches) == 2
+    assert batches[0]["execution_price"] == [Decimal("10050.5000")]
+    assert batches[1]["execution_qty"] == [3]
+    assert batches[0]["occurred_at"][0] == datetime(2026, 2, 17, 9, 0, tzinfo=timezone.utc)
+
+    exporter = PrpColumnarExporter(db_path, tmp_path / "export", today_fn=lambda: date(2026, 2, 17))
+    assert exporter.pending_partitions() == [("execution_events", date(2026, 2, 16))]
+    assert exporter.pending_partitions(include_today=True) == [
+        ("execution_events", date(2026, 2, 16)),
+        ("execution_events", date(2026, 2, 17)),
+    ]
+
+
+def test_export_writes_parquet_partitions_incrementally(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    from prp.export import PrpColumnarExporter
+
+    db_path = _exportable_db(tmp_path)
+    exporter = PrpColumnarExporter(db_path, tmp_path / "export", today_fn=lambda: date(2026, 2, 18))
+
+    exported = exporter.export()
+    assert [(item.table, item.trading_date, item.row_count) for item in exported] == [
+        ("execution_events", date(2026, 2, 16), 1),
+        ("execution_events", date(2026, 2, 17), 2),
+    ]
+    table = pq.read_table(exporter.partition_path("execution_events", date(2026, 2, 17)))
+    assert str(table.schema.field("execution_price").type) == "decimal128(18, 4)"
+    assert table.column("execution_price").to_pylist() == [Decimal("10050.5000"), Decimal("10100.0000")]
+    assert exporter.export() == []
+
+
+def test_codec_round_trips_scaled_prices_and_epoch_micros_losslessly() -> None:
+    from datetime import timedelta
+
+    from prp.codec import decode_decimal, decode_timestamp, encode_decimal, encode_timestamp
+
+    for text in ("0", "70000", "10050.5", "-1234.5678", "0.0001", "213000.00", "99999999999.9999"):
+        assert decode_decimal(encode_decimal(Decimal(text))) == Decimal(text)
+    assert str(decode_decimal(encode_decimal(Decimal("213000.00")))) == "213000"
+    assert str(decode_decimal(encode_decimal(Decimal("10050.50")))) == "10050.5"
+    with pytest.raises(ValueError):
+        encode_decimal(Decimal("1.00001"))
+
+    kst = timezone(timedelta(hours=9))
+    moment = datetime(2026, 2, 17, 9, 30, 15, 123456, tzinfo=kst)
+    assert decode_timestamp(encode_timestamp(moment)) == moment
+    assert decode_timestamp(encode_timestamp(moment)).isoformat() == "2026-02-17T09:30:15.123456+09:00"
+    assert encode_timestamp(_dt(9)) < encode_timestamp(_dt(9, 1))
+
+
+def test_v1_database_is_migrated_in_place_to_scaled_integer_schema(tmp_path: Path) -> None:
+    from prp.bootstrap import initialize_database
+
+    db_path = tmp_path / "prp.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(
+        """
+        CREATE TABLE schema_version (version INTEGER PRIMARY KEY, applied_at TEXT NOT NULL);
+        INSERT INTO schema_version VALUES (1, '2026-02-01T00:00:00+00:00');
+        CREATE TABLE execution_events (
+          event_id TEXT PRIMARY KEY, execution_id TEXT NOT NULL UNIQUE, order_id TEXT NOT NULL,
+          trading_date TEXT NOT NULL, occurred_at TEXT NOT NULL, symbol TEXT NOT NULL, side TEXT NOT NULL,
+          execution_price NUMERIC NOT NULL, execution_qty INTEGER NOT NULL, cum_qty INTEGER NOT NULL,
+          remaining_qty INTEGER NOT NULL
+        );
+        CREATE INDEX idx_execution_events_date ON execution_events(trading_date);
+        INSERT INTO execution_events VALUES
+          ('evt-1', 'exe-1', 'ord-1', '2026-02-17', '2026-02-17T09:00:00+09:00', '005930', 'BUY', '70000', 3, 3, 0),
+          ('evt-2', 'exe-2', 'ord-2', '2026-02-17', '2026-02-17T01:10:00.250000+00:00', '005930', 'SELL', '71050.5', 3, 3, 0);
+        """
+    )
+    conn.close()
+
+    repo = PrpRepository(conn=initialize_database(db_path))
+    try:
+        assert repo.conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] == 2
+        assert tuple(
+            repo.conn.execute(
+                "SELECT typeof(execution_price), typeof(occurred_at) FROM execution_events WHERE event_id = 'evt-2'"
+            ).fetchone()
+        ) == ("integer", "integer")
+        assert repo.existing_execution_ids(["exe-1", "exe-2"]) == {"exe-1", "exe-2"}
+
+        executions = repo._list_executions_for_date(date(2026, 2, 17))
+        assert [event.execution_price for event in executions] == [Decimal("70000"), Decimal("71050.5")]
+        assert executions[1].occurred_at == datetime(2026, 2, 17, 1, 10, 0, 250000, tzinfo=timezone.utc)
+
+        report = repo.generate_daily_report(date(2026, 2, 17))
+        assert report.total_buy_amount == Decimal("210000.00")
+        assert repo.load_daily_report(date(2026, 2, 17)).total_net_pnl == report.total_net_pnl
+    finally:
+        repo.close()
+
+    reopened = PrpRepository(conn=initialize_database(db_path))
+    try:
+        assert reopened.conn.execute("SELECT COUNT(*) FROM execution_events").fetchone()[0] == 2
+    finally:
+        reopened.close()
@@ -4,6 +4,7 @@ from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
 import sys
+import time
 
 import pytest
 
@@ -13,14 +14,21 @@ if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from tse.rules import (
+    calc_drop_rate,
     calc_profit_preservation_rate,
+    calc_rebound_rate,
     should_emit_sell_signal,
     should_enter_buy_candidate,
     should_lock_min_profit,
     should_trigger_rebound_buy,
 )
 from tse.service import TseService
+from tse.sharding import ShardedTseService
 from tse.models import PositionUpdateEvent, QuoteEvent
+from tse.scheduler import FixedRateScheduler
+
+
+BACKTEST_MIN_EVENTS_PER_SECOND = 10_000
 
 
 def _dt(hour: int, minute: int = 0, second: int = 0) -> datetime:
@@ -111,6 +119,31 @@ def test_buy_transition_with_reference_drop_rebound() -> None:
     assert service.ctx.portfolio.gate_open is False
 
 
+def test_command_ids_are_unique_across_same_day_restarts() -> None:
+    def first_buy_command_id(service: TseService) -> str:
+        for sequence, (minute, second, price) in enumerate([(3, 0, "100.0"), (4, 0, "99.0"), (4, 10, "99.198")], start=1):
+            output = service.on_quote(
+                QuoteEvent(
+                    trading_date=date(2026, 2, 17),
+                    occurred_at=_dt(9, minute, second),
+                    symbol="005930",
+                    current_price=Decimal(price),
+                    sequence=sequence,
+                )
+            )
+        return output.commands[0].command_id
+
+    pinned = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"], session_id="s1")
+    assert first_buy_command_id(pinned) == "2026-02-17-005930-BUY-s1-1"
+
+    before_restart = first_buy_command_id(TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"]))
+    after_restart = first_buy_command_id(TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"]))
+    assert before_restart != after_restart
+
+    sharded = ShardedTseService(trading_date=date(2026, 2, 17), watch_symbols=["005930", "000660"], shard_size=1)
+    assert {shard.session_id for shard in sharded.shards} == {sharded.session_id}
+
+
 def test_single_position_constraint_first_match_only() -> None:
     service = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930", "000660"])
 
@@ -228,7 +261,7 @@ def test_watch_symbol_count_validation() -> None:
     with pytest.raises(ValueError):
         TseService(trading_date=date(2026, 2, 17), watch_symbols=[])
 
-    symbols = [f"S{i:02d}" for i in range(21)]
+    symbols = [f"S{i:03d}" for i in range(201)]
     with pytest.raises(ValueError):
         TseService(trading_date=date(2026, 2, 17), watch_symbols=symbols)
 
@@ -335,3 +368,301 @@ def test_rebound_buy_not_emitted_when_price_is_two_ticks_or_more_above_trigger()
 
     assert output.commands == []
     assert service.ctx.symbols["005930"].state == "BUY_CANDIDATE"
+
+
+def test_fixed_rate_scheduler_skip_policy_drops_missed_slots() -> None:
+    clock = {"now": 10.0}
+    scheduler = FixedRateScheduler(interval_seconds=1.0, overrun_policy="skip", monotonic_fn=lambda: clock["now"])
+
+    first = scheduler.begin_cycle()
+    clock["now"] = 13.4
+    delay = scheduler.complete_cycle()
+
+    assert first.scheduled_at == 10.0
+    assert round(delay, 6) == 0.6
+    assert scheduler.overrun_count == 1
+    assert scheduler.skipped_cycles == 3
+
+    clock["now"] = 14.05
+    second = scheduler.begin_cycle()
+    assert second.scheduled_at == 14.0
+    assert round(second.lateness_seconds, 6) == 0.05
+    assert round(scheduler.last_duration_seconds, 6) == 3.4
+
+
+def test_vector_rule_engine_matches_decimal_rules_bit_for_bit() -> None:
+    pytest.importorskip("numpy")
+    import random
+
+    from tse.vector_rules import VectorRuleEngine
+
+    rng = random.Random(20260217)
+    watch_symbols = [f"{index:06d}" for index in range(1, 21)]
+    edge_lows = [Decimal("998"), Decimal("4990"), Decimal("9980"), Decimal("49900"), Decimal("99800"), Decimal("499000")]
+
+    for round_index in range(300):
+        tse = TseService(trading_date=date(2026, 2, 17), watch_symbols=watch_symbols)
+        prices: dict[str, Decimal] = {}
+        for slot, symbol in enumerate(watch_symbols):
+            symbol_ctx = tse.ctx.symbols[symbol]
+            reference = Decimal(rng.randint(500, 600000)) + Decimal(rng.choice(["0", "0.5", "0.25"]))
+            symbol_ctx.reference_price = reference
+            if rng.random() < 0.5:
+                symbol_ctx.state = "TRACKING"
+            else:
+                symbol_ctx.state = "BUY_CANDIDATE"
+                if slot < len(edge_lows) and round_index % 2 == 0:
+                    symbol_ctx.tracked_low = edge_lows[slot]
+                else:
+                    symbol_ctx.tracked_low = (reference * Decimal(rng.randint(950, 1000)) / 1000).quantize(Decimal("1"))
+            base = symbol_ctx.tracked_low or reference
+            if rng.random() < 0.1:
+                continue
+            prices[symbol] = (base * Decimal(rng.randint(980, 1010)) / 1000).quantize(Decimal("0.01"))
+
+        engine = VectorRuleEngine.from_context(tse.ctx)
+        evaluation = engine.evaluate(engine.scale_prices(prices))
+
+        for index, symbol in enumerate(watch_symbols):
+            symbol_ctx = tse.ctx.symbols[symbol]
+            current = prices.get(symbol)
+            assert bool(evaluation.has_quote[index]) is (current is not None)
+            if current is None:
+                continue
+            drop_rate = calc_drop_rate(symbol_ctx.reference_price, current)
+            assert evaluation.drop_rate(symbol).as_tuple() == drop_rate.as_tuple()
+            entered = should_enter_buy_candidate(drop_rate)
+            assert bool(evaluation.enter_candidate[index]) is entered
+
+            tracked_low = symbol_ctx.tracked_low
+            candidate = symbol_ctx.state == "BUY_CANDIDATE"
+            if symbol_ctx.state == "TRACKING" and entered:
+                candidate = True
+                tracked_low = current
+            new_low = candidate and tracked_low is not None and current < tracked_low
+            assert bool(evaluation.new_low[index]) is new_low
+            if not candidate or tracked_low is None:
+                assert bool(evaluation.rebound_trigger[index]) is False
+                continue
+            if new_low:
+                tracked_low = current
+            rebound_rate = calc_rebound_rate(tracked_low, current)
+            assert evaluation.rebound_rate(symbol).as_tuple() == rebound_rate.as_tuple()
+            assert bool(evaluation.rebound_trigger[index]) is should_trigger_rebound_buy(rebound_rate)
+            assert bool(evaluation.within_entry_band[index]) is TseService._is_within_rebound_entry_price_band(
+                tracked_low=tracked_low,
+                current_price=current,
+            )
+
+
+def test_vector_rules_opt_in_matches_decimal_service_over_quote_batches() -> None:
+    pytest.importorskip("numpy")
+    import random
+
+    watch_symbols = [f"{index:06d}" for index in range(1, 21)]
+    buy_commands = 0
+
+    for seed in range(12):
+        rng = random.Random(seed)
+        decimal_service = ShardedTseService(
+            trading_date=date(2026, 2, 17), watch_symbols=watch_symbols, shard_size=8, session_id="diff"
+        )
+        vector_service = ShardedTseService(
+            trading_date=date(2026, 2, 17), watch_symbols=watch_symbols, shard_size=8, session_id="diff", vector_rules=True
+        )
+        assert all(shard.vector_rules for shard in vector_service.shards)
+        prices = {symbol: Decimal(rng.choice([980, 4990, 9990, 49950, 99900, 250000])) for symbol in watch_symbols}
+
+        for cycle in range(90):
+            events = []
+            for symbol in rng.sample(watch_symbols, k=rng.randint(1, len(watch_symbols))):
+                prices[symbol] = max(Decimal("1"), (prices[symbol] * Decimal(rng.randint(985, 1012)) / 1000).quantize(Decimal("1")))
+                events.append((symbol, prices[symbol]))
+                if rng.random() < 0.1:
+                    prices[symbol] = prices[symbol] + 1
+                    events.append((symbol, prices[symbol]))
+            quotes = [
+                QuoteEvent(
+                    trading_date=date(2026, 2, 17),
+                    occurred_at=_dt(9, 3 + cycle // 60, cycle % 60),
+                    symbol=symbol,
+                    current_price=price,
+                    sequence=sequence,
+                )
+                for sequence, (symbol, price) in enumerate(events, start=1)
+            ]
+
+            expected = [decimal_service.on_quote(event) for event in quotes]
+            actual = vector_service.on_quotes(quotes)
+
+            assert actual == expected
+            buy_commands += sum(len(output.commands) for output in expected)
+
+        assert vector_service.ctx.symbols == decimal_service.ctx.symbols
+        assert vector_service.ctx.portfolio == decimal_service.ctx.portfolio
+
+    assert buy_commands > 0
+
+
+def test_backtest_engine_fills_signals_and_reports_trades_with_drawdown() -> None:
+    from tse.backtest import BacktestConfig, BacktestEngine, MinuteBar
+
+    closes = ["100", "100", "99", "99.2", "99.5", "101", "102", "101.5", "100.5", "100.6", "100"]
+    bars = [
+        MinuteBar(
+            symbol="005930",
+            at=_dt(9, 3 + index),
+            open=Decimal(close),
+            high=Decimal(close),
+            low=Decimal(close),
+            close=Decimal(close),
+        )
+        for index, close in enumerate(closes)
+    ]
+    engine = BacktestEngine(
+        trading_date=date(2026, 2, 17),
+        watch_symbols=["005930"],
+        config=BacktestConfig(budget=Decimal("1000"), price_path="close"),
+    )
+
+    result = engine.run_bars(bars)
+
+    assert [command.reason_code for command in result.commands] == [
+        "TSE_REBOUND_BUY_SIGNAL",
+        "TSE_PROFIT_PRESERVATION_BREAK",
+    ]
+    assert len(result.trades) == 1
+    trade = result.trades[0]
+    assert trade.quantity == 9
+    assert trade.buy_price == Decimal("99.5")
+    assert trade.sell_price == Decimal("100.6")
+    assert trade.sell_executed_at == _dt(9, 12, 59)
+    assert result.report.total_net_pnl == trade.net_pnl
+    assert len(result.equity_curve) == len(closes)
+    assert result.equity_curve[-1].equity == trade.net_pnl
+    assert result.max_drawdown == min(point.drawdown for point in result.equity_curve)
+    assert result.max_drawdown < 0
+
+
+def test_backtest_engine_replays_full_session_for_twenty_symbols_quickly() -> None:
+    from tse.backtest import BacktestEngine, MinuteBar
+
+    symbols = [f"{index:06d}" for index in range(1, 21)]
+    bars: list[MinuteBar] = []
+    for offset, symbol in enumerate(symbols):
+        price = 10000 + offset * 100
+        for minute in range(390):
+            close = price + ((minute * 37 + offset * 11) % 121) - 60
+            bars.append(
+                MinuteBar(
+                    symbol=symbol,
+                    at=_dt(9) + timedelta(minutes=minute),
+                    open=Decimal(price),
+                    high=Decimal(max(price, close) + 20),
+                    low=Decimal(min(price, close) - 20),
+                    close=Decimal(close),
+                )
+            )
+            price = close
+
+    started = time.perf_counter()
+    result = BacktestEngine(trading_date=date(2026, 2, 17), watch_symbols=symbols).run_bars(bars)
+    elapsed = time.perf_counter() - started
+
+    assert result.quote_count == 390 * 20 * 4
+    assert len(result.equity_curve) == 390
+    assert result.quote_count / elapsed >= BACKTEST_MIN_EVENTS_PER_SECOND
+
+
+def test_strategy_params_override_threshold_constants_per_service() -> None:
+    from tse.models import StrategyParams
+    from tse.vector_rules import VectorRuleEngine
+
+    def quote(minute: int, price: str, sequence: int) -> QuoteEvent:
+        return QuoteEvent(
+            trading_date=date(2026, 2, 17),
+            occurred_at=_dt(9, minute),
+            symbol="005930",
+            current_price=Decimal(price),
+            sequence=sequence,
+        )
+
+    default_service = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"])
+    strict_params = StrategyParams(drop_threshold_pct=Decimal("2.0"))
+    strict_service = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"], params=strict_params)
+    for service in (default_service, strict_service):
+        service.on_quote(quote(3, "100", 1))
+        service.on_quote(quote(4, "98.5", 2))
+
+    assert default_service.ctx.symbols["005930"].state == "BUY_CANDIDATE"
+    assert strict_service.ctx.symbols["005930"].state == "TRACKING"
+
+    engine = VectorRuleEngine.from_context(strict_service.ctx, params=strict_params)
+    evaluation = engine.evaluate(engine.scale_prices({"005930": Decimal("98.5")}))
+    assert bool(evaluation.enter_candidate[0]) is should_enter_buy_candidate(Decimal("1.5"), strict_params.drop_threshold_pct)
+
+    rounded = VectorRuleEngine(
+        watch_symbols=["005930"],
+        params=StrategyParams(drop_threshold_pct=Decimal("0.99999"), rebound_threshold_pct=Decimal("0.20001")),
+    )
+    assert rounded._drop_threshold_units == 10000
+    assert rounded._rebound_threshold_units == 2000
+
+    with pytest.raises(ValueError):
+        StrategyParams(profit_preservation_sell_pct=Decimal("100"))
+
+
+def test_parameter_sweep_process_pool_matches_in_process_results() -> None:
+    from tse.backtest import BacktestConfig, MinuteBar
+    from tse.sweep import ParameterSweep, SweepDay, grid_parameter_sets, random_parameter_sets
+
+    def day(trading_date: date, closes_by_symbol: dict[str, list[str]]) -> SweepDay:
+        start = datetime(trading_date.year, trading_date.month, trading_date.day, 9, 3, tzinfo=timezone(timedelta(hours=9)))
+        return SweepDay(
+            trading_date=trading_date,
+            bars=tuple(
+                MinuteBar(
+                    symbol=symbol,
+                    at=start + timedelta(minutes=index),
+                    open=Decimal(close),
+                    high=Decimal(close),
+                    low=Decimal(close),
+                    close=Decimal(close),
+                )
+                for symbol, closes in closes_by_symbol.items()
+                for index, close in enumerate(closes)
+            ),
+        )
+
+    days = [
+        day(date(2026, 2, 17), {"005930": ["100", "100", "99", "99.2", "99.5", "101", "102", "101.5", "100.5", "100.6"]}),
+        day(
+            date(2026, 2, 18),
+            {
+                "005930": ["200", "199", "197", "197.5", "198", "202", "204", "203", "200", "201"],
+                "000660": ["100", "98", "97", "97.3", "99", "99.5", "98", "97", "96", "95"],
+            },
+        ),
+    ]
+    param_sets = grid_parameter_sets(
+        drop_threshold_pct=[Decimal("1.0"), Decimal("1.5")],
+        profit_preservation_sell_pct=[Decimal("50"), Decimal("80")],
+    )
+    config = BacktestConfig(budget=Decimal("10000"), price_path="close")
+
+    in_process = ParameterSweep(days=days, config=config, max_workers=1).run(param_sets)
+    pooled = ParameterSweep(days=days, config=config, max_workers=2).run(param_sets)
+
+    assert len(in_process) == 4
+    assert pooled == in_process
+    assert [outcome.total_net_pnl for outcome in in_process] == sorted(
+        (outcome.total_net_pnl for outcome in in_process), reverse=True
+    )
+    assert all(len(outcome.days) == 2 for outcome in in_process)
+    assert any(outcome.trade_count > 0 for outcome in in_process)
+
+    sampled = random_parameter_sets(count=3, seed=7, rebound_threshold_pct=(Decimal("0.1"), Decimal("0.5")))
+    assert sampled == random_parameter_sets(count=3, seed=7, rebound_threshold_pct=(Decimal("0.1"), Decimal("0.5")))
+    assert all(Decimal("0.1") <= params.rebound_threshold_pct <= Decimal("0.5") for params in sampled)
+    with pytest.raises(ValueError):
+        grid_parameter_sets(unknown_pct=[Decimal("1")])
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from dataclasses import replace
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
+import os
 import sys
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from kia.contracts import PollQuotesRequest, PollQuotesResult, PollQuoteError, MarketQuote
-from tse.quote_monitoring import QuoteMonitoringConfig, QuoteMonitoringLoop
+from tse.quote_monitoring import AsyncQuoteMonitoringLoop, QuoteMonitoringConfig, QuoteMonitoringLoop, QuoteStreamMonitor
+from tse.price_table import SharedPriceTable, SharedPriceTableMonitoringLoop
+from tse.quote_ingestion import QuoteIngestionPool
+from tse.models import PositionUpdateEvent
 from tse.service import TseService
+from tse.tick_log import TICK_LOG_HEADER_SIZE, TICK_LOG_RECORD_SIZE, TickLogReader, TickLogWriter, TickReplayDriver
+from tse.sharding import AsyncShardedQuoteMonitoringLoop, ShardedQuoteMonitoringLoop, ShardedTseService
 
 
 class _FakeKiaGateway:
@@ -27,6 +38,12 @@ class _FakeKiaGateway:
         return self._results.pop(0)
 
 
+class _FakeAsyncKiaGateway(_FakeKiaGateway):
+    async def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:  # type: ignore[override]
+        await asyncio.sleep(0)
+        return super().fetch_quotes_batch(req)
+
+
 def _quote(symbol: str, price: str, hour: int, minute: int, second: int) -> MarketQuote:
     return MarketQuote(
         symbol=symbol,
@@ -107,3 +124,470 @@ def test_quote_monitor_loop_uses_watch_symbols_and_generates_cycle_id() -> None:
     assert fake_gateway.requests[0].symbols == ["005930", "000660"]
     assert fake_gateway.requests[0].poll_cycle_id == "poll-20260217-090305-001"
     assert fake_gateway.requests[0].timeout_ms == 700
+
+
+def test_async_quote_monitor_loop_runs_cycles_with_async_sleep() -> None:
+    service = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"])
+    fake_gateway = _FakeAsyncKiaGateway(
+        [
+            PollQuotesResult(
+                poll_cycle_id="c1",
+                quotes=[],
+                errors=[PollQuoteError(symbol="005930", code="KIA_API_TIMEOUT", retryable=True)],
+                partial=True,
+            ),
+            PollQuotesResult(
+                poll_cycle_id="c2",
+                quotes=[_quote("005930", "100", 9, 3, 1)],
+                errors=[],
+                partial=False,
+            ),
+        ]
+    )
+    sleeps: list[float] = []
+    seen_states: list[str] = []
+    clock = {"now": 50.0}
+
+    async def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    async def on_cycle(cycle) -> None:
+        seen_states.append(cycle.state)
+
+    loop = AsyncQuoteMonitoringLoop(
+        tse_service=service,
+        kia_gateway=fake_gateway,
+        config=QuoteMonitoringConfig(
+            mode="mock",
+            consecutive_error_threshold=1,
+            recovery_success_threshold=1,
+        ),
+        now_fn=lambda: datetime(2026, 2, 17, 9, 3, 0, tzinfo=timezone.utc),
+        sleep_fn=fake_sleep,
+        monotonic_fn=lambda: clock["now"],
+    )
+
+    cycles = asyncio.run(loop.run_forever(max_cycles=3, on_cycle=on_cycle))
+
+    assert seen_states == ["DEGRADED", "RUNNING", "DEGRADED"]
+    assert [cycle.poll_cycle_id for cycle in cycles] == [
+        "poll-20260217-090300-001",
+        "poll-20260217-090300-002",
+        "poll-20260217-090300-003",
+    ]
+    assert cycles[1].quote_count == 1
+    assert cycles[2].fetch_error == "no more fake results"
+    assert sleeps == [1.0, 1.0, 1.0]
+    assert service.buy_entry_blocked_by_degraded is True
+
+
+def test_quote_stream_monitor_feeds_ticks_and_degrades_on_disconnect() -> None:
+    service = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"])
+    monitor = QuoteStreamMonitor(
+        tse_service=service,
+        config=QuoteMonitoringConfig(mode="live", consecutive_error_threshold=2, recovery_success_threshold=1),
+        now_fn=lambda: datetime(2026, 2, 17, 9, 3, 0, tzinfo=timezone.utc),
+    )
+
+    first = monitor.on_quote(_quote("005930", "100", 9, 3, 0))
+    assert first.poll_cycle_id == "stream-20260217-090300-001"
+    assert first.quote_count == 1
+    assert service.ctx.symbols["005930"].last_sequence == 1
+
+    monitor.on_disconnect(ConnectionError("reset"))
+    monitor.on_disconnect(ConnectionError("reset"))
+    assert monitor.state == "DEGRADED"
+    assert service.buy_entry_blocked_by_degraded is True
+
+    recovered = monitor.on_quote(_quote("005930", "101", 9, 3, 1))
+    assert recovered.state == "RUNNING"
+    assert service.buy_entry_blocked_by_degraded is False
+
+
+def test_quote_monitor_loop_runs_on_fixed_cadence_and_coalesces_overruns() -> None:
+    service = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"])
+    clock = {"now": 0.0}
+    cycle_durations = [0.3, 2.5, 0.1, 0.1]
+    sleeps: list[float] = []
+
+    class _TimedGateway(_FakeKiaGateway):
+        def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
+            clock["now"] += cycle_durations[len(self.requests)]
+            return super().fetch_quotes_batch(req)
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(round(seconds, 6))
+        clock["now"] += seconds
+
+    fake_gateway = _TimedGateway(
+        [
+            PollQuotesResult(poll_cycle_id=f"c{index}", quotes=[_quote("005930", "100", 9, 3, index)], errors=[], partial=False)
+            for index in range(4)
+        ]
+    )
+    loop = QuoteMonitoringLoop(
+        tse_service=service,
+        kia_gateway=fake_gateway,
+        config=QuoteMonitoringConfig(mode="mock"),
+        now_fn=lambda: datetime(2026, 2, 17, 9, 3, 0, tzinfo=timezone.utc),
+        sleep_fn=fake_sleep,
+        monotonic_fn=lambda: clock["now"],
+    )
+
+    loop.run_forever(max_cycles=4)
+
+    assert sleeps == [0.7, 0.4, 0.9]
+    assert loop.scheduler is not None
+    assert loop.scheduler.overrun_count == 1
+    assert loop.scheduler.skipped_cycles == 1
+    assert round(loop.scheduler.max_lateness_seconds, 6) == 0.5
+
+
+class _EchoKiaGateway:
+    def __init__(self, prices_by_cycle: list[dict[str, str]]) -> None:
+        self._prices_by_cycle = prices_by_cycle
+        self.requests: list[PollQuotesRequest] = []
+
+    def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
+        self.requests.append(req)
+        cycle_index = len(self.requests) - 1
+        prices = self._prices_by_cycle[cycle_index]
+        return PollQuotesResult(
+            poll_cycle_id=req.poll_cycle_id,
+            quotes=[_quote(symbol, prices.get(symbol, "100"), 9, 3, cycle_index) for symbol in req.symbols],
+            errors=[],
+            partial=False,
+        )
+
+
+def test_sharded_quote_loop_polls_batches_of_twenty_and_shares_one_portfolio_gate() -> None:
+    symbols = [f"{index:06d}" for index in range(1, 46)]
+    service = ShardedTseService(trading_date=date(2026, 2, 17), watch_symbols=symbols)
+    first_shard_symbol, second_shard_symbol = symbols[0], symbols[20]
+    prices_by_cycle = [
+        {},
+        {first_shard_symbol: "98", second_shard_symbol: "98"},
+        {first_shard_symbol: "98.3", second_shard_symbol: "98.3"},
+    ]
+    gateways = [_EchoKiaGateway(prices_by_cycle) for _ in service.shards]
+    emitted: list[str] = []
+    service.set_command_listener(lambda command: emitted.append(command.symbol))
+
+    loop = ShardedQuoteMonitoringLoop(
+        tse_service=service,
+        kia_gateways=gateways,
+        config=QuoteMonitoringConfig(mode="mock"),
+        now_fn=lambda: datetime(2026, 2, 17, 9, 3, 5, tzinfo=timezone.utc),
+    )
+    cycles = [loop.run_cycle() for _ in prices_by_cycle]
+    loop.stop()
+
+    assert [len(shard.ctx.symbols) for shard in service.shards] == [20, 20, 5]
+    assert [gateway.requests[0].symbols for gateway in gateways] == [symbols[0:20], symbols[20:40], symbols[40:45]]
+    assert cycles[0].quote_count == 45
+    assert service.ctx.symbols[symbols[44]].watch_rank == 45
+    assert len(emitted) == 1
+    assert sum(len(output.commands) for output in cycles[2].outputs) == 1
+    assert service.ctx.portfolio.gate_open is False
+    assert all(shard.ctx.portfolio is service.ctx.portfolio for shard in service.shards)
+    assert service.ctx.portfolio.active_symbol == emitted[0]
+
+
+def test_async_sharded_quote_loop_merges_shard_cycles() -> None:
+    symbols = [f"{index:06d}" for index in range(1, 31)]
+    service = ShardedTseService(trading_date=date(2026, 2, 17), watch_symbols=symbols)
+    gateways = [
+        _FakeAsyncKiaGateway(
+            [PollQuotesResult(poll_cycle_id="c1", quotes=[_quote(symbols[0], "100", 9, 3, 0)], errors=[], partial=False)]
+        ),
+        _FakeAsyncKiaGateway([]),
+    ]
+    loop = AsyncShardedQuoteMonitoringLoop(
+        tse_service=service,
+        kia_gateways=gateways,
+        config=QuoteMonitoringConfig(mode="mock", consecutive_error_threshold=1),
+        now_fn=lambda: datetime(2026, 2, 17, 9, 3, 5, tzinfo=timezone.utc),
+    )
+
+    cycle = asyncio.run(loop.run_cycle())
+
+    assert cycle.quote_count == 1
+    assert cycle.partial is True
+    assert cycle.fetch_error == "no more fake results"
+    assert cycle.state == "DEGRADED"
+    assert service.shards[0].buy_entry_blocked_by_degraded is False
+    assert service.shards[1].buy_entry_blocked_by_degraded is True
+
+
+class _StaticQuoteGateway:
+    def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
+        return PollQuotesResult(
+            poll_cycle_id=req.poll_cycle_id,
+            quotes=[_quote(symbol, f"{int(symbol) * 100}", 9, 5, 0) for symbol in req.symbols],
+            errors=[],
+            partial=False,
+        )
+
+
+def _static_gateway_factory() -> _StaticQuoteGateway:
+    return _StaticQuoteGateway()
+
+
+def test_shared_price_table_loop_feeds_only_fresh_quotes_and_flags_failed_workers() -> None:
+    symbols = ["005930", "000660", "035420"]
+    service = TseService(trading_date=date(2026, 2, 17), watch_symbols=symbols)
+    table = SharedPriceTable.create(symbols=symbols, worker_count=2)
+    try:
+        loop = SharedPriceTableMonitoringLoop(
+            tse_service=service,
+            price_table=table,
+            config=QuoteMonitoringConfig(mode="mock", consecutive_error_threshold=1),
+            now_fn=lambda: datetime(2026, 2, 17, 9, 5, 0, tzinfo=timezone.utc),
+        )
+        as_of = datetime(2026, 2, 17, 9, 5, 0, tzinfo=timezone(timedelta(hours=9)))
+        table.write(0, price=Decimal("71200"), tick_size=100, as_of=as_of)
+        table.write(2, price=Decimal("198.5"), tick_size=1, as_of=as_of)
+
+        first = loop.run_cycle()
+        assert [(quote.symbol, quote.price, quote.as_of) for quote in first.quotes] == [
+            ("005930", Decimal("71200"), as_of),
+            ("035420", Decimal("198.5"), as_of),
+        ]
+        assert service.ctx.symbols["005930"].reference_price == Decimal("71200")
+        assert table.worker_symbols(0) == ["005930", "000660"]
+
+        assert loop.run_cycle().quote_count == 0
+
+        table.record_worker_cycle(1, failed=True, now=as_of)
+        degraded = loop.run_cycle()
+        assert degraded.partial is True
+        assert degraded.error_count == 1
+        assert degraded.state == "DEGRADED"
+    finally:
+        table.close()
+        table.unlink()
+
+
+def test_shared_price_table_loop_degrades_and_supervises_stale_or_dead_workers() -> None:
+    symbols = ["005930", "000660", "035420"]
+    service = TseService(trading_date=date(2026, 2, 17), watch_symbols=symbols)
+    table = SharedPriceTable.create(symbols=symbols, worker_count=2)
+    clock = {"now": datetime(2026, 2, 17, 0, 5, 0, tzinfo=timezone.utc)}
+    supervised: list[list[int]] = []
+    try:
+        loop = SharedPriceTableMonitoringLoop(
+            tse_service=service,
+            price_table=table,
+            config=QuoteMonitoringConfig(mode="mock", consecutive_error_threshold=2),
+            now_fn=lambda: clock["now"],
+            stale_after_ms=3000,
+            supervisor=lambda workers: supervised.append(list(workers)),
+        )
+        table.touch_worker(0, now=clock["now"])
+        table.touch_worker(1, now=clock["now"])
+        assert loop.run_cycle().partial is False
+
+        clock["now"] += timedelta(seconds=2)
+        table.record_worker_cycle(0, failed=False, now=clock["now"])
+        clock["now"] += timedelta(seconds=2)
+        stale = loop.run_cycle()
+        assert stale.partial is True
+        assert stale.error_count == 1
+        assert supervised == [[1]]
+
+        table.record_worker_cycle(1, failed=False, now=clock["now"])
+        table.mark_worker_dead(0)
+        dead = loop.run_cycle()
+        assert dead.error_count == 2
+        assert dead.state == "DEGRADED"
+        assert supervised == [[1], [0]]
+    finally:
+        table.close()
+        table.unlink()
+
+
+def _failing_gateway_factory() -> _StaticQuoteGateway:
+    raise RuntimeError("gateway unavailable")
+
+
+def test_quote_ingestion_worker_crash_is_marked_dead_and_restarted() -> None:
+    pool = QuoteIngestionPool(
+        symbols=["005930", "000660"],
+        gateway_factory=_failing_gateway_factory,
+        config=QuoteMonitoringConfig(mode="mock", poll_interval_ms=50),
+        worker_count=1,
+    )
+    try:
+        pool.start()
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline and pool.price_table.worker_snapshot()["heartbeat_us"][0] >= 0:
+            time.sleep(0.05)
+        workers = pool.price_table.worker_snapshot()
+        assert workers["heartbeat_us"][0] == -1
+        assert workers["failures"][0] == 1
+
+        pool.restart_workers([0])
+        assert pool.restarts == 1
+        assert pool.price_table.worker_snapshot()["heartbeat_us"][0] > 0
+    finally:
+        pool.stop()
+
+
+class _HangingTickSize:
+    def __init__(self, value: int) -> None:
+        self._value = value
+
+    def __int__(self) -> int:
+        time.sleep(60)
+        return self._value
+
+
+class _TornWriteGateway(_StaticQuoteGateway):
+    def __init__(self, hang: bool) -> None:
+        self._hang = hang
+
+    def fetch_quotes_batch(self, req: PollQuotesRequest) -> PollQuotesResult:
+        result = super().fetch_quotes_batch(req)
+        if not self._hang:
+            return result
+        quotes = [replace(quote, tick_size=_HangingTickSize(quote.tick_size)) for quote in result.quotes]
+        return replace(result, quotes=quotes)
+
+
+def _torn_write_gateway_factory(hung_once) -> _TornWriteGateway:
+    hang = not hung_once.is_set()
+    hung_once.set()
+    return _TornWriteGateway(hang)
+
+
+def test_quote_ingestion_restart_repairs_slots_torn_by_terminated_worker() -> None:
+    import multiprocessing
+    from functools import partial
+
+    hung_once = multiprocessing.get_context("spawn").Event()
+    pool = QuoteIngestionPool(
+        symbols=["005930", "000660"],
+        gateway_factory=partial(_torn_write_gateway_factory, hung_once),
+        config=QuoteMonitoringConfig(mode="mock", poll_interval_ms=50),
+        worker_count=1,
+    )
+    try:
+        pool.start()
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline and not pool.price_table.quotes["version"][0] % 2:
+            time.sleep(0.05)
+        assert pool.price_table.quotes["version"][0] % 2 == 1
+
+        pool.restart_workers([0])
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            snapshot = pool.price_table.snapshot()
+            if (snapshot["sequence"] > 0).all():
+                break
+            time.sleep(0.05)
+        assert (snapshot["sequence"] > 0).all()
+        assert (snapshot["version"] % 2 == 0).all()
+        assert snapshot["price"].tolist() == [5930 * 100 * 100, 660 * 100 * 100]
+    finally:
+        pool.stop()
+
+
+def test_shared_price_table_write_rejects_bad_price_without_tearing_slot() -> None:
+    table = SharedPriceTable.create(symbols=["005930"], worker_count=1)
+    try:
+        with pytest.raises(ValueError):
+            table.write(0, price=Decimal("100.001"), tick_size=1, as_of=datetime(2026, 2, 17, tzinfo=timezone.utc))
+        assert int(table.quotes["version"][0]) == 0
+
+        table.quotes["version"][0] = 3
+        assert table.release_worker_slots(0) == 1
+        assert int(table.quotes["version"][0]) == 4
+    finally:
+        table.close()
+        table.unlink()
+
+
+def test_quote_ingestion_pool_workers_fill_shared_price_table() -> None:
+    symbols = [f"{index:06d}" for index in range(1, 26)]
+    pool = QuoteIngestionPool(
+        symbols=symbols,
+        gateway_factory=_static_gateway_factory,
+        config=QuoteMonitoringConfig(mode="mock", poll_interval_ms=50),
+        worker_count=2,
+    )
+    try:
+        pool.start()
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            snapshot = pool.price_table.snapshot()
+            if (snapshot["sequence"] > 0).all():
+                break
+            time.sleep(0.05)
+        assert (snapshot["sequence"] > 0).all()
+        assert snapshot["price"].tolist() == [index * 100 * 100 for index in range(1, 26)]
+        assert pool.price_table.worker_snapshot()["cycles"].min() >= 1
+    finally:
+        pool.stop()
+    assert pool.alive_workers == 0
+
+
+def test_tick_log_replay_reproduces_live_service_outputs(tmp_path: Path) -> None:
+    symbols = ["005930", "000660"]
+    kst = timezone(timedelta(hours=9))
+    results = [
+        PollQuotesResult(poll_cycle_id="c1", quotes=[_quote("005930", "100", 9, 3, 0), _quote("000660", "200", 9, 3, 0)], errors=[], partial=False),
+        PollQuotesResult(poll_cycle_id="c2", quotes=[_quote("005930", "98", 9, 3, 1)], errors=[], partial=False),
+        PollQuotesResult(
+            poll_cycle_id="c3",
+            quotes=[_quote("005930", "98.3", 9, 3, 2)],
+            errors=[PollQuoteError(symbol="000660", code="KIA_API_TIMEOUT", retryable=True)],
+            partial=True,
+        ),
+    ]
+    clock = iter(datetime(2026, 2, 17, 0, 3, second, tzinfo=timezone.utc) for second in range(10))
+    writer = TickLogWriter(directory=str(tmp_path), trading_date=date(2026, 2, 17))
+    live = TseService(trading_date=date(2026, 2, 17), watch_symbols=symbols, session_id="replay")
+    loop = QuoteMonitoringLoop(
+        tse_service=live,
+        kia_gateway=_FakeKiaGateway(results),
+        config=QuoteMonitoringConfig(mode="mock"),
+        now_fn=lambda: next(clock),
+        recorder=writer,
+    )
+    live_outputs = []
+    for _ in range(4):
+        live_outputs.extend(loop.run_cycle().outputs)
+    position = PositionUpdateEvent(
+        trading_date=date(2026, 2, 17),
+        symbol="005930",
+        position_state="LONG_OPEN",
+        avg_buy_price=Decimal("98.5"),
+        current_price=Decimal("100"),
+        current_profit_rate=Decimal("1.5228"),
+        max_profit_rate=Decimal("1.5228"),
+        min_profit_locked=True,
+        updated_at=datetime(2026, 2, 17, 9, 3, 5, tzinfo=kst),
+    )
+    writer.record_position_update(position, recorded_at=next(clock))
+    live_outputs.append(live.on_position_update(position))
+    writer.close()
+
+    assert any(output.commands for output in live_outputs)
+    assert (os.path.getsize(writer.path) - TICK_LOG_HEADER_SIZE) % TICK_LOG_RECORD_SIZE == 0
+    with TickLogReader(writer.path) as reader:
+        assert reader.trading_date == date(2026, 2, 17)
+        assert reader.record_count == 10
+        replayed = TseService(trading_date=date(2026, 2, 17), watch_symbols=symbols, session_id="replay")
+        sleeps: list[float] = []
+        outputs = TickReplayDriver(
+            tse_service=replayed,
+            reader=reader,
+            config=QuoteMonitoringConfig(mode="mock"),
+            speed=10.0,
+            sleep_fn=sleeps.append,
+        ).run()
+
+    assert outputs == live_outputs
+    assert replayed.ctx == live.ctx
+    assert sleeps == [0.2, 0.2, 0.2, 0.1]
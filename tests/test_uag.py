@@ -1,27 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import sqlite3
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
 import sys
+import threading
 import time
 from types import SimpleNamespace
 
 from fastapi.testclient import TestClient
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+from kia.api_client import RoutingKiaApiClient
 from kia.gateway import DefaultKiaGateway
-from kia.contracts import MarketQuote, OrderResult
-from tse.models import PlaceBuyOrderCommand
+from kia.mock_realtime_server import MockKiwoomRealtimeServer
+from kia.realtime import KiaRealtimeQuoteClient
+from kia.contracts import MarketQuote, OrderResult, PollQuotesResult
+from tse.models import PlaceBuyOrderCommand, PlaceSellOrderCommand, ServiceOutput, StrategyParams
+from tse.quote_monitoring import QuoteMonitoringConfig, QuoteStreamMonitor
 from tse.service import TseService
+from tse.sharding import ShardedTseService
+from tse.tick_log import TickLogWriter
 from uag.bootstrap import create_app
 from uag.models import MonitoringSnapshot
+from uag.order_lane import OrderExecutionLane
 from uag.service import UagService
 
 
@@ -171,6 +181,28 @@ def test_start_trading_connects_quote_monitoring_loop(tmp_path: Path) -> None:
         client.close()
 
 
+def test_uag_applies_configured_kia_request_cap_to_routing_clients(tmp_path: Path) -> None:
+    def build(**kwargs: Any) -> UagService:
+        return UagService(
+            settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+            credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+            prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+            **kwargs,
+        )
+
+    capped = build(kia_request_rate_per_second=1.0, kia_request_burst=2)
+    limiter = capped._routing_client().rate_limiter
+    assert limiter.reserve(mode="live", api_id="kt10000") == pytest.approx(0.0, abs=0.05)
+    assert limiter.reserve(mode="live", api_id="kt10000") == pytest.approx(2.0, abs=0.05)
+    assert limiter.reserve(mode="live", api_id="kt10000", priority=True) == pytest.approx(0.0, abs=0.05)
+    capped.shutdown()
+
+    uncapped = build(kia_request_rate_per_second=0.0)
+    limiter = uncapped._routing_client().rate_limiter
+    assert [limiter.reserve(mode="live", api_id="kt10000") for _ in range(10)] == [0.0] * 10
+    uncapped.shutdown()
+
+
 def test_uag_executes_tse_buy_command_via_opm_and_kia(tmp_path: Path) -> None:
     db_path = tmp_path / "runtime" / "state" / "prp.db"
     service = UagService(
@@ -190,6 +222,7 @@ def test_uag_executes_tse_buy_command_via_opm_and_kia(tmp_path: Path) -> None:
     )
 
     service._execute_tse_command(command)
+    assert service.prp_journal.flush(timeout=5.0)
 
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
@@ -244,6 +277,7 @@ def test_uag_buy_quantity_uses_max_affordable_from_buy_budget(tmp_path: Path) ->
     )
 
     service._execute_tse_command(command)
+    assert service.prp_journal.flush(timeout=5.0)
 
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
@@ -678,6 +712,51 @@ def test_update_monitoring_snapshots_does_not_update_previous_low_after_buy(tmp_
     assert snapshot.previous_low_time == first_low_time
 
 
+def test_append_position_update_outputs_uses_strategy_min_profit_lock_threshold(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+    )
+
+    kst = timezone(timedelta(hours=9))
+    service.state.trading_date = date(2026, 2, 17)
+    service._tse_service = TseService(
+        trading_date=date(2026, 2, 17),
+        watch_symbols=["005930"],
+        params=StrategyParams(min_profit_lock_pct=Decimal("3.0")),
+    )
+    service.state.monitoring_snapshots["005930"] = MonitoringSnapshot(
+        symbol_code="005930",
+        symbol_name="삼성전자",
+        buy_time=datetime(2026, 2, 17, 9, 20, 0, tzinfo=kst),
+        buy_price=Decimal("100"),
+    )
+    events: list[Any] = []
+    service._tse_service.on_position_update = lambda event: events.append(event) or ServiceOutput()
+
+    def cycle(price: str, minute: int) -> SimpleNamespace:
+        quote = MarketQuote(
+            symbol="005930",
+            symbol_name="삼성전자",
+            price=Decimal(price),
+            tick_size=1,
+            as_of=datetime(2026, 2, 17, 9, minute, 0, tzinfo=kst),
+        )
+        return SimpleNamespace(quotes=[quote], outputs=[])
+
+    service._append_position_update_outputs(cycle("102", 31))
+    service._append_position_update_outputs(cycle("103", 32))
+
+    assert [event.min_profit_locked for event in events] == [False, True]
+    assert not service._meets_previous_high_requirements(
+        snapshot=service.state.monitoring_snapshots["005930"],
+        quote_time=datetime(2026, 2, 17, 9, 33, 0, tzinfo=kst),
+        quote_price=Decimal("102"),
+    )
+
+
 def test_append_position_update_outputs_generates_sell_and_updates_monitoring_history(tmp_path: Path) -> None:
     service = UagService(
         settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
@@ -921,6 +1000,7 @@ def test_uag_buy_order_attempt_still_occurs_when_gateway_rejects(tmp_path: Path)
         reason_code="TEST",
     )
     service._execute_tse_command(command)
+    assert service.prp_journal.flush(timeout=5.0)
 
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
@@ -1082,6 +1162,112 @@ def test_running_engine_is_auto_resumed_on_service_restart(tmp_path: Path) -> No
         second.shutdown()
 
 
+def test_ingestion_workers_split_the_broker_budget_and_share_one_token(tmp_path: Path) -> None:
+    from kia.token_provider import SharedAccessToken
+    from uag.service import _build_ingestion_gateway
+
+    shared_token = SharedAccessToken()
+    gateway = _build_ingestion_gateway(
+        str(tmp_path / "settings.local.json"),
+        str(tmp_path / "credentials.local.json"),
+        shared_token,
+        4,
+        8.0,
+        8,
+    )
+    live_client = gateway._api_client._live_client
+    limiter = live_client._rate_limiter
+
+    assert limiter._mode_rule.rate_per_second == pytest.approx(8.0 / 4)
+    assert limiter._mode_rule.burst == 2
+    assert limiter._priority_rule is None
+    assert limiter.rule_for("ka10007").rate_per_second == pytest.approx(4.0 / 4)
+    assert gateway._api_client.token_provider._auth_issuer == shared_token.issue
+
+
+def test_shutdown_closes_prp_journal_connections_and_chart_store(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+    )
+    with service.prp.reader():
+        pass
+
+    service.shutdown()
+
+    assert service.prp_journal._thread.is_alive() is False
+    assert service.prp_journal._file.closed is True
+    with pytest.raises(RuntimeError):
+        service.prp_journal._append("noop", ())
+    with pytest.raises(RuntimeError):
+        with service.prp.reader():
+            pass
+    with pytest.raises(sqlite3.ProgrammingError):
+        service.chart_cache.store._conn.execute("SELECT 1")
+
+    service.shutdown()
+
+
+def test_app_lifespan_attaches_event_loop_and_shuts_service_down(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+    shutdown = UagService.shutdown
+    monkeypatch.setattr(UagService, "attach_event_loop", lambda self, loop: calls.append("attach"))
+
+    def tracking_shutdown(self: UagService) -> None:
+        calls.append("shutdown")
+        shutdown(self)
+
+    monkeypatch.setattr(UagService, "shutdown", tracking_shutdown)
+
+    with _create_client(tmp_path) as client:
+        assert calls == ["attach"]
+        assert client.get("/api/monitor/status").status_code == 200
+
+    assert calls == ["attach", "shutdown"]
+
+
+def test_backtest_ticks_endpoint_replays_recorded_tick_log(tmp_path: Path) -> None:
+    tick_dir = tmp_path / "runtime" / "ticks"
+    kst = timezone(timedelta(hours=9))
+    writer = TickLogWriter(directory=str(tick_dir), trading_date=date(2026, 2, 17))
+    for minute, (samsung, hynix) in enumerate([("70000", "120000"), ("69000", "121000"), ("69500", "119000")]):
+        at = datetime(2026, 2, 17, 9, minute, 0, tzinfo=kst)
+        writer.record_poll_result(
+            PollQuotesResult(
+                poll_cycle_id=f"c{minute}",
+                quotes=[
+                    MarketQuote(symbol="005930", price=Decimal(samsung), tick_size=1, as_of=at),
+                    MarketQuote(symbol="000660", price=Decimal(hynix), tick_size=1, as_of=at),
+                ],
+                errors=[],
+                partial=False,
+            ),
+            recorded_at=at,
+        )
+    writer.close()
+    app = create_app(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        tick_log_dir=str(tick_dir),
+    )
+    client = TestClient(app)
+
+    everything = client.get("/api/backtest/ticks", params={"date": "2026-02-17"})
+    only_samsung = client.get("/api/backtest/ticks", params={"date": "2026-02-17", "symbols": "005930"})
+    missing = client.get("/api/backtest/ticks", params={"date": "2026-02-18"})
+
+    assert everything.status_code == 200
+    assert everything.json()["data"]["quoteCount"] == 6
+    assert everything.json()["data"]["symbols"] == ["000660", "005930"]
+    assert only_samsung.json()["data"]["quoteCount"] == 3
+    assert only_samsung.json()["data"]["symbols"] == ["005930"]
+    assert missing.status_code == 404
+    assert missing.json()["error"]["code"] == "UAG_HTTP_ERROR"
+
+
 def test_initialize_reference_prices_backfills_0830_when_started_after_reference_time(tmp_path: Path) -> None:
     service = UagService(
         settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
@@ -1101,7 +1287,7 @@ def test_initialize_reference_prices_backfills_0830_when_started_after_reference
 
     service._initialize_reference_prices(
         tse_service=tse_service,
-        kia_gateway=_Gateway(),  # type: ignore[arg-type]
+        kia_gateways=[_Gateway()],  # type: ignore[list-item]
         mode="live",
         watch_symbols=["005930"],
         now_value=datetime(2026, 2, 17, 9, 10, 0, tzinfo=timezone(timedelta(hours=9))),
@@ -1113,6 +1299,43 @@ def test_initialize_reference_prices_backfills_0830_when_started_after_reference
     assert tse_service.ctx.symbols["005930"].state == "TRACKING"
 
 
+def test_initialize_reference_prices_fans_out_to_each_shard_gateway_concurrently(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+    )
+    service.state.trading_date = date(2026, 2, 17)
+    symbols = [f"{index:06d}" for index in range(1, 26)]
+    tse_service = ShardedTseService(trading_date=date(2026, 2, 17), watch_symbols=symbols)
+    both_shards_fetching = threading.Barrier(2)
+
+    class _ShardGateway:
+        def __init__(self) -> None:
+            self.symbols: list[str] = []
+
+        def fetch_reference_price_0830(self, *, mode, symbol):
+            if not self.symbols:
+                both_shards_fetching.wait(timeout=2.0)
+            self.symbols.append(symbol)
+            return Decimal("1000")
+
+    gateways = [_ShardGateway(), _ShardGateway()]
+    service._initialize_reference_prices(
+        tse_service=tse_service,
+        kia_gateways=gateways,  # type: ignore[arg-type]
+        mode="live",
+        watch_symbols=symbols,
+        now_value=datetime(2026, 2, 17, 9, 10, 0, tzinfo=timezone(timedelta(hours=9))),
+    )
+
+    assert [sorted(gateway.symbols) for gateway in gateways] == [
+        sorted(shard.ctx.symbols) for shard in tse_service.shards
+    ]
+    assert all(tse_service.ctx.symbols[symbol].reference_price == Decimal("1000") for symbol in symbols)
+
+
 def test_initialize_reference_prices_restores_tse_buy_candidate_from_previous_low_snapshot(tmp_path: Path) -> None:
     service = UagService(
         settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
@@ -1138,7 +1361,7 @@ def test_initialize_reference_prices_restores_tse_buy_candidate_from_previous_lo
 
     service._initialize_reference_prices(
         tse_service=tse_service,
-        kia_gateway=_Gateway(),  # type: ignore[arg-type]
+        kia_gateways=[_Gateway()],  # type: ignore[list-item]
         mode="mock",
         watch_symbols=["005930"],
         now_value=datetime(2026, 2, 17, 9, 10, 0, tzinfo=timezone(timedelta(hours=9))),
@@ -1174,7 +1397,7 @@ def test_initialize_reference_prices_does_not_restore_buy_candidate_when_trackin
 
     service._initialize_reference_prices(
         tse_service=tse_service,
-        kia_gateway=_Gateway(),  # type: ignore[arg-type]
+        kia_gateways=[_Gateway()],  # type: ignore[list-item]
         mode="mock",
         watch_symbols=["005930"],
         now_value=datetime(2026, 2, 17, 9, 10, 0, tzinfo=timezone(timedelta(hours=9))),
@@ -1213,7 +1436,7 @@ def test_initialize_reference_prices_does_not_restore_buy_candidate_after_buy_si
 
     service._initialize_reference_prices(
         tse_service=tse_service,
-        kia_gateway=_Gateway(),  # type: ignore[arg-type]
+        kia_gateways=[_Gateway()],  # type: ignore[list-item]
         mode="mock",
         watch_symbols=["005930"],
         now_value=datetime(2026, 2, 17, 9, 10, 0, tzinfo=timezone(timedelta(hours=9))),
@@ -1222,4 +1445,415 @@ def test_initialize_reference_prices_does_not_restore_buy_candidate_after_buy_si
     symbol_ctx = tse_service.ctx.symbols["005930"]
     assert symbol_ctx.reference_price == Decimal("100")
     assert symbol_ctx.state == "BUY_BLOCKED"
-    assert symbol_ctx.tracked_low is None
\ No newline at end of file
+    assert symbol_ctx.tracked_low is None
+
+def test_uag_asyncio_runtime_runs_quote_loop_on_attached_event_loop(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+        quote_runtime="asyncio",
+    )
+    service.start_trading(trading_date=date.today(), dry_run=True)
+    assert service.state.quote_cycles_total == 0
+
+    async def scenario() -> dict:
+        service.attach_event_loop(asyncio.get_running_loop())
+        for _ in range(200):
+            if service.state.quote_cycles_total > 0:
+                break
+            await asyncio.sleep(0.01)
+        status = service.monitor_status()
+        service.shutdown()
+        await asyncio.sleep(0)
+        return status
+
+    status = asyncio.run(scenario())
+
+    assert service.state.quote_cycles_total >= 1
+    assert service._quote_loop_thread is None
+    assert status["quoteMonitoring"]["runtime"] == "asyncio"
+    assert status["quoteMonitoring"]["lastQuoteCount"] == 1
+    assert status["quoteMonitoring"]["lastCycleError"] is None
+    assert status["quoteMonitoring"]["overrunCount"] == 0
+    assert status["quoteMonitoring"]["skippedCycles"] == 0
+    assert status["quoteMonitoring"]["maxLatenessMs"] >= 0
+
+
+def test_uag_asyncio_runtime_keeps_blocking_persistence_off_the_event_loop(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+        quote_runtime="asyncio",
+    )
+    record_threads: list[int] = []
+    record_quote_cycle = service._record_quote_cycle
+
+    def tracking_record(cycle, **kwargs):  # type: ignore[no-untyped-def]
+        record_threads.append(threading.get_ident())
+        record_quote_cycle(cycle, **kwargs)
+
+    service._record_quote_cycle = tracking_record  # type: ignore[method-assign]
+    service.start_trading(trading_date=date.today(), dry_run=True)
+
+    async def scenario() -> int:
+        service.attach_event_loop(asyncio.get_running_loop())
+        for _ in range(200):
+            if record_threads:
+                break
+            await asyncio.sleep(0.01)
+        service.shutdown()
+        await asyncio.sleep(0)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+
+    assert record_threads
+    assert loop_thread not in record_threads
+
+
+def test_uag_quote_stream_updates_monitoring_and_falls_back_to_rest(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+        quote_source="stream",
+    )
+    server = MockKiwoomRealtimeServer(
+        ticks_by_connection=[[MockKiwoomRealtimeServer.tick("005930", "70100", "090001")]],
+        max_connections=1,
+    )
+    credentials = service.repository.read_credentials()
+    credentials["credential"].update({"appKey": "APPKEY", "appSecret": "APPSECRET", "liveWebSocketUrl": server.url})
+    service.repository.write_credentials(credentials)
+
+    api_client = RoutingKiaApiClient(
+        csm_repository=service.repository,
+        transport=lambda *_args: (200, {"token": "ws-token", "expires_in": 3600}),
+    )
+    tse_service = TseService(trading_date=date.today(), watch_symbols=["005930"])
+    fallbacks: list[str] = []
+    service.state.engine_state = "RUNNING"
+    service.state.trading_date = date.today()
+    service._tse_service = tse_service
+    service._quote_stream_monitor = QuoteStreamMonitor(tse_service=tse_service, config=QuoteMonitoringConfig(mode="live"))
+    service._quote_stream_client = KiaRealtimeQuoteClient(
+        api_client=api_client,
+        mode="live",
+        recv_timeout_seconds=2.0,
+        reconnect_base_delay_seconds=0.01,
+        max_reconnect_attempts=1,
+    )
+    service._quote_stream_thread = threading.current_thread()
+    service._launch_rest_quote_loop = lambda: fallbacks.append("rest")  # type: ignore[method-assign]
+
+    with server:
+        service._quote_stream_worker(["005930"])
+
+    assert server.registrations == [["005930"]]
+    assert service.state.quote_cycles_total == 1
+    assert service.state.quote_last_poll_cycle_id.startswith("stream-")
+    assert service.state.monitoring_snapshots["005930"].current_price == Decimal("70100")
+    assert service.state.quote_stream_reconnects == 2
+    assert fallbacks == ["rest"]
+
+
+def test_order_lane_runs_sells_ahead_of_queued_buys_and_records_latency() -> None:
+    release_first = threading.Event()
+    executed: list[str] = []
+    clock = {"now": 0.0}
+
+    def execute(command):
+        if not executed:
+            assert release_first.wait(timeout=1.0)
+        executed.append(command.command_id)
+        clock["now"] += 0.03
+        return OrderResult(
+            broker_order_id=f"B-{command.command_id}",
+            client_order_id=command.command_id,
+            status="ACCEPTED",
+            accepted_at=None,
+        )
+
+    def command(command_type, command_id: str):
+        return command_type(
+            command_id=command_id,
+            trading_date=date(2026, 2, 17),
+            symbol="005930",
+            order_price=Decimal("70000"),
+            reason_code="TEST",
+        )
+
+    lane = OrderExecutionLane(execute_fn=execute, monotonic_fn=lambda: clock["now"])
+    lane.start()
+    assert lane.submit(command(PlaceBuyOrderCommand, "buy-1")) is True
+    for _ in range(100):
+        if lane.stats()["pending"] == 1 and lane._queue.empty():
+            break
+        time.sleep(0.01)
+    assert lane.submit(command(PlaceBuyOrderCommand, "buy-2")) is True
+    assert lane.submit(command(PlaceSellOrderCommand, "sell-1")) is True
+    assert lane.submit(command(PlaceSellOrderCommand, "sell-1")) is False
+    release_first.set()
+    lane.stop()
+
+    stats = lane.stats()
+    assert executed == ["buy-1", "sell-1", "buy-2"]
+    assert stats["running"] is False
+    assert stats["pending"] == 0
+    assert stats["acknowledged"] == 3
+    assert stats["signalToAckMs"]["count"] == 3
+    assert stats["signalToAckMs"]["maxMs"] == 90.0
+    assert sum(bucket["count"] for bucket in stats["signalToAckMs"]["buckets"]) == 3
+
+
+def test_order_lane_forgets_command_ids_on_restart_and_bounds_tracking(caplog) -> None:
+    executed: list[str] = []
+
+    def execute(command):
+        executed.append(command.command_id)
+        return OrderResult(broker_order_id="B", client_order_id=command.command_id, status="ACCEPTED", accepted_at=None)
+
+    def command(command_id: str):
+        return PlaceBuyOrderCommand(
+            command_id=command_id,
+            trading_date=date(2026, 2, 17),
+            symbol="005930",
+            order_price=Decimal("70000"),
+            reason_code="TEST",
+        )
+
+    lane = OrderExecutionLane(execute_fn=execute, max_tracked_command_ids=2)
+    lane.start()
+    assert lane.submit(command("2026-02-17-005930-BUY-1")) is True
+    with caplog.at_level("WARNING", logger="privatetrade.uag.order_lane"):
+        assert lane.submit(command("2026-02-17-005930-BUY-1")) is False
+    assert "duplicate command" in caplog.text
+    assert lane.submit(command("2026-02-17-005930-BUY-2")) is True
+    assert lane.submit(command("2026-02-17-005930-BUY-3")) is True
+    assert list(lane._seen_command_ids) == ["2026-02-17-005930-BUY-2", "2026-02-17-005930-BUY-3"]
+    lane.stop()
+
+    lane.start()
+    assert lane.submit(command("2026-02-17-005930-BUY-1")) is True
+    lane.stop()
+
+    assert executed == [
+        "2026-02-17-005930-BUY-1",
+        "2026-02-17-005930-BUY-2",
+        "2026-02-17-005930-BUY-3",
+        "2026-02-17-005930-BUY-1",
+    ]
+    assert lane.stats()["duplicates"] == 1
+    assert lane.stats()["submitted"] == 4
+
+
+def test_tse_sell_signal_is_dispatched_to_order_lane_before_cycle_completes(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+    )
+    submitted = threading.Event()
+
+    class _AcceptGateway:
+        def submit_order(self, req):
+            submitted.set()
+            return OrderResult(broker_order_id="S-1", client_order_id=req.client_order_id, status="ACCEPTED", accepted_at=None)
+
+    kst = timezone(timedelta(hours=9))
+    service.state.trading_date = date(2026, 2, 17)
+    service.state.dry_run = False
+    service._order_gateway = _AcceptGateway()  # type: ignore[assignment]
+    tse_service = TseService(trading_date=date(2026, 2, 17), watch_symbols=["005930"])
+    tse_service.set_command_listener(service._dispatch_order_command)
+    tse_service.ctx.portfolio.min_profit_locked = True
+    service._tse_service = tse_service
+    service.state.monitoring_snapshots["005930"] = MonitoringSnapshot(
+        symbol_code="005930",
+        symbol_name="삼성전자",
+        buy_time=datetime(2026, 2, 17, 9, 20, 0, tzinfo=kst),
+        buy_price=Decimal("100"),
+        previous_high_price=Decimal("102"),
+    )
+    service._order_lane.start()
+    try:
+        service._append_position_update_outputs(
+            SimpleNamespace(
+                quotes=[
+                    MarketQuote(
+                        symbol="005930",
+                        price=Decimal("100.5"),
+                        tick_size=1,
+                        as_of=datetime(2026, 2, 17, 9, 32, 0, tzinfo=kst),
+                    )
+                ],
+                outputs=[],
+            )
+        )
+        assert submitted.wait(timeout=1.0)
+    finally:
+        service._order_lane.stop()
+
+    status = service.monitor_status()["orderExecution"]
+    assert status["submitted"] == 1
+    assert status["acknowledged"] == 1
+    assert status["signalToAckMs"]["count"] == 1
+
+
+def test_order_lane_submits_through_async_gateway_on_event_loop_in_priority_order(tmp_path: Path) -> None:
+    service = UagService(
+        settings_path=str(tmp_path / "runtime" / "config" / "settings.local.json"),
+        credentials_path=str(tmp_path / "runtime" / "config" / "credentials.local.json"),
+        prp_db_path=str(tmp_path / "runtime" / "state" / "prp.db"),
+        monitoring_state_path=str(tmp_path / "runtime" / "state" / "uag_monitoring_state.json"),
+        quote_runtime="asyncio",
+    )
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+    submitted: list[tuple[str, bool]] = []
+
+    class _SyncGateway:
+        def submit_order(self, req):
+            raise AssertionError("sync order path used while the event loop is running")
+
+    class _AsyncGateway:
+        async def submit_order(self, req):
+            submitted.append((req.client_order_id, asyncio.get_running_loop() is loop))
+            return OrderResult(broker_order_id=f"B-{len(submitted)}", client_order_id=req.client_order_id, status="ACCEPTED", accepted_at=None)
+
+        def close(self) -> None:
+            return None
+
+    service._event_loop = loop
+    service._order_gateway = _SyncGateway()  # type: ignore[assignment]
+    service._async_order_gateway = _AsyncGateway()  # type: ignore[assignment]
+    commands = [
+        PlaceBuyOrderCommand(command_id="BUY-1", trading_date=date(2026, 2, 17), symbol="005930", order_price=Decimal("70000"), reason_code="TEST"),
+        PlaceBuyOrderCommand(command_id="BUY-2", trading_date=date(2026, 2, 17), symbol="000660", order_price=Decimal("70000"), reason_code="TEST"),
+        PlaceSellOrderCommand(command_id="SELL-1", trading_date=date(2026, 2, 17), symbol="035420", order_price=Decimal("70000"), reason_code="TEST"),
+    ]
+    try:
+        for command in commands:
+            assert service._order_lane.submit(command)
+        service._order_lane.start()
+        for _ in range(200):
+            if service._order_lane.stats()["pending"] == 0:
+                break
+            time.sleep(0.01)
+    finally:
+        service._order_lane.stop()
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=2.0)
+        loop.close()
+
+    assert submitted == [("SELL-1", True), ("BUY-1", True), ("BUY-2", True)]
+    assert service._order_lane.stats()["acknowledged"] == 3
+
+
+def test_backtest_minutes_endpoint_simulates_strategy_when_requested(tmp_path: Path) -> None:
+    client = _create_client(tmp_path)
+    try:
+        plain = client.get("/api/backtest/minutes", params={"symbol": "005930", "date": "2026-02-17"})
+        assert plain.status_code == 200
+        assert "backtest" not in plain.json()["data"]
+
+        response = client.get("/api/backtest/minutes", params={"symbol": "005930", "date": "2026-02-17", "simulate": "true"})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        backtest = data["backtest"]
+        assert backtest["tradingDate"] == "2026-02-17"
+        assert backtest["quoteCount"] == len(data["minutes"]) * 4
+        assert len(backtest["equityCurve"]) == len(data["minutes"])
+        assert isinstance(backtest["totalNetPnl"], str)
+        assert isinstance(backtest["maxDrawdown"], str)
+    finally:
+        client.close()
+
+
+def test_report_endpoints_return_503_when_prp_journal_cannot_drain(tmp_path: Path, monkeypatch) -> None:
+    from prp.journal import PrpWriteBehindJournal
+
+    monkeypatch.setattr(PrpWriteBehindJournal, "flush", lambda self, timeout=None: False)
+    client = _create_client(tmp_path)
+    try:
+        for path in ("/api/reports/daily?date=2026-02-17", "/api/reports/trades?date=2026-02-17"):
+            response = client.get(path)
+            assert response.status_code == 503
+            assert response.json()["error"]["code"] == "UAG_PRP_JOURNAL_STALLED"
+            assert response.json()["error"]["retryable"] is True
+    finally:
+        client.close()
+
+
+def test_trades_report_endpoint_serves_etag_and_revalidates_on_new_executions(tmp_path: Path) -> None:
+    from prp.bootstrap import initialize_database
+    from prp.models import ExecutionEvent
+    from prp.repository import PrpRepository
+
+    client = _create_client(tmp_path)
+    try:
+        first = client.get("/api/reports/trades?date=2026-02-17")
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert first.json()["data"]["count"] == 0
+
+        cached = client.get("/api/reports/trades?date=2026-02-17", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+
+        with PrpRepository(conn=initialize_database(tmp_path / "runtime" / "state" / "prp.db")) as repo:
+            repo.append_execution_events(
+                [
+                    ExecutionEvent(
+                        event_id=f"evt-{side}",
+                        execution_id=f"exe-{side}",
+                        order_id=f"ord-{side}",
+                        occurred_at=datetime(2026, 2, 17, 9, minute, tzinfo=timezone.utc),
+                        trading_date=date(2026, 2, 17),
+                        symbol="005930",
+                        side=side,
+                        execution_price=Decimal(price),
+                        execution_qty=3,
+                        cum_qty=3,
+                        remaining_qty=0,
+                    )
+                    for minute, side, price in ((0, "BUY", "70000"), (5, "SELL", "71000"))
+                ]
+            )
+
+        refreshed = client.get("/api/reports/trades?date=2026-02-17", headers={"If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.headers["ETag"] != etag
+        payload = refreshed.json()
+        assert payload["success"] is True
+        assert payload["data"]["count"] == 1
+        assert payload["data"]["items"][0]["id"] == "exe-SELL-0"
+        assert payload["data"]["items"][0]["sellAmount"] == "213000"
+    finally:
+        client.close()
+
+
+def test_range_report_endpoint_contract_and_rejects_reversed_range(tmp_path: Path) -> None:
+    client = _create_client(tmp_path)
+    try:
+        response = client.get("/api/reports/range?from=2026-02-01&to=2026-02-28")
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["success"] is True
+        assert payload["data"]["from"] == "2026-02-01"
+        assert payload["data"]["tradingDays"] == 0
+        assert payload["data"]["maxDrawdown"] == "0.00"
+        assert payload["data"]["days"] == []
+
+        reversed_range = client.get("/api/reports/range?from=2026-02-28&to=2026-02-01")
+        assert reversed_range.status_code == 400
+        assert reversed_range.json()["success"] is False
+    finally:
+        client.close()